@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Protocol of the automation helper
+
+The automation helper (cmk --automation-helper) is a long running process of the site which
+keeps the check plugins and the configuration loaded. It executes the automation calls in
+forked child processes, which saves starting a new check_mk process for each call.
+
+The client sends a request and the helper answers with a response. Both are JSON objects
+terminated by shutting down the writing side of the connection. The helper answers with
+null in case it did not execute the call, e.g. because it needs to be restarted. The
+client has to execute the call on its own in this case."""
+
+import json
+import socket
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Sequence
+
+import cmk.utils.paths
+
+
+class AutomationHelperRequest(NamedTuple):
+    command: str
+    args: Sequence[str]
+    stdin: str
+    verbosity: int
+
+
+class AutomationHelperResponse(NamedTuple):
+    exit_code: int
+    stdout: str
+    stderr: str
+
+
+def send(sock: socket.socket, data: Any) -> None:
+    sock.sendall(json.dumps(data).encode("utf-8"))
+    sock.shutdown(socket.SHUT_WR)
+
+
+def receive(sock: socket.socket) -> Any:
+    chunks = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    if not chunks:
+        raise ConnectionError("The connection was closed without any data")
+    return json.loads(b"".join(chunks))
+
+
+def execute(
+    request: AutomationHelperRequest, socket_path: Optional[Path] = None
+) -> Optional[AutomationHelperResponse]:
+    """Execute an automation call with the automation helper
+
+    Returns None in case the helper is not running or did not execute the call."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        try:
+            sock.connect(str(socket_path or cmk.utils.paths.automation_helper_socket))
+        except OSError:
+            return None
+        send(sock, request._asdict())
+        response = receive(sock)
+    return None if response is None else AutomationHelperResponse(**response)
@@ -3,6 +3,9 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import marshal
+import os
+import struct
 from ast import literal_eval
 from contextlib import contextmanager
 from pathlib import Path
@@ -18,6 +21,7 @@ from typing import (
     Mapping,
     MutableMapping,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
@@ -76,6 +80,14 @@ class _StaticDiskSyncedMapping(Mapping[_TKey, _TValue]):
     on disk.
 
     The only way to modify the values is the disksync method.
+
+    The file is a log of change records: The first record is a snapshot of all
+    values, every sync appends a record containing only the changed keys.
+    Once the appended records outgrow the snapshot, the log is compacted into
+    a new snapshot. Every snapshot gets a new random generation marker in the
+    header, so that appended records are only replayed onto the snapshot they
+    belong to. Files written by previous versions (the repr of the whole
+    mapping) are read, and replaced by a log upon the next change.
     """
 
     def __init__(
@@ -83,15 +95,15 @@ class _StaticDiskSyncedMapping(Mapping[_TKey, _TValue]):
         *,
         path: Path,
         log_debug: Callable[[str], None],
-        serializer: Callable[[Mapping[_TKey, _TValue]], str],
-        deserializer: Callable[[str], Mapping[_TKey, _TValue]],
     ) -> None:
         self._path: Final = path
-        self._last_sync: Optional[float] = None
-        self._data: Mapping[_TKey, _TValue] = {}
+        self._last_sync: Optional[Tuple[int, int, int]] = None
+        self._data: Dict[_TKey, _TValue] = {}
         self._log_debug = log_debug
-        self._serializer: Final = serializer
-        self._deserializer: Final = deserializer
+        # Position of the end of the last complete record, if the file is a valid log
+        self._log_end: Optional[int] = None
+        self._generation: Optional[bytes] = None
+        self._snapshot_size = 0
         self.disksync()
 
     def __getitem__(self, key: _TKey) -> _TValue:
@@ -112,7 +124,7 @@ class _StaticDiskSyncedMapping(Mapping[_TKey, _TValue]):
         """Re-load and write the changes of the stored values
 
         This method will reload the values from disk, apply the changes (remove keys
-        and update values) as specified by the arguments, and then write the result to disk.
+        and update values) as specified by the arguments, and then write the changes to disk.
 
         When this method returns, the data provided via the Mapping-interface and
         the data stored on disk must be in sync.
@@ -124,27 +136,153 @@ class _StaticDiskSyncedMapping(Mapping[_TKey, _TValue]):
         try:
             store.aquire_lock(self._path)
 
-            if self._path.stat().st_mtime == self._last_sync:
-                self._log_debug("already loaded")
-            else:
-                self._log_debug("loading from disk")
-                self._data = self._deserializer(
-                    store.load_text_from_file(self._path, default="{}", lock=False)
-                )
-
-            if removed or updated:
-                data = {k: v for k, v in self._data.items() if k not in removed}
-                data.update(updated)
-                self._log_debug("writing to disk")
-                store.save_text_to_file(self._path, self._serializer(data))
-                self._data = data
-
-            self._last_sync = self._path.stat().st_mtime
+            self._load()
+
+            removed_keys = [k for k in self._data if k in removed]
+            updated_items = [(k, v) for k, v in updated if not self._is_unchanged(k, v)]
+            if removed_keys or updated_items:
+                for key in removed_keys:
+                    del self._data[key]
+                self._data.update(updated_items)
+                self._write(_serialize_record(removed_keys, updated_items))
+
+            self._last_sync = self._file_signature()
         except Exception as exc:
             raise MKGeneralException from exc
         finally:
             store.release_lock(self._path)
 
+    def _is_unchanged(self, key: _TKey, value: _TValue) -> bool:
+        try:
+            stored = self._data[key]
+        except KeyError:
+            return False
+        # If it is the very same object, it may have been modified in place.
+        return stored is not value and type(stored) is type(value) and stored == value
+
+    def _file_signature(self) -> Tuple[int, int, int]:
+        stat = self._path.stat()
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _load(self) -> None:
+        signature = self._file_signature()
+        if signature == self._last_sync:
+            self._log_debug("already loaded")
+            return
+
+        if (
+            self._last_sync is not None
+            and self._log_end is not None
+            and self._generation is not None
+            and signature[0] == self._last_sync[0]
+            and signature[1] > self._log_end
+        ):
+            with self._path.open("rb") as file:
+                # The inode may have been reused for a different file: only replay the appended
+                # records if they belong to the snapshot we have loaded.
+                if file.read(_LOG_HEADER_SIZE) == _LOG_MAGIC + self._generation:
+                    self._log_debug("loading appended changes from disk")
+                    file.seek(self._log_end)
+                    self._log_end += _replay_records(self._data, file.read())
+                    return
+
+        self._log_debug("loading from disk")
+        raw = self._path.read_bytes()
+        self._data = {}
+        self._generation = None
+        self._snapshot_size = 0
+        if not raw.startswith(_LOG_MAGIC):
+            if raw.strip():
+                self._data.update(literal_eval(raw.decode("utf-8")))
+                self._log_end = None  # not appendable, write a new log upon the next change
+            else:
+                self._log_end = 0
+            return
+
+        if len(raw) < _LOG_HEADER_SIZE:
+            self._log_end = None  # truncated header, write a new log upon the next change
+            return
+
+        self._generation = raw[len(_LOG_MAGIC) : _LOG_HEADER_SIZE]
+        self._snapshot_size = _replay_records(self._data, raw[_LOG_HEADER_SIZE:], count=1)
+        self._log_end = (
+            _LOG_HEADER_SIZE
+            + self._snapshot_size
+            + _replay_records(self._data, raw[_LOG_HEADER_SIZE + self._snapshot_size :])
+        )
+
+    def _must_compact(self, record_size: int) -> bool:
+        if self._log_end is None or self._log_end < _LOG_HEADER_SIZE + self._snapshot_size:
+            return True  # no valid log yet
+        if self._log_end != self._path.stat().st_size:
+            return True  # there is an incomplete record, e.g. after a crash
+        appended = self._log_end - _LOG_HEADER_SIZE - self._snapshot_size
+        return appended + record_size > self._snapshot_size + _MIN_COMPACTION_SIZE
+
+    def _write(self, record: bytes) -> None:
+        if self._must_compact(len(record)):
+            self._log_debug("writing snapshot to disk")
+            snapshot = _serialize_record([], list(self._data.items()))
+            generation = os.urandom(_GENERATION_SIZE)
+            store.save_bytes_to_file(self._path, _LOG_MAGIC + generation + snapshot)
+            self._generation = generation
+            self._log_end = _LOG_HEADER_SIZE + len(snapshot)
+            self._snapshot_size = len(snapshot)
+            return
+
+        self._log_debug("appending changes to disk")
+        with self._path.open("ab") as file:
+            file.write(record)
+        self._log_end += len(record)
+
+
+_LOG_MAGIC: Final = b"CMK-VALUE-STORE-LOG-1\n"
+_GENERATION_SIZE: Final = 16
+_LOG_HEADER_SIZE: Final = len(_LOG_MAGIC) + _GENERATION_SIZE
+_RECORD_HEADER: Final = struct.Struct("<I")
+# Do not compact logs smaller than this, no matter how small the snapshot is.
+_MIN_COMPACTION_SIZE: Final = 4096
+
+
+def _serialize_record(
+    removed: Sequence[_TKey],
+    updated: Sequence[Tuple[_TKey, _TValue]],
+) -> bytes:
+    try:
+        payload = marshal.dumps((removed, updated))
+    except ValueError:
+        # Subclasses of builtin types can't be marshalled. Store them
+        # the way they have always been stored: as what their repr evaluates to.
+        payload = marshal.dumps(literal_eval(repr((removed, updated))))
+    return _RECORD_HEADER.pack(len(payload)) + payload
+
+
+def _replay_records(
+    data: MutableMapping[_TKey, _TValue],
+    raw: bytes,
+    count: Optional[int] = None,
+) -> int:
+    """Apply the changes of the (first `count`) complete records to data
+
+    Returns the size of the records that have been applied.
+    """
+    pos = 0
+    while count is None or count > 0:
+        if pos + _RECORD_HEADER.size > len(raw):
+            break
+        (size,) = _RECORD_HEADER.unpack_from(raw, pos)
+        end = pos + _RECORD_HEADER.size + size
+        if end > len(raw):
+            break  # incomplete record, most likely left over by a crash
+        removed, updated = marshal.loads(raw[pos + _RECORD_HEADER.size : end])
+        for key in removed:
+            data.pop(key, None)
+        data.update(updated)
+        pos = end
+        if count is not None:
+            count -= 1
+    return pos
+
 
 class _DiskSyncedMapping(MutableMapping[_TKey, _TValue]):  # pylint: disable=too-many-ancestors
     """Implements the overlay logic between dynamic and static value store"""
@@ -155,17 +293,10 @@ class _DiskSyncedMapping(MutableMapping[_TKey, _TValue]):  # pylint: disable=too
         *,
         path: Path,
         log_debug: Callable[[str], None],
-        serializer: Callable[[Mapping[_TKey, _TValue]], str],
-        deserializer: Callable[[str], Mapping[_TKey, _TValue]],
     ) -> "_DiskSyncedMapping":
         return cls(
             dynamic=_DynamicDiskSyncedMapping(),
-            static=_StaticDiskSyncedMapping(
-                path=path,
-                log_debug=log_debug,
-                serializer=serializer,
-                deserializer=deserializer,
-            ),
+            static=_StaticDiskSyncedMapping(path=path, log_debug=log_debug),
         )
 
     def __init__(
@@ -287,8 +418,6 @@ class ValueStoreManager:
         self._value_store: _DiskSyncedMapping[_ValueStoreKey, Any] = _DiskSyncedMapping.make(
             path=self.STORAGE_PATH / str(host_name),
             log_debug=lambda x: logger.debug("value store: %s", x),
-            serializer=repr,
-            deserializer=literal_eval,
         )
         self.active_service_interface: Optional[_ValueStore] = None
         self._host_name = host_name
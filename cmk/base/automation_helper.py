@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Execute automation calls in child processes of a long running helper process
+
+The helper loads the check plugins and the configuration once. For each automation call it
+forks a child process, which starts with everything loaded and behaves like a freshly
+started "check_mk --automation" process: It reads stdin from the request and its stdout,
+stderr and exit code are sent back to the client.
+
+The configuration is reloaded when one of its files changed since it was loaded. Changed
+local plugins can not be reloaded, the helper restarts itself in this case."""
+
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import traceback
+from itertools import chain
+from pathlib import Path
+from types import FrameType
+from typing import Callable, IO, Iterable, Iterator, List, NoReturn, Optional, Tuple
+
+import cmk.utils.daemon as daemon
+import cmk.utils.log as log
+import cmk.utils.paths
+from cmk.utils.exceptions import MKBailOut, MKGeneralException
+
+from cmk.automations.helper import AutomationHelperRequest, AutomationHelperResponse, receive, send
+
+import cmk.base.crash_reporting
+from cmk.base.automations import Automations
+
+logger = logging.getLogger("cmk.base.automation_helper")
+
+# Path, modification time and size of all files a loaded state depends on
+FilesSignature = Tuple[Tuple[str, int, int], ...]
+
+# Executes an automation call given as command line arguments and exits with its exit code
+RunAutomation = Callable[[List[str]], None]
+
+
+def _files_signature(paths: Iterable[Path]) -> FilesSignature:
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _walk(directory: Path) -> Iterator[Path]:
+    # The directories themselves are included to notice removed files
+    yield directory
+    yield from sorted(directory.rglob("*"))
+
+
+def config_signature() -> FilesSignature:
+    return _files_signature(
+        chain(
+            [
+                Path(cmk.utils.paths.main_config_file),
+                Path(cmk.utils.paths.final_config_file),
+                Path(cmk.utils.paths.local_config_file),
+                cmk.utils.paths.make_experimental_config_file(),
+            ],
+            _walk(Path(cmk.utils.paths.check_mk_config_dir)),
+        )
+    )
+
+
+def plugins_signature() -> FilesSignature:
+    return _files_signature(
+        chain.from_iterable(
+            _walk(Path(directory))
+            for directory in [
+                cmk.utils.paths.local_checks_dir,
+                cmk.utils.paths.local_agent_based_plugins_dir,
+            ]
+        )
+    )
+
+
+class AutomationHelper:
+    def __init__(
+        self,
+        socket_path: Path,
+        automations: Automations,
+        run_automation: RunAutomation,
+    ) -> None:
+        self._socket_path = socket_path
+        self._automations = automations
+        self._run_automation = run_automation
+        self._config_signature: FilesSignature = ()
+        self._plugins_signature: FilesSignature = ()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def serve_forever(self) -> None:
+        self._plugins_signature = plugins_signature()
+        self._automations.load_checks()
+        self._load_config()
+
+        if self._socket_path.exists():
+            self._socket_path.unlink()
+        self._listener.bind(str(self._socket_path))
+        self._listener.listen(32)
+        # Wake up regularly to clean up the finished child processes
+        self._listener.settimeout(1)
+        logger.info("Listening on %s", self._socket_path)
+
+        try:
+            while True:
+                self._reap_children()
+                try:
+                    connection, _address = self._listener.accept()
+                except socket.timeout:
+                    continue
+                with connection:
+                    self._handle_connection(connection)
+        finally:
+            self._listener.close()
+            self._socket_path.unlink(missing_ok=True)
+
+    def _load_config(self) -> None:
+        # The signature is taken first to notice changes made while loading
+        self._config_signature = config_signature()
+        self._automations.load_config()
+
+    def _reap_children(self) -> None:
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except ChildProcessError:
+            pass
+
+    def _handle_connection(self, connection: socket.socket) -> None:
+        connection.settimeout(10)
+        try:
+            request = AutomationHelperRequest(**receive(connection))
+        except (OSError, ValueError, TypeError) as e:
+            logger.error("Invalid request: %s", e)
+            return
+
+        if plugins_signature() != self._plugins_signature:
+            logger.info("Local plugins changed, restarting")
+            send(connection, None)
+            self._restart()
+
+        if config_signature() != self._config_signature:
+            logger.info("Configuration changed, reloading")
+            self._load_config()
+
+        logger.debug("Executing %s %r", request.command, request.args)
+        if os.fork() == 0:
+            self._execute_in_child(connection, request)
+
+    def _restart(self) -> NoReturn:
+        self._listener.close()
+        self._socket_path.unlink(missing_ok=True)
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    def _execute_in_child(
+        self, connection: socket.socket, request: AutomationHelperRequest
+    ) -> NoReturn:
+        try:
+            self._listener.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            connection.settimeout(None)
+            with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+                _redirect_standard_streams(request.stdin, stdout, stderr)
+                exit_code = self._execute(request)
+                for stream in (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__):
+                    if stream is not None:
+                        stream.flush()
+                response = AutomationHelperResponse(exit_code, _read(stdout), _read(stderr))
+            send(connection, response._asdict())
+        except Exception:
+            logger.exception("Failed to execute %s", request.command)
+            os._exit(1)
+        os._exit(0)
+
+    def _execute(self, request: AutomationHelperRequest) -> int:
+        """Execute the automation call like bin/check_mk does"""
+        log.setup_console_logging()
+        log.logger.setLevel(log.verbosity_to_log_level(request.verbosity))
+        try:
+            self._run_automation([request.command, *request.args])
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else int(e.code is not None)
+        except (MKGeneralException, MKBailOut) as e:
+            sys.stderr.write("%s\n" % e)
+            return 3
+        except Exception:
+            crash = cmk.base.crash_reporting.CMKBaseCrashReport.from_exception()
+            cmk.base.crash_reporting.CrashReportStore().save(crash)
+            sys.stderr.write(traceback.format_exc())
+            return 1
+        return 0
+
+
+def _redirect_standard_streams(stdin_data: str, stdout: IO[bytes], stderr: IO[bytes]) -> None:
+    """Let the standard streams of the process point to the given files
+
+    The file descriptors are replaced, so that also subprocesses use the files, and new stream
+    objects are created, so that no buffered data of the helper process is used."""
+    for stream in (sys.stdout, sys.stderr):
+        stream.flush()
+
+    with tempfile.TemporaryFile() as stdin:
+        stdin.write(stdin_data.encode("utf-8"))
+        stdin.seek(0)
+        os.dup2(stdin.fileno(), 0)
+    os.dup2(stdout.fileno(), 1)
+    os.dup2(stderr.fileno(), 2)
+
+    sys.stdin = open(0, encoding="utf-8", closefd=False)  # pylint: disable=consider-using-with
+    sys.stdout = open(
+        1, "w", encoding="utf-8", closefd=False
+    )  # pylint: disable=consider-using-with
+    sys.stderr = open(
+        2, "w", encoding="utf-8", closefd=False
+    )  # pylint: disable=consider-using-with
+
+
+def _read(f: IO[bytes]) -> str:
+    f.seek(0)
+    return f.read().decode("utf-8", errors="replace")
+
+
+def _raise_terminate(signum: int, stackframe: Optional[FrameType]) -> NoReturn:
+    sys.exit(0)
+
+
+def main(automations: Automations, run_automation: RunAutomation) -> None:
+    log.init_dedicated_logging(logging.INFO, logger, Path("automation-helper.log"))
+    # Clean up the socket when being stopped
+    signal.signal(signal.SIGTERM, _raise_terminate)
+    with daemon.pid_file_lock(cmk.utils.paths.omd_root / "tmp/run/automation-helper.pid"):
+        AutomationHelper(
+            cmk.utils.paths.automation_helper_socket, automations, run_automation
+        ).serve_forever()
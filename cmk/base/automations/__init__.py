@@ -34,6 +34,8 @@ class Automations:
     def __init__(self) -> None:
         super().__init__()
         self._automations: Dict[str, Automation] = {}
+        self._checks_loaded = False
+        self._config_loaded = False
 
     def register(self, automation: "Automation") -> None:
         if automation.cmd is None:
@@ -52,12 +54,11 @@ class Automations:
             if automation.needs_checks:
                 with redirect_stdout(open(os.devnull, "w")):
                     log.setup_console_logging()
-                    config.load_all_agent_based_plugins(
-                        check_api.get_check_api_context,
-                    )
+                    if not self._checks_loaded:
+                        self.load_checks()
 
-            if automation.needs_config:
-                config.load(validate_hosts=False)
+            if automation.needs_config and not self._config_loaded:
+                self.load_config()
 
             result = automation.execute(args)
 
@@ -81,6 +82,18 @@ class Automations:
 
         return 0
 
+    def load_checks(self) -> None:
+        """Load the check plugins for all following automation calls"""
+        config.load_all_agent_based_plugins(
+            check_api.get_check_api_context,
+        )
+        self._checks_loaded = True
+
+    def load_config(self) -> None:
+        """Load the configuration for all following automation calls"""
+        config.load(validate_hosts=False)
+        self._config_loaded = True
+
     def _handle_generic_arguments(self, args: List[str]) -> None:
         """Handle generic arguments (currently only the optional timeout argument)"""
         if len(args) > 1 and args[0] == "--timeout":
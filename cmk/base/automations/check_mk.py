@@ -1564,6 +1564,7 @@ class AutomationDiagHost(Automation):
             is_bulkwalk_host=is_bulkwalk_host,
             is_snmpv2or3_without_bulkwalk_host=is_snmpv2or3_without_bulkwalk_host,
             bulk_walk_size_of=snmp_config.bulk_walk_size_of,
+            max_concurrent_walks=snmp_config.max_concurrent_walks,
             timing={
                 "timeout": snmp_timeout,
                 "retries": snmp_retries,
@@ -2640,6 +2640,7 @@ class HostConfig:
                 self.hostname, snmpv2c_hosts
             ),
             bulk_walk_size_of=self._bulk_walk_size(),
+            max_concurrent_walks=self._snmp_max_concurrent_walks(),
             timing=self._snmp_timing(),
             oid_range_limits={
                 SectionName(name): rule
@@ -2702,6 +2703,14 @@ class HostConfig:
             return 10
         return bulk_sizes[0]
 
+    def _snmp_max_concurrent_walks(self) -> int:
+        max_concurrent_walks = self._config_cache.host_extra_conf(
+            self.hostname, snmp_max_concurrent_walks
+        )
+        if not max_concurrent_walks:
+            return 1
+        return max_concurrent_walks[0]
+
     def _snmp_character_encoding(self) -> Optional[str]:
         entries = self._config_cache.host_extra_conf(self.hostname, snmp_character_encodings)
         if not entries:
@@ -3182,6 +3191,7 @@ class HostConfig:
                 self.hostname, snmpv2c_hosts
             ),
             bulk_walk_size_of=self._bulk_walk_size(),
+            max_concurrent_walks=self._snmp_max_concurrent_walks(),
             timing=self._snmp_timing(),
             oid_range_limits={
                 SectionName(name): rule
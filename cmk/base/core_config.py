@@ -398,6 +398,12 @@ def _create_core_config(
     with config_path.create(is_cmc=core.is_cmc()), _backup_objects_file(core):
         core.create_config(config_path, config_cache, hosts_to_update=hosts_to_update)
 
+    cache_info = config_cache.ruleset_matcher.service_description_match_cache_info()
+    console.vverbose(
+        "Service description match cache: %d hits, %d misses (%.1f%% hit rate)\n"
+        % (cache_info.hits, cache_info.misses, cache_info.hit_rate * 100)
+    )
+
     cmk.utils.password_store.save_for_helpers(config_path)
 
     return get_configuration_warnings()
@@ -98,6 +98,8 @@ non_inline_snmp_hosts: Ruleset = []
 snmp_limit_oid_range: Ruleset = []
 # Ruleset to customize bulk size
 snmp_bulk_size: Ruleset = []
+# Ruleset to allow concurrent SNMP walks per host
+snmp_max_concurrent_walks: Ruleset = []
 snmp_default_community = "public"
 snmp_communities: Ruleset = []
 # override the rule based configuration
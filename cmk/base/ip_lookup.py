@@ -4,9 +4,24 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Iterable, Iterator, Mapping, MutableMapping, Optional, Protocol, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import cmk.utils.debug
 import cmk.utils.paths
@@ -22,6 +37,15 @@ IPLookupCacheId = Tuple[HostName, socket.AddressFamily]
 _fake_dns: Optional[HostAddress] = None
 _enforce_localhost = False
 
+# Number of concurrent DNS lookups and the time each of them may take when updating the cache
+_UPDATE_DNS_CACHE_WORKERS = 50
+_UPDATE_DNS_CACHE_LOOKUP_TIMEOUT = 30.0
+
+
+class _Resolver(Protocol):
+    def __call__(self, *, host_name: HostName, family: socket.AddressFamily) -> HostAddress:
+        ...
+
 
 class _HostConfigLike(Protocol):
     """This is what we expect from a HostConfig in *this* module"""
@@ -319,6 +343,12 @@ class IPLookupCache:
         self._cache.clear()
         self.save_persisted()
 
+    def replace(self, entries: Mapping[IPLookupCacheId, HostAddress]) -> None:
+        """Replace the persisted AND in memory cache with the given entries"""
+        self._cache.clear()
+        self._cache.update(entries)
+        self.save_persisted()
+
 
 def _get_ip_lookup_cache() -> IPLookupCache:
     """A file based fall-back DNS cache in case resolution fails"""
@@ -340,56 +370,125 @@ def update_dns_cache(
     # will just clear the cache.
     simulation_mode: bool,
     override_dns: Optional[HostAddress],
+    incremental: bool = False,
+    resolve: _Resolver = _actual_dns_lookup,
+    max_workers: int = _UPDATE_DNS_CACHE_WORKERS,
+    timeout: float = _UPDATE_DNS_CACHE_LOOKUP_TIMEOUT,
 ) -> UpdateDNSCacheResult:
+    """Resolve the addresses of all hosts looked up via DNS and write them to the cache
 
-    failed = []
-
+    The lookups are made concurrently and the cache file is written once in the end. The
+    addresses of hosts which are not looked up via DNS anymore are removed from the cache.
+    In incremental mode only the hosts without a cached address are looked up."""
     ip_lookup_cache = _get_ip_lookup_cache()
 
-    with ip_lookup_cache.persisting_disabled():
-
-        console.verbose("Cleaning up existing DNS cache...\n")
-        ip_lookup_cache.clear()
-
-        console.verbose("Updating DNS cache...\n")
-        for host_config, family in _annotate_family(host_configs):
-            console.verbose(f"{host_config.hostname} ({family})...")
-            try:
-                ip = lookup_ip_address(
-                    host_name=host_config.hostname,
-                    family=family,
-                    configured_ip_address=(
-                        configured_ipv4_addresses
-                        if family is socket.AF_INET
-                        else configured_ipv4_addresses
-                    ).get(host_config.hostname),
-                    simulation_mode=simulation_mode,
-                    is_snmp_usewalk_host=host_config.is_usewalk_host and host_config.is_snmp_host,
-                    override_dns=override_dns,
-                    is_dyndns_host=host_config.is_dyndns_host,
-                    is_no_ip_host=host_config.is_no_ip_host,
-                    force_file_cache_renewal=True,  # it's cleared anyway
-                )
-                console.verbose(f"{ip}\n")
-
-            except (MKTerminate, MKTimeout):
-                # We should be more specific with the exception handler below, then we
-                # could drop this special handling here
-                raise
-            except MKIPAddressLookupError as e:
-                failed.append(host_config.hostname)
-                console.verbose("lookup failed: %s\n" % e)
-                continue
-            except Exception as e:
-                failed.append(host_config.hostname)
-                console.verbose("lookup failed: %s\n" % e)
-                if cmk.utils.debug.enabled():
-                    raise
-                continue
-
-    ip_lookup_cache.save_persisted()
-
-    return len(ip_lookup_cache), failed
+    lookups = [
+        (host_config.hostname, family)
+        for host_config, family in _annotate_family(host_configs)
+        if _uses_dns_lookup(
+            host_config,
+            configured_ip_address=(
+                configured_ipv4_addresses if family is socket.AF_INET else configured_ipv6_addresses
+            ).get(host_config.hostname),
+            simulation_mode=simulation_mode,
+            override_dns=override_dns,
+        )
+    ]
+
+    entries: Dict[IPLookupCacheId, HostAddress] = {}
+    if incremental:
+        console.verbose("Keeping cached addresses of known hosts...\n")
+        for cache_id in lookups:
+            if (cached_ip := ip_lookup_cache.get(cache_id)) is not None:
+                entries[cache_id] = cached_ip
+
+    console.verbose("Updating DNS cache...\n")
+    failed_lookups: Set[IPLookupCacheId] = set()
+    for (host_name, family), result in _resolve_concurrently(
+        [cache_id for cache_id in lookups if cache_id not in entries],
+        resolve=resolve,
+        max_workers=max_workers,
+        timeout=timeout,
+    ):
+        if isinstance(result, Exception):
+            failed_lookups.add((host_name, family))
+            console.verbose(f"{host_name} ({family})...lookup failed: {result}\n")
+            if cmk.utils.debug.enabled() and not isinstance(result, MKIPAddressLookupError):
+                raise result
+            continue
+        console.verbose(f"{host_name} ({family})...{result}\n")
+        entries[(host_name, family)] = result
+
+    ip_lookup_cache.replace(entries)
+
+    return len(ip_lookup_cache), [
+        host_name for host_name, family in lookups if (host_name, family) in failed_lookups
+    ]
+
+
+def _uses_dns_lookup(
+    host_config: _HostConfigLike,
+    *,
+    configured_ip_address: Optional[HostAddress],
+    simulation_mode: bool,
+    override_dns: Optional[HostAddress],
+) -> bool:
+    """Whether or not lookup_ip_address() would look up the address of the host via DNS"""
+    return not (
+        _fake_dns
+        or override_dns
+        or simulation_mode
+        or _enforce_localhost
+        or (host_config.is_usewalk_host and host_config.is_snmp_host)
+        or configured_ip_address
+        or host_config.is_dyndns_host
+        or host_config.is_no_ip_host
+    )
+
+
+def _resolve_concurrently(
+    lookups: Sequence[IPLookupCacheId],
+    *,
+    resolve: _Resolver,
+    max_workers: int,
+    timeout: float,
+) -> Iterator[Tuple[IPLookupCacheId, Union[HostAddress, Exception]]]:
+    """Resolve the addresses with a pool of threads and yield them in the order they arrive
+
+    Failed lookups and lookups taking longer than the timeout yield the exception instead.
+    The threads of timed out lookups are left behind, the resolver can not be interrupted.
+    """
+    started: Dict[IPLookupCacheId, float] = {}
+
+    def lookup(cache_id: IPLookupCacheId) -> HostAddress:
+        started[cache_id] = time.monotonic()
+        return resolve(host_name=cache_id[0], family=cache_id[1])
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dns-lookup")
+    try:
+        pending: Dict[Future[HostAddress], IPLookupCacheId] = {
+            executor.submit(lookup, cache_id): cache_id for cache_id in lookups
+        }
+        while pending:
+            done, _not_done = wait(pending, timeout=min(timeout, 1.0), return_when=FIRST_COMPLETED)
+            for future in done:
+                cache_id = pending.pop(future)
+                result: Union[HostAddress, Exception]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield cache_id, result
+
+            now = time.monotonic()
+            for future, cache_id in list(pending.items()):
+                if cache_id in started and now - started[cache_id] > timeout:
+                    del pending[future]
+                    yield cache_id, MKIPAddressLookupError(
+                        f"Lookup of {cache_id[0]} timed out after {timeout} seconds"
+                    )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def _annotate_family(
@@ -784,14 +784,15 @@ modes.register(
 #   '----------------------------------------------------------------------'
 
 
-def mode_update_dns_cache() -> None:
+def mode_update_dns_cache(options: Mapping[str, Literal[True]]) -> None:
     config_cache = config.get_config_cache()
     ip_lookup.update_dns_cache(
         host_configs=(config_cache.get_host_config(hn) for hn in config_cache.all_active_hosts()),
-        configured_ipv6_addresses=config.ipaddresses,
-        configured_ipv4_addresses=config.ipv6addresses,
+        configured_ipv4_addresses=config.ipaddresses,
+        configured_ipv6_addresses=config.ipv6addresses,
         simulation_mode=config.simulation_mode,
         override_dns=config.fake_dns,
+        incremental="incremental" in options,
     )
 
 
@@ -800,6 +801,12 @@ modes.register(
         long_option="update-dns-cache",
         handler_function=mode_update_dns_cache,
         short_help="Update IP address lookup cache",
+        sub_options=[
+            Option(
+                long_option="incremental",
+                short_help="Only look up the hosts without a cached address",
+            ),
+        ],
     )
 )
 
@@ -1394,6 +1401,24 @@ modes.register(
     )
 )
 
+
+def mode_automation_helper() -> None:
+    import cmk.base.automation_helper as automation_helper  # pylint: disable=import-outside-toplevel
+    import cmk.base.automations as automations  # pylint: disable=import-outside-toplevel
+
+    automation_helper.main(automations.automations, mode_automation)
+
+
+modes.register(
+    Mode(
+        long_option="automation-helper",
+        handler_function=mode_automation_helper,
+        needs_config=False,
+        needs_checks=False,
+        short_help="Internal helper process executing the automation calls",
+    )
+)
+
 # .
 #   .--notify--------------------------------------------------------------.
 #   |                                 _   _  __                            |
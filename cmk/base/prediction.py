@@ -6,9 +6,8 @@
 
 import json
 import logging
-import math
 import time
-from typing import Callable, Final, List, NamedTuple, Optional, Tuple
+from typing import Callable, Final, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
 
 import cmk.utils.debug
 import cmk.utils.defines as defines
@@ -33,6 +32,9 @@ from cmk.utils.prediction import (
 )
 from cmk.utils.type_defs import HostName, MetricName, ServiceName
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger("cmk.prediction")
 
 _GroupByFunction = Callable[[Timestamp], Tuple[Timegroup, Timestamp]]
@@ -161,25 +163,39 @@ def _retrieve_grouped_data_from_rrd(
 
 def _data_stats(slices: List[TimeSeriesValues]) -> DataStats:
     "Statistically summarize all the upsampled RRD data"
+    # numpy is only needed when predictions are computed, which is rarely the case in the
+    # processes importing this module
+    import numpy as np  # pylint: disable=import-outside-toplevel
 
-    descriptors: DataStats = []
-
-    for time_column in zip(*slices):
-        point_line = [x for x in time_column if x is not None]
-        if point_line:
-            average = sum(point_line) / float(len(point_line))
-            descriptors.append(
-                [
-                    average,
-                    min(point_line),
-                    max(point_line),
-                    _std_dev(point_line, average),
-                ]
-            )
-        else:
-            descriptors.append([None, None, None, None])
+    if not slices:
+        return []
 
-    return descriptors
+    # Like zip(), only the time columns all slices have data for are summarized
+    num_columns = min(len(s) for s in slices)
+    points = np.array([s[:num_columns] for s in slices], dtype=float).reshape(
+        len(slices), num_columns
+    )
+    valid = ~np.isnan(points)
+    samples = valid.sum(axis=0)
+
+    # The sums along the first axis add up the slices one after another, exactly like sum()
+    # does it for the points of a time column.
+    valid_points = np.where(valid, points, 0.0)
+    average = valid_points.sum(axis=0) / np.maximum(samples, 1)
+    minimum = np.where(valid, points, np.inf).min(axis=0)
+    maximum = np.where(valid, points, -np.inf).max(axis=0)
+    std_dev = _std_dev(valid_points, average, samples)
+
+    return [
+        [avg, min_, max_, dev] if count else [None, None, None, None]
+        for avg, min_, max_, dev, count in zip(
+            average.tolist(),
+            minimum.tolist(),
+            maximum.tolist(),
+            std_dev.tolist(),
+            samples.tolist(),
+        )
+    ]
 
 
 def _calculate_data_for_prediction(
@@ -199,16 +215,19 @@ def _calculate_data_for_prediction(
     )
 
 
-def _std_dev(point_line: List[float], average: float) -> float:
-    samples = len(point_line)
+def _std_dev(points: "np.ndarray", average: "np.ndarray", samples: "np.ndarray") -> "np.ndarray":
+    """Standard deviation of the time columns of the points
+
+    The points of the columns without data have to be zero."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    squares = (points**2).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std_dev = np.sqrt(np.abs(squares - average**2 * samples) / (samples - 1))
     # In the case of a single data-point an unbiased standard deviation is
     # undefined. In this case we take the magnitude of the measured value
     # itself as a measure of the dispersion.
-    if samples == 1:
-        return abs(average)
-    return math.sqrt(
-        abs(sum(p**2 for p in point_line) - average**2 * samples) / float(samples - 1)
-    )
+    return np.where(samples == 1, np.abs(average), std_dev)
 
 
 def _is_prediction_up_to_date(
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from cmk.utils.type_defs import HostName, ServiceName
+
+from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+
+# Aggregation ID and title of a branch
+BranchID = tuple[str, str]
+
+
+class BIBranchIndex:
+    """Lookup of the aggregation branches which contain a host or a service
+
+    The index is created together with the compiled aggregations, so that filtering
+    aggregations by host or service does not need to look at all branches."""
+
+    def __init__(
+        self,
+        hosts: Mapping[HostName, set[BranchID]],
+        services: Mapping[tuple[HostName, ServiceName], set[BranchID]],
+    ) -> None:
+        self._hosts = hosts
+        self._services = services
+
+    @classmethod
+    def create(cls, compiled_aggregations: Mapping[str, BICompiledAggregation]) -> BIBranchIndex:
+        hosts: dict[HostName, set[BranchID]] = {}
+        services: dict[tuple[HostName, ServiceName], set[BranchID]] = {}
+        for aggr_id, compiled_aggregation in compiled_aggregations.items():
+            for branch in compiled_aggregation.branches:
+                branch_id = branch_id_of(aggr_id, branch)
+                for _site_id, host_name, service_description in branch.required_elements():
+                    hosts.setdefault(host_name, set()).add(branch_id)
+                    if service_description is not None:
+                        services.setdefault((host_name, service_description), set()).add(branch_id)
+        return cls(hosts, services)
+
+    def branches_of_hosts(self, host_names: Iterable[HostName]) -> set[BranchID]:
+        return {branch_id for host in host_names for branch_id in self._hosts.get(host, ())}
+
+    def branches_of_services(
+        self, services: Iterable[tuple[HostName, ServiceName]]
+    ) -> set[BranchID]:
+        return {branch_id for service in services for branch_id in self._services.get(service, ())}
+
+    def serialize(self) -> dict[str, Any]:
+        return {"hosts": self._hosts, "services": self._services}
+
+    @classmethod
+    def deserialize(cls, data: dict[str, Any]) -> BIBranchIndex:
+        return cls(data["hosts"], data["services"])
+
+
+def branch_id_of(aggr_id: str, branch: BICompiledRule) -> BranchID:
+    return aggr_id, branch.properties.title
@@ -18,6 +18,7 @@ from cmk.utils.paths import default_config_dir
 from cmk.utils.redis import get_redis_client
 
 from cmk.bi.aggregation import BIAggregation
+from cmk.bi.branch_index import BIBranchIndex
 from cmk.bi.data_fetcher import BIStructureFetcher, get_cache_dir, SiteProgramStart
 from cmk.bi.lib import SitesCallback
 from cmk.bi.packs import BIAggregationPacks
@@ -28,6 +29,12 @@ if TYPE_CHECKING:
     from cmk.utils.redis import RedisDecoded
 
 
+# Compiled aggregations loaded by this process, by path, together with the inode, mtime and size
+# of the file they have been loaded from
+_loaded_aggregations: dict[Path, tuple[tuple[int, int, int], BICompiledAggregation]] = {}
+_loaded_branch_index: dict[Path, tuple[tuple[int, int, int], BIBranchIndex]] = {}
+
+
 class ConfigStatus(TypedDict):
     configfile_timestamp: float
     known_sites: set[SiteProgramStart]
@@ -41,10 +48,12 @@ class BICompiler:
 
         self._logger = logger.getChild("bi.compiler")
         self._compiled_aggregations: dict[str, BICompiledAggregation] = {}
+        self._branch_index: BIBranchIndex | None = None
         self._path_compilation_lock = Path(get_cache_dir(), "compilation.LOCK")
         self._path_compilation_timestamp = Path(get_cache_dir(), "last_compilation")
         self._path_compiled_aggregations = Path(get_cache_dir(), "compiled_aggregations")
         self._path_compiled_aggregations.mkdir(parents=True, exist_ok=True)
+        self._path_branch_index = Path(get_cache_dir(), "branch_index")
 
         self._redis_client: RedisDecoded | None = None
         self._setup()
@@ -58,14 +67,23 @@ class BICompiler:
     def compiled_aggregations(self) -> dict[str, BICompiledAggregation]:
         return self._compiled_aggregations
 
+    @property
+    def branch_index(self) -> BIBranchIndex:
+        if self._branch_index is None:
+            self._branch_index = BIBranchIndex.create(self._compiled_aggregations)
+        return self._branch_index
+
     def cleanup(self) -> None:
         self._compiled_aggregations.clear()
+        self._branch_index = None
 
     def load_compiled_aggregations(self) -> None:
         try:
             self._check_compilation_status()
         finally:
             self._load_compiled_aggregations()
+            if self._branch_index is None:
+                self._branch_index = self._load_branch_index()
 
     def _load_compiled_aggregations(self) -> None:
         for path_object in self._path_compiled_aggregations.iterdir():
@@ -75,9 +93,42 @@ class BICompiler:
             if aggr_id.endswith(".new") or aggr_id in self._compiled_aggregations:
                 continue
 
-            self._logger.debug("Loading cached aggregation results %s" % aggr_id)
-            aggr_data = self._load_data(path_object)
-            self._compiled_aggregations[aggr_id] = BIAggregation.create_trees_from_schema(aggr_data)
+            self._compiled_aggregations[aggr_id] = self._load_compiled_aggregation(path_object)
+
+    def _load_compiled_aggregation(self, path_object: Path) -> BICompiledAggregation:
+        # The trees are kept in memory until the aggregation is compiled again. This saves the
+        # deserialization and keeps the branch results of the previous computations.
+        stat = path_object.stat()
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        loaded_file_id, compiled_aggregation = _loaded_aggregations.get(path_object, (None, None))
+        if compiled_aggregation is not None and loaded_file_id == file_id:
+            return compiled_aggregation
+
+        self._logger.debug("Loading cached aggregation results %s" % path_object.name)
+        aggr_data = self._load_data(path_object)
+        compiled_aggregation = BIAggregation.create_trees_from_schema(aggr_data)
+        _loaded_aggregations[path_object] = (file_id, compiled_aggregation)
+        return compiled_aggregation
+
+    def _load_branch_index(self) -> BIBranchIndex | None:
+        # Without an index (e.g. compiled by a previous version), it is created from the compiled
+        # aggregations on demand, see branch_index
+        try:
+            stat = self._path_branch_index.stat()
+        except FileNotFoundError:
+            return None
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        loaded_file_id, branch_index = _loaded_branch_index.get(
+            self._path_branch_index, (None, None)
+        )
+        if branch_index is not None and loaded_file_id == file_id:
+            return branch_index
+
+        if not (index_data := self._load_data(self._path_branch_index)):
+            return None
+        branch_index = BIBranchIndex.deserialize(index_data)
+        _loaded_branch_index[self._path_branch_index] = (file_id, branch_index)
+        return branch_index
 
     def _check_compilation_status(self) -> None:
         current_configstatus = self.compute_current_configstatus()
@@ -114,6 +165,9 @@ class BICompiler:
                 )
                 self._save_data(self._path_compiled_aggregations.joinpath(aggr_id), result)
 
+            self._branch_index = BIBranchIndex.create(self._compiled_aggregations)
+            self._save_data(self._path_branch_index, self._branch_index.serialize())
+
             self._generate_part_of_aggregation_lookup(self._compiled_aggregations)
 
         known_sites = {kv[0]: kv[1] for kv in current_configstatus.get("known_sites", set())}
@@ -130,6 +184,7 @@ class BICompiler:
                 continue
             if path_object.name not in valid_aggregations:
                 path_object.unlink(missing_ok=True)
+                _loaded_aggregations.pop(path_object, None)
 
     def _verify_aggregation_title_uniqueness(
         self, compiled_aggregations: dict[str, BICompiledAggregation]
@@ -10,6 +10,7 @@ from typing import NamedTuple
 from cmk.utils.plugin_registry import Registry
 from cmk.utils.type_defs import HostName, ServiceName
 
+from cmk.bi.branch_index import BIBranchIndex, BranchID
 from cmk.bi.data_fetcher import BIStatusFetcher
 from cmk.bi.lib import RequiredBIElement
 from cmk.bi.trees import BICompiledAggregation, BICompiledRule, NodeResultBundle
@@ -57,9 +58,11 @@ class BIComputer:
         self,
         compiled_aggregations: dict[str, BICompiledAggregation],
         bi_status_fetcher: BIStatusFetcher,
+        branch_index: BIBranchIndex | None = None,
     ) -> None:
         self._compiled_aggregations = compiled_aggregations
         self._bi_status_fetcher = bi_status_fetcher
+        self._branch_index = branch_index
         self._legacy_branch_cache: dict = {}
 
     def compute_aggregation_result(
@@ -90,14 +93,55 @@ class BIComputer:
     def get_required_aggregations(
         self, bi_aggregation_filter: BIAggregationFilter
     ) -> list[tuple[BICompiledAggregation, list[BICompiledRule]]]:
+        candidate_branches = self._get_candidate_branches(bi_aggregation_filter)
+        if candidate_branches is None:
+            return [
+                (
+                    compiled_aggregation,
+                    self.get_filtered_aggregation_branches(
+                        compiled_aggregation, bi_aggregation_filter
+                    ),
+                )
+                for compiled_aggregation in self._compiled_aggregations.values()
+            ]
+
+        candidate_titles: dict[str, set[str]] = {}
+        for aggr_id, title in candidate_branches:
+            candidate_titles.setdefault(aggr_id, set()).add(title)
         return [
             (
                 compiled_aggregation,
-                self.get_filtered_aggregation_branches(compiled_aggregation, bi_aggregation_filter),
+                self.get_filtered_aggregation_branches(
+                    compiled_aggregation,
+                    bi_aggregation_filter,
+                    candidate_titles.get(compiled_aggregation.id, set()),
+                ),
             )
             for compiled_aggregation in self._compiled_aggregations.values()
         ]
 
+    def _get_candidate_branches(
+        self, bi_aggregation_filter: BIAggregationFilter
+    ) -> set[BranchID] | None:
+        """Preselect the branches matching the host and service filters using the branch index
+
+        Returns None if all branches have to be checked"""
+        if self._branch_index is None:
+            return None
+
+        candidate_branches = None
+        if bi_aggregation_filter.hosts:
+            candidate_branches = self._branch_index.branches_of_hosts(bi_aggregation_filter.hosts)
+        if bi_aggregation_filter.services:
+            service_branches = self._branch_index.branches_of_services(
+                bi_aggregation_filter.services
+            )
+            if candidate_branches is None:
+                candidate_branches = service_branches
+            else:
+                candidate_branches &= service_branches
+        return candidate_branches
+
     def get_required_elements(
         self, required_aggregations: list[tuple[BICompiledAggregation, list[BICompiledRule]]]
     ) -> set[RequiredBIElement]:
@@ -132,12 +176,22 @@ class BIComputer:
         self,
         compiled_aggregation: BICompiledAggregation,
         bi_aggregation_filter: BIAggregationFilter,
+        candidate_titles: set[str] | None = None,
     ) -> list[BICompiledRule]:
+        if candidate_titles is not None and not candidate_titles:
+            return []
+
         if not self._use_aggregation(compiled_aggregation, bi_aggregation_filter):
             return []
 
+        branches = compiled_aggregation.branches
+        if candidate_titles is not None:
+            branches = [
+                branch for branch in branches if branch.properties.title in candidate_titles
+            ]
+
         used_branches = []
-        for compiled_branch in compiled_aggregation.branches:
+        for compiled_branch in branches:
             if not self._use_aggregation_branch(compiled_branch, bi_aggregation_filter):
                 continue
             used_branches.append(compiled_branch)
@@ -288,6 +288,9 @@ class BIStructureFetcher:
 
 
 class BIStatusFetcher(ABCBIStatusFetcher):
+    # Up to this number of hosts, the hosts are filtered by the core
+    _MAX_FILTERED_HOSTS = 1000
+
     def set_assumed_states(self, assumed_states: dict) -> None:
         # Streamline format to site, host, service (may be None)
         self.assumed_states = {}
@@ -327,20 +330,12 @@ class BIStatusFetcher(ABCBIStatusFetcher):
             req_hosts.add(host)
             req_sites.add(site)
 
-        # TODO: the cmc slows down if the host filter gets too big
-        #       fetch all hosts if the filter exceeds 1000 hosts
-        host_filter = ""
-        for host in req_hosts:
-            host_filter += "Filter: name = %s\n" % host
-        if len(req_hosts) > 1:
-            host_filter += "Or: %d\n" % len(req_hosts)
-
-        query = "GET hosts\nColumns: %s\n" % " ".join(self.get_status_columns()) + host_filter
-        return self.create_bi_status_data(
-            self.sites_callback.query(
-                query, list(req_sites), output_format=LivestatusOutputFormat.JSON
-            )
+        query = "GET hosts\nColumns: %s\n" % " ".join(self.get_status_columns())
+        query += self._host_filter(req_hosts)
+        rows = self.sites_callback.query(
+            query, list(req_sites), output_format=LivestatusOutputFormat.JSON
         )
+        return self.create_bi_status_data(self._required_rows(rows, req_hosts))
 
     # This variant of the function is configured not with a list of
     # hosts but with a livestatus filter header and a list of columns
@@ -381,20 +376,38 @@ class BIStatusFetcher(ABCBIStatusFetcher):
             remaining_hosts = missing_hosts
 
         if remaining_hosts:
-            remaining_sites = set()
-            host_filter = ""
-            for site_id, host in remaining_hosts:
-                remaining_sites.add(site_id)
-                host_filter += "Filter: name = %s\n" % host
-            if len(remaining_hosts) > 1:
-                host_filter += "Or: %d\n" % len(remaining_hosts)
+            remaining_sites = {site_id for site_id, _host in remaining_hosts}
+            remaining_host_names = {host for _site_id, host in remaining_hosts}
             query = "GET hosts%s\n" % ("bygroup" if bygroup else "")
             query += "Columns: " + (" ".join(columns)) + "\n"
-            query += host_filter
-            data.extend(self.sites_callback.query(query, list(remaining_sites)))
+            query += self._host_filter(remaining_host_names)
+            data.extend(
+                self._required_rows(
+                    self.sites_callback.query(query, list(remaining_sites)), remaining_host_names
+                )
+            )
 
         return self.create_bi_status_data(data, extra_columns=host_columns)
 
+    @classmethod
+    def _host_filter(cls, host_names: set[HostName]) -> str:
+        # The core slows down if the host filter gets too big. In this case all hosts are fetched
+        # and the rows which are not required are dropped afterwards, see _required_rows.
+        if len(host_names) > cls._MAX_FILTERED_HOSTS:
+            return ""
+        host_filter = "".join("Filter: name = %s\n" % host for host in host_names)
+        if len(host_names) > 1:
+            host_filter += "Or: %d\n" % len(host_names)
+        return host_filter
+
+    @classmethod
+    def _required_rows(
+        cls, rows: LivestatusResponse, host_names: set[HostName]
+    ) -> LivestatusResponse:
+        if len(host_names) <= cls._MAX_FILTERED_HOSTS:
+            return rows
+        return LivestatusResponse([row for row in rows if row[1] in host_names])
+
     @classmethod
     def create_bi_status_data(
         cls, rows: LivestatusResponse, extra_columns: list[LivestatusColumn] | None = None
@@ -488,6 +488,11 @@ class BICompiledAggregation:
         self.computation_options = computation_options
         self.aggregation_visualization = aggregation_visualization
         self.groups = groups
+        # The last result of each branch (by title), together with the host states it has been
+        # computed from. A branch is only computed again once the state of one of its hosts changed.
+        self._branch_results: dict[
+            str, tuple[list[BIHostStatusInfoRow | None], NodeResultBundle | None]
+        ] = {}
 
     def compute_branches(
         self, branches: list[BICompiledRule], bi_status_fetcher: ABCBIStatusFetcher
@@ -496,14 +501,31 @@ class BICompiledAggregation:
         aggregation_results = []
         for bi_compiled_branch in branches:
             required_elements = bi_compiled_branch.required_elements()
-            compute_assumed_state = any(assumed_state_ids.intersection(required_elements))
-            result = bi_compiled_branch.compute(
-                self.computation_options, bi_status_fetcher, use_assumed=compute_assumed_state
-            )
+            if any(assumed_state_ids.intersection(required_elements)):
+                result = bi_compiled_branch.compute(
+                    self.computation_options, bi_status_fetcher, use_assumed=True
+                )
+            else:
+                result = self._compute_branch(bi_compiled_branch, bi_status_fetcher)
             if result is not None:
                 aggregation_results.append(result)
         return aggregation_results
 
+    def _compute_branch(
+        self, bi_compiled_branch: BICompiledRule, bi_status_fetcher: ABCBIStatusFetcher
+    ) -> NodeResultBundle | None:
+        host_states = [
+            bi_status_fetcher.states.get(host)
+            for host in sorted(bi_compiled_branch.get_required_hosts())
+        ]
+        title = bi_compiled_branch.properties.title
+        if (cached := self._branch_results.get(title)) is not None and cached[0] == host_states:
+            return cached[1]
+
+        result = bi_compiled_branch.compute(self.computation_options, bi_status_fetcher)
+        self._branch_results[title] = (host_states, result)
+        return result
+
     def convert_result_to_legacy_format(self, node_result_bundle: NodeResultBundle) -> dict:
         def generate_state(item):
             if not item:
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import abc
 import logging
+import re
 import time
 from pathlib import Path
 from typing import (
@@ -87,8 +88,21 @@ class PushAgentFileCache(FileCache[AgentRawData]):
 
 
 class SectionWithHeader(NamedTuple):
+    """A section and its raw data
+
+    The data is kept as it has been sliced from the agent output. It is only
+    split into lines if somebody is interested in the section.
+    """
+
     header: SectionMarker
-    section: List[AgentRawData]
+    section: List[memoryview]
+
+    def lines(self) -> Iterator[AgentRawData]:
+        for chunk in self.section:
+            for line in bytes(chunk).split(b"\n"):
+                line = line.rstrip(b"\r")
+                if line.strip():
+                    yield AgentRawData(line)
 
 
 MutableSection = List[SectionWithHeader]
@@ -154,6 +168,11 @@ class ParserState(abc.ABC):
     def do_action(self, line: bytes) -> "ParserState":
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def do_bulk_action(self, lines: memoryview) -> "ParserState":
+        """Process consecutive lines, none of which is a section or piggyback marker"""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def on_section_header(self, line: bytes) -> "ParserState":
         raise NotImplementedError()
@@ -302,6 +321,9 @@ class NOOPParser(ParserState):
     def do_action(self, line: bytes) -> "ParserState":
         return self
 
+    def do_bulk_action(self, lines: memoryview) -> "ParserState":
+        return self
+
     def on_piggyback_header(self, line: bytes) -> "ParserState":
         piggyback_header = PiggybackMarker.from_headerline(
             line,
@@ -350,6 +372,9 @@ class PiggybackParser(ParserState):
         # We are not in a section -> ignore line.
         return self
 
+    def do_bulk_action(self, lines: memoryview) -> "ParserState":
+        return self
+
     def on_piggyback_header(self, line: bytes) -> "ParserState":
         piggyback_header = PiggybackMarker.from_headerline(
             line,
@@ -400,8 +425,11 @@ class PiggybackSectionParser(ParserState):
         self.current_section: Final = current_section
 
     def do_action(self, line: bytes) -> "ParserState":
+        return self.do_bulk_action(memoryview(line))
+
+    def do_bulk_action(self, lines: memoryview) -> "ParserState":
         assert self.piggyback_sections[self.current_host][-1].header == self.current_section
-        self.piggyback_sections[self.current_host][-1].section.append(AgentRawData(line))
+        self.piggyback_sections[self.current_host][-1].section.append(lines)
         return self
 
     def on_piggyback_header(self, line: bytes) -> "ParserState":
@@ -451,6 +479,9 @@ class PiggybackNOOPParser(ParserState):
     def do_action(self, line: bytes) -> "PiggybackNOOPParser":
         return self
 
+    def do_bulk_action(self, lines: memoryview) -> "PiggybackNOOPParser":
+        return self
+
     def on_piggyback_header(self, line: bytes) -> "ParserState":
         piggyback_header = PiggybackMarker.from_headerline(
             line,
@@ -499,11 +530,12 @@ class HostSectionParser(ParserState):
         self.current_section: Final = current_section
 
     def do_action(self, line: bytes) -> "ParserState":
-        if not self.current_section.nostrip:
-            line = line.strip()
+        return self.do_bulk_action(memoryview(line))
 
+    def do_bulk_action(self, lines: memoryview) -> "ParserState":
+        # Note: Stripping the lines (unless `nostrip`) is left to `SectionMarker.parse_line`.
         assert self.sections[-1].header == self.current_section
-        self.sections[-1].section.append(AgentRawData(line))
+        self.sections[-1].section.append(lines)
         return self
 
     def on_piggyback_header(self, line: bytes) -> "ParserState":
@@ -528,6 +560,10 @@ class HostSectionParser(ParserState):
         return self.to_noop_parser()
 
 
+# Lines that *may* be markers: Everything else is data, see `SectionMarker.is_header` et al.
+_MARKER_CANDIDATE: Final = re.compile(rb"^[ \t\r\x0b\x0c]*<<<.*$", re.MULTILINE)
+
+
 class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
     """A parser for agent data."""
 
@@ -576,8 +612,11 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             sections: ImmutableSection,
         ) -> MutableMapping[SectionName, List[AgentRawDataSection]]:
             out: MutableMapping[SectionName, List[AgentRawDataSection]] = {}
-            for header, content in sections:
-                out.setdefault(header.name, []).extend(header.parse_line(line) for line in content)
+            for section in sections:
+                if selection is NO_SELECTION or section.header.name in selection:
+                    out.setdefault(section.header.name, []).extend(
+                        section.header.parse_line(line) for line in section.lines()
+                    )
             return out
 
         def flatten_piggyback_section(
@@ -587,7 +626,8 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             cache_for: int,
             selection: SectionNameCollection,
         ) -> Iterator[bytes]:
-            for header, content in sections:
+            for section in sections:
+                header = section.header
                 if not (selection is NO_SELECTION or header.name in selection):
                     continue
 
@@ -605,13 +645,9 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
                             header.separator,
                         )
                     ).encode(header.encoding)
-                yield from (bytes(line) for line in content)
+                yield from section.lines()
 
-        sections = {
-            name: content
-            for name, content in decode_sections(raw_sections).items()
-            if selection is NO_SELECTION or name in selection
-        }
+        sections = decode_sections(raw_sections)
         piggybacked_raw_data = {
             header.hostname: list(
                 flatten_piggyback_section(
@@ -652,7 +688,12 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         self,
         raw_data: AgentRawData,
     ) -> Tuple[ImmutableSection, Mapping[PiggybackMarker, ImmutableSection]]:
-        """Split agent output in chunks, splits lines by whitespaces."""
+        """Split agent output in chunks
+
+        Only the lines that may be section or piggyback markers are looked at
+        one by one. The lines in between are passed on in bulk, as slices of
+        the agent output.
+        """
         parser: ParserState = NOOPParser(
             self.hostname,
             [],
@@ -661,8 +702,15 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
         )
-        for line in raw_data.split(b"\n"):
-            parser = parser(line.rstrip(b"\r"))
+        view = memoryview(raw_data)
+        pos = 0
+        for match in _MARKER_CANDIDATE.finditer(raw_data):
+            if match.start() > pos:
+                parser = parser.do_bulk_action(view[pos : match.start()])
+            parser = parser(match.group().rstrip(b"\r"))
+            pos = match.end()
+        if pos < len(raw_data):
+            parser = parser.do_bulk_action(view[pos:])
 
         return parser.sections, parser.piggyback_sections
 
@@ -29,6 +29,7 @@ from cmk.utils.check_utils import ActiveCheckResult
 from cmk.utils.exceptions import OnError
 from cmk.utils.type_defs import HostName, SectionName
 
+import cmk.snmplib.cache_format as cache_format
 import cmk.snmplib.snmp_table as snmp_table
 from cmk.snmplib.snmp_scan import gather_available_raw_section_names
 from cmk.snmplib.type_defs import (
@@ -142,11 +143,21 @@ class SectionMeta:
 class SNMPFileCache(FileCache[SNMPRawData]):
     @staticmethod
     def _from_cache_file(raw_data: bytes) -> SNMPRawData:
-        return {SectionName(k): v for k, v in ast.literal_eval(raw_data.decode("utf-8")).items()}
+        if not cache_format.is_cache_file(raw_data):
+            # Cache file written by a previous version
+            return {
+                SectionName(k): v for k, v in ast.literal_eval(raw_data.decode("utf-8")).items()
+            }
+        return {
+            SectionName(section_name): cache_format.decode_value(raw_data[offset : offset + size])
+            for section_name, (offset, size) in cache_format.load_index(raw_data).items()
+        }
 
     @staticmethod
     def _to_cache_file(raw_data: SNMPRawData) -> bytes:
-        return (repr({str(k): v for k, v in raw_data.items()}) + "\n").encode("utf-8")
+        return cache_format.dump(
+            {str(k): cache_format.encode_value(v) for k, v in raw_data.items()}
+        )
 
     def make_path(self, mode: Mode) -> Path:
         return self.base_path / mode.name.lower() / self.hostname
@@ -343,24 +354,45 @@ class SNMPFetcher(Fetcher[SNMPRawData]):
                 ),
             )
 
-        fetched_data: MutableMapping[SectionName, Sequence[SNMPRawDataSection]] = {}
+        section_names_to_fetch = []
         for section_name in self._sort_section_names(section_names):
             try:
                 _from, until, _section = persisted_sections[section_name]
                 if now > until:
                     raise LookupError(section_name)
             except LookupError:
-                self._logger.debug("%s: Fetching data (%s)", section_name, walk_cache_msg)
-
-                fetched_data[section_name] = [
-                    snmp_table.get_snmp_table(
-                        section_name=section_name,
-                        tree=tree,
-                        walk_cache=walk_cache,
-                        backend=self._backend,
-                    )
+                section_names_to_fetch.append(section_name)
+
+        if self.snmp_config.max_concurrent_walks > 1:
+            self._logger.debug(
+                "Performing up to %d SNMP walks concurrently (%s)",
+                self.snmp_config.max_concurrent_walks,
+                walk_cache_msg,
+            )
+            snmp_table.prefetch_snmpwalks(
+                trees=(
+                    (section_name, tree)
+                    for section_name in section_names_to_fetch
                     for tree in self.plugin_store[section_name].trees
-                ]
+                ),
+                walk_cache=walk_cache,
+                backend=self._backend,
+                max_workers=self.snmp_config.max_concurrent_walks,
+            )
+
+        fetched_data: MutableMapping[SectionName, Sequence[SNMPRawDataSection]] = {}
+        for section_name in section_names_to_fetch:
+            self._logger.debug("%s: Fetching data (%s)", section_name, walk_cache_msg)
+
+            fetched_data[section_name] = [
+                snmp_table.get_snmp_table(
+                    section_name=section_name,
+                    tree=tree,
+                    walk_cache=walk_cache,
+                    backend=self._backend,
+                )
+                for tree in self.plugin_store[section_name].trees
+            ]
 
         walk_cache.save()
 
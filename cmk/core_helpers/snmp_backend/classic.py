@@ -3,15 +3,25 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import contextlib
+import logging
 import subprocess
-from typing import Iterable, List, Optional
+import threading
+from typing import Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 import cmk.utils.tty as tty
 from cmk.utils.exceptions import MKGeneralException, MKSNMPError, MKTimeout
 from cmk.utils.log import console
 from cmk.utils.type_defs import SectionName
 
-from cmk.snmplib.type_defs import OID, SNMPBackend, SNMPContextName, SNMPRawValue, SNMPRowInfo
+from cmk.snmplib.type_defs import (
+    OID,
+    SNMPBackend,
+    SNMPContextName,
+    SNMPHostConfig,
+    SNMPRawValue,
+    SNMPRowInfo,
+)
 
 from ._utils import strip_snmp_value
 
@@ -19,6 +29,27 @@ __all__ = ["ClassicSNMPBackend"]
 
 
 class ClassicSNMPBackend(SNMPBackend):
+    def __init__(self, snmp_config: SNMPHostConfig, logger: logging.Logger) -> None:
+        super().__init__(snmp_config, logger)
+        self._walk_processes: Set["subprocess.Popen[str]"] = set()
+        self._walk_processes_lock = threading.Lock()
+
+    def cancel_walks(self) -> None:
+        """Kill the snmpwalk processes, the walks fail with an SNMP error"""
+        with self._walk_processes_lock:
+            for snmp_process in self._walk_processes:
+                snmp_process.kill()
+
+    @contextlib.contextmanager
+    def _cancellable(self, snmp_process: "subprocess.Popen[str]") -> Iterator[None]:
+        with self._walk_processes_lock:
+            self._walk_processes.add(snmp_process)
+        try:
+            yield
+        finally:
+            with self._walk_processes_lock:
+                self._walk_processes.discard(snmp_process)
+
     def get(
         self, oid: OID, context_name: Optional[SNMPContextName] = None
     ) -> Optional[SNMPRawValue]:
@@ -112,7 +143,7 @@ class ClassicSNMPBackend(SNMPBackend):
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             encoding="utf-8",
-        ) as snmp_process:
+        ) as snmp_process, self._cancellable(snmp_process):
             assert snmp_process.stdout
             assert snmp_process.stderr
             try:
@@ -122,6 +153,107 @@ class ClassicSNMPBackend(SNMPBackend):
                 snmp_process.kill()
                 raise
 
+        self._raise_on_walk_error(snmp_process, error, ipaddress)
+        return rowinfo
+
+    def walk_columns(
+        self,
+        oids: Sequence[OID],
+        section_name: Optional[SectionName] = None,
+        table_base_oid: Optional[OID] = None,
+        context_name: Optional[SNMPContextName] = None,
+    ) -> Mapping[OID, SNMPRowInfo]:
+        """Walk several columns of a table with a single snmpwalk of the table entry
+
+        Each snmpwalk means a fork/exec of a new process, which often costs more than the
+        communication with the device. Columns of the same table entry are walked at once,
+        if only few of the other columns of the entry need to be walked along.
+        """
+        rowinfos: MutableMapping[OID, SNMPRowInfo] = {}
+        for entry_oid, columns in _group_columns_by_entry(oids).items():
+            if _is_worth_walking_entry(columns):
+                rowinfos.update(self._walk_entry(entry_oid, columns, context_name))
+                continue
+
+            for oid in columns.values():
+                rowinfos[oid] = self.walk(
+                    oid,
+                    section_name=section_name,
+                    table_base_oid=table_base_oid,
+                    context_name=context_name,
+                )
+
+        return {oid: rowinfos[oid] for oid in oids}
+
+    def _walk_entry(
+        self,
+        entry_oid: OID,
+        columns: Mapping[int, OID],
+        context_name: Optional[SNMPContextName],
+    ) -> Mapping[OID, SNMPRowInfo]:
+        protospec = self._snmp_proto_spec()
+
+        ipaddress = self.config.ipaddress or "0.0.0.0"
+        if self.config.is_ipv6_primary:
+            ipaddress = "[" + ipaddress + "]"
+
+        portspec = self._snmp_port_spec()
+        command = self._snmp_walk_command(context_name)
+        command += [
+            "-OQ",
+            "-OU",
+            "-On",
+            "-Ot",
+            "%s%s%s" % (protospec, ipaddress, portspec),
+            entry_oid,
+        ]
+        console.vverbose("Running '%s'\n" % subprocess.list2cmdline(command))
+
+        rowinfos: Mapping[OID, SNMPRowInfo] = {oid: [] for oid in columns.values()}
+        last_column = max(columns)
+        prefix = entry_oid + "."
+        completed = False
+        with subprocess.Popen(
+            command,
+            close_fds=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        ) as snmp_process, self._cancellable(snmp_process):
+            assert snmp_process.stdout
+            assert snmp_process.stderr
+            try:
+                # The rows are dispatched to the columns while they arrive. Only the values
+                # of the requested columns are processed any further.
+                for oid, value in self._iter_walk_output(snmp_process.stdout):
+                    if not oid.startswith(prefix):
+                        continue
+                    column = oid[len(prefix) :].split(".", 1)[0]
+                    if not column.isdigit():
+                        continue
+                    if int(column) > last_column:
+                        # Everything we need has been walked, stop the walk
+                        completed = True
+                        snmp_process.kill()
+                        break
+                    if (column_oid := columns.get(int(column))) is not None:
+                        rowinfos[column_oid].append((oid, strip_snmp_value(value)))
+                error = "" if completed else snmp_process.stderr.read()
+            except MKTimeout:
+                snmp_process.kill()
+                raise
+
+        if not completed:
+            self._raise_on_walk_error(snmp_process, error, ipaddress)
+        return rowinfos
+
+    def _raise_on_walk_error(
+        self,
+        snmp_process: "subprocess.Popen[str]",
+        error: str,
+        ipaddress: str,
+    ) -> None:
         if snmp_process.returncode:
             console.verbose(
                 tty.red + tty.bold + "ERROR: " + tty.normal + "SNMP error: %s\n" % error.strip()
@@ -134,16 +266,18 @@ class ClassicSNMPBackend(SNMPBackend):
                     snmp_process.returncode,
                 )
             )
-        return rowinfo
 
     def _get_rowinfo_from_walk_output(self, lines: Iterable[str]) -> SNMPRowInfo:
+        return [(oid, strip_snmp_value(value)) for oid, value in self._iter_walk_output(lines)]
+
+    @staticmethod
+    def _iter_walk_output(lines: Iterable[str]) -> Iterator[Tuple[OID, str]]:
         # Ugly(1): in some cases snmpwalk inserts line feed within one
         # dataset. This happens for example on hexdump outputs longer
         # than a few bytes. Those dumps are enclosed in double quotes.
         # So if the value begins with a double quote, but the line
         # does not end with a double quote, we take the next line(s) as
         # a continuation line.
-        rowinfo = []
         line_iter = iter(lines)
         while True:
             try:
@@ -168,13 +302,13 @@ class ClassicSNMPBackend(SNMPBackend):
             if value == '"' or (
                 len(value) > 1 and value[0] == '"' and (value[-1] != '"')
             ):  # to be continued
-                while True:  # scan for end of this dataset
-                    nextline = next(line_iter).strip()
-                    value += " " + nextline
+                for nextline in line_iter:  # scan for end of this dataset
+                    value += " " + nextline.strip()
                     if value[-1] == '"':
                         break
-            rowinfo.append((oid, strip_snmp_value(value)))
-        return rowinfo
+                else:
+                    return  # The output ended within this dataset
+            yield oid, value
 
     def _snmp_proto_spec(self) -> str:
         if self.config.is_ipv6_primary:
@@ -308,6 +442,37 @@ class ClassicSNMPBackend(SNMPBackend):
         return command + options
 
 
+def _group_columns_by_entry(oids: Iterable[OID]) -> Mapping[OID, Mapping[int, OID]]:
+    """Group the OIDs by their parent (the table entry) and their last OID part (the column)
+
+    OIDs not ending in a column number get an entry of their own.
+
+    >>> _group_columns_by_entry([".1.2.3.1", ".1.2.3.4", ".1.2.4.1", ".1.2.x"])
+    {'.1.2.3': {1: '.1.2.3.1', 4: '.1.2.3.4'}, '.1.2.4': {1: '.1.2.4.1'}, '.1.2.x': {0: '.1.2.x'}}
+    """
+    entries: MutableMapping[OID, MutableMapping[int, OID]] = {}
+    for oid in oids:
+        entry_oid, column = oid.rsplit(".", 1)
+        if column.isdigit():
+            entries.setdefault(entry_oid, {})[int(column)] = oid
+        else:
+            entries[oid] = {0: oid}
+    return entries
+
+
+def _is_worth_walking_entry(columns: Mapping[int, OID]) -> bool:
+    """Walking the entry walks all columns up to the last requested one
+
+    Only do it if at least half of these columns are actually needed.
+
+    >>> _is_worth_walking_entry({2: ".1.2", 3: ".1.3"})
+    True
+    >>> _is_worth_walking_entry({1: ".1.1", 8: ".1.8"})
+    False
+    """
+    return len(columns) > 1 and max(columns) <= 2 * len(columns)
+
+
 def _auth_proto_for(proto_name: str) -> str:
     if proto_name == "md5":
         return "md5"
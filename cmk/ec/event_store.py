@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""The store of the currently existing events"""
+
+from collections.abc import Iterable, Iterator
+
+from .event import Event
+
+
+class EventStore:
+    """The existing events, indexed by event ID, rule ID and host name
+
+    All indices keep the order in which the events have been added, so the
+    first event of each of them is the oldest one. This makes looking up,
+    removing and evicting events independent of the total number of events.
+
+    The event dicts are mutable. If the host of a stored event is changed,
+    the store has to be told via `update_host`. Rule IDs and event IDs of
+    stored events must not be changed at all.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()) -> None:
+        self._events: dict[int, Event] = {}
+        self._by_rule: dict[str | None, dict[int, Event]] = {}
+        self._by_host: dict[str, dict[int, Event]] = {}
+        # The keys the events have been indexed with
+        self._hosts: dict[int, str] = {}
+        for event in events:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events.values())
+
+    def get(self, event_id: int) -> Event | None:
+        return self._events.get(event_id)
+
+    def of_rule(self, rule_id: str | None) -> list[Event]:
+        return list(self._by_rule.get(rule_id, {}).values())
+
+    def oldest(self) -> Event | None:
+        return next(iter(self._events.values()), None)
+
+    def oldest_of_rule(self, rule_id: str | None) -> Event | None:
+        return next(iter(self._by_rule.get(rule_id, {}).values()), None)
+
+    def oldest_of_host(self, host: str) -> Event | None:
+        return next(iter(self._by_host.get(host, {}).values()), None)
+
+    def add(self, event: Event) -> None:
+        event_id = event["id"]
+        self._events[event_id] = event
+        self._by_rule.setdefault(event["rule_id"], {})[event_id] = event
+        self._by_host.setdefault(event["host"], {})[event_id] = event
+        self._hosts[event_id] = event["host"]
+
+    def remove(self, event: Event) -> None:
+        """Remove the event, raise a KeyError if it does not exist"""
+        event_id = event["id"]
+        del self._events[event_id]
+        _remove_from_index(self._by_rule, event["rule_id"], event_id)
+        _remove_from_index(self._by_host, self._hosts.pop(event_id), event_id)
+
+    def update_host(self, event: Event) -> None:
+        """Re-index the event after its host has been changed"""
+        event_id = event["id"]
+        if (old_host := self._hosts[event_id]) == event["host"]:
+            return
+        _remove_from_index(self._by_host, old_host, event_id)
+        events_of_host = self._by_host.setdefault(event["host"], {})
+        events_of_host[event_id] = event
+        # Keep the order of the events, the IDs are ascending.
+        self._by_host[event["host"]] = dict(sorted(events_of_host.items()))
+        self._hosts[event_id] = event["host"]
+
+
+def _remove_from_index(index: dict, key: object, event_id: int) -> None:
+    events = index[key]
+    del events[event_id]
+    if not events:
+        del index[key]
@@ -3,12 +3,14 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import contextlib
 import os
 import shlex
+import sqlite3
 import subprocess
 import threading
 import time
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator
 from logging import Logger
 from pathlib import Path
 from typing import Any
@@ -43,6 +45,7 @@ class History:
         self._history_columns = history_columns
         self._lock = threading.Lock()
         self._mongodb = MongoDB()
+        self._sqlite = SQLite()
         self._active_history_period = ActiveHistoryPeriod()
         self.reload_configuration(config)
 
@@ -50,29 +53,39 @@ class History:
         self._config = config
         if self._config["archive_mode"] == "mongodb":
             _reload_configuration_mongodb(self)
+        elif self._config["archive_mode"] == "sqlite":
+            _reload_configuration_sqlite(self)
         else:
             _reload_configuration_files(self)
 
     def flush(self) -> None:
         if self._config["archive_mode"] == "mongodb":
             _flush_mongodb(self)
+        elif self._config["archive_mode"] == "sqlite":
+            _flush_sqlite(self)
         else:
             _flush_files(self)
 
     def add(self, event: Event, what: str, who: str = "", addinfo: str = "") -> None:
         if self._config["archive_mode"] == "mongodb":
             _add_mongodb(self, event, what, who, addinfo)
+        elif self._config["archive_mode"] == "sqlite":
+            _add_sqlite(self, event, what, who, addinfo)
         else:
             _add_files(self, event, what, who, addinfo)
 
     def get(self, query: QueryGET) -> Iterable[Any]:
         if self._config["archive_mode"] == "mongodb":
             return _get_mongodb(self, query)
+        if self._config["archive_mode"] == "sqlite":
+            return _get_sqlite(self, query)
         return _get_files(self, self._logger, query)
 
     def housekeeping(self) -> None:
         if self._config["archive_mode"] == "mongodb":
             _housekeeping_mongodb(self)
+        elif self._config["archive_mode"] == "sqlite":
+            _housekeeping_sqlite(self)
         else:
             _housekeeping_files(self)
 
@@ -287,6 +300,254 @@ def _get_mongodb(  # pylint: disable=too-many-branches
     return history_entries
 
 
+# .
+#   .--SQLite--------------------------------------------------------------.
+#   |                     ____   ___  _     _ _                            |
+#   |                    / ___| / _ \| |   (_) |_ ___                      |
+#   |                    \___ \| | | | |   | | __/ _ \                     |
+#   |                     ___) | |_| | |___| | ||  __/                     |
+#   |                    |____/ \__\_\_____|_|\__\___|                     |
+#   +----------------------------------------------------------------------+
+#   | The Event Log Archive can be stored in a local SQLite database,      |
+#   | this section contains SQLite related code.                           |
+#   '----------------------------------------------------------------------'
+
+
+class SQLite:
+    def __init__(self) -> None:
+        super().__init__()
+        # Used for writing only. Every query opens its own connection, so queries can be
+        # answered while events are being added.
+        self.connection: sqlite3.Connection | None = None
+
+
+# Columns which may contain tuples. They are stored like in the history files, see quote_tab.
+_SQLITE_TUPLE_COLUMNS = {
+    "event_match_groups",
+    "event_contact_groups",
+    "event_match_groups_syslog_application",
+}
+
+# The indexes of the history table. The history is always sorted by time, so the indexes
+# for the most frequently used filters include the time, too.
+_SQLITE_INDEXES = {
+    "history_time_idx": "history_time",
+    "history_host_idx": "event_host, history_time",
+    "history_rule_id_idx": "event_rule_id, history_time",
+    "history_event_id_idx": "event_id",
+}
+
+_SQLITE_PUSHED_DOWN_OPERATORS = {"=", ">", "<", ">=", "<="}
+
+# The maximum number of parameters of a statement of older SQLite versions
+_SQLITE_MAX_VARIABLES = 999
+
+
+def _sqlite_path(settings: Settings) -> Path:
+    return settings.paths.history_dir.value / "history.sqlite"
+
+
+def _sqlite_type(default_value: Any) -> str:
+    if isinstance(default_value, (bool, int)):
+        return "INTEGER"
+    if isinstance(default_value, float):
+        return "REAL"
+    return "TEXT"
+
+
+def _sqlite_column(name: str, default_value: Any) -> str:
+    """The column definition, rows added before a column existed have its default value"""
+    value = _sqlite_value(default_value)
+    if value is None:
+        literal = "NULL"
+    elif isinstance(value, str):
+        literal = "'%s'" % value.replace("'", "''")
+    else:
+        literal = repr(value)
+    return f"{name} {_sqlite_type(default_value)} DEFAULT {literal}"
+
+
+def _reload_configuration_sqlite(history: History) -> None:
+    pass
+
+
+def _flush_sqlite(history: History) -> None:
+    _expire_sqlite(history, True)
+
+
+def _housekeeping_sqlite(history: History) -> None:
+    _expire_sqlite(history, False)
+
+
+def _connect_sqlite(history: History) -> sqlite3.Connection:
+    """Open the history database for writing and create or update its table"""
+    path = _sqlite_path(history._settings)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The connection is protected by the history lock
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    # Write ahead logging lets readers and the writer work concurrently. Syncing only at
+    # checkpoints keeps adding events cheap, the database stays consistent anyway.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    # The line is the row ID of the history table
+    columns = history._history_columns[1:]
+    existing_columns = {row[1] for row in connection.execute("PRAGMA table_info(history)")}
+    if not existing_columns:
+        connection.execute(
+            "CREATE TABLE history (history_line INTEGER PRIMARY KEY, %s)"
+            % ", ".join(_sqlite_column(name, default) for name, default in columns)
+        )
+    for name, default in columns:
+        if existing_columns and name not in existing_columns:
+            connection.execute(f"ALTER TABLE history ADD COLUMN {_sqlite_column(name, default)}")
+    for index_name, index_columns in _SQLITE_INDEXES.items():
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON history ({index_columns})")
+    return connection
+
+
+def _sqlite_value(value: Any) -> Any:
+    if isinstance(value, (tuple, list)):
+        return "\1" + "\1".join(str(e) for e in value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _add_sqlite(history: History, event: Event, what: str, who: str, addinfo: str) -> None:
+    _log_event(history._config, history._logger, event, what, who, addinfo)
+    values = [time.time(), scrub_string(what), scrub_string(who), scrub_string(addinfo)]
+    values += [
+        _sqlite_value(event.get(colname[6:], defval))  # drop "event_"
+        for colname, defval in history._event_columns
+    ]
+    column_names = [name for name, _default in history._history_columns[1:]]
+    with history._lock:
+        if history._sqlite.connection is None:
+            history._sqlite.connection = _connect_sqlite(history)
+        history._sqlite.connection.execute(
+            "INSERT INTO history (%s) VALUES (%s)"
+            % (", ".join(column_names), ", ".join("?" * len(column_names))),
+            values,
+        )
+
+
+def _expire_sqlite(history: History, flush: bool) -> None:
+    with history._lock:
+        try:
+            if history._sqlite.connection is None:
+                history._sqlite.connection = _connect_sqlite(history)
+            if flush:
+                history._sqlite.connection.execute("DELETE FROM history")
+                return
+            days = history._config["history_lifetime"]
+            min_time = time.time() - days * 86400
+            history._logger.log(
+                VERBOSE,
+                "Expiring history entries (Horizon: %d days -> %s)",
+                days,
+                date_and_time(min_time),
+            )
+            history._sqlite.connection.execute(
+                "DELETE FROM history WHERE history_time < ?", (min_time,)
+            )
+        except Exception as e:
+            if history._settings.options.debug:
+                raise
+            history._logger.exception("Error expiring history entries: %s" % e)
+
+
+def _get_sqlite(history: History, query: QueryGET) -> Iterable[Any]:
+    path = _sqlite_path(history._settings)
+    if not path.exists():
+        return []
+
+    # Push down the filters which SQLite evaluates exactly like the query does. The
+    # others, e.g. the regular expressions, are applied to the rows SQLite returns.
+    column_defaults = dict(history._history_columns)
+    conditions = []
+    arguments = []
+    for column_name, operator_name, _predicate, argument in query.filters:
+        default = column_defaults.get(column_name)
+        if (
+            operator_name in _SQLITE_PUSHED_DOWN_OPERATORS
+            and column_name not in _SQLITE_TUPLE_COLUMNS
+            and type(default) in (int, float, str)
+        ):
+            conditions.append(f"{column_name} {operator_name} ?")
+            arguments.append(argument)
+    where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+    order = " ORDER BY history_time DESC, history_line DESC"  # younger entries first
+    # The line is needed to identify the rows
+    requested_columns = [
+        name
+        for name in column_defaults
+        if name == "history_line" or name in query.requested_columns
+    ]
+
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        if len(conditions) == len(query.filters):
+            limit = "" if query.limit is None else " LIMIT %d" % query.limit
+            return list(
+                _sqlite_rows(
+                    history, connection, requested_columns, where + order + limit, arguments
+                )
+            )
+
+        # Determine the matching lines using the filtered columns only, converting all
+        # columns of all rows to Python objects would be much more expensive.
+        lines = []
+        filtered_columns = [
+            name
+            for name in column_defaults
+            if name == "history_line" or any(name == f[0] for f in query.filters)
+        ]
+        for row in _sqlite_rows(history, connection, filtered_columns, where + order, arguments):
+            if query.limit is not None and len(lines) >= query.limit:
+                break
+            if query.filter_row(row):
+                lines.append(row[0])
+
+        entries: list[Any] = []
+        for chunk_start in range(0, len(lines), _SQLITE_MAX_VARIABLES):
+            chunk = lines[chunk_start : chunk_start + _SQLITE_MAX_VARIABLES]
+            entries += _sqlite_rows(
+                history,
+                connection,
+                requested_columns,
+                " WHERE history_line IN (%s)%s" % (", ".join("?" * len(chunk)), order),
+                chunk,
+            )
+        return entries
+
+
+def _sqlite_rows(
+    history: History,
+    connection: sqlite3.Connection,
+    columns: list[str],
+    sql_tail: str,
+    arguments: list[Any],
+) -> Iterator[list[Any]]:
+    """Query the given columns, the others are filled with their default values"""
+    sql = "SELECT %s FROM history%s" % (", ".join(columns), sql_tail)
+    history._logger.debug("querying history database with [%s] %r", sql, arguments)
+    template = [default for _name, default in history._history_columns]
+    column_names = [name for name, _default in history._history_columns]
+    indices = [column_names.index(name) for name in columns]
+    converters = [
+        (position, _unsplit if name in _SQLITE_TUPLE_COLUMNS else bool)
+        for position, name in enumerate(columns)
+        if name in _SQLITE_TUPLE_COLUMNS or isinstance(template[indices[position]], bool)
+    ]
+    for row in connection.execute(sql, arguments):
+        values = template.copy()
+        for index, value in zip(indices, row):
+            values[index] = value
+        for position, converter in converters:
+            values[indices[position]] = converter(row[position])
+        yield values
+
+
 # .
 #   .--History-------------------------------------------------------------.
 #   |                   _   _ _     _                                      |
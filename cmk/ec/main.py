@@ -56,11 +56,13 @@ from .config import Config, ConfigFromWATO, MatchGroups, Rule, TextMatchResult,
 from .core_queries import HostInfo, query_hosts_scheduled_downtime_depth, query_timeperiods_in
 from .crash_reporting import CrashReportStore, ECCrashReport
 from .event import create_event_from_line, Event
+from .event_store import EventStore
 from .helpers import ECLock
 from .history import ActiveHistoryPeriod, get_logfile, History, quote_tab, scrub_string
 from .host_config import HostConfig
 from .perfcounters import Perfcounters
 from .query import filter_operator_in, MKClientError, Query, QueryCOMMAND, QueryGET, QueryREPLICATE
+from .rule_dispatch import RuleDispatcher
 from .rule_packs import load_config as load_config_using
 from .settings import FileDescriptor, PortNumber, Settings
 from .settings import settings as create_settings
@@ -1050,9 +1052,8 @@ class EventServer(ECServerThread):
                 # First look for case 1: rule that already have at least one hit
                 # and this events in the state "counting" exist.
                 events_to_delete = []
-                events = self._event_status.events()
-                for nr, event in enumerate(events):
-                    if event["rule_id"] == rule["id"] and event["phase"] == "counting":
+                for event in self._event_status.events_of_rule(rule["id"]):
+                    if event["phase"] == "counting":
                         # time has elapsed. Now lets see if we have reached
                         # the necessary count:
                         if event["count"] < expected_count:  # no -> trigger alarm
@@ -1070,15 +1071,15 @@ class EventServer(ECServerThread):
                             )
                             self._history.add(event, "COUNTREACHED")
                         # Counting event is no longer needed.
-                        events_to_delete.append(nr)
+                        events_to_delete.append(event)
                         break
 
                 # Ou ou, no event found at all.
                 else:
                     self._handle_absent_event(rule, 0, expected_count, interval_start)
 
-                for nr in events_to_delete[::-1]:
-                    self._event_status.remove_event(events[nr])
+                for event in events_to_delete:
+                    self._event_status.remove_event(event)
 
     def _handle_absent_event(
         self, rule: Rule, event_count: int, expected_count: int, interval_start: float
@@ -1105,10 +1106,8 @@ class EventServer(ECServerThread):
             merge, reset_ack = merge
 
         if merge != "never":
-            for event in self._event_status.events():
-                if event["rule_id"] == rule["id"] and (
-                    event["phase"] == "open" or (event["phase"] == "ack" and merge == "acked")
-                ):
+            for event in self._event_status.events_of_rule(rule["id"]):
+                if event["phase"] == "open" or (event["phase"] == "ack" and merge == "acked"):
                     merge_event = event
                     break
 
@@ -1124,9 +1123,12 @@ class EventServer(ECServerThread):
 
             merge_event["time"] = now
             merge_event["text"] = text
+            host_key = (merge_event["host"], merge_event["core_host"])
             # Better rewrite (again). Rule might have changed. Also we have changed
             # the text and the user might have his own text added via set_text.
             self.rewrite_event(rule, merge_event, {}, set_first=False)
+            # The rule may set the host
+            self._event_status.update_host(merge_event, host_key)
             self._history.add(merge_event, "COUNTFAILED")
         else:
             # Create artificial event from scratch. Make sure that all important
@@ -1186,6 +1188,7 @@ class EventServer(ECServerThread):
         self._rule_by_id = {}
         # Speedup-Hash for rule execution
         self._rule_hash: dict[int, dict[int, Any]] = {}
+        self._rule_dispatch: dict[int, dict[int, RuleDispatcher]] = {}
         count_disabled = 0
         count_rules = 0
         count_unspecific = 0
@@ -1264,7 +1267,9 @@ class EventServer(ECServerThread):
         self._logger.info(
             "Compiled %d active rules (ignoring %d disabled rules)", count_rules, count_disabled
         )
+        self._perfcounters.reset_rule_costs()
         if self._config["rule_optimizer"]:
+            self._compile_rule_dispatch()
             self._logger.info(
                 "Rule hash: %d rules - %d hashed, %d unspecific",
                 len(self._rules),
@@ -1326,6 +1331,17 @@ class EventServer(ECServerThread):
             if need:
                 prio_hash.setdefault(prio, []).append(rule)
 
+    def _compile_rule_dispatch(self) -> None:
+        # Many facilities and priorities share the same rules, e.g. all the rules
+        # without facility and priority conditions. Share their dispatchers, too.
+        dispatchers: dict[tuple[int, ...], RuleDispatcher] = {}
+        for facility, prio_hash in self._rule_hash.items():
+            for prio, rules in prio_hash.items():
+                key = tuple(id(rule) for rule in rules)
+                if key not in dispatchers:
+                    dispatchers[key] = RuleDispatcher(rules)
+                self._rule_dispatch.setdefault(facility, {})[prio] = dispatchers[key]
+
     def output_hash_stats(self) -> None:
         self._logger.info("Top 20 of facility/priority:")
         entries = []
@@ -1362,7 +1378,13 @@ class EventServer(ECServerThread):
         # Rule optimizer
         if self._config["rule_optimizer"]:
             self._hash_stats[event["facility"]][event["priority"]] += 1
-            rule_candidates = self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+            dispatcher = self._rule_dispatch.get(event["facility"], {}).get(event["priority"])
+            if dispatcher is None:
+                rule_candidates = []
+            elif self._config["debug_rules"]:
+                rule_candidates = dispatcher.rules  # Show why the other rules do not match
+            else:
+                rule_candidates = dispatcher.candidates(event)
         else:
             rule_candidates = self._rules
 
@@ -1544,7 +1566,13 @@ class EventServer(ECServerThread):
     # if matched regex groups in either text (normal) or match_ok (cancelling)
     # match.
     def event_rule_matches(self, rule: Rule, event: Event) -> MatchResult:
-        self._perfcounters.count("rule_tries")
+        start = time.perf_counter()
+        try:
+            return self._event_rule_matches(rule, event)
+        finally:
+            self._perfcounters.count_rule_try(rule["id"], time.perf_counter() - start)
+
+    def _event_rule_matches(self, rule: Rule, event: Event) -> MatchResult:
         with self._lock_configuration:
             result = self._rule_matcher.event_rule_matches_non_inverted(rule, event)
             if rule.get("invert_matching"):
@@ -2372,6 +2400,8 @@ class StatusTableRules(StatusTable):
     columns = [
         ("rule_id", ""),
         ("rule_hits", 0),
+        ("rule_tries", 0),
+        ("rule_match_time", 0.0),
     ]
 
     def __init__(self, logger: Logger, event_status: EventStatus) -> None:
@@ -2977,8 +3007,7 @@ class EventStatus:
         self._config = config
 
     def flush(self) -> None:
-        # TODO: Improve types!
-        self._events: list[Event] = []
+        self._events = EventStore()
         self._next_event_id = 1
         self._rule_stats: dict[str, int] = {}
         # needed for expecting rules
@@ -2991,14 +3020,13 @@ class EventStatus:
         # - number of rule misses
 
     def events(self) -> list[Event]:
-        # TODO: Improve type!
-        return self._events
+        return list(self._events)
+
+    def events_of_rule(self, rule_id: str) -> list[Event]:
+        return self._events.of_rule(rule_id)
 
     def event(self, eid: int) -> Event | None:
-        for event in self._events:
-            if event["id"] == eid:
-                return event
-        return None
+        return self._events.get(eid)
 
     def interval_start(self, rule_id: str, interval: int) -> int:
         """
@@ -3047,14 +3075,14 @@ class EventStatus:
     def pack_status(self) -> dict[str, Any]:
         return {
             "next_event_id": self._next_event_id,
-            "events": self._events,
+            "events": list(self._events),
             "rule_stats": self._rule_stats,
             "interval_starts": self._interval_starts,
         }
 
     def unpack_status(self, status: Mapping[str, Any]) -> None:
         self._next_event_id = status["next_event_id"]
-        self._events = status["events"]
+        self._events = EventStore(status["events"])
         self._rule_stats = status["rule_stats"]
         self._interval_starts = status["interval_starts"]
 
@@ -3082,11 +3110,12 @@ class EventStatus:
 
     def load_status(self, event_server: EventServer) -> None:
         path = self.settings.paths.status_file.value
+        events = list(self._events)
         if path.exists():
             try:
                 status = ast.literal_eval(path.read_text(encoding="utf-8"))
                 self._next_event_id = status["next_event_id"]
-                self._events = status["events"]
+                events = status["events"]
                 self._rule_stats = status["rule_stats"]
                 self._interval_starts = status.get("interval_starts", {})
                 self._logger.info("Loaded event state from %s.", path)
@@ -3095,7 +3124,7 @@ class EventStatus:
                 raise
 
         # Add new columns and fix broken events
-        for event in self._events:
+        for event in events:
             event.setdefault("ipaddress", "")
             event.setdefault("host", "")
             event.setdefault("application", "")
@@ -3105,7 +3134,8 @@ class EventStatus:
                 event_server.add_core_host_to_event(event)
                 event["host_in_downtime"] = False
 
-        # core_host is needed to initialize the status
+        # The host is needed to index the events, core_host is needed to initialize the status
+        self._events = EventStore(events)
         self._initialize_event_limit_status()
 
     # Called on Event Console initialization from status file to initialize
@@ -3142,7 +3172,7 @@ class EventStatus:
         self._perfcounters.count("events")
         event["id"] = self._next_event_id
         self._next_event_id += 1
-        self._events.append(event)
+        self._events.add(event)
         self.num_existing_events += 1
         self._count_event_add(event)
         self._history.add(event, "NEW")
@@ -3158,19 +3188,15 @@ class EventStatus:
         try:
             self._events.remove(event)
             self._count_event_remove(event)
-        except ValueError:
+        except KeyError:
             self._logger.exception("Cannot remove event %d: not present", event["id"])
 
-    # protected by self.lock
-    def _remove_event_by_nr(self, index: int) -> None:
-        event = self._events.pop(index)
-        self._count_event_remove(event)
-
     # protected by self.lock
     def remove_oldest_event(self, ty: str, event: Event) -> None:
         if ty == "overall":
             self._logger.log(VERBOSE, "  Removing oldest event")
-            self._remove_event_by_nr(0)
+            if (oldest := self._events.oldest()) is not None:
+                self.remove_event(oldest)
         elif ty == "by_rule" and event["rule_id"] is not None:
             self._logger.log(VERBOSE, '  Removing oldest event of rule "%s"', event["rule_id"])
             self._remove_oldest_event_of_rule(event["rule_id"])
@@ -3180,17 +3206,13 @@ class EventStatus:
 
     # protected by self.lock
     def _remove_oldest_event_of_rule(self, rule_id: str) -> None:
-        for event in self._events:
-            if event["rule_id"] == rule_id:
-                self.remove_event(event)
-                return
+        if (oldest := self._events.oldest_of_rule(rule_id)) is not None:
+            self.remove_event(oldest)
 
     # protected by self.lock
     def _remove_oldest_event_of_host(self, hostname: str) -> None:
-        for event in self._events:
-            if event["host"] == hostname:
-                self.remove_event(event)
-                return
+        if (oldest := self._events.oldest_of_host(hostname)) is not None:
+            self.remove_event(oldest)
 
     # protected by self.lock
     def get_num_existing_events_by(self, ty: str, event: Event) -> int:
@@ -3216,10 +3238,8 @@ class EventStatus:
         """
         with self.lock:
             to_delete = []
-            for nr, event in enumerate(self._events):
-                if event["rule_id"] == rule["id"] and self.cancelling_match(
-                    match_groups, new_event, event, rule
-                ):
+            for event in self._events.of_rule(rule["id"]):
+                if self.cancelling_match(match_groups, new_event, event, rule):
                     # Fill a few fields of the cancelled event with data from
                     # the cancelling event so that action scripts have useful
                     # values and the logfile entry if more relevant.
@@ -3262,10 +3282,10 @@ class EventStatus:
                                 is_cancelling=True,
                             )
 
-                    to_delete.append(nr)
+                    to_delete.append(event)
 
-            for nr in to_delete[::-1]:
-                self._remove_event_by_nr(nr)
+            for event in to_delete:
+                self.remove_event(event)
 
     def cancelling_match(  # pylint: disable=too-many-branches
         self, match_groups: dict, new_event: Event, event: Event, rule: Rule
@@ -3384,12 +3404,29 @@ class EventStatus:
                 preserve["comment"] = found["comment"]
             if "contact" in found:
                 preserve["contact"] = found["contact"]
+        host_key = (found["host"], found.get("core_host"))
         found.update(event)
         found.update(preserve)
+        # The host of the event may have changed, see the "match_host" option of counting rules
+        self.update_host(found, host_key)
+
+    def update_host(self, event: Event, host_key: tuple[str, HostName | None]) -> None:
+        """Re-index the event after its host may have been changed
+
+        host_key is the host and core host the event had before the change.
+        """
+        if self._events.get(event["id"]) is not event:
+            return
+        self._events.update_host(event)
+        if (new_host_key := (event["host"], event["core_host"])) != host_key:
+            self.num_existing_events_by_host[host_key] -= 1
+            self.num_existing_events_by_host[new_host_key] = (
+                self.num_existing_events_by_host.get(new_host_key, 0) + 1
+            )
 
     def count_expected_event(self, event_server: EventServer, event: Event) -> None:
-        for ev in self._events:
-            if ev["rule_id"] == event["rule_id"] and ev["phase"] == "counting":
+        for ev in self._events.of_rule(event["rule_id"]):
+            if ev["phase"] == "counting":
                 self.count_event_up(ev, event)
                 return
 
@@ -3408,33 +3445,32 @@ class EventStatus:
         since the event has been created because the count was too
         low in the specified period of time.
         """
-        for ev in self._events:
-            if ev["rule_id"] == event["rule_id"]:
-                if ev["phase"] == "ack" and not count["count_ack"]:
-                    continue  # skip acknowledged events
+        for ev in self._events.of_rule(event["rule_id"]):
+            if ev["phase"] == "ack" and not count["count_ack"]:
+                continue  # skip acknowledged events
 
-                if count["separate_host"] and ev["host"] != event["host"]:
-                    continue  # treat events with separated hosts separately
+            if count["separate_host"] and ev["host"] != event["host"]:
+                continue  # treat events with separated hosts separately
 
-                if count["separate_application"] and ev["application"] != event["application"]:
-                    continue  # same for application
+            if count["separate_application"] and ev["application"] != event["application"]:
+                continue  # same for application
 
-                if count["separate_match_groups"] and ev["match_groups"] != event["match_groups"]:
-                    continue
+            if count["separate_match_groups"] and ev["match_groups"] != event["match_groups"]:
+                continue
 
-                if (
-                    count.get("count_duration") is not None
-                    and ev["first"] + count["count_duration"] < event["time"]
-                ):
-                    # Counting has been discontinued on this event after a certain time
-                    continue
+            if (
+                count.get("count_duration") is not None
+                and ev["first"] + count["count_duration"] < event["time"]
+            ):
+                # Counting has been discontinued on this event after a certain time
+                continue
 
-                if ev["host_in_downtime"] != event["host_in_downtime"]:
-                    continue  # treat events with different downtime states separately
+            if ev["host_in_downtime"] != event["host_in_downtime"]:
+                continue  # treat events with different downtime states separately
 
-                found = ev
-                self.count_event_up(found, event)
-                break
+            found = ev
+            self.count_event_up(found, event)
+            break
         else:
             event["count"] = 1
             event["phase"] = "counting"
@@ -3449,21 +3485,23 @@ class EventStatus:
 
     # locked with self.lock
     def delete_event(self, event_id: int, user: str) -> None:
-        for nr, event in enumerate(self._events):
-            if event["id"] == event_id:
-                event["phase"] = "closed"
-                if user:
-                    event["owner"] = user
-                self._history.add(event, "DELETE", user)
-                self._remove_event_by_nr(nr)
-                return
-        raise MKClientError(f"No event with id {event_id}")
+        if (event := self._events.get(event_id)) is None:
+            raise MKClientError(f"No event with id {event_id}")
+        event["phase"] = "closed"
+        if user:
+            event["owner"] = user
+        self._history.add(event, "DELETE", user)
+        self.remove_event(event)
 
     def get_events(self) -> list[Any]:
-        return self._events
+        return list(self._events)
 
     def get_rule_stats(self) -> Iterable[Any]:
-        return sorted(self._rule_stats.items(), key=lambda x: x[0])
+        rule_costs = self._perfcounters.get_rule_costs()
+        return [
+            [rule_id, self._rule_stats.get(rule_id, 0), *rule_costs.get(rule_id, (0, 0.0))]
+            for rule_id in sorted(self._rule_stats.keys() | rule_costs.keys())
+        ]
 
 
 # .
@@ -47,6 +47,8 @@ class Perfcounters:
         self._average_rates: dict[str, float] = {}
         self._times: dict[str, float] = {}
         self._last_statistics: float | None = None
+        # Number of tries and total matching time per rule ID
+        self._rule_costs: dict[str, tuple[int, float]] = {}
 
         self._logger = logger.getChild("Perfcounters")
 
@@ -61,6 +63,20 @@ class Perfcounters:
             else:
                 self._times[counter] = ptime
 
+    def count_rule_try(self, rule_id: str, duration: float) -> None:
+        with self._lock:
+            self._counters["rule_tries"] += 1
+            tries, total_duration = self._rule_costs.get(rule_id, (0, 0.0))
+            self._rule_costs[rule_id] = (tries + 1, total_duration + duration)
+
+    def get_rule_costs(self) -> dict[str, tuple[int, float]]:
+        with self._lock:
+            return self._rule_costs.copy()
+
+    def reset_rule_costs(self) -> None:
+        with self._lock:
+            self._rule_costs = {}
+
     def do_statistics(self) -> None:
         with self._lock:
             now = time.time()
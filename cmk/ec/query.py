@@ -85,7 +85,8 @@ class QueryGET(Query):
         self.table_name = self.method_arg
         self.table = status_server.table(self.table_name)
         self.requested_columns = self.table.column_names
-        # NOTE: history's _get_mongodb and _get_files access filters and limits directly.
+        # NOTE: history's _get_mongodb, _get_sqlite and _get_files access filters and limits
+        # directly.
         self.filters: list[tuple[str, OperatorName, Callable[[Any], bool], Any]] = []
         self.limit: int | None = None
         # NOTE: StatusTableEvents uses only_host for optimization.
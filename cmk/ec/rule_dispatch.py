@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Preselection of the rules an event has to be matched against
+
+Matching an event against a rule is expensive: the host, application and
+message conditions are evaluated one after another. Many rules can be ruled
+out much cheaper, because they only match a single host or need a certain
+text to be contained in the message. The RuleDispatcher extracts these
+conditions when the rules are compiled and only hands out the rules which
+could possibly match an event, in their original order.
+"""
+
+import functools
+import re
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from .config import Rule, TextPattern
+from .event import Event
+
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux-]")
+_QUANTIFIER = re.compile(r"\{\d*(,\d*)?\}")
+_CHARACTER_CLASS = re.compile(r"\[\^?\]?(\\.|[^\]\\])*\]")
+# Escapes which are not a single literal character nor a character class
+_NUMERIC_ESCAPES = frozenset("0123456789xuUN")
+
+
+class _Needle(NamedTuple):
+    text: str
+    # Texts derived from regular expressions are only exact for ASCII messages,
+    # because of the Unicode case folding of re.IGNORECASE.
+    ascii_only: bool
+
+
+class _Prefilter:
+    """The positions of the rules for one host, grouped by the text they need"""
+
+    def __init__(self) -> None:
+        self.unconditional: list[int] = []
+        self.by_text: dict[_Needle, list[int]] = {}
+
+    def add(self, position: int, needles: Sequence[_Needle] | None) -> None:
+        if needles is None:
+            self.unconditional.append(position)
+            return
+        for needle in needles:
+            self.by_text.setdefault(needle, []).append(position)
+
+    def collect(self, text: str, is_ascii: bool, positions: set[int]) -> None:
+        positions.update(self.unconditional)
+        for needle, needle_positions in self.by_text.items():
+            if (needle.ascii_only and not is_ascii) or needle.text in text:
+                positions.update(needle_positions)
+
+
+class RuleDispatcher:
+    """Selects the rules which could match an event
+
+    Rules matching a single host (no regular expression) are only handed
+    out for events of that host. Rules whose message condition needs a
+    certain text are only handed out if the message contains that text.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = rules
+        self._any_host = _Prefilter()
+        self._by_host: dict[str, _Prefilter] = {}
+        for position, rule in enumerate(rules):
+            host = _required_host(rule)
+            prefilter = (
+                self._any_host if host is None else self._by_host.setdefault(host, _Prefilter())
+            )
+            prefilter.add(position, _required_texts(rule))
+        self._is_unconditional = not self._by_host and not self._any_host.by_text
+
+    def candidates(self, event: Event) -> Sequence[Rule]:
+        if self._is_unconditional:
+            return self.rules
+
+        text = event["text"]
+        is_ascii = text.isascii()
+        text = text.lower()
+        positions: set[int] = set()
+        self._any_host.collect(text, is_ascii, positions)
+        if (prefilter := self._by_host.get(event["host"].lower())) is not None:
+            prefilter.collect(text, is_ascii, positions)
+        return [self.rules[position] for position in sorted(positions)]
+
+
+def _required_host(rule: Rule) -> str | None:
+    """The host name the rule exclusively matches, see match(..., complete=True)"""
+    if rule.get("invert_matching"):
+        return None
+    pattern = rule.get("match_host")
+    return pattern if isinstance(pattern, str) else None
+
+
+def _required_texts(rule: Rule) -> Sequence[_Needle] | None:
+    """The texts of which the message has to contain at least one to match the rule
+
+    A rule matches if either its message or its cancelling message matches,
+    see RuleMatcher.event_rule_matches_message.
+    """
+    if rule.get("invert_matching"):
+        return None
+    needles = []
+    for key in ("match", "match_ok"):
+        if key not in rule:
+            if key == "match":
+                return None  # A missing pattern always matches
+            continue
+        if (needle := _needle(rule[key])) is None:  # type: ignore[literal-required]
+            return None
+        needles.append(needle)
+    return needles
+
+
+def _needle(pattern: TextPattern) -> _Needle | None:
+    if pattern is None:
+        return None
+    if isinstance(pattern, str):
+        return _Needle(pattern, ascii_only=False)  # already lower case
+    if text := required_text(pattern.pattern):
+        return _Needle(text, ascii_only=True)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def required_text(pattern: str) -> str:
+    """Find a text every match of the regular expression contains
+
+    The result is lower case. It is empty if there is no such text or if the
+    expression is too complex to tell. Only ASCII characters outside of any
+    group are considered.
+
+    >>> required_text(r"kernel: .*(link|carrier) (up|down) on eth\\d+")
+    'kernel: '
+    >>> required_text(r"Disk [a-z]+ failed?")
+    ' faile'
+    >>> required_text(r"error|warning")
+    ''
+    """
+    if _INLINE_FLAGS.search(pattern):
+        return ""
+
+    texts = []
+    current = ""
+    depth = 0
+    pos = 0
+    while pos < len(pattern):
+        char = pattern[pos]
+        literal = None
+        if char == "\\":
+            escaped = pattern[pos + 1 : pos + 2]
+            if escaped in _NUMERIC_ESCAPES:
+                return ""
+            if escaped.isascii() and not escaped.isalnum():
+                literal = escaped
+            pos += 2
+        elif char == "[":
+            if (character_class := _CHARACTER_CLASS.match(pattern, pos)) is None:
+                return ""
+            pos = character_class.end()
+        elif char in "*?+{":
+            if char == "{":
+                if (quantifier := _QUANTIFIER.match(pattern, pos)) is None:
+                    return ""
+                pos = quantifier.end()
+            else:
+                pos += 1
+            texts.append(current if char == "+" else current[:-1])
+            # The last repetition of a character directly precedes the following text
+            current = current[-1:] if char == "+" else ""
+            continue
+        else:
+            if char == "|" and depth == 0:
+                return ""
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char not in ".^$" and char.isascii():
+                literal = char
+            pos += 1
+
+        if literal is not None and depth == 0:
+            current += literal
+        else:
+            texts.append(current)
+            current = ""
+
+    texts.append(current)
+    return max(texts, key=len).lower()
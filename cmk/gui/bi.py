@@ -987,7 +987,9 @@ class BIManager:
         self.compiler = BICompiler(self.bi_configuration_file(), sites_callback)
         self.compiler.load_compiled_aggregations()
         self.status_fetcher = BIStatusFetcher(sites_callback)
-        self.computer = BIComputer(self.compiler.compiled_aggregations, self.status_fetcher)
+        self.computer = BIComputer(
+            self.compiler.compiled_aggregations, self.status_fetcher, self.compiler.branch_index
+        )
 
     @classmethod
     def bi_configuration_file(cls) -> str:
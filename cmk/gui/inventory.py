@@ -25,10 +25,15 @@ import cmk.utils.regex
 import cmk.utils.store as store
 from cmk.utils.exceptions import MKException, MKGeneralException
 from cmk.utils.structured_data import (
+    apply_raw_delta,
+    get_changed_raw_tree,
+    get_raw_sub_tree,
     make_filter,
     SDKey,
     SDPath,
+    SDRawDelta,
     SDRawPath,
+    SDRawTree,
     StructuredDataNode,
     StructuredDataStore,
 )
@@ -255,8 +260,11 @@ def load_latest_delta_tree(hostname: HostName) -> Optional[StructuredDataNode]:
 def load_delta_tree(
     hostname: HostName,
     timestamp: int,
+    path: SDPath = (),
 ) -> Tuple[Optional[StructuredDataNode], Sequence[str]]:
-    """Load inventory history and compute delta tree of a specific timestamp"""
+    """Load inventory history and compute delta tree of a specific timestamp
+
+    The delta tree may be restricted to the node below the given path."""
     # Timestamp is timestamp of the younger of both trees. For the oldest
     # tree we will just return the complete tree - without any delta
     # computation.
@@ -285,6 +293,7 @@ def load_delta_tree(
         filter_tree_paths=lambda filter_tree_paths: _search_timestamps(
             filter_tree_paths, timestamp
         ),
+        path=path,
     )
     if not delta_history:
         return None, []
@@ -305,6 +314,7 @@ def _get_history(
     hostname: HostName,
     *,
     filter_tree_paths: Callable[[Sequence[InventoryHistoryPath]], FilteredInventoryHistoryPaths],
+    path: SDPath = (),
 ) -> Tuple[Sequence[HistoryEntry], Sequence[str]]:
     if "/" in hostname:
         return [], []  # just for security reasons
@@ -317,7 +327,7 @@ def _get_history(
     except FilterInventoryHistoryPathsError:
         return [], []
 
-    cached_tree_loader = _CachedTreeLoader()
+    cached_tree_loader = _CachedTreeLoader(tree_paths)
     corrupted_history_files: Set[Path] = set()
     history: List[HistoryEntry] = []
 
@@ -331,20 +341,21 @@ def _get_history(
             current.timestamp,
         )
 
-        if (cached_history_entry := cached_delta_tree_loader.get_cached_entry()) is not None:
+        if (cached_history_entry := cached_delta_tree_loader.get_cached_entry(path)) is not None:
             history.append(cached_history_entry)
             continue
 
         try:
-            previous_tree = cached_tree_loader.get_tree(previous.path)
-            current_tree = cached_tree_loader.get_tree(current.path)
+            previous_tree, current_tree = cached_tree_loader.get_changed_trees(
+                previous.path, current.path, path
+            )
         except LoadStructuredDataError:
             corrupted_history_files.add(current.short)
             continue
 
         if (
             history_entry := cached_delta_tree_loader.get_calculated_or_store_entry(
-                previous_tree, current_tree
+                previous_tree, current_tree, store_entry=not path
             )
         ) is not None:
             history.append(history_entry)
@@ -395,27 +406,79 @@ def _get_pairs(
 
 @dataclass(frozen=True)
 class _CachedTreeLoader:
-    _lookup: Dict[Path, StructuredDataNode] = field(default_factory=dict)
+    """Restore the trees of the inventory history
+
+    The archived trees, except the newest one, are stored as the changes needed to restore them
+    from the next newer archived tree. They are restored from the newest one as far as needed.
+    Only the parts of two trees which differ are deserialized for comparing them."""
+
+    tree_paths: Sequence[InventoryHistoryPath]
+    _raw_trees: Dict[Path, Optional[SDRawTree]] = field(default_factory=dict)
+    _raw_deltas: Dict[Path, SDRawDelta] = field(default_factory=dict)
+
+    def get_changed_trees(
+        self, previous_filepath: Path, current_filepath: Path, path: SDPath
+    ) -> Tuple[StructuredDataNode, StructuredDataNode]:
+        previous_raw_tree = self._get_raw_tree(previous_filepath)
+        current_raw_tree = self._get_raw_tree(current_filepath)
+
+        if (raw_delta := self._raw_deltas.get(previous_filepath)) is not None:
+            previous_raw_tree = get_changed_raw_tree(previous_raw_tree, raw_delta)
+            current_raw_tree = get_changed_raw_tree(current_raw_tree, raw_delta)
+
+        return (
+            self._deserialize(get_raw_sub_tree(previous_raw_tree, path)),
+            self._deserialize(get_raw_sub_tree(current_raw_tree, path)),
+        )
 
-    def get_tree(self, filepath: Path) -> StructuredDataNode:
+    def _get_raw_tree(self, filepath: Path) -> SDRawTree:
         if filepath == _DEFAULT_PATH_TO_TREE:
-            return StructuredDataNode()
+            return StructuredDataNode().serialize()
 
-        if filepath in self._lookup:
-            return self._lookup[filepath]
+        if filepath not in self._raw_trees:
+            self._restore_raw_trees(filepath)
 
-        return self._lookup.setdefault(filepath, self._load_tree_from_file(filepath))
+        if (raw_tree := self._raw_trees[filepath]) is None:
+            raise LoadStructuredDataError()
+        return raw_tree
+
+    def _restore_raw_trees(self, filepath: Path) -> None:
+        # The current tree is not stored in the archive directory and never as delta
+        archived_filepaths = [
+            tree_path.path
+            for tree_path in self.tree_paths
+            if tree_path.path.parent == filepath.parent
+        ]
+        newer_raw_tree: Optional[SDRawTree] = None
+        for archived_filepath in reversed(archived_filepaths[archived_filepaths.index(filepath) :]):
+            if archived_filepath in self._raw_trees:
+                newer_raw_tree = self._raw_trees[archived_filepath]
+                continue
+            newer_raw_tree = self._raw_trees[archived_filepath] = self._load_raw_tree(
+                archived_filepath, newer_raw_tree
+            )
 
-    def _load_tree_from_file(self, filepath: Path) -> StructuredDataNode:
+    def _load_raw_tree(
+        self, filepath: Path, newer_raw_tree: Optional[SDRawTree]
+    ) -> Optional[SDRawTree]:
         try:
-            tree = _filter_tree(StructuredDataStore.load_file(filepath))
-        except FileNotFoundError:
-            raise LoadStructuredDataError()
+            archived_raw_tree = StructuredDataStore.load_archive_file(filepath)
+        except (MKGeneralException, SyntaxError, ValueError):
+            return None
 
-        if tree is None or tree.is_empty():
-            # load_file may return an empty tree
-            raise LoadStructuredDataError()
+        if archived_raw_tree.raw_delta is None:
+            return archived_raw_tree.raw_tree
+
+        if newer_raw_tree is None:
+            return None
+
+        self._raw_deltas[filepath] = archived_raw_tree.raw_delta
+        return apply_raw_delta(newer_raw_tree, archived_raw_tree.raw_delta)
 
+    @staticmethod
+    def _deserialize(raw_tree: SDRawTree) -> StructuredDataNode:
+        if (tree := _filter_tree(StructuredDataNode.deserialize(raw_tree))) is None:
+            raise LoadStructuredDataError()
         return tree
 
 
@@ -433,7 +496,7 @@ class _CachedDeltaTreeLoader:
             "%s_%s" % (self.previous_timestamp, self.current_timestamp),
         )
 
-    def get_cached_entry(self) -> Optional[HistoryEntry]:
+    def get_cached_entry(self, path: SDPath = ()) -> Optional[HistoryEntry]:
         try:
             cached_data = store.load_object_from_file(self._path, default=None)
         except MKGeneralException:
@@ -443,13 +506,14 @@ class _CachedDeltaTreeLoader:
             return None
 
         new, changed, removed, delta_tree_data = cached_data
-        delta_tree = StructuredDataNode.deserialize(delta_tree_data)
+        delta_tree = StructuredDataNode.deserialize(get_raw_sub_tree(delta_tree_data, path))
         return HistoryEntry(self.current_timestamp, new, changed, removed, delta_tree)
 
     def get_calculated_or_store_entry(
         self,
         previous_tree: StructuredDataNode,
         current_tree: StructuredDataNode,
+        store_entry: bool = True,
     ) -> Optional[HistoryEntry]:
         delta_result = current_tree.compare_with(previous_tree)
         new, changed, removed, delta_tree = (
@@ -459,10 +523,11 @@ class _CachedDeltaTreeLoader:
             delta_result.delta,
         )
         if new or changed or removed:
-            store.save_text_to_file(
-                self._path,
-                repr((new, changed, removed, delta_tree.serialize())),
-            )
+            if store_entry:
+                store.save_text_to_file(
+                    self._path,
+                    repr((new, changed, removed, delta_tree.serialize())),
+                )
             return HistoryEntry(self.current_timestamp, new, changed, removed, delta_tree)
         return None
 
@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 import functools
-from typing import Callable, cast, Dict, List, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, cast, Dict, List, Optional, Sequence, Tuple, Union
 
 from livestatus import LivestatusColumn, LivestatusRow, OnlySites, Query, QuerySpecification
 
@@ -100,12 +100,26 @@ class RowTableLivestatus(RowTable):
         datasource = view.datasource
 
         columns, dynamic_columns = self._prepare_columns(columns, view)
-        data = query_livestatus(
-            self.create_livestatus_query(columns, headers + datasource.add_headers),
-            only_sites,
-            limit,
-            datasource.auth_domain,
-        )
+        query = self.create_livestatus_query(columns, headers + datasource.add_headers)
+        order_by = _livestatus_order_by(view, columns) if limit is not None else None
+        if order_by:
+            order_by_headers = "".join(
+                "OrderBy: %s%s\n" % (column, " desc" if descending else "")
+                for column, descending in order_by
+            )
+            # Sites which do not know OrderBy: yet are asked the query without it
+            data = query_livestatus(
+                self.create_livestatus_query(
+                    columns, headers + order_by_headers + datasource.add_headers
+                ),
+                only_sites,
+                limit,
+                datasource.auth_domain,
+                _merge_key(order_by, columns),
+                query,
+            )
+        else:
+            data = query_livestatus(query, only_sites, limit, datasource.auth_domain)
 
         if merge_column := datasource.merge_by:
             data = _merge_data(data, columns, merge_column)
@@ -122,9 +136,52 @@ class RowTableLivestatus(RowTable):
         return rows, len(data)
 
 
+def _livestatus_order_by(
+    view: View, columns: List[ColumnName]
+) -> Optional[List[Tuple[ColumnName, bool]]]:
+    """Translate the sorters of the view to OrderBy: headers, if all of them can be translated
+
+    With a limit, the sites then send their first rows instead of some arbitrary rows."""
+    if view.datasource.merge_by:
+        return None
+    order_by = []
+    for entry in view.sorters:
+        if entry.join_key or (sorter_order_by := entry.sorter.order_by) is None:
+            return None
+        column, descending = sorter_order_by
+        if column not in columns:
+            return None
+        order_by.append((column, descending != bool(entry.negate)))
+    return order_by
+
+
+def _merge_key(
+    order_by: List[Tuple[ColumnName, bool]], columns: List[ColumnName]
+) -> Callable[[LivestatusRow], Any]:
+    # The first column of the rows is the site
+    indices = [(columns.index(column) + 1, descending) for column, descending in order_by]
+
+    def compare(row1: LivestatusRow, row2: LivestatusRow) -> int:
+        for index, descending in indices:
+            c = (row1[index] > row2[index]) - (row1[index] < row2[index])
+            if c != 0:
+                return -c if descending else c
+        return 0
+
+    return functools.cmp_to_key(compare)
+
+
 def query_livestatus(
-    query: Query, only_sites: OnlySites, limit: Optional[int], auth_domain: str
+    query: Query,
+    only_sites: OnlySites,
+    limit: Optional[int],
+    auth_domain: str,
+    merge_key: Optional[Callable[[LivestatusRow], Any]] = None,
+    unordered_query: Optional[Query] = None,
 ) -> List[LivestatusRow]:
+    """Query the sites, with a merge key the already ordered rows of the sites are merged
+
+    Sites which reject the ordered query are asked the unordered_query instead."""
 
     if all(
         (
@@ -139,7 +196,10 @@ def query_livestatus(
 
     sites.live().set_auth_domain(auth_domain)
     with sites.only_sites(only_sites), sites.prepend_site(), sites.set_limit(limit):
-        data = sites.live().query(query)
+        if merge_key is None:
+            data = sites.live().query(query)
+        else:
+            data = sites.live().query_merged(query, merge_key, unordered_query=unordered_query)
 
     sites.live().set_auth_domain("read")
 
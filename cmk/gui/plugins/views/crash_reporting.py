@@ -278,6 +278,9 @@ class SorterCrashTime(Sorter):
     def cmp(self, r1, r2):
         return cmp_simple_number("crash_time", r1, r2)
 
+    def sort_key(self, row: Row) -> float:
+        return row["crash_time"]
+
 
 PermissionActionDeleteCrashReport = permission_registry.register(
     Permission(
@@ -1416,15 +1416,17 @@ class CommandECArchiveEventsOfHost(ECCommand):
 
 
 def cmp_simple_state(column, ra, rb):
-    a = ra.get(column, -1)
-    b = rb.get(column, -1)
-    if a == 3:
-        a = 1.5
-    if b == 3:
-        b = 1.5
+    a = key_simple_state(column, ra)
+    b = key_simple_state(column, rb)
     return (a > b) - (a < b)
 
 
+def key_simple_state(column: ColumnName, row: Row) -> float:
+    # UNKNOWN is sorted between WARN and CRIT
+    state = row.get(column, -1)
+    return 1.5 if state == 3 else state
+
+
 declare_1to1_sorter("event_id", cmp_simple_number)
 declare_1to1_sorter("event_count", cmp_simple_number)
 declare_1to1_sorter("event_text", cmp_simple_string)
@@ -1440,7 +1442,7 @@ declare_1to1_sorter("event_pid", cmp_simple_number)
 declare_1to1_sorter("event_priority", cmp_simple_number)
 declare_1to1_sorter("event_facility", cmp_simple_number)  # maybe convert to text
 declare_1to1_sorter("event_rule_id", cmp_simple_string)
-declare_1to1_sorter("event_state", cmp_simple_state)
+declare_1to1_sorter("event_state", cmp_simple_state, key=key_simple_state)
 declare_1to1_sorter("event_phase", cmp_simple_string)
 declare_1to1_sorter("event_owner", cmp_simple_string)
 
@@ -20,10 +20,9 @@ from cmk.gui.plugins.views.utils import (
     is_stale,
     Painter,
     painter_registry,
-    Row,
 )
 from cmk.gui.sorter import Sorter, sorter_registry
-from cmk.gui.type_defs import ColumnName, Perfdata, PerfometerSpec, TranslatedMetrics
+from cmk.gui.type_defs import ColumnName, Perfdata, PerfometerSpec, Row, TranslatedMetrics
 from cmk.gui.utils.html import HTML
 
 
@@ -288,12 +287,15 @@ class SorterPerfometer(Sorter):
         ]
 
     def cmp(self, r1, r2):
+        v1 = self.sort_key(r1)
+        v2 = self.sort_key(r2)
+        return (v1 > v2) - (v1 < v2)
+
+    def sort_key(self, row: Row) -> Tuple[float, ...]:
         try:
-            v1 = tuple(-float("inf") if s is None else s for s in Perfometer(r1).sort_value())
-            v2 = tuple(-float("inf") if s is None else s for s in Perfometer(r2).sort_value())
-            return (v1 > v2) - (v1 < v2)
+            return tuple(-float("inf") if s is None else s for s in Perfometer(row).sort_value())
         except Exception:
             logger.exception("error sorting perfometer values")
             if active_config.debug:
                 raise
-            return 0
+            return (0.0,)
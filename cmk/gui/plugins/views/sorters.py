@@ -21,8 +21,14 @@ from cmk.gui.plugins.views.utils import (
     cmp_string_list,
     compare_ips,
     declare_1to1_sorter,
+    get_custom_var,
     get_perfdata_nth_value,
     get_tag_groups,
+    ip_sort_key,
+    key_insensitive_string,
+    key_num_split,
+    key_simple_number,
+    key_simple_string,
 )
 from cmk.gui.site_config import get_site_config
 from cmk.gui.sorter import declare_simple_sorter, DerivedColumnsSorter, Sorter, sorter_registry
@@ -71,6 +77,9 @@ class SorterSvcstate(Sorter):
             cmp_state_equiv(r1) < cmp_state_equiv(r2)
         )
 
+    def sort_key(self, row: Row) -> int:
+        return cmp_state_equiv(row)
+
 
 @sorter_registry.register
 class SorterHoststate(Sorter):
@@ -91,6 +100,9 @@ class SorterHoststate(Sorter):
             cmp_host_state_equiv(r1) < cmp_host_state_equiv(r2)
         )
 
+    def sort_key(self, row: Row) -> int:
+        return cmp_host_state_equiv(row)
+
 
 @sorter_registry.register
 class SorterSiteHost(Sorter):
@@ -111,6 +123,9 @@ class SorterSiteHost(Sorter):
             "host_name", r1, r2
         )
 
+    def sort_key(self, row: Row) -> Tuple:
+        return row["site"], key_num_split("host_name", row)
+
 
 @sorter_registry.register
 class SorterHostName(Sorter):
@@ -129,6 +144,9 @@ class SorterHostName(Sorter):
     def cmp(self, r1, r2):
         return cmp_num_split("host_name", r1, r2)
 
+    def sort_key(self, row: Row) -> Tuple:
+        return key_num_split("host_name", row)
+
 
 @sorter_registry.register
 class SorterSitealias(Sorter):
@@ -149,6 +167,9 @@ class SorterSitealias(Sorter):
             get_site_config(r1["site"])["alias"] < get_site_config(r2["site"])["alias"]
         )
 
+    def sort_key(self, row: Row) -> str:
+        return get_site_config(row["site"])["alias"]
+
 
 class ABCTagSorter(Sorter, abc.ABC):
     @property
@@ -161,6 +182,9 @@ class ABCTagSorter(Sorter, abc.ABC):
         tag_groups_2 = sorted(get_tag_groups(r2, self.object_type).items())
         return (tag_groups_1 > tag_groups_2) - (tag_groups_1 < tag_groups_2)
 
+    def sort_key(self, row: Row) -> List[Tuple[str, str]]:
+        return sorted(get_tag_groups(row, self.object_type).items())
+
 
 @sorter_registry.register
 class SorterHost(ABCTagSorter):
@@ -211,6 +235,9 @@ class ABCLabelSorter(Sorter, abc.ABC):
         labels_2 = sorted(get_labels(r2, self.object_type).items())
         return (labels_1 > labels_2) - (labels_1 < labels_2)
 
+    def sort_key(self, row: Row) -> List[Tuple[str, str]]:
+        return sorted(get_labels(row, self.object_type).items())
+
 
 @sorter_registry.register
 class SorterHostLabels(ABCTagSorter):
@@ -267,6 +294,9 @@ class SorterServicelevel(Sorter):
     def cmp(self, r1, r2):
         return cmp_custom_variable(r1, r2, "EC_SL", cmp_simple_number)
 
+    def sort_key(self, row: Row) -> str:
+        return get_custom_var(row, "EC_SL")
+
 
 def cmp_service_name(column, r1, r2):
     return (cmp_service_name_equiv(r1[column]) > cmp_service_name_equiv(r2[column])) - (
@@ -274,26 +304,49 @@ def cmp_service_name(column, r1, r2):
     ) or cmp_num_split(column, r1, r2)
 
 
+def key_service_name(column: ColumnName, row: Row) -> Tuple:
+    return cmp_service_name_equiv(row[column]), key_num_split(column, row)
+
+
 #                      name                      title                              column                       sortfunction
-declare_simple_sorter("svcdescr", _("Service description"), "service_description", cmp_service_name)
 declare_simple_sorter(
-    "svcdispname", _("Service alternative display name"), "service_display_name", cmp_simple_string
+    "svcdescr", _("Service description"), "service_description", cmp_service_name, key_service_name
+)
+declare_simple_sorter(
+    "svcdispname",
+    _("Service alternative display name"),
+    "service_display_name",
+    cmp_simple_string,
+    key_simple_string,
 )
 declare_simple_sorter(
-    "svcoutput", _("Service plugin output"), "service_plugin_output", cmp_simple_string
+    "svcoutput",
+    _("Service plugin output"),
+    "service_plugin_output",
+    cmp_simple_string,
+    key_simple_string,
 )
 declare_simple_sorter(
     "svc_long_plugin_output",
     _("Long output of check plugin"),
     "service_long_plugin_output",
     cmp_simple_string,
+    key_simple_string,
+)
+declare_simple_sorter("site", _("Site"), "site", cmp_simple_string, key_simple_string)
+declare_simple_sorter(
+    "stateage",
+    _("Service state age"),
+    "service_last_state_change",
+    cmp_simple_number,
+    key_simple_number,
+)
+declare_simple_sorter(
+    "servicegroup", _("Service group"), "servicegroup_alias", cmp_simple_string, key_simple_string
 )
-declare_simple_sorter("site", _("Site"), "site", cmp_simple_string)
 declare_simple_sorter(
-    "stateage", _("Service state age"), "service_last_state_change", cmp_simple_number
+    "hostgroup", _("Host group"), "hostgroup_alias", cmp_simple_string, key_simple_string
 )
-declare_simple_sorter("servicegroup", _("Service group"), "servicegroup_alias", cmp_simple_string)
-declare_simple_sorter("hostgroup", _("Host group"), "hostgroup_alias", cmp_simple_string)
 
 # Alerts
 declare_1to1_sorter("alert_stats_crit", cmp_simple_number, reverse=True)
@@ -322,7 +375,7 @@ declare_1to1_sorter("svc_is_active", cmp_simple_number)
 declare_1to1_sorter("svc_group_memberlist", cmp_string_list)
 declare_1to1_sorter("svc_acknowledged", cmp_simple_number)
 declare_1to1_sorter("svc_staleness", cmp_simple_number)
-declare_1to1_sorter("svc_servicelevel", cmp_simple_number)
+declare_1to1_sorter("svc_servicelevel", cmp_simple_number, livestatus_order=False)
 
 
 class PerfValSorter(Sorter):
@@ -345,6 +398,9 @@ class PerfValSorter(Sorter):
         v2 = utils.savefloat(get_perfdata_nth_value(r2, self._num - 1, True))
         return (v1 > v2) - (v1 < v2)
 
+    def sort_key(self, row: Row) -> float:
+        return utils.savefloat(get_perfdata_nth_value(row, self._num - 1, True))
+
 
 @sorter_registry.register
 class SorterSvcPerfVal01(PerfValSorter):
@@ -399,7 +455,7 @@ class SorterSvcPerfVal10(PerfValSorter):
 # Host
 declare_1to1_sorter("alias", cmp_num_split)
 declare_1to1_sorter("host_address", cmp_ip_address)
-declare_1to1_sorter("host_address_family", cmp_simple_number)
+declare_1to1_sorter("host_address_family", cmp_simple_number, livestatus_order=False)
 declare_1to1_sorter("host_plugin_output", cmp_simple_string)
 declare_1to1_sorter("host_perf_data", cmp_simple_string)
 declare_1to1_sorter("host_check_command", cmp_simple_string)
@@ -429,7 +485,7 @@ declare_1to1_sorter("host_childs", cmp_string_list)
 declare_1to1_sorter("host_group_memberlist", cmp_string_list)
 declare_1to1_sorter("host_contacts", cmp_string_list)
 declare_1to1_sorter("host_contact_groups", cmp_string_list)
-declare_1to1_sorter("host_servicelevel", cmp_simple_number)
+declare_1to1_sorter("host_servicelevel", cmp_simple_number, livestatus_order=False)
 
 
 @sorter_registry.register
@@ -473,16 +529,20 @@ class SorterCustomHostVariable(DerivedColumnsSorter):
     def cmp(self, r1: Row, r2: Row) -> int:
         if self._variable_name is None:
             return 0
-        variable_name = self._variable_name.upper()  # outwit mypy
+        return cmp_insensitive_string(self._get_value(r1), self._get_value(r2))
 
-        def _get_value(row: Row) -> str:
-            try:
-                index = row["host_custom_variable_names"].index(variable_name)
-            except ValueError:
-                return ""
-            return row["host_custom_variable_values"][index]
+    def sort_key(self, row: Row) -> Tuple[str, str]:
+        if self._variable_name is None:
+            return "", ""
+        return key_insensitive_string(self._get_value(row))
 
-        return cmp_insensitive_string(_get_value(r1), _get_value(r2))
+    def _get_value(self, row: Row) -> str:
+        assert self._variable_name is not None
+        try:
+            index = row["host_custom_variable_names"].index(self._variable_name.upper())
+        except ValueError:
+            return ""
+        return row["host_custom_variable_values"][index]
 
 
 @sorter_registry.register
@@ -500,13 +560,17 @@ class SorterHostIpv4Address(Sorter):
         return ["host_custom_variable_names", "host_custom_variable_values"]
 
     def cmp(self, r1, r2):
-        def get_address(row):
-            custom_vars = dict(
-                zip(row["host_custom_variable_names"], row["host_custom_variable_values"])
-            )
-            return custom_vars.get("ADDRESS_4", "")
+        return compare_ips(self._get_address(r1), self._get_address(r2))
 
-        return compare_ips(get_address(r1), get_address(r2))
+    def sort_key(self, row: Row) -> Tuple:
+        return ip_sort_key(self._get_address(row))
+
+    @staticmethod
+    def _get_address(row: Row) -> str:
+        custom_vars = dict(
+            zip(row["host_custom_variable_names"], row["host_custom_variable_values"])
+        )
+        return custom_vars.get("ADDRESS_4", "")
 
 
 @sorter_registry.register
@@ -524,12 +588,13 @@ class SorterNumProblems(Sorter):
         return ["host_num_services", "host_num_services_ok", "host_num_services_pending"]
 
     def cmp(self, r1, r2):
+        return (self.sort_key(r1) > self.sort_key(r2)) - (self.sort_key(r1) < self.sort_key(r2))
+
+    def sort_key(self, row: Row) -> int:
         return (
-            r1["host_num_services"] - r1["host_num_services_ok"] - r1["host_num_services_pending"]
-            > r2["host_num_services"] - r2["host_num_services_ok"] - r2["host_num_services_pending"]
-        ) - (
-            r1["host_num_services"] - r1["host_num_services_ok"] - r1["host_num_services_pending"]
-            < r2["host_num_services"] - r2["host_num_services_ok"] - r2["host_num_services_pending"]
+            row["host_num_services"]
+            - row["host_num_services_ok"]
+            - row["host_num_services_pending"]
         )
 
 
@@ -564,7 +629,9 @@ declare_1to1_sorter("comment_comment", cmp_simple_string)
 declare_1to1_sorter("comment_time", cmp_simple_number)
 declare_1to1_sorter("comment_expires", cmp_simple_number, reverse=True)
 declare_1to1_sorter("comment_what", cmp_simple_number)
-declare_simple_sorter("comment_type", _("Comment type"), "comment_type", cmp_simple_number)
+declare_simple_sorter(
+    "comment_type", _("Comment type"), "comment_type", cmp_simple_number, key_simple_number
+)
 
 # Downtimes
 declare_1to1_sorter("downtime_id", cmp_simple_number)
@@ -573,16 +640,32 @@ declare_1to1_sorter("downtime_comment", cmp_simple_string)
 declare_1to1_sorter("downtime_fixed", cmp_simple_number)
 declare_1to1_sorter("downtime_type", cmp_simple_number)
 declare_simple_sorter(
-    "downtime_what", _("Downtime for host/service"), "downtime_is_service", cmp_simple_number
+    "downtime_what",
+    _("Downtime for host/service"),
+    "downtime_is_service",
+    cmp_simple_number,
+    key_simple_number,
 )
 declare_simple_sorter(
-    "downtime_start_time", _("Downtime start"), "downtime_start_time", cmp_simple_number
+    "downtime_start_time",
+    _("Downtime start"),
+    "downtime_start_time",
+    cmp_simple_number,
+    key_simple_number,
 )
 declare_simple_sorter(
-    "downtime_end_time", _("Downtime end"), "downtime_end_time", cmp_simple_number
+    "downtime_end_time",
+    _("Downtime end"),
+    "downtime_end_time",
+    cmp_simple_number,
+    key_simple_number,
 )
 declare_simple_sorter(
-    "downtime_entry_time", _("Downtime entry time"), "downtime_entry_time", cmp_simple_number
+    "downtime_entry_time",
+    _("Downtime entry time"),
+    "downtime_entry_time",
+    cmp_simple_number,
+    key_simple_number,
 )
 
 # Log
@@ -600,6 +683,10 @@ def cmp_log_what(col, a, b):
     return (log_what(a[col]) > log_what(b[col])) - (log_what(a[col]) < log_what(b[col]))
 
 
+def key_log_what(col: ColumnName, row: Row) -> int:
+    return log_what(row[col])
+
+
 def log_what(t):
     if "HOST" in t:
         return 1
@@ -608,7 +695,7 @@ def log_what(t):
     return 0
 
 
-declare_1to1_sorter("log_what", cmp_log_what)
+declare_1to1_sorter("log_what", cmp_log_what, key=key_log_what)
 
 
 def get_day_start_timestamp(t):
@@ -626,24 +713,51 @@ def cmp_date(column, r1, r2):
     return (r2_date > r1_date) - (r2_date < r1_date)
 
 
-declare_1to1_sorter("log_date", cmp_date)
+def key_date(column: ColumnName, row: Row) -> int:
+    # The newest day first, like cmp_date
+    return -get_day_start_timestamp(row[column])[0]
+
+
+declare_1to1_sorter("log_date", cmp_date, key=key_date)
 
 # Alert statistics
-declare_simple_sorter("alerts_ok", _("Number of recoveries"), "log_alerts_ok", cmp_simple_number)
-declare_simple_sorter("alerts_warn", _("Number of warnings"), "log_alerts_warn", cmp_simple_number)
 declare_simple_sorter(
-    "alerts_crit", _("Number of critical alerts"), "log_alerts_crit", cmp_simple_number
+    "alerts_ok", _("Number of recoveries"), "log_alerts_ok", cmp_simple_number, key_simple_number
 )
 declare_simple_sorter(
-    "alerts_unknown", _("Number of unknown alerts"), "log_alerts_unknown", cmp_simple_number
+    "alerts_warn", _("Number of warnings"), "log_alerts_warn", cmp_simple_number, key_simple_number
 )
 declare_simple_sorter(
-    "alerts_problem", _("Number of problem alerts"), "log_alerts_problem", cmp_simple_number
+    "alerts_crit",
+    _("Number of critical alerts"),
+    "log_alerts_crit",
+    cmp_simple_number,
+    key_simple_number,
+)
+declare_simple_sorter(
+    "alerts_unknown",
+    _("Number of unknown alerts"),
+    "log_alerts_unknown",
+    cmp_simple_number,
+    key_simple_number,
+)
+declare_simple_sorter(
+    "alerts_problem",
+    _("Number of problem alerts"),
+    "log_alerts_problem",
+    cmp_simple_number,
+    key_simple_number,
 )
 
 # Aggregations
-declare_simple_sorter("aggr_name", _("Aggregation name"), "aggr_name", cmp_simple_string)
-declare_simple_sorter("aggr_group", _("Aggregation group"), "aggr_group", cmp_simple_string)
+declare_simple_sorter(
+    "aggr_name", _("Aggregation name"), "aggr_name", cmp_simple_string, key_simple_string
+)
+declare_simple_sorter(
+    "aggr_group", _("Aggregation group"), "aggr_group", cmp_simple_string, key_simple_string
+)
 
 # Crash reports
-declare_simple_sorter("crash_time", _("Crash time"), "crash_time", cmp_simple_number)
+declare_simple_sorter(
+    "crash_time", _("Crash time"), "crash_time", cmp_simple_number, key_simple_number
+)
@@ -58,10 +58,11 @@ from cmk.gui.log import logger
 from cmk.gui.logged_in import user
 from cmk.gui.main_menu import mega_menu_registry
 from cmk.gui.num_split import cmp_num_split as _cmp_num_split
+from cmk.gui.num_split import key_num_split as _key_num_split
 from cmk.gui.pagetypes import PagetypeTopics
 from cmk.gui.permissions import Permission, permission_registry
 from cmk.gui.plugins.metrics.utils import CombinedGraphMetricSpec
-from cmk.gui.sorter import register_sorter, sorter_registry
+from cmk.gui.sorter import register_sorter, ReversedSortKey, sorter_registry
 from cmk.gui.type_defs import (
     ColumnName,
     CombinedGraphSpec,
@@ -75,6 +76,7 @@ from cmk.gui.type_defs import (
     SorterFunction,
     SorterName,
     SorterSpec,
+    SortKeyFunction,
     ViewSpec,
     VisualLinkSpec,
 )
@@ -691,20 +693,34 @@ def paint_nagiosflag(row: Row, field: ColumnName, bold_if_nonzero: bool) -> Cell
 
 
 def declare_1to1_sorter(
-    painter_name: PainterName, func: SorterFunction, col_num: int = 0, reverse: bool = False
+    painter_name: PainterName,
+    func: SorterFunction,
+    col_num: int = 0,
+    reverse: bool = False,
+    livestatus_order: bool = True,
+    key: Optional[SortKeyFunction] = None,
 ) -> PainterName:
     painter = painter_registry[painter_name]()
-
-    register_sorter(
-        painter_name,
-        {
-            "title": painter.title,
-            "columns": painter.columns,
-            "cmp": (lambda self, r1, r2: func(painter.columns[col_num], r2, r1))
+    column = painter.columns[col_num]
+
+    spec: Dict[str, Any] = {
+        "title": painter.title,
+        "columns": painter.columns,
+        "cmp": (lambda self, r1, r2: func(column, r2, r1))
+        if reverse
+        else lambda self, r1, r2: func(column, r1, r2),
+    }
+    if (sort_key := key or _SORT_KEY_FUNCTIONS.get(func)) is not None:
+        spec["sort_key"] = (
+            (lambda self, row: ReversedSortKey(sort_key(column, row)))
             if reverse
-            else lambda self, r1, r2: func(painter.columns[col_num], r1, r2),
-        },
-    )
+            else lambda self, row: sort_key(column, row)
+        )
+    # Livestatus orders numbers and strings just like the plain comparison does, but it can not
+    # order list columns
+    if func is cmp_simple_number and livestatus_order:
+        spec["order_by"] = (column, reverse)
+    register_sorter(painter_name, spec)
     return painter_name
 
 
@@ -738,6 +754,27 @@ def cmp_string_list(column: ColumnName, r1: Row, r2: Row) -> int:
     return cmp_insensitive_string(v1, v2)
 
 
+def key_simple_number(column: ColumnName, row: Row) -> Any:
+    return row[column]
+
+
+def key_num_split(column: ColumnName, row: Row) -> Tuple[Union[int, str], ...]:
+    return _key_num_split(row[column].lower())
+
+
+def key_simple_string(column: ColumnName, row: Row) -> Tuple[str, str]:
+    return key_insensitive_string(row.get(column, ""))
+
+
+def key_insensitive_string(v: str) -> Tuple[str, str]:
+    # Like cmp_insensitive_string: the spelling decides if the lower case strings are equal
+    return v.lower(), v
+
+
+def key_string_list(column: ColumnName, row: Row) -> Tuple[str, str]:
+    return key_insensitive_string("".join(row.get(column, [])))
+
+
 def cmp_service_name_equiv(r: str) -> int:
     if r == "Check_MK":
         return -6
@@ -762,18 +799,33 @@ def cmp_ip_address(column: ColumnName, r1: Row, r2: Row) -> int:
     return compare_ips(r1.get(column, ""), r2.get(column, ""))
 
 
-def compare_ips(ip1: str, ip2: str) -> int:
-    def split_ip(ip: str) -> Tuple:
-        try:
-            return tuple(int(part) for part in ip.split("."))
-        except ValueError:
-            # Make hostnames comparable with IPv4 address representations
-            return (255, 255, 255, 255, ip)
+def key_ip_address(column: ColumnName, row: Row) -> Tuple:
+    return ip_sort_key(row.get(column, ""))
 
-    v1, v2 = split_ip(ip1), split_ip(ip2)
+
+def compare_ips(ip1: str, ip2: str) -> int:
+    v1, v2 = ip_sort_key(ip1), ip_sort_key(ip2)
     return (v1 > v2) - (v1 < v2)
 
 
+def ip_sort_key(ip: str) -> Tuple:
+    try:
+        return tuple(int(part) for part in ip.split("."))
+    except ValueError:
+        # Make hostnames comparable with IPv4 address representations
+        return (255, 255, 255, 255, ip)
+
+
+# The sort keys of the comparison functions, which declare_1to1_sorter() uses automatically
+_SORT_KEY_FUNCTIONS: Dict[SorterFunction, SortKeyFunction] = {
+    cmp_simple_number: key_simple_number,
+    cmp_num_split: key_num_split,
+    cmp_simple_string: key_simple_string,
+    cmp_string_list: key_string_list,
+    cmp_ip_address: key_ip_address,
+}
+
+
 def get_custom_var(row: Row, key: str) -> str:
     return row["custom_variables"].get(key, "")
 
@@ -180,6 +180,9 @@ class SorterWatoFolderAbs(Sorter):
     def cmp(self, r1, r2):
         return cmp_wato_folder(r1, r2, "abs")
 
+    def sort_key(self, row: Row) -> str:
+        return _get_wato_folder_text(row, "abs")
+
 
 @sorter_registry.register
 class SorterWatoFolderRel(Sorter):
@@ -198,6 +201,9 @@ class SorterWatoFolderRel(Sorter):
     def cmp(self, r1, r2):
         return cmp_wato_folder(r1, r2, "rel")
 
+    def sort_key(self, row: Row) -> str:
+        return _get_wato_folder_text(row, "rel")
+
 
 @sorter_registry.register
 class SorterWatoFolderPlain(Sorter):
@@ -215,3 +221,6 @@ class SorterWatoFolderPlain(Sorter):
 
     def cmp(self, r1, r2):
         return cmp_wato_folder(r1, r2, "plain")
+
+    def sort_key(self, row: Row) -> str:
+        return _get_wato_folder_text(row, "plain")
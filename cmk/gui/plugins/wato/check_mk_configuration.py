@@ -4859,6 +4859,33 @@ rulespec_registry.register(
 )
 
 
+def _valuespec_snmp_max_concurrent_walks():
+    return Integer(
+        title=_("Maximum number of concurrent SNMP walks"),
+        label=_("Number of concurrent walks per host: "),
+        minvalue=1,
+        maxvalue=32,
+        default_value=1,
+        help=_(
+            "By default Checkmk fetches the SNMP sections of a host one after another. "
+            "Devices with many SNMP sections (e.g. large switch stacks) may take longer to "
+            "fetch than the check interval, since every walk has to wait for the responses "
+            "of the previous one. With this rule you can allow Checkmk to run several walks "
+            "of a host concurrently. Identical OIDs needed by several sections are only "
+            "walked once. Be aware: Not all devices cope well with concurrent requests."
+        ),
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupAgentSNMP,
+        name="snmp_max_concurrent_walks",
+        valuespec=_valuespec_snmp_max_concurrent_walks,
+    )
+)
+
+
 def _help_snmp_without_sys_descr():
     return _(
         "Devices which do not publish the system description OID .1.3.6.1.2.1.1.1.0 are "
@@ -6,11 +6,23 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Type, TYPE_CHECKING
+import functools
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+)
 
 from cmk.utils.plugin_registry import Registry
 
-from cmk.gui.type_defs import ColumnName, SorterFunction
+from cmk.gui.type_defs import ColumnName, Row, SorterFunction, SortKeyFunction
 from cmk.gui.valuespec import ValueSpec
 
 if TYPE_CHECKING:
@@ -64,6 +76,21 @@ class Sorter(abc.ABC):
         one service, etc."""
         raise NotImplementedError()
 
+    def sort_key(self, row: Row) -> Any:
+        """Compute a key of the row, which orders the rows just like cmp() does
+
+        The key is computed once per row, so sorting does not call Python code for each
+        comparison. Sorters should override this, the default falls back to cmp()."""
+        return functools.cmp_to_key(self.cmp)(row)
+
+    @property
+    def order_by(self) -> Optional[Tuple[ColumnName, bool]]:
+        """The Livestatus column and direction (descending or not) sorting like cmp() does
+
+        Sorters which can be expressed like this are pushed down to the sites with OrderBy:
+        headers, if all sorters of a view support it."""
+        return None
+
     @property
     def _args(self) -> Optional[List]:
         """Optional list of arguments for the cmp function"""
@@ -125,6 +152,21 @@ class DerivedColumnsSorter(Sorter):
         return None
 
 
+class ReversedSortKey:
+    """Wraps a sort key to order the rows the other way round"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ReversedSortKey) and self.key == other.key
+
+    def __lt__(self, other: ReversedSortKey) -> bool:
+        return other.key < self.key
+
+
 class SorterRegistry(Registry[Type[Sorter]]):
     def plugin_name(self, instance: Type[Sorter]) -> str:
         return instance().ident
@@ -136,24 +178,35 @@ sorter_registry = SorterRegistry()
 # Kept for pre 1.6 compatibility. But also the inventory.py uses this to
 # register some painters dynamically
 def register_sorter(ident: str, spec: Dict[str, Any]) -> None:
-    cls = type(
-        "LegacySorter%s" % str(ident).title(),
-        (Sorter,),
-        {
-            "_ident": ident,
-            "_spec": spec,
-            "ident": property(lambda s: s._ident),
-            "title": property(lambda s: s._spec["title"]),
-            "columns": property(lambda s: s._spec["columns"]),
-            "load_inv": property(lambda s: s._spec.get("load_inv", False)),
-            "cmp": spec["cmp"],
-        },
-    )
+    attributes = {
+        "_ident": ident,
+        "_spec": spec,
+        "ident": property(lambda s: s._ident),
+        "title": property(lambda s: s._spec["title"]),
+        "columns": property(lambda s: s._spec["columns"]),
+        "load_inv": property(lambda s: s._spec.get("load_inv", False)),
+        "order_by": property(lambda s: s._spec.get("order_by")),
+        "cmp": spec["cmp"],
+    }
+    if "sort_key" in spec:
+        attributes["sort_key"] = spec["sort_key"]
+    cls = type("LegacySorter%s" % str(ident).title(), (Sorter,), attributes)
     sorter_registry.register(cls)
 
 
-def declare_simple_sorter(name: str, title: str, column: ColumnName, func: SorterFunction) -> None:
-    register_sorter(
-        name,
-        {"title": title, "columns": [column], "cmp": lambda self, r1, r2: func(column, r1, r2)},
-    )
+def declare_simple_sorter(
+    name: str,
+    title: str,
+    column: ColumnName,
+    func: SorterFunction,
+    key: Optional[SortKeyFunction] = None,
+) -> None:
+    """Declare a sorter comparing one column with func, key has to order the rows like func"""
+    spec: Dict[str, Any] = {
+        "title": title,
+        "columns": [column],
+        "cmp": lambda self, r1, r2: func(column, r1, r2),
+    }
+    if key is not None:
+        spec["sort_key"] = lambda self, row: key(column, row)
+    register_sorter(name, spec)
@@ -103,6 +103,7 @@ from cmk.gui.plugins.visuals.utils import (
 from cmk.gui.sorter import (
     DerivedColumnsSorter,
     register_sorter,
+    ReversedSortKey,
     Sorter,
     sorter_registry,
     SorterEntry,
@@ -596,6 +597,9 @@ def _register_host_tag_sorters():
                 "title": _("Host tag:") + " " + tag_group.title,
                 "columns": ["host_tags"],
                 "cmp": lambda self, r1, r2: _cmp_host_tag(r1, r2, self._spec["_tag_group_id"]),
+                "sort_key": lambda self, row: _get_tag_group_value(
+                    row, "host", self._spec["_tag_group_id"]
+                ),
             },
         )
 
@@ -1875,32 +1879,33 @@ def _sort_data(view: View, data: "Rows", sorters: List[SorterEntry]) -> None:
     if not sorters:
         return
 
-    # Handle case where join columns are not present for all rows
-    def safe_compare(compfunc: Callable[[Row, Row], int], row1: Row, row2: Row) -> int:
-        if row1 is None and row2 is None:
-            return 0
-        if row1 is None:
-            return -1
-        if row2 is None:
-            return 1
-        return compfunc(row1, row2)
-
-    def multisort(e1: Row, e2: Row) -> int:
-        for entry in sorters:
-            neg = -1 if entry.negate else 1
-
-            if entry.join_key:  # Sorter for join column, use JOIN info
-                c = neg * safe_compare(
-                    entry.sorter.cmp, e1["JOIN"].get(entry.join_key), e2["JOIN"].get(entry.join_key)
-                )
-            else:
-                c = neg * entry.sorter.cmp(e1, e2)
+    # The sort keys of all sorters are combined to a tuple, so that the rows are sorted with
+    # a single list.sort() call. Sorters in the opposite direction of the whole sort are wrapped.
+    reverse = all(entry.negate for entry in sorters)
+    keys = [_sort_key_of(entry, reverse) for entry in sorters]
+
+    if len(keys) == 1:
+        data.sort(key=keys[0], reverse=reverse)
+    else:
+        data.sort(key=lambda row: tuple([key(row) for key in keys]), reverse=reverse)
+
+
+def _sort_key_of(entry: SorterEntry, reverse: bool) -> Callable[[Row], Any]:
+    sorter = entry.sorter
+    join_key = entry.join_key
+
+    def sort_key(row: Row) -> Any:
+        return sorter.sort_key(row)
 
-            if c != 0:
-                return c
-        return 0  # equal
+    def join_sort_key(row: Row) -> Any:
+        # Handle case where join columns are not present for all rows
+        joined_row = row["JOIN"].get(join_key)
+        return (0,) if joined_row is None else (1, sorter.sort_key(joined_row))
 
-    data.sort(key=functools.cmp_to_key(multisort))
+    key = join_sort_key if join_key else sort_key
+    if bool(entry.negate) == reverse:
+        return key
+    return lambda row: ReversedSortKey(key(row))
 
 
 def sorters_of_datasource(ds_name: str) -> Mapping[str, Sorter]:
@@ -2532,8 +2532,12 @@ def ajax_inv_render_tree() -> None:
     tree_id = request.get_ascii_input("tree_id", "")
     show_internal_tree_paths = bool(request.var("show_internal_tree_paths"))
 
+    inventory_path = inventory.InventoryPath.parse(raw_path or "")
+
     if tree_id:
-        tree, corrupted_history_files = inventory.load_delta_tree(hostname, int(tree_id[1:]))
+        tree, corrupted_history_files = inventory.load_delta_tree(
+            hostname, int(tree_id[1:]), inventory_path.path
+        )
         if corrupted_history_files:
             user_errors.add(
                 MKUserError(
@@ -2574,7 +2578,6 @@ def ajax_inv_render_tree() -> None:
         html.show_error(_("No such inventory tree."))
         return
 
-    inventory_path = inventory.InventoryPath.parse(raw_path or "")
     if (node := tree.get_node(inventory_path.path)) is None:
         html.show_error(
             _("Invalid path in inventory tree: '%s' >> %s") % (raw_path, repr(inventory_path.path))
@@ -4147,6 +4147,33 @@ class ConfigVariableEventConsoleEventLimit(ConfigVariable):
         )
 
 
+@config_variable_registry.register
+class ConfigVariableEventConsoleArchiveMode(ConfigVariable):
+    def group(self) -> Type[ConfigVariableGroup]:
+        return ConfigVariableGroupEventConsoleGeneric
+
+    def domain(self) -> Type[ABCConfigDomain]:
+        return ConfigDomainEventConsole
+
+    def ident(self) -> str:
+        return "archive_mode"
+
+    def valuespec(self) -> ValueSpec:
+        return DropdownChoice(
+            title=_("Event history storage"),
+            help=_(
+                "Specify where the event history is stored. The logfiles have to be read "
+                "completely for each query of the history. The SQLite database is indexed by "
+                "time, host, rule and event ID, which makes the typical queries of the GUI much "
+                "faster. Switching the storage does not migrate the existing history."
+            ),
+            choices=[
+                ("file", _("Logfiles")),
+                ("sqlite", _("SQLite database")),
+            ],
+        )
+
+
 @config_variable_registry.register
 class ConfigVariableEventConsoleHistoryRotation(ConfigVariable):
     def group(self) -> Type[ConfigVariableGroup]:
@@ -30,6 +30,7 @@ import traceback
 from dataclasses import asdict, dataclass
 from itertools import filterfalse
 from pathlib import Path
+from stat import S_ISLNK
 from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
 
 import psutil  # type: ignore[import]
@@ -1422,6 +1423,8 @@ class ActivateChangesSchedulerBackgroundJob(WatoBackgroundJob):
 
             file_filter_func = managed_snapshots.customer_user_files_filter()
 
+        file_hash_cache = _update_config_sync_file_hashes(self._site_snapshot_settings)
+
         for site_id, snapshot_settings in sorted(
             self._site_snapshot_settings.items(), key=lambda e: e[0]
         ):
@@ -1431,6 +1434,7 @@ class ActivateChangesSchedulerBackgroundJob(WatoBackgroundJob):
                 self._activation_id,
                 self._prevent_activate,
                 file_filter_func,
+                file_hash_cache,
             )
             site_job.load()
             if site_job.lock_activation():
@@ -1448,6 +1452,7 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
         activation_id: str,
         prevent_activate: bool = False,
         file_filter_func: Optional[Callable[[str], bool]] = None,
+        file_hash_cache: Optional["ConfigSyncFileHashCache"] = None,
     ) -> None:
         super().__init__()
         self._site_id = site_id
@@ -1455,6 +1460,7 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
         self._activation_id = activation_id
         self._snapshot_settings = snapshot_settings
         self._file_filter_func = file_filter_func
+        self._file_hash_cache = file_hash_cache
         self.daemon = True
         self._prevent_activate = prevent_activate
 
@@ -1704,14 +1710,19 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
         self._set_sync_state(_("Fetching sync state"))
         self._logger.debug("Starting config sync")
         replication_paths = self._snapshot_settings.snapshot_components
-        remote_file_infos, remote_config_generation = self._get_config_sync_state(replication_paths)
+        (
+            remote_file_infos,
+            remote_config_generation,
+            compressed_archive,
+        ) = self._get_config_sync_state(replication_paths)
         self._logger.debug("Received %d file infos from remote", len(remote_file_infos))
 
-        # In case we experience performance issues here, we could postpone the hashing of the
-        # central files to only be done ad-hoc in get_file_names_to_sync when the other attributes
-        # are not enough to detect a differing file.
+        # The hashes of most files were already computed by the scheduler, see
+        # _update_config_sync_file_hashes()
         site_config_dir = Path(self._snapshot_settings.work_dir)
-        central_file_infos = _get_config_sync_file_infos(replication_paths, site_config_dir)
+        central_file_infos = _get_config_sync_file_infos(
+            replication_paths, site_config_dir, self._file_hash_cache
+        )
         self._logger.debug("Got %d file infos from %s", len(remote_file_infos), site_config_dir)
 
         self._set_sync_state(_("Computing differences"))
@@ -1732,7 +1743,11 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
             % (len(to_sync_new), len(to_sync_changed), len(to_delete))
         )
         self._synchronize_files(
-            to_sync_new + to_sync_changed, to_delete, remote_config_generation, site_config_dir
+            to_sync_new + to_sync_changed,
+            to_delete,
+            remote_config_generation,
+            site_config_dir,
+            compressed_archive,
         )
         self._logger.debug("Finished config sync")
 
@@ -1741,11 +1756,12 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
 
     def _get_config_sync_state(
         self, replication_paths: List[ReplicationPath]
-    ) -> "Tuple[Dict[str, ConfigSyncFileInfo], int]":
+    ) -> "Tuple[Dict[str, ConfigSyncFileInfo], int, bool]":
         """Get the config file states from the remote sites
 
         Calls the automation call "get-config-sync-state" on the remote site,
-        which is handled by AutomationGetConfigSyncState."""
+        which is handled by AutomationGetConfigSyncState. Remote sites of older versions do not
+        tell whether they can receive a compressed archive."""
         site = get_site_config(self._site_id)
         response = cmk.gui.watolib.automations.do_remote_automation(
             site,
@@ -1753,7 +1769,11 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
             [("replication_paths", repr([tuple(r) for r in replication_paths]))],
         )
 
-        return {k: ConfigSyncFileInfo(*v) for k, v in response[0].items()}, response[1]
+        return (
+            {k: ConfigSyncFileInfo(*v) for k, v in response[0].items()},
+            response[1],
+            len(response) > 2 and response[2],
+        )
 
     def _synchronize_files(
         self,
@@ -1761,6 +1781,7 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
         files_to_delete: List[str],
         remote_config_generation: int,
         site_config_dir: Path,
+        compressed_archive: bool = False,
     ) -> None:
         """Pack the files in a simple tar archive and send it to the remote site
 
@@ -1768,7 +1789,7 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
         be deleted and the current config generation is handed over using dedicated HTTP parameters.
         """
 
-        sync_archive = _get_sync_archive(files_to_sync, site_config_dir)
+        sync_archive = _get_sync_archive(files_to_sync, site_config_dir, compressed_archive)
 
         site = get_site_config(self._site_id)
         response = cmk.gui.watolib.automations.do_remote_automation(
@@ -1776,7 +1797,6 @@ class ActivateChangesSite(multiprocessing.Process, ActivateChanges):
             "receive-config-sync",
             [
                 ("site_id", self._site_id),
-                ("sync_archive", sync_archive),
                 ("to_delete", repr(files_to_delete)),
                 ("config_generation", "%d" % remote_config_generation),
             ],
@@ -2280,12 +2300,13 @@ def get_file_names_to_sync(
     return to_sync_new, to_sync_changed, to_delete
 
 
-def _get_sync_archive(to_sync: List[str], base_dir: Path) -> bytes:
+def _get_sync_archive(to_sync: List[str], base_dir: Path, compressed: bool = False) -> bytes:
     # Use native tar instead of python tarfile for performance reasons
     completed_process = subprocess.run(
         [
             "tar",
             "-c",
+            *(["-z"] if compressed else []),
             "-C",
             str(base_dir),
             "-f",
@@ -2320,6 +2341,8 @@ def _unpack_sync_archive(sync_archive: bytes, base_dir: Path) -> None:
         [
             "tar",
             "-x",
+            # Central sites of older versions send uncompressed archives
+            *(["-z"] if sync_archive.startswith(_GZIP_MAGIC) else []),
             "-C",
             str(base_dir),
             "-f",
@@ -2343,6 +2366,9 @@ def _unpack_sync_archive(sync_archive: bytes, base_dir: Path) -> None:
         )
 
 
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
 class ConfigSyncFileInfo(NamedTuple):
     st_mode: int
     st_size: int
@@ -2356,7 +2382,10 @@ class ConfigSyncFileInfo(NamedTuple):
 #    ("file_infos", Dict[str, ConfigSyncFileInfo]),
 #    ("config_generation", int),
 # ])
-GetConfigSyncStateResponse = Tuple[Dict[str, Tuple[int, int, Optional[str], Optional[str]]], int]
+# The third element tells the central site that compressed sync archives are supported
+GetConfigSyncStateResponse = Tuple[
+    Dict[str, Tuple[int, int, Optional[str], Optional[str]]], int, bool
+]
 
 
 @automation_command_registry.register
@@ -2380,15 +2409,22 @@ class AutomationGetConfigSyncState(AutomationCommand):
 
     def execute(self, api_request: List[ReplicationPath]) -> GetConfigSyncStateResponse:
         with store.lock_checkmk_configuration():
-            file_infos = _get_config_sync_file_infos(api_request, base_dir=cmk.utils.paths.omd_root)
+            file_hash_cache = ConfigSyncFileHashCache()
+            file_hash_cache.load()
+            file_infos = _get_config_sync_file_infos(
+                api_request, base_dir=cmk.utils.paths.omd_root, file_hash_cache=file_hash_cache
+            )
+            file_hash_cache.save()
             transport_file_infos = {
                 k: (v.st_mode, v.st_size, v.link_target, v.file_hash) for k, v in file_infos.items()
             }
-            return (transport_file_infos, _get_current_config_generation())
+            return (transport_file_infos, _get_current_config_generation(), True)
 
 
 def _get_config_sync_file_infos(
-    replication_paths: List[ReplicationPath], base_dir: Path
+    replication_paths: List[ReplicationPath],
+    base_dir: Path,
+    file_hash_cache: Optional["ConfigSyncFileHashCache"] = None,
 ) -> Dict[str, ConfigSyncFileInfo]:
     """Scans the given replication paths for the information needed for the config sync
 
@@ -2405,7 +2441,7 @@ def _get_config_sync_file_infos(
             continue  # Only report back existing things
 
         if replication_path.ty == "file":
-            infos[replication_path.site_path] = _get_config_sync_file_info(path)
+            infos[replication_path.site_path] = _get_config_sync_file_info(path, file_hash_cache)
 
         elif replication_path.ty == "dir":
             for entry in path.glob("**/*"):
@@ -2420,21 +2456,28 @@ def _get_config_sync_file_infos(
                     continue
 
                 entry_site_path = entry.relative_to(base_dir)
-                infos[str(entry_site_path)] = _get_config_sync_file_info(entry)
+                infos[str(entry_site_path)] = _get_config_sync_file_info(entry, file_hash_cache)
 
         else:
             raise NotImplementedError()
     return infos
 
 
-def _get_config_sync_file_info(file_path: Path) -> ConfigSyncFileInfo:
+def _get_config_sync_file_info(
+    file_path: Path, file_hash_cache: Optional["ConfigSyncFileHashCache"] = None
+) -> ConfigSyncFileInfo:
     stat = file_path.lstat()
-    is_symlink = file_path.is_symlink()
+    if is_symlink := S_ISLNK(stat.st_mode):
+        file_hash = None
+    elif file_hash_cache is None:
+        file_hash = _create_config_sync_file_hash(file_path)
+    else:
+        file_hash = file_hash_cache.file_hash(file_path, stat)
     return ConfigSyncFileInfo(
         stat.st_mode,
         stat.st_size,
         os.readlink(str(file_path)) if is_symlink else None,
-        _create_config_sync_file_hash(file_path) if not is_symlink else None,
+        file_hash,
     )
 
 
@@ -2449,6 +2492,70 @@ def _create_config_sync_file_hash(file_path: Path) -> str:
     return sha256.hexdigest()
 
 
+# Device, inode, size and modification time (ns) of a file
+FileIdentity = Tuple[int, int, int, int]
+
+
+class ConfigSyncFileHashCache:
+    """The hashes of the synchronized files, kept from one activation to the next
+
+    Files are identified by their inode and modification time instead of their path. The site
+    config directories of all remote sites are hard linked copies of the same files, so the hash of
+    a file is computed only once for all of them, as long as the file is not changed.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._store = store.ObjectStore(
+            path or Path(cmk.utils.paths.tmp_dir, "config_sync_file_hashes.pkl"),
+            serializer=store.PickleSerializer[Dict[FileIdentity, str]](),
+        )
+        self._hashes: Dict[FileIdentity, str] = {}
+        self._used: Dict[FileIdentity, str] = {}
+
+    def load(self) -> None:
+        self._hashes = self._store.read_obj(default={})
+
+    def save(self) -> None:
+        """Save the hashes of the files seen since loading, the hashes of vanished files are dropped"""
+        store.makedirs(self._store.path.parent)
+        self._store.write_obj(self._used)
+
+    def file_hash(self, file_path: Path, stat: os.stat_result) -> str:
+        # Not the change time: Hard linking the site config directories changes it on every
+        # activation. Files saved via cmk.utils.store are replaced and get a new inode anyway.
+        identity = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if (file_hash := self._hashes.get(identity)) is None:
+            file_hash = self._hashes[identity] = _create_config_sync_file_hash(file_path)
+        self._used[identity] = file_hash
+        return file_hash
+
+
+def _update_config_sync_file_hashes(
+    site_snapshot_settings: Dict[SiteId, SnapshotSettings]
+) -> ConfigSyncFileHashCache:
+    """Compute the hashes of the files in the site config directories before the sync starts
+
+    The processes synchronizing the single sites inherit the cache. Since the site config
+    directories are mostly hard links of each other, only one of them needs to be scanned for
+    each distinct set of replication paths."""
+    file_hash_cache = ConfigSyncFileHashCache()
+    file_hash_cache.load()
+
+    scanned: Set[str] = set()
+    for snapshot_settings in site_snapshot_settings.values():
+        work_dir = Path(snapshot_settings.work_dir)
+        components = repr(snapshot_settings.snapshot_components)
+        if components in scanned or not work_dir.exists():
+            continue
+        scanned.add(components)
+        _get_config_sync_file_infos(
+            snapshot_settings.snapshot_components, work_dir, file_hash_cache
+        )
+
+    file_hash_cache.save()
+    return file_hash_cache
+
+
 def update_config_generation() -> None:
     """Increase the config generation ID
 
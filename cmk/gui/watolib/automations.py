@@ -24,6 +24,8 @@ import cmk.utils.version as cmk_version
 from cmk.utils.log import VERBOSE
 from cmk.utils.type_defs import PhaseOneResult, UserId
 
+import cmk.automations.helper as automation_helper
+from cmk.automations.helper import AutomationHelperRequest
 from cmk.automations.results import result_type_registry, SerializedResult
 
 import cmk.gui.gui_background_job as gui_background_job
@@ -75,14 +77,14 @@ def check_mk_local_automation_serialized(
     if timeout:
         new_args = ["--timeout", "%d" % timeout] + new_args
 
-    cmd = ["check_mk"]
-
     if auto_logger.isEnabledFor(logging.DEBUG):
-        cmd.append("-vv")
+        verbosity = 2
     elif auto_logger.isEnabledFor(VERBOSE):
-        cmd.append("-v")
+        verbosity = 1
+    else:
+        verbosity = 0
 
-    cmd += ["--automation", command] + new_args
+    cmd = ["check_mk"] + ["-v"] * verbosity + ["--automation", command] + new_args
 
     if command in ["restart", "reload"]:
         call_hook_pre_activate_changes()
@@ -95,15 +97,22 @@ def check_mk_local_automation_serialized(
     auto_logger.info("STDIN: %r" % stdin_data)
 
     try:
-        completed_process = subprocess.run(
+        completed_process = _execute_with_automation_helper(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            close_fds=True,
-            encoding="utf-8",
-            input=stdin_data,
-            check=False,
+            AutomationHelperRequest(
+                command=command, args=new_args, stdin=stdin_data, verbosity=verbosity
+            ),
         )
+        if completed_process is None:
+            completed_process = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                close_fds=True,
+                encoding="utf-8",
+                input=stdin_data,
+                check=False,
+            )
     except Exception as e:
         raise local_automation_failure(command=command, cmdline=cmd, exc=e)
 
@@ -141,6 +150,22 @@ def check_mk_local_automation_serialized(
     return cmd, SerializedResult(completed_process.stdout)
 
 
+def _execute_with_automation_helper(
+    cmd: Sequence[str], helper_request: AutomationHelperRequest
+) -> Optional[subprocess.CompletedProcess]:
+    """Let the automation helper of the site execute the call, if it is running
+
+    The helper has the check plugins and the configuration already loaded, which saves
+    the start up time of a new check_mk process."""
+    response = automation_helper.execute(helper_request)
+    if response is None:
+        auto_logger.debug("The automation helper did not execute the call")
+        return None
+    return subprocess.CompletedProcess(
+        cmd, response.exit_code, stdout=response.stdout, stderr=response.stderr
+    )
+
+
 def local_automation_failure(  # type:ignore[no-untyped-def]
     command,
     cmdline,
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Binary on-disk format of the SNMP caches
+
+A cache file starts with a header and an index of its entries, followed by the
+encoded entries:
+
+    header  magic (8 bytes), format version (uint16), number of entries (uint32)
+    index   per entry: offset (uint64), size (uint32), key size (uint16), key (UTF-8)
+    data    the encoded entries at the offsets given in the index
+
+All integers are little endian.  The index allows to decode single entries of a
+memory mapped file without parsing the rest of it, and to copy entries from one
+cache file to another without decoding them at all.
+"""
+
+import contextlib
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Iterator, List, Mapping, Tuple
+
+from .type_defs import SNMPRowInfo
+
+MAGIC = b"CMKSNMPC"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHI")
+_INDEX_ENTRY = struct.Struct("<QIH")
+_ROWINFO_HEADER = struct.Struct("<II")
+_SIZE = struct.Struct("<I")
+_INT = struct.Struct("<q")
+
+# Tags of the values in `encode_value`
+_NONE = b"n"
+_INTEGER = b"i"
+_STRING = b"s"
+_BYTES = b"y"
+_BINARY = b"b"  # a list of integers in range(256), i.e. a decoded binary SNMP value
+_LIST = b"l"
+_TUPLE = b"t"
+
+CacheIndex = Mapping[str, Tuple[int, int]]
+
+
+def dump(entries: Mapping[str, bytes]) -> bytes:
+    """Serialize the encoded entries to a complete cache file"""
+    encoded_keys = [key.encode("utf-8") for key in entries]
+    offset = _HEADER.size + sum(_INDEX_ENTRY.size + len(key) for key in encoded_keys)
+    index = []
+    for key, data in zip(encoded_keys, entries.values()):
+        index.append(_INDEX_ENTRY.pack(offset, len(data), len(key)) + key)
+        offset += len(data)
+    return b"".join([_HEADER.pack(MAGIC, VERSION, len(index)), *index, *entries.values()])
+
+
+def is_cache_file(buffer: bytes) -> bool:
+    return buffer[: len(MAGIC)] == MAGIC
+
+
+def load_index(buffer: Any) -> CacheIndex:
+    """Read the index of a cache file
+
+    The buffer may be anything supporting the buffer protocol and slicing, in
+    particular bytes and mmap objects. Use the result to slice the entries
+    from the buffer: `buffer[offset:offset + size]`.
+    """
+    if not buffer:  # freshly created by the file locking
+        return {}
+    try:
+        magic, version, count = _HEADER.unpack_from(buffer)
+    except struct.error as e:
+        raise ValueError("Truncated SNMP cache file") from e
+    if magic != MAGIC:
+        raise ValueError("Not an SNMP cache file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported SNMP cache file version: {version}")
+
+    index = {}
+    pos = _HEADER.size
+    try:
+        for _ in range(count):
+            offset, size, key_size = _INDEX_ENTRY.unpack_from(buffer, pos)
+            pos += _INDEX_ENTRY.size
+            index[bytes(buffer[pos : pos + key_size]).decode("utf-8")] = (offset, size)
+            pos += key_size
+    except struct.error as e:
+        raise ValueError("Truncated SNMP cache file") from e
+    if any(offset + size > len(buffer) for offset, size in index.values()):
+        raise ValueError("Truncated SNMP cache file")
+    return index
+
+
+@contextlib.contextmanager
+def mapped_file(path: Path) -> Iterator[Any]:
+    """Map the cache file to memory, readonly
+
+    Yields an empty bytes object for empty files, which can not be mapped.
+    """
+    with path.open("rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            yield b""
+            return
+        with buffer:
+            yield buffer
+
+
+def encode_rowinfo(rowinfo: SNMPRowInfo) -> bytes:
+    """Encode the result of a walk
+
+    The OIDs are stored as one newline separated string, followed by
+    the sizes of the values and the values themselves.
+    """
+    oids = "\n".join(oid for oid, _value in rowinfo).encode("utf-8")
+    return b"".join(
+        [
+            _ROWINFO_HEADER.pack(len(rowinfo), len(oids)),
+            oids,
+            struct.pack(f"<{len(rowinfo)}I", *(len(value) for _oid, value in rowinfo)),
+            *(value for _oid, value in rowinfo),
+        ]
+    )
+
+
+def decode_rowinfo(data: bytes) -> SNMPRowInfo:
+    count, oids_size = _ROWINFO_HEADER.unpack_from(data)
+    if not count:
+        return []
+    pos = _ROWINFO_HEADER.size
+    oids = data[pos : pos + oids_size].decode("utf-8").split("\n")
+    pos += oids_size
+    sizes = struct.unpack_from(f"<{count}I", data, pos)
+    pos += 4 * count
+    rowinfo = []
+    for oid, size in zip(oids, sizes):
+        rowinfo.append((oid, data[pos : pos + size]))
+        pos += size
+    return rowinfo
+
+
+def encode_value(value: Any) -> bytes:
+    """Encode nested lists and tuples of strings, bytes and integers
+
+    >>> decode_value(encode_value([["eth0", [0, 12, 255]], ("", None, -1), []]))
+    [['eth0', [0, 12, 255]], ('', None, -1), []]
+    """
+    chunks: List[bytes] = []
+    _encode(value, chunks)
+    return b"".join(chunks)
+
+
+def _encode(value: Any, chunks: List[bytes]) -> None:
+    # Note: `type(...) is` on purpose. We must not silently turn bools into ints.
+    if type(value) is str:
+        encoded = value.encode("utf-8")
+        chunks += (_STRING, _SIZE.pack(len(encoded)), encoded)
+    elif type(value) is list or type(value) is tuple:
+        if value and type(value) is list and all(type(v) is int and 0 <= v < 256 for v in value):
+            chunks += (_BINARY, _SIZE.pack(len(value)), bytes(value))
+            return
+        chunks += (_LIST if type(value) is list else _TUPLE, _SIZE.pack(len(value)))
+        for item in value:
+            _encode(item, chunks)
+    elif type(value) is bytes:
+        chunks += (_BYTES, _SIZE.pack(len(value)), value)
+    elif type(value) is int:
+        chunks += (_INTEGER, _INT.pack(value))
+    elif value is None:
+        chunks.append(_NONE)
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}: {value!r}")
+
+
+def decode_value(data: bytes) -> Any:
+    value, pos = _decode(data, 0)
+    if pos != len(data):
+        raise ValueError("Trailing data in SNMP cache entry")
+    return value
+
+
+def _decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos : pos + 1]
+    pos += 1
+    if tag == _NONE:
+        return None, pos
+    if tag == _INTEGER:
+        return _INT.unpack_from(data, pos)[0], pos + _INT.size
+
+    (size,) = _SIZE.unpack_from(data, pos)
+    pos += _SIZE.size
+    if tag == _STRING:
+        return data[pos : pos + size].decode("utf-8"), pos + size
+    if tag == _BINARY:
+        return list(data[pos : pos + size]), pos + size
+    if tag == _BYTES:
+        return data[pos : pos + size], pos + size
+    if tag == _LIST or tag == _TUPLE:
+        items = []
+        for _ in range(size):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return (items if tag == _LIST else tuple(items)), pos
+    raise ValueError(f"Invalid tag in SNMP cache entry: {tag!r}")
@@ -4,12 +4,15 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 """Provide methods to get an snmp table with or without caching
 """
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import (
     Callable,
+    Container,
     Iterable,
     Iterator,
     List,
+    Mapping,
     MutableMapping,
     Optional,
     Sequence,
@@ -19,10 +22,11 @@ from typing import (
 
 import cmk.utils.debug
 import cmk.utils.store as store
-from cmk.utils.exceptions import MKGeneralException
+from cmk.utils.exceptions import MKGeneralException, MKTerminate, MKTimeout
 from cmk.utils.log import console
 from cmk.utils.type_defs import HostName, SectionName
 
+from . import cache_format
 from .type_defs import (
     BackendSNMPTree,
     OID,
@@ -52,32 +56,60 @@ class WalkCache(
     The fetched data is always saved to a file *if* the respective OID is marked as being cached
     by the plugin using `OIDCached` (that is: if the save_to_cache attribute of the OID object
     is true).
+
+    All walks of a host are stored in one binary cache file (see `cache_format`). Its index
+    allows us to decode only the walks needed by the sections at hand.
     """
 
-    __slots__ = ("_store", "_path")
+    __slots__ = ("_store", "_dir")
 
     def __init__(self, host_name: HostName) -> None:
         self._store: MutableMapping[str, Tuple[bool, SNMPRowInfo]] = {}
-        self._path = Path(cmk.utils.paths.var_dir, "snmp_cache", host_name)
-
-    def _read_row(self, path: Path) -> SNMPRowInfo:
-        return store.load_object_from_file(path, default=None)
-
-    def _write_row(self, path: Path, rowinfo: SNMPRowInfo) -> None:
-        return store.save_object_to_file(path, rowinfo, pretty=False)
-
-    @staticmethod
-    def _oid2name(fetchoid: str) -> str:
-        return f"OID{fetchoid}"
+        self._dir = Path(cmk.utils.paths.var_dir, "snmp_cache", host_name)
+
+    @property
+    def path(self) -> Path:
+        return self._dir / "walks"
+
+    def _read_walks(self, fetchoids: Container[str]) -> Iterator[Tuple[str, SNMPRowInfo]]:
+        try:
+            with cache_format.mapped_file(self.path) as buffer:
+                for fetchoid, (offset, size) in cache_format.load_index(buffer).items():
+                    if fetchoid in fetchoids:
+                        yield fetchoid, cache_format.decode_rowinfo(buffer[offset : offset + size])
+        except FileNotFoundError:
+            return
+
+    def _write_walks(self, walks: Mapping[str, SNMPRowInfo]) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        cache_file = store.ObjectStore(self.path, serializer=store.BytesSerializer())
+        # Hold the lock from reading the walks we keep until the file is replaced, so that no
+        # walks of a concurrent fetcher of this host get lost.
+        with cache_file.locked():
+            entries: MutableMapping[str, bytes] = {}
+            # Keep the walks of the sections we did not need this time.
+            try:
+                with cache_format.mapped_file(self.path) as buffer:
+                    for fetchoid, (offset, size) in cache_format.load_index(buffer).items():
+                        if fetchoid not in walks:
+                            entries[fetchoid] = buffer[offset : offset + size]
+            except FileNotFoundError:
+                pass
+            except ValueError:
+                console.vverbose(f"  Discarding invalid walk cache {self.path}\n")
+                if cmk.utils.debug.enabled():
+                    raise
 
-    @staticmethod
-    def _name2oid(basename: str) -> str:
-        return basename[3:]
+            entries.update(
+                (fetchoid, cache_format.encode_rowinfo(rowinfo))
+                for fetchoid, rowinfo in walks.items()
+            )
+            cache_file.write_obj(cache_format.dump(entries))
 
     def _iterfiles(self) -> Iterable[Path]:
-        if not self._path.is_dir():
+        if not self._dir.is_dir():
             return ()
-        return self._path.iterdir()
+        return self._dir.iterdir()
 
     def __repr__(self) -> str:
         return "%s(%r)" % (type(self).__name__, self._store)
@@ -98,6 +130,7 @@ class WalkCache(
         return self._store.__len__()
 
     def clear(self) -> None:
+        # This also removes the per-fetchoid files of previous versions.
         for path in self._iterfiles():
             path.unlink(missing_ok=True)
 
@@ -106,7 +139,8 @@ class WalkCache(
         *,
         trees: Iterable[BackendSNMPTree],
     ) -> None:
-        """Try to read the OIDs data from cache files"""
+        """Try to read the OIDs data from the cache file"""
+        trees = list(trees)
         # Do not load the cached data if *any* plugin needs live data
         do_not_load = {
             f"{tree.base}.{oid.column}"
@@ -114,35 +148,32 @@ class WalkCache(
             for oid in tree.oids
             if not oid.save_to_cache
         }
-
-        for path in self._iterfiles():
-            fetchoid = self._name2oid(path.name)
-            if fetchoid in do_not_load:
-                continue
-
-            console.vverbose(f"  Loading {fetchoid} from walk cache {path}\n")
-            try:
-                read_walk = self._read_row(path)
-            except Exception:
-                console.vverbose(f"  Failed to load {fetchoid} from walk cache {path}\n")
-                if cmk.utils.debug.enabled():
-                    raise
-                continue
-
-            if read_walk is not None:
+        fetchoids = {
+            f"{tree.base}.{oid.column}" for tree in trees for oid in tree.oids
+        } - do_not_load
+        if not fetchoids:
+            return
+
+        console.vverbose(f"  Loading walks from walk cache {self.path}\n")
+        try:
+            for fetchoid, read_walk in self._read_walks(fetchoids):
+                console.vverbose(f"  Loaded {fetchoid} from walk cache\n")
                 # 'False': no need to store this value: it is already stored!
                 self._store[fetchoid] = (False, read_walk)
+        except Exception:
+            console.vverbose(f"  Failed to load walk cache {self.path}\n")
+            if cmk.utils.debug.enabled():
+                raise
 
     def save(self) -> None:
-        self._path.mkdir(parents=True, exist_ok=True)
-
-        for fetchoid, (save_flag, rowinfo) in self._store.items():
-            if not save_flag:
-                continue
+        walks = {
+            fetchoid: rowinfo for fetchoid, (save_flag, rowinfo) in self._store.items() if save_flag
+        }
+        if not walks:
+            return
 
-            path = self._path / self._oid2name(fetchoid)
-            console.vverbose(f"  Saving walk of {fetchoid} to walk cache {path}\n")
-            self._write_row(path, rowinfo)
+        console.vverbose(f"  Saving walks of {', '.join(walks)} to walk cache {self.path}\n")
+        self._write_walks(walks)
 
 
 def get_snmp_table(
@@ -153,6 +184,8 @@ def get_snmp_table(
     backend: SNMPBackend,
 ) -> Sequence[SNMPTable]:
 
+    _prefetch_snmpwalks_of_tree(section_name, tree, walk_cache=walk_cache, backend=backend)
+
     index_column = -1
     index_format: Optional[SpecialColumn] = None
     columns: ResultColumnsUnsanitized = []
@@ -205,6 +238,94 @@ def get_snmp_table(
     return _make_table(columns, backend.config)
 
 
+def prefetch_snmpwalks(
+    *,
+    trees: Iterable[Tuple[Optional[SectionName], BackendSNMPTree]],
+    walk_cache: MutableMapping[str, Tuple[bool, SNMPRowInfo]],
+    backend: SNMPBackend,
+    max_workers: int,
+) -> None:
+    """Perform the walks needed for the given trees concurrently
+
+    The results are put into the walk cache, so a subsequent get_snmp_table() does not need
+    to talk to the device anymore. Every fetch OID is only walked once, no matter how many
+    trees (of possibly different sections) contain it. OIDs already in the walk cache are
+    not walked at all.
+
+    The results are added to the walk cache in the order of the given trees, which
+    makes the outcome independent of the order in which the walks complete.
+
+    A timeout or termination only interrupts the main thread. The running walks are
+    cancelled then instead of waiting for them, so that the fetch timeout is honoured.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snmpwalk")
+    wait_for_walks = True
+    scheduled: Set[OID] = set()
+    pending: List[Tuple[Mapping[OID, bool], Future[Mapping[OID, SNMPRowInfo]]]] = []
+    try:
+        for section_name, tree in trees:
+            save_flags = {
+                fetchoid: save_walk_cache
+                for fetchoid, save_walk_cache in _fetchoids_to_walk(tree, walk_cache)
+                if fetchoid not in scheduled
+            }
+            if not save_flags:
+                continue
+            scheduled.update(save_flags)
+            pending.append(
+                (
+                    save_flags,
+                    executor.submit(
+                        _perform_snmpwalks,
+                        section_name,
+                        tree.base,
+                        list(save_flags),
+                        backend=backend,
+                    ),
+                )
+            )
+
+        for save_flags, future in pending:
+            for fetchoid, rowinfo in future.result().items():
+                walk_cache[fetchoid] = (save_flags[fetchoid], rowinfo)
+    except (MKTimeout, MKTerminate):
+        wait_for_walks = False
+        backend.cancel_walks()
+        raise
+    finally:
+        executor.shutdown(wait=wait_for_walks, cancel_futures=True)
+
+
+def _prefetch_snmpwalks_of_tree(
+    section_name: Optional[SectionName],
+    tree: BackendSNMPTree,
+    *,
+    walk_cache: MutableMapping[str, Tuple[bool, SNMPRowInfo]],
+    backend: SNMPBackend,
+) -> None:
+    """Walk all missing columns of a tree at once, which allows the backend to batch them"""
+    save_flags = dict(_fetchoids_to_walk(tree, walk_cache))
+    if len(save_flags) < 2:
+        return  # Nothing to batch
+
+    for fetchoid, rowinfo in _perform_snmpwalks(
+        section_name, tree.base, list(save_flags), backend=backend
+    ).items():
+        walk_cache[fetchoid] = (save_flags[fetchoid], rowinfo)
+
+
+def _fetchoids_to_walk(
+    tree: BackendSNMPTree,
+    walk_cache: MutableMapping[str, Tuple[bool, SNMPRowInfo]],
+) -> Iterator[Tuple[OID, bool]]:
+    for oid in tree.oids:
+        if isinstance(oid.column, SpecialColumn):
+            continue
+        fetchoid: OID = "%s.%s" % (tree.base, oid.column)
+        if fetchoid not in walk_cache:
+            yield fetchoid, oid.save_to_cache
+
+
 def _make_index_rows(
     max_column: SNMPRowInfo,
     index_format: SpecialColumn,
@@ -300,35 +421,47 @@ def _perform_snmpwalk(
     *,
     backend: SNMPBackend,
 ) -> SNMPRowInfo:
-    added_oids: Set[OID] = set([])
-    rowinfo: SNMPRowInfo = []
+    return _perform_snmpwalks(section_name, base_oid, [fetchoid], backend=backend)[fetchoid]
+
+
+def _perform_snmpwalks(
+    section_name: Optional[SectionName],
+    base_oid: str,
+    fetchoids: Sequence[OID],
+    *,
+    backend: SNMPBackend,
+) -> Mapping[OID, SNMPRowInfo]:
+    added_oids: Mapping[OID, Set[OID]] = {fetchoid: set() for fetchoid in fetchoids}
+    rowinfos: Mapping[OID, SNMPRowInfo] = {fetchoid: [] for fetchoid in fetchoids}
 
     for context_name in backend.config.snmpv3_contexts_of(section_name):
-        rows = backend.walk(
-            oid=fetchoid,
+        walks = backend.walk_columns(
+            fetchoids,
             section_name=section_name,
             table_base_oid=base_oid,
             context_name=context_name,
         )
 
-        # I've seen a broken device (Mikrotik Router), that broke after an
-        # update to RouterOS v6.22. It would return 9 time the same OID when
-        # .1.3.6.1.2.1.1.1.0 was being walked. We try to detect these situations
-        # by removing any duplicate OID information
-        if len(rows) > 1 and rows[0][0] == rows[1][0]:
-            console.vverbose(
-                "Detected broken SNMP agent. Ignoring duplicate OID %s.\n" % rows[0][0]
-            )
-            rows = rows[:1]
+        for fetchoid in fetchoids:
+            rows = walks[fetchoid]
+            # I've seen a broken device (Mikrotik Router), that broke after an
+            # update to RouterOS v6.22. It would return 9 time the same OID when
+            # .1.3.6.1.2.1.1.1.0 was being walked. We try to detect these situations
+            # by removing any duplicate OID information
+            if len(rows) > 1 and rows[0][0] == rows[1][0]:
+                console.vverbose(
+                    "Detected broken SNMP agent. Ignoring duplicate OID %s.\n" % rows[0][0]
+                )
+                rows = rows[:1]
 
-        for row_oid, val in rows:
-            if row_oid in added_oids:
-                console.vverbose("Duplicate OID found: %s (%r)\n" % (row_oid, val))
-            else:
-                rowinfo.append((row_oid, val))
-                added_oids.add(row_oid)
+            for row_oid, val in rows:
+                if row_oid in added_oids[fetchoid]:
+                    console.vverbose("Duplicate OID found: %s (%r)\n" % (row_oid, val))
+                else:
+                    rowinfos[fetchoid].append((row_oid, val))
+                    added_oids[fetchoid].add(row_oid)
 
-    return rowinfo
+    return rowinfos
 
 
 def _sanitize_snmp_encoding(
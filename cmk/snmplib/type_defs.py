@@ -135,6 +135,7 @@ class SNMPHostConfig(
             ("is_bulkwalk_host", bool),
             ("is_snmpv2or3_without_bulkwalk_host", bool),
             ("bulk_walk_size_of", int),
+            ("max_concurrent_walks", int),
             ("timing", SNMPTiming),
             ("oid_range_limits", Mapping[_SectionName, Sequence[RangeLimit]]),
             ("snmpv3_contexts", list),
@@ -227,6 +228,14 @@ class SNMPBackend(abc.ABC):
         """
         raise NotImplementedError()
 
+    def cancel_walks(self) -> None:
+        """Abort the walks currently running in other threads
+
+        This is used if fetching is interrupted while the walks of a host run concurrently:
+        the timeout signal only interrupts the main thread. Backends without a way to abort a
+        running walk let it finish.
+        """
+
     @abc.abstractmethod
     def walk(
         self,
@@ -237,6 +246,27 @@ class SNMPBackend(abc.ABC):
     ) -> SNMPRowInfo:
         return []
 
+    def walk_columns(
+        self,
+        oids: Sequence[OID],
+        section_name: Optional[_SectionName] = None,
+        table_base_oid: Optional[OID] = None,
+        context_name: Optional[SNMPContextName] = None,
+    ) -> Mapping[OID, SNMPRowInfo]:
+        """Walk several OIDs, usually the columns of one table
+
+        Backends may overwrite this to fetch the OIDs with fewer requests.
+        """
+        return {
+            oid: self.walk(
+                oid,
+                section_name=section_name,
+                table_base_oid=table_base_oid,
+                context_name=context_name,
+            )
+            for oid in oids
+        }
+
 
 class SpecialColumn(enum.IntEnum):
     # Until we remove all but the first, its worth having an enum
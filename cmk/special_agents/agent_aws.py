@@ -16,6 +16,7 @@ import logging
 import sys
 from collections import Counter, defaultdict
 from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from pathlib import Path
 from time import sleep
@@ -48,6 +49,12 @@ from cmk.special_agents.utils.argument_parsing import Args
 
 NOW = datetime.now()
 
+# Number of sections fetching their data at the same time
+MAX_CONCURRENT_SECTIONS = 10
+
+# A single GetMetricData call can include up to 500 MetricDataQuery structures
+MAX_METRIC_DATA_QUERIES = 500
+
 
 AWSStrings = bytes | str
 
@@ -516,10 +523,12 @@ class ResultDistributor:
     def add(self, sender_name: str, colleague: "AWSSection") -> None:
         self._colleagues[sender_name].append(colleague)
 
+    def colleagues(self, sender: "AWSSection") -> Sequence["AWSSection"]:
+        return [c for c in self._colleagues.get(sender.name, []) if c.name != sender.name]
+
     def distribute(self, sender: "AWSSection", result: "AWSComputedContent") -> None:
-        for colleague in self._colleagues[sender.name]:
-            if colleague.name != sender.name:
-                colleague.receive(sender, result)
+        for colleague in self.colleagues(sender):
+            colleague.receive(sender, result)
 
 
 class ResultDistributorS3Limits(ResultDistributor):
@@ -676,6 +685,15 @@ class AWSSection(DataCache):
             )
         return period
 
+    @property
+    def client(self) -> BaseClient:
+        return self._client
+
+    @property
+    def colleagues(self) -> Sequence["AWSSection"]:
+        """The sections receiving the results of this section"""
+        return self._distributor.colleagues(self)
+
     def _send(self, content: AWSComputedContent) -> None:
         self._distributor.distribute(self, content)
 
@@ -840,19 +858,54 @@ class AWSSectionLabels(AWSSection):
 
 
 class AWSSectionCloudwatch(AWSSection):
+    def __init__(
+        self,
+        client: BaseClient,
+        region: str,
+        config: AWSConfig,
+        distributor: ResultDistributor | None = None,
+    ) -> None:
+        super().__init__(client, region, config, distributor=distributor)
+        self._metric_data: tuple[Metrics, list] | None = None
+
+    def plan_metric_data(self, planner: "MetricDataPlanner", use_cache: bool) -> None:
+        """
+        Add the metric data queries of this section to the planner, unless the section will
+        use its cached data anyway.
+        """
+        colleague_contents = self._get_colleague_contents()
+        if use_cache and self.get_validity_from_args(colleague_contents) and self._cache_is_valid():
+            return
+        if metric_specs := self._get_metrics(colleague_contents):
+            planner.add(self, metric_specs)
+
+    def receive_metric_data(self, metric_specs: Metrics, raw_content: list) -> None:
+        """Receive the results of the metric data queries fetched by a planner"""
+        self._metric_data = (metric_specs, raw_content)
+
     def get_live_data(self, *args: AWSColleagueContents) -> Sequence[Mapping[str, object]]:
         (colleague_contents,) = args
-        end_time = NOW.timestamp()
-        start_time = end_time - self.period
         metric_specs = self._get_metrics(colleague_contents)
         if not metric_specs:
             return []
 
-        # A single GetMetricData call can include up to 100 MetricDataQuery structures
+        if self._metric_data is not None and self._metric_data[0] == metric_specs:
+            raw_content = self._metric_data[1]
+        else:
+            raw_content = self._get_metric_data(metric_specs)
+
+        self._extend_metrics_by_period(metric_specs, raw_content)
+
+        return raw_content
+
+    def _get_metric_data(self, metric_specs: Metrics) -> list:
+        end_time = NOW.timestamp()
+        start_time = end_time - self.period
+
         # There's no pagination for this operation:
         # self._client.can_paginate('get_metric_data') = False
         raw_content = []
-        for chunk in _chunks(metric_specs):
+        for chunk in _chunks(metric_specs, MAX_METRIC_DATA_QUERIES):
             if not chunk:
                 continue
             response = self._client.get_metric_data(
@@ -865,9 +918,6 @@ class AWSSectionCloudwatch(AWSSection):
             if not metrics:
                 continue
             raw_content.extend(metrics)
-
-        self._extend_metrics_by_period(metric_specs, raw_content)
-
         return raw_content
 
     @abc.abstractmethod
@@ -901,6 +951,71 @@ class AWSSectionCloudwatch(AWSSection):
             metric_contents["Values"] = [(v, period) for v in metric_contents["Values"]]
 
 
+class MetricDataPlanner:
+    """
+    Fetches the metric data queries of several CloudWatch sections using the same client with
+    as few GetMetricData calls as possible and dispatches the results back to the sections.
+
+    The IDs of the queries only have to be unique within a section, so they are replaced by
+    IDs unique within the planner. The time range applies to all queries of a call, so only
+    the queries of sections with the same period share calls.
+    """
+
+    def __init__(self, client: BaseClient) -> None:
+        self._client = client
+        self._planned: list[tuple[AWSSectionCloudwatch, Metrics]] = []
+
+    def add(self, section: AWSSectionCloudwatch, metric_specs: Metrics) -> None:
+        self._planned.append((section, metric_specs))
+
+    def fetch(self) -> None:
+        """
+        Fetch the data of all added queries. The sections of failed calls do not receive
+        anything and have to fetch their data on their own.
+        """
+        queries_by_period: dict[int, list[tuple[int, int, Metric]]] = defaultdict(list)
+        for section_idx, (section, metric_specs) in enumerate(self._planned):
+            queries_by_period[section.period].extend(
+                (section_idx, query_idx, query) for query_idx, query in enumerate(metric_specs)
+            )
+
+        results: list[dict[int, dict]] = [{} for _planned in self._planned]
+        failed: set[int] = set()
+        for period, queries in queries_by_period.items():
+            end_time = NOW.timestamp()
+            for chunk in _chunks(queries, MAX_METRIC_DATA_QUERIES):
+                try:
+                    response = self._client.get_metric_data(
+                        MetricDataQueries=[
+                            {**query, "Id": f"s{section_idx}_{query['Id']}"}
+                            for section_idx, _query_idx, query in chunk
+                        ],
+                        StartTime=end_time - period,
+                        EndTime=end_time,
+                    )
+                except Exception as e:
+                    logging.info("%s: Failed to get metric data: %s", self.__class__.__name__, e)
+                    failed.update(section_idx for section_idx, _query_idx, _query in chunk)
+                    continue
+
+                query_positions = {
+                    f"s{section_idx}_{query['Id']}": (section_idx, query_idx, query["Id"])
+                    for section_idx, query_idx, query in chunk
+                }
+                for row in response.get("MetricDataResults", []):
+                    if (position := query_positions.get(row.get("Id"))) is None:
+                        continue
+                    section_idx, query_idx, query_id = position
+                    results[section_idx][query_idx] = {**row, "Id": query_id}
+
+        for section_idx, (section, metric_specs) in enumerate(self._planned):
+            if section_idx not in failed:
+                section.receive_metric_data(
+                    metric_specs,
+                    [results[section_idx][idx] for idx in sorted(results[section_idx])],
+                )
+
+
 # .
 #   .--costs/usage---------------------------------------------------------.
 #   |                      _          __                                   |
@@ -5345,6 +5460,110 @@ class SNSLimits(AWSSectionLimits):
 #   '----------------------------------------------------------------------'
 
 
+AWSSectionOutcome = AWSSectionResults | Exception
+
+
+def run_sections(
+    sections: Sequence[AWSSection],
+    use_cache: bool,
+    debug: bool = False,
+    max_workers: int = MAX_CONCURRENT_SECTIONS,
+) -> Sequence[AWSSectionOutcome]:
+    """Run the sections concurrently and return their results or exceptions in their order
+
+    A section starts after all preceding sections it receives results from are finished, so it
+    gets the same colleague contents as when running the sections one after another. To stay
+    within the API rate limits, the sections using the same client, i.e. the same service in
+    the same region, do not run at the same time.
+
+    The CloudWatch sections of a client run together, so that their metric data can be fetched
+    with shared GetMetricData calls.
+    """
+    position = {id(section): idx for idx, section in enumerate(sections)}
+    senders: list[set[int]] = [set() for _section in sections]
+    for idx, section in enumerate(sections):
+        for colleague in section.colleagues:
+            if (colleague_idx := position.get(id(colleague), -1)) > idx:
+                senders[colleague_idx].add(idx)
+
+    outcomes: dict[int, AWSSectionOutcome] = {}
+    waiting = _group_sections(sections)
+    running: dict[Future[Sequence[AWSSectionOutcome]], Sequence[int]] = {}
+    busy_clients: set[int] = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aws-section") as pool:
+        while waiting or running:
+            for group in list(waiting):
+                if len(running) >= max_workers:
+                    break
+                client = sections[group[0]].client
+                if (
+                    not all(senders[idx].issubset(outcomes) for idx in group)
+                    or id(client) in busy_clients
+                ):
+                    continue
+                waiting.remove(group)
+                busy_clients.add(id(client))
+                running[
+                    pool.submit(_run_section_group, [sections[idx] for idx in group], use_cache)
+                ] = group
+
+            done, _not_done = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                group = running.pop(future)
+                busy_clients.discard(id(sections[group[0]].client))
+                for idx, outcome in zip(group, future.result()):
+                    if debug and isinstance(outcome, Exception):
+                        raise outcome
+                    outcomes[idx] = outcome
+
+    return [outcomes[idx] for idx in range(len(sections))]
+
+
+def _group_sections(sections: Sequence[AWSSection]) -> list[Sequence[int]]:
+    """
+    Put the CloudWatch sections of each client into one group. Only the sections no other
+    section receives results from are grouped, so that no group has to wait for itself.
+    """
+    groups: list[Sequence[int]] = []
+    cloudwatch_groups: dict[int, list[int]] = {}
+    for idx, section in enumerate(sections):
+        if not isinstance(section, AWSSectionCloudwatch) or section.colleagues:
+            groups.append([idx])
+        elif (cloudwatch_group := cloudwatch_groups.get(id(section.client))) is not None:
+            cloudwatch_group.append(idx)
+        else:
+            groups.append(cloudwatch_groups.setdefault(id(section.client), [idx]))
+    return groups
+
+
+def _run_section_group(
+    sections: Sequence[AWSSection], use_cache: bool
+) -> Sequence[AWSSectionOutcome]:
+    if len(sections) > 1:
+        planner = MetricDataPlanner(sections[0].client)
+        for section in sections:
+            assert isinstance(section, AWSSectionCloudwatch)
+            try:
+                section.plan_metric_data(planner, use_cache)
+            except Exception as e:
+                # The section fails again when running it on its own
+                logging.info("%s: %s", section.__class__.__name__, e)
+        planner.fetch()
+    return [_run_section(section, use_cache) for section in sections]
+
+
+def _run_section(section: AWSSection, use_cache: bool) -> AWSSectionOutcome:
+    try:
+        return section.run(use_cache=use_cache)
+    except AssertionError as e:
+        logging.info(e)
+        return e
+    except Exception as e:
+        logging.info("%s: %s", section.__class__.__name__, e)
+        return e
+
+
 class AWSSections(abc.ABC):
     def __init__(
         self,
@@ -5387,27 +5606,27 @@ class AWSSections(abc.ABC):
             logging.info("Invalid region name or client key %s: %s", client_key, e)
             raise
 
+    @property
+    def sections(self) -> Sequence[AWSSection]:
+        return self._sections
+
     def run(self, use_cache: bool = True) -> None:
+        self.write_outcomes(run_sections(self._sections, use_cache=use_cache, debug=self._debug))
+
+    def write_outcomes(self, outcomes: Sequence[AWSSectionOutcome]) -> None:
         exceptions = []
         results: Results = {}
 
-        for section in self._sections:
-            try:
-                section_result = section.run(use_cache=use_cache)
-            except AssertionError as e:
-                logging.info(e)
-                if self._debug:
-                    raise
-            except Exception as e:
-                logging.info("%s: %s", section.__class__.__name__, e)
-                if self._debug:
-                    raise
-                exceptions.append(e)
-            else:
-                results.setdefault(
-                    (section.name, section_result.cache_timestamp, section.cache_interval),
-                    section_result.results,
-                )
+        for section, outcome in zip(self._sections, outcomes):
+            if isinstance(outcome, AssertionError):
+                continue
+            if isinstance(outcome, Exception):
+                exceptions.append(outcome)
+                continue
+            results.setdefault(
+                (section.name, outcome.cache_timestamp, section.cache_interval),
+                outcome.results,
+            )
 
         self._write_exceptions(exceptions)
         self._write_section_results(results)
@@ -6277,6 +6496,8 @@ def main(sys_argv: Sequence[str] | None = None) -> int:  # pylint: disable=too-m
 
     # Special distributor for S3 limits which distributes results across different regions
     s3_limits_distributor = ResultDistributorS3Limits()
+    all_sections: list[AWSSections] = []
+    access_error: AwsAccessError | None = None
 
     if regional_services and not args.regions:
         logging.error(
@@ -6291,6 +6512,8 @@ def main(sys_argv: Sequence[str] | None = None) -> int:  # pylint: disable=too-m
         (global_services, ["us-east-1"], AWSSectionsUSEast),
         (regional_services, args.regions, AWSSectionsGeneric),
     ]:
+        if access_error is not None:
+            break
         if not aws_services or not aws_regions:
             continue
 
@@ -6315,12 +6538,10 @@ def main(sys_argv: Sequence[str] | None = None) -> int:  # pylint: disable=too-m
                 sections.init_sections(
                     aws_services, region, aws_config, s3_limits_distributor=s3_limits_distributor
                 )
-                sections.run(use_cache=use_cache)
             except AwsAccessError as ae:
-                # can not access AWS, retreat
-                sys.stdout.write("<<<aws_exceptions>>>\n")
-                sys.stdout.write("Exception: %s\n" % ae)
-                return 0
+                # can not access AWS, retreat, but still report the regions initialized so far
+                access_error = ae
+                break
             except AssertionError:
                 if args.debug:
                     raise
@@ -6329,6 +6550,29 @@ def main(sys_argv: Sequence[str] | None = None) -> int:  # pylint: disable=too-m
                 has_exceptions = True
                 if args.debug:
                     raise
+            else:
+                all_sections.append(sections)
+
+    # The sections of all regions run together, the output is written region by region
+    outcomes = iter(
+        run_sections(
+            [section for sections in all_sections for section in sections.sections],
+            use_cache=use_cache,
+            debug=args.debug,
+        )
+    )
+    for sections in all_sections:
+        try:
+            sections.write_outcomes([next(outcomes) for _section in sections.sections])
+        except Exception as e:
+            logging.info(e)
+            has_exceptions = True
+            if args.debug:
+                raise
+    if access_error is not None:
+        sys.stdout.write("<<<aws_exceptions>>>\n")
+        sys.stdout.write("Exception: %s\n" % access_error)
+        return 0
     if has_exceptions:
         return 1
     return 0
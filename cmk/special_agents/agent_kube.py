@@ -358,6 +358,14 @@ def setup_logging(verbosity: int) -> None:
 class PodOwner(abc.ABC):
     def __init__(self, pods: Sequence[api.Pod]) -> None:
         self._pods: Sequence[api.Pod] = pods
+        self._pods_by_phase: DefaultDict[api.Phase, List[api.Pod]] = collections.defaultdict(list)
+        for pod in pods:
+            self._pods_by_phase[pod.status.phase].append(pod)
+
+    def pods(self, phase: Optional[api.Phase] = None) -> Sequence[api.Pod]:
+        if phase is None:
+            return self._pods
+        return self._pods_by_phase.get(phase, [])
 
 
 class PodNamespacedOwner(PodOwner, abc.ABC):
@@ -539,11 +547,6 @@ class Deployment(PodNamespacedOwner):
 
         return f"{self.metadata.namespace}_{self.metadata.name}"
 
-    def pods(self, phase: Optional[api.Phase] = None) -> Sequence[api.Pod]:
-        if phase is None:
-            return self._pods
-        return [pod for pod in self._pods if pod.status.phase == phase]
-
     def info(
         self,
         cluster_name: str,
@@ -623,11 +626,6 @@ class DaemonSet(PodNamespacedOwner):
 
         return f"{self.metadata.namespace}_{self.metadata.name}"
 
-    def pods(self, phase: Optional[api.Phase] = None) -> Sequence[api.Pod]:
-        if phase is None:
-            return self._pods
-        return [pod for pod in self._pods if pod.status.phase == phase]
-
     def pod_resources(self) -> section.PodResources:
         return _pod_resources_from_api_pods(self._pods)
 
@@ -693,11 +691,6 @@ class StatefulSet(PodNamespacedOwner):
             return self.metadata.name
         return f"{self.metadata.namespace}_{self.metadata.name}"
 
-    def pods(self, phase: Optional[api.Phase] = None) -> Sequence[api.Pod]:
-        if phase is None:
-            return self._pods
-        return [pod for pod in self._pods if pod.status.phase == phase]
-
     def pod_resources(self) -> section.PodResources:
         return _pod_resources_from_api_pods(self._pods)
 
@@ -761,11 +754,6 @@ class Node(PodOwner):
     def name(self) -> api.NodeName:
         return api.NodeName(self.metadata.name)
 
-    def pods(self, phase: Optional[api.Phase] = None) -> Sequence[api.Pod]:
-        if phase is None:
-            return self._pods
-        return [pod for pod in self._pods if pod.status.phase == phase]
-
     def pod_resources(self) -> section.PodResources:
         return _pod_resources_from_api_pods(self._pods)
 
@@ -981,7 +969,7 @@ class Cluster:
             ):
                 cluster_aggregation_nodes.append(node)
 
-        cluster_aggregation_node_names = [node.name for node in cluster_aggregation_nodes]
+        cluster_aggregation_node_names = {node.name for node in cluster_aggregation_nodes}
 
         cluster_aggregation_pods = [
             pod
@@ -1073,6 +1061,43 @@ class Cluster:
         return _node_collector_daemons(self.daemonsets)
 
 
+class PodIndex:
+    """Look up the API pods of a namespace, a phase or a set of UIDs
+
+    The indexes are built once, so that writing the sections of all namespaces and cron jobs
+    does not filter all pods of the cluster for each of them. The pods are always returned in
+    the order of the API.
+    """
+
+    def __init__(self, pods: Sequence[api.Pod]) -> None:
+        self._pods = pods
+        self._positions = {pod.uid: position for position, pod in enumerate(pods)}
+        self._by_namespace: DefaultDict[api.NamespaceName, List[api.Pod]] = collections.defaultdict(
+            list
+        )
+        self._by_phase: DefaultDict[api.Phase, List[api.Pod]] = collections.defaultdict(list)
+        for pod in pods:
+            self._by_namespace[pod_namespace(pod)].append(pod)
+            self._by_phase[pod.status.phase].append(pod)
+
+    def pods(self, phase: Optional[api.Phase] = None) -> Sequence[api.Pod]:
+        if phase is None:
+            return self._pods
+        return self._by_phase.get(phase, [])
+
+    def namespace_pods(
+        self, namespace: api.NamespaceName, phase: Optional[api.Phase] = None
+    ) -> Sequence[api.Pod]:
+        namespace_pods = self._by_namespace.get(namespace, [])
+        if phase is None:
+            return namespace_pods
+        return filter_pods_by_phase(namespace_pods, phase)
+
+    def pods_by_uids(self, uids: Iterable[api.PodUID]) -> Sequence[api.Pod]:
+        positions = {position for uid in uids if (position := self._positions.get(uid)) is not None}
+        return [self._pods[position] for position in sorted(positions)]
+
+
 def _node_collector_daemons(daemonsets: Iterable[DaemonSet]) -> section.CollectorDaemons:
     # Extract DaemonSets with label key `node-collector`
     collector_daemons = collections.defaultdict(list)
@@ -1203,13 +1228,14 @@ def cron_job_latest_job(
     )
 
 
-def filter_matching_namespace_resource_quota(
-    namespace: api.NamespaceName, resource_quotas: Sequence[api.ResourceQuota]
-) -> Optional[api.ResourceQuota]:
+def resource_quotas_by_namespace(
+    resource_quotas: Sequence[api.ResourceQuota],
+) -> Mapping[api.NamespaceName, api.ResourceQuota]:
+    """The resource quota of each namespace, the first one in case of several"""
+    namespace_resource_quotas: Dict[api.NamespaceName, api.ResourceQuota] = {}
     for resource_quota in resource_quotas:
-        if resource_quota.metadata.namespace == namespace:
-            return resource_quota
-    return None
+        namespace_resource_quotas.setdefault(resource_quota.metadata.namespace, resource_quota)
+    return namespace_resource_quotas
 
 
 def filter_pods_by_resource_quota_criteria(
@@ -1367,16 +1393,6 @@ def pod_name(pod: api.Pod, prepend_namespace: bool = False) -> str:
     return f"{pod.metadata.namespace}_{pod.metadata.name}"
 
 
-def filter_pods_by_namespace(
-    pods: Sequence[api.Pod], namespace: api.NamespaceName
-) -> Sequence[api.Pod]:
-    return [pod for pod in pods if pod_namespace(pod) == namespace]
-
-
-def filter_pods_by_cron_job(pods: Sequence[api.Pod], cron_job: api.CronJob) -> Sequence[api.Pod]:
-    return [pod for pod in pods if pod.uid in cron_job.pod_uids]
-
-
 def filter_pods_by_phase(pods: Iterable[api.Pod], phase: api.Phase) -> Sequence[api.Pod]:
     return [pod for pod in pods if pod.status.phase == phase]
 
@@ -1465,7 +1481,7 @@ def write_cronjobs_api_sections(
     cluster_name: str,
     annotation_key_pattern: AnnotationOption,
     api_cron_jobs: Sequence[api.CronJob],
-    api_cron_job_pods: Sequence[api.Pod],
+    pod_index: PodIndex,
     api_jobs: Mapping[api.JobUID, api.Job],
     kubernetes_cluster_hostname: str,
     piggyback_formatter: ObjectSpecificPBFormatter,
@@ -1500,10 +1516,7 @@ def write_cronjobs_api_sections(
         with ConditionalPiggybackSection(
             piggyback_formatter(f"{api_cron_job.metadata.namespace}_{api_cron_job.metadata.name}")
         ):
-            output_cronjob_sections(
-                api_cron_job,
-                filter_pods_by_cron_job(api_cron_job_pods, api_cron_job),
-            )
+            output_cronjob_sections(api_cron_job, pod_index.pods_by_uids(api_cron_job.pod_uids))
 
 
 def write_namespaces_api_sections(
@@ -1511,7 +1524,7 @@ def write_namespaces_api_sections(
     annotation_key_pattern: AnnotationOption,
     api_namespaces: Sequence[api.Namespace],
     api_resource_quotas: Sequence[api.ResourceQuota],
-    api_pods: Sequence[api.Pod],
+    pod_index: PodIndex,
     kubernetes_cluster_hostname: str,
     piggyback_formatter: ObjectSpecificPBFormatter,
 ) -> None:
@@ -1550,16 +1563,15 @@ def write_namespaces_api_sections(
         }
         _write_sections(sections)
 
+    namespace_resource_quotas = resource_quotas_by_namespace(api_resource_quotas)
     for api_namespace in api_namespaces:
         with ConditionalPiggybackSection(piggyback_formatter(namespace_name(api_namespace))):
             output_namespace_sections(
-                api_namespace, filter_pods_by_namespace(api_pods, namespace_name(api_namespace))
+                api_namespace, pod_index.namespace_pods(namespace_name(api_namespace))
             )
 
             if (
-                api_resource_quota := filter_matching_namespace_resource_quota(
-                    namespace_name(api_namespace), api_resource_quotas
-                )
+                api_resource_quota := namespace_resource_quotas.get(namespace_name(api_namespace))
             ) is not None:
                 output_resource_quota_sections(api_resource_quota)
 
@@ -2317,7 +2329,7 @@ def determine_pods_to_host(
     monitored_pods: Set[PodLookupName],
     cluster: Cluster,
     monitored_namespaces: Set[api.NamespaceName],
-    api_pods: Sequence[api.Pod],
+    pod_index: PodIndex,
     resource_quotas: Sequence[api.ResourceQuota],
     monitored_api_namespaces: Sequence[api.Namespace],
     api_cron_jobs: Sequence[api.CronJob],
@@ -2326,14 +2338,12 @@ def determine_pods_to_host(
 ) -> PodsToHost:
     namespace_piggies = []
     if MonitoredObject.namespaces in monitored_objects:
+        namespace_resource_quotas = resource_quotas_by_namespace(resource_quotas)
         for api_namespace in monitored_api_namespaces:
-            namespace_api_pods = filter_pods_by_phase(
-                filter_pods_by_namespace(api_pods, namespace_name(api_namespace)),
-                api.Phase.RUNNING,
-            )
-            resource_quota = filter_matching_namespace_resource_quota(
-                namespace_name(api_namespace), resource_quotas
+            namespace_api_pods = pod_index.namespace_pods(
+                namespace_name(api_namespace), api.Phase.RUNNING
             )
+            resource_quota = namespace_resource_quotas.get(namespace_name(api_namespace))
             if resource_quota is not None:
                 resource_quota_pod_names = [
                     pod_lookup_from_api_pod(pod)
@@ -2360,11 +2370,10 @@ def determine_pods_to_host(
     # other function similar to namespaces
     piggybacks: list[Piggyback] = []
     if MonitoredObject.pods in monitored_objects:
-        running_pods = pods_from_namespaces(
-            filter_pods_by_phase(api_pods, api.Phase.RUNNING), monitored_namespaces
-        )
+        running_pods = pods_from_namespaces(pod_index.pods(api.Phase.RUNNING), monitored_namespaces)
         lookup_name_piggyback_mappings = {
-            pod_lookup_from_api_pod(pod): pod_name(pod, prepend_namespace=True) for pod in api_pods
+            pod_lookup_from_api_pod(pod): pod_name(pod, prepend_namespace=True)
+            for pod in pod_index.pods()
         }
 
         monitored_running_pods = monitored_pods.intersection(
@@ -2426,7 +2435,7 @@ def determine_pods_to_host(
                 pod_names=[
                     pod_lookup_from_api_pod(pod)
                     for pod in filter_pods_by_phase(
-                        filter_pods_by_cron_job(api_pods, k),
+                        pod_index.pods_by_uids(k.pod_uids),
                         api.Phase.RUNNING,
                     )
                 ],
@@ -2755,6 +2764,8 @@ def main(args: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-b
                 cluster_details=api_data.cluster_details,
             )
 
+            pod_index = PodIndex(api_data.pods)
+
             # Sections based on API server data
             LOGGER.info("Write cluster sections based on API data")
             write_cluster_api_sections(arguments.cluster, cluster)
@@ -2813,7 +2824,7 @@ def main(args: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-b
                     arguments.annotation_key_pattern,
                     monitored_api_namespaces,
                     resource_quotas,
-                    api_data.pods,
+                    pod_index,
                     kubernetes_cluster_hostname=arguments.kubernetes_cluster_hostname,
                     piggyback_formatter=functools.partial(piggyback_formatter, "namespace"),
                 )
@@ -2849,14 +2860,13 @@ def main(args: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-b
             monitored_api_cron_job_pods = [
                 api_pod
                 for cron_job in api_data.cron_jobs
-                for api_pod in api_data.pods
-                if api_pod.uid in cron_job.pod_uids
+                for api_pod in pod_index.pods_by_uids(cron_job.pod_uids)
             ]
             write_cronjobs_api_sections(
                 arguments.cluster,
                 arguments.annotation_key_pattern,
                 api_data.cron_jobs,
-                monitored_api_cron_job_pods,
+                pod_index,
                 {job.uid: job for job in api_data.jobs},
                 kubernetes_cluster_hostname=arguments.kubernetes_cluster_hostname,
                 piggyback_formatter=functools.partial(piggyback_formatter, "cronjob"),
@@ -2873,6 +2883,9 @@ def main(args: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-b
                 )
             if MonitoredObject.pods in arguments.monitored_objects:
                 LOGGER.info("Write pods sections based on API data")
+                cron_job_pod_lookup_names = {
+                    pod_lookup_from_api_pod(pod) for pod in monitored_api_cron_job_pods
+                }
                 write_pods_api_sections(
                     arguments.cluster,
                     arguments.annotation_key_pattern,
@@ -2880,11 +2893,7 @@ def main(args: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-b
                         pod
                         for pod in cluster.pods.values()
                         if pod_lookup_from_agent_pod(pod) in monitored_pods
-                        and pod_lookup_from_agent_pod(pod)
-                        not in [
-                            f"{pod_name(pod, prepend_namespace=True)}"
-                            for pod in monitored_api_cron_job_pods
-                        ]
+                        and pod_lookup_from_agent_pod(pod) not in cron_job_pod_lookup_names
                     ],
                     kubernetes_cluster_hostname=arguments.kubernetes_cluster_hostname,
                     piggyback_formatter=functools.partial(piggyback_formatter, "pod"),
@@ -2990,7 +2999,7 @@ def main(args: Optional[List[str]] = None) -> int:  # pylint: disable=too-many-b
                         monitored_pods=monitored_pods,
                         monitored_objects=arguments.monitored_objects,
                         monitored_namespaces=monitored_namespace_names,
-                        api_pods=api_data.pods,
+                        pod_index=pod_index,
                         resource_quotas=resource_quotas,
                         api_cron_jobs=api_data.cron_jobs,
                         monitored_api_namespaces=monitored_api_namespaces,
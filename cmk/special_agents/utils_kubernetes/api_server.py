@@ -7,8 +7,20 @@ import itertools
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Dict, Generic, Literal, Mapping, Optional, Sequence, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
 from kubernetes import client  # type: ignore[import]
 
@@ -40,6 +52,49 @@ SUPPORTED_VERSIONS = [(1, 21), (1, 22), (1, 23)]
 LOWEST_FUNCTIONING_VERSION = min(SUPPORTED_VERSIONS)
 SUPPORTED_VERSIONS_DISPLAY = ", ".join(f"v{major}.{minor}" for major, minor in SUPPORTED_VERSIONS)
 
+# Number of objects per response when listing objects. Large clusters are listed with several
+# requests, so that no response has to hold all objects of a kind at once.
+LIST_PAGE_SIZE = 500
+# Number of kubelets whose health is queried at the same time
+KUBELET_HEALTH_WORKERS = 20
+
+T = TypeVar("T")
+# Queries the objects of a page with the given limit and continue token and returns them
+# together with the continue token of the next page
+QueryPage = Callable[[Optional[int], Optional[str]], tuple[Sequence[T], Optional[str]]]
+
+
+def _query_paginated(query_page: QueryPage[T]) -> Sequence[T]:
+    """Query all objects of a list page by page
+
+    The continue token expires after some minutes (HTTP status 410). In this case the objects
+    are queried once more with a single request, like kubectl does it.
+    """
+    objects: list[T] = []
+    continue_token: Optional[str] = None
+    while True:
+        try:
+            page, continue_token = query_page(LIST_PAGE_SIZE, continue_token)
+        except client.ApiException as e:
+            if e.status != 410 or continue_token is None:
+                raise
+            LOGGER.info("Continue token expired, querying all objects with a single request")
+            page, _continue_token = query_page(None, None)
+            return page
+        objects.extend(page)
+        if not continue_token:
+            return objects
+
+
+def _list_paginated(list_objects: Callable[..., Any], timeout: tuple[int, int]) -> Sequence[Any]:
+    def query_page(
+        limit: Optional[int], continue_token: Optional[str]
+    ) -> tuple[Sequence[Any], Optional[str]]:
+        response = list_objects(limit=limit, _continue=continue_token, _request_timeout=timeout)
+        return response.items, response.metadata._continue
+
+    return _query_paginated(query_page)
+
 
 class BatchAPI:
     def __init__(self, api_client: client.ApiClient, timeout: tuple[int, int]) -> None:
@@ -47,10 +102,10 @@ class BatchAPI:
         self.timeout = timeout
 
     def query_raw_cron_jobs(self) -> Sequence[client.V1CronJob]:
-        return self.connection.list_cron_job_for_all_namespaces(_request_timeout=self.timeout).items
+        return _list_paginated(self.connection.list_cron_job_for_all_namespaces, self.timeout)
 
     def query_raw_jobs(self) -> Sequence[client.V1Job]:
-        return self.connection.list_job_for_all_namespaces(_request_timeout=self.timeout).items
+        return _list_paginated(self.connection.list_job_for_all_namespaces, self.timeout)
 
 
 class CoreAPI:
@@ -59,18 +114,16 @@ class CoreAPI:
         self.timeout = timeout
 
     def query_raw_nodes(self) -> Sequence[client.V1Node]:
-        return self.connection.list_node(_request_timeout=self.timeout).items
+        return _list_paginated(self.connection.list_node, self.timeout)
 
     def query_raw_pods(self) -> Sequence[client.V1Pod]:
-        return self.connection.list_pod_for_all_namespaces(_request_timeout=self.timeout).items
+        return _list_paginated(self.connection.list_pod_for_all_namespaces, self.timeout)
 
     def query_raw_resource_quotas(self) -> Sequence[client.V1ResourceQuota]:
-        return self.connection.list_resource_quota_for_all_namespaces(
-            _request_timeout=self.timeout
-        ).items
+        return _list_paginated(self.connection.list_resource_quota_for_all_namespaces, self.timeout)
 
     def query_raw_namespaces(self):
-        return self.connection.list_namespace(_request_timeout=self.timeout).items
+        return _list_paginated(self.connection.list_namespace, self.timeout)
 
 
 class AppsAPI:
@@ -79,24 +132,16 @@ class AppsAPI:
         self.timeout = timeout
 
     def query_raw_deployments(self) -> Sequence[client.V1Deployment]:
-        return self.connection.list_deployment_for_all_namespaces(
-            _request_timeout=self.timeout
-        ).items
+        return _list_paginated(self.connection.list_deployment_for_all_namespaces, self.timeout)
 
     def query_raw_daemon_sets(self) -> Sequence[client.V1DaemonSet]:
-        return self.connection.list_daemon_set_for_all_namespaces(
-            _request_timeout=self.timeout
-        ).items
+        return _list_paginated(self.connection.list_daemon_set_for_all_namespaces, self.timeout)
 
     def query_raw_statefulsets(self) -> Sequence[client.V1StatefulSet]:
-        return self.connection.list_stateful_set_for_all_namespaces(
-            _request_timeout=self.timeout
-        ).items
+        return _list_paginated(self.connection.list_stateful_set_for_all_namespaces, self.timeout)
 
     def query_raw_replica_sets(self) -> Sequence[client.V1ReplicaSet]:
-        return self.connection.list_replica_set_for_all_namespaces(
-            _request_timeout=self.timeout
-        ).items
+        return _list_paginated(self.connection.list_replica_set_for_all_namespaces, self.timeout)
 
 
 @dataclass
@@ -165,8 +210,38 @@ class RawAPI:
     def query_kubelet_health(self, node_name: str) -> api.HealthZ:
         return self._get_healthz(f"/api/v1/nodes/{node_name}/proxy/healthz")
 
+    def query_kubelets_health(self, node_names: Sequence[str]) -> Mapping[str, api.HealthZ]:
+        """Query the health of the kubelets of several nodes at the same time
+
+        The number of workers is limited by the connection pool of the client, since urllib3
+        would discard the connections not fitting into the pool."""
+        if not node_names:
+            return {}
+        max_workers = min(
+            KUBELET_HEALTH_WORKERS,
+            self._api_client.configuration.connection_pool_maxsize,
+            len(node_names),
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(node_names, pool.map(self.query_kubelet_health, node_names)))
+
     def query_raw_statefulsets(self) -> JSONStatefulSetList:
-        return json.loads(self._request("GET", "/apis/apps/v1/statefulsets").response)
+        def query_page(
+            limit: Optional[int], continue_token: Optional[str]
+        ) -> tuple[Sequence[Any], Optional[str]]:
+            query_params = {}
+            if limit is not None:
+                query_params["limit"] = str(limit)
+            if continue_token is not None:
+                query_params["continue"] = continue_token
+            response = json.loads(
+                self._request(
+                    "GET", "/apis/apps/v1/statefulsets", query_params=query_params
+                ).response
+            )
+            return response["items"], response.get("metadata", {}).get("continue")
+
+        return {"items": _query_paginated(query_page)}
 
 
 def _extract_sequence_based_identifier(git_version: str) -> Optional[str]:
@@ -345,10 +420,9 @@ def query_raw_api_data_v1(
         raw_daemonsets=external_api.query_raw_daemon_sets(),
         raw_statefulsets=external_api.query_raw_statefulsets(),
         raw_replica_sets=external_api.query_raw_replica_sets(),
-        node_to_kubelet_health={
-            raw_node.metadata.name: raw_api.query_kubelet_health(raw_node.metadata.name)
-            for raw_node in raw_nodes
-        },
+        node_to_kubelet_health=raw_api.query_kubelets_health(
+            [raw_node.metadata.name for raw_node in raw_nodes]
+        ),
         api_health=raw_api.query_api_health(),
     )
 
@@ -371,10 +445,9 @@ def query_raw_api_data_v2(
         raw_daemonsets=external_api.query_raw_daemon_sets(),
         raw_statefulsets=raw_api.query_raw_statefulsets(),
         raw_replica_sets=external_api.query_raw_replica_sets(),
-        node_to_kubelet_health={
-            raw_node.metadata.name: raw_api.query_kubelet_health(raw_node.metadata.name)
-            for raw_node in raw_nodes
-        },
+        node_to_kubelet_health=raw_api.query_kubelets_health(
+            [raw_node.metadata.name for raw_node in raw_nodes]
+        ),
         api_health=raw_api.query_api_health(),
     )
 
@@ -507,7 +507,9 @@ def execute_query(
 
         # Filtering and Aggregating
         filtered_dicts = evaluate_filter(query, tables[table].get(site_name, []))
-        result_dicts = evaluate_stats(query, query_columns, filtered_dicts)
+        result_dicts = evaluate_order_by(
+            query, evaluate_stats(query, query_columns, filtered_dicts)
+        )
 
         # Flatten the result for serialization.
         for entry in result_dicts:
@@ -1074,6 +1076,31 @@ def evaluate_filter(query: str, result: ResultList) -> ResultList:
     return [entry for entry in result if filters[0](entry)]
 
 
+def evaluate_order_by(query: str, result: ResultList) -> ResultList:
+    """Sort a list of dictionaries according to the OrderBy: directives of a LiveStatus query.
+
+    Examples:
+
+        >>> data = [{'name': 'b', 'state': 0}, {'name': 'c', 'state': 1}, {'name': 'a', 'state': 0}]
+        >>> evaluate_order_by("GET hosts\\nOrderBy: name", data)
+        [{'name': 'a', 'state': 0}, {'name': 'b', 'state': 0}, {'name': 'c', 'state': 1}]
+
+        >>> evaluate_order_by("GET hosts\\nOrderBy: state desc\\nOrderBy: name desc", data)
+        [{'name': 'c', 'state': 1}, {'name': 'b', 'state': 0}, {'name': 'a', 'state': 0}]
+
+    Returns:
+        The sorted list of dictionaries.
+
+    """
+    order_by = [
+        line.split(":", 1)[1].split() for line in query.splitlines() if line.startswith("OrderBy:")
+    ]
+    # Sorting is stable, so sorting by the last column first yields the right order.
+    for column, *direction in reversed(order_by):
+        result = sorted(result, key=lambda entry: entry[column], reverse=direction == ["desc"])
+    return result
+
+
 def and_(filters: list[FilterKeyFunc]) -> FilterKeyFunc:
     """Combines multiple filters via a logical AND.
 
@@ -71,6 +71,7 @@ nagios_binary = _omd_path_str("bin/nagios")
 apache_config_dir = _omd_path_str("etc/apache")
 htpasswd_file = _omd_path_str("etc/htpasswd")
 livestatus_unix_socket = _omd_path_str("tmp/run/live")
+automation_helper_socket = _omd_path("tmp/run/automation-helper")
 livebackendsdir = _omd_path_str("share/check_mk/livestatus")
 inventory_output_dir = _omd_path_str("var/check_mk/inventory")
 inventory_archive_dir = _omd_path_str("var/check_mk/inventory_archive")
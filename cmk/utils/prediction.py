@@ -181,19 +181,38 @@ class TimeSeries:
         twindow : 3-tuple, (start, end, step)
              description of target time interval
         """
-        upsa = []
-        i = 0
         start, end, step = twindow
-        current_times = rrd_timestamps(self.twindow)
-        if start != self.start or end != self.end or step != self.step:
-            for t in range(start, end, step):
-                if t >= current_times[i] + shift:
-                    i += 1
-                upsa.append(self.values[i])
+        if start == self.start and end == self.end and step == self.step:
+            return self.values
 
-            return upsa
+        # numpy is only needed here, which is rarely the case in the processes importing
+        # this module
+        import numpy as np  # pylint: disable=import-outside-toplevel
 
-        return self.values
+        current_times = np.array(rrd_timestamps(self.twindow), dtype=np.int64) + shift
+        # Number of current timestamps reached by each of the desired timestamps
+        indices = np.searchsorted(
+            current_times, np.arange(start, end, step, dtype=np.int64), side="right"
+        )
+        if len(indices) and (
+            indices[0] > 1
+            or indices[-1] >= min(len(current_times), len(self.values))
+            or (np.diff(indices) > 1).any()
+        ):
+            # The desired timestamps skip values of the series or reach beyond it. Only use
+            # the values the backward filling step by step reaches.
+            return self._bfill_upsample_stepwise(twindow, shift)
+        return [self.values[i] for i in indices.tolist()]
+
+    def _bfill_upsample_stepwise(self, twindow: TimeWindow, shift: Seconds) -> TimeSeriesValues:
+        upsa = []
+        i = 0
+        current_times = rrd_timestamps(self.twindow)
+        for t in range(*twindow):
+            if t >= current_times[i] + shift:
+                i += 1
+            upsa.append(self.values[i])
+        return upsa
 
     def downsample(
         self, twindow: TimeWindow, cf: ConsolidationFunctionName = "max"
@@ -4,14 +4,15 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 """This module provides generic Check_MK ruleset processing functionality"""
 
-from collections.abc import Generator, Iterable
+import functools
+from collections.abc import Generator, Iterable, Sequence
 from re import Pattern
-from typing import Any, cast
+from typing import Any, cast, NamedTuple
 
 from cmk.utils.exceptions import MKGeneralException
 from cmk.utils.labels import BuiltinHostLabelsStore, DiscoveredHostLabelsStore, LabelManager
 from cmk.utils.parameters import boil_down_parameters
-from cmk.utils.regex import regex
+from cmk.utils.regex import is_regex, regex
 from cmk.utils.rulesets.tuple_rulesets import (
     ALL_HOSTS,
     ALL_SERVICES,
@@ -44,10 +45,110 @@ from cmk.utils.type_defs import (
 
 LabelConditions = dict  # TODO: Optimize this
 PreprocessedHostRuleset = dict[HostName, list[RuleValue]]
-PreprocessedPattern = tuple[bool, Pattern[str]]
-PreprocessedServiceRuleset = list[
-    tuple[RuleValue, set[HostName], LabelConditions, tuple, PreprocessedPattern]
-]
+PreprocessedServiceRules = list[tuple[RuleValue, set[HostName], LabelConditions]]
+
+# Number of service descriptions remembered per service ruleset
+SERVICE_DESCRIPTION_MATCH_CACHE_SIZE = 8192
+
+
+class MatchCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ServiceDescriptionMatcher:
+    """Answers which rules of a service ruleset match a service description in one pass
+
+    The service description conditions of all rules are split up into their alternatives.
+    Plain strings (optionally terminated by "$") are no regexes at all. They are looked up
+    in tables of exact descriptions and description prefixes. Only the remaining real regex
+    alternatives are matched rule by rule.
+
+    The results are remembered in a bounded LRU cache per service description.
+    """
+
+    def __init__(
+        self,
+        conditions: Sequence[HostOrServiceConditions | None],
+        cache_size: int = SERVICE_DESCRIPTION_MATCH_CACHE_SIZE,
+    ) -> None:
+        self._exact: dict[str, set[int]] = {}
+        # Prefix length -> prefix -> rule indices
+        self._prefixes: dict[int, dict[str, set[int]]] = {}
+        self._regexes: list[tuple[int, Pattern[str]]] = []
+        self._negated: set[int] = set()
+        # Share equal results between the cached service descriptions
+        self._results: dict[tuple[int, ...], tuple[int, ...]] = {}
+
+        for rule_index, condition in enumerate(conditions):
+            self._add_condition(rule_index, condition)
+
+        self.matching_rules = functools.lru_cache(maxsize=cache_size)(self._matching_rules)
+
+    def _add_condition(self, rule_index: int, condition: HostOrServiceConditions | None) -> None:
+        if not condition:
+            self._add_prefix(rule_index, "")  # Match everything
+            return
+
+        negate, entries = parse_negated_condition_list(condition)
+        if negate:
+            self._negated.add(rule_index)
+
+        if not entries:
+            # Matches everything, which means nothing when negated
+            self._add_prefix(rule_index, "")
+            return
+
+        regex_parts = []
+        for entry in entries:
+            pattern = entry["$regex"] if isinstance(entry, dict) else entry
+            if not is_regex(pattern):
+                self._add_prefix(rule_index, pattern)
+            elif pattern.endswith("$") and not is_regex(pattern[:-1]):
+                # "$" also matches in front of a trailing newline
+                for description in (pattern[:-1], pattern[:-1] + "\n"):
+                    self._exact.setdefault(description, set()).add(rule_index)
+            else:
+                regex_parts.append(pattern)
+
+        if regex_parts:
+            self._regexes.append(
+                (rule_index, regex("(?:%s)" % "|".join("(?:%s)" % p for p in regex_parts)))
+            )
+
+    def _add_prefix(self, rule_index: int, prefix: str) -> None:
+        self._prefixes.setdefault(len(prefix), {}).setdefault(prefix, set()).add(rule_index)
+
+    def _matching_rules(self, service_description: ServiceName) -> tuple[int, ...]:
+        """Returns the indices of the matching rules in ruleset order"""
+        matched = set(self._exact.get(service_description, ()))
+        for length, prefixes in self._prefixes.items():
+            if (rule_indices := prefixes.get(service_description[:length])) is not None:
+                matched.update(rule_indices)
+
+        for rule_index, pattern in self._regexes:
+            if rule_index not in matched and pattern.match(service_description) is not None:
+                matched.add(rule_index)
+
+        # Negated conditions match the descriptions which are not matched by the patterns
+        matched.symmetric_difference_update(self._negated)
+
+        result = tuple(sorted(matched))
+        return self._results.setdefault(result, result)
+
+    def cache_info(self) -> MatchCacheInfo:
+        info = self.matching_rules.cache_info()
+        return MatchCacheInfo(hits=info.hits, misses=info.misses)
+
+
+class PreprocessedServiceRuleset(NamedTuple):
+    rules: PreprocessedServiceRules
+    service_description_matcher: ServiceDescriptionMatcher
 
 
 class RulesetMatchObject:
@@ -121,8 +222,6 @@ class RulesetMatcher:
         self.label_sources_of_host = self.ruleset_optimizer.label_sources_of_host
         self.label_sources_of_service = self.ruleset_optimizer.label_sources_of_service
 
-        self._service_match_cache: dict = {}
-
     def is_matching_host_ruleset(self, match_object: RulesetMatchObject, ruleset: Ruleset) -> bool:
         """Compute outcome of a ruleset set that just says yes/no
 
@@ -208,67 +307,30 @@ class RulesetMatcher:
             ruleset, with_foreign_hosts, is_binary=is_binary
         )
 
-        for (
-            value,
-            hosts,
-            service_labels_condition,
-            service_labels_condition_cache_id,
-            service_description_condition,
-        ) in optimized_ruleset:
-            if match_object.service_description is None:
-                continue
+        if match_object.service_description is None:
+            return
 
+        for rule_index in optimized_ruleset.service_description_matcher.matching_rules(
+            match_object.service_description
+        ):
+            value, hosts, service_labels_condition = optimized_ruleset.rules[rule_index]
             if match_object.host_name not in hosts:
                 continue
 
-            service_cache_id = (
-                match_object.service_cache_id,
-                service_description_condition,
-                service_labels_condition_cache_id,
-            )
-
-            if service_cache_id in self._service_match_cache:
-                match = self._service_match_cache[service_cache_id]
-            else:
-                match = self._matches_service_conditions(
-                    service_description_condition, service_labels_condition, match_object
-                )
-                self._service_match_cache[service_cache_id] = match
-
-            if match:
-                yield value
-
-    def _matches_service_conditions(
-        self,
-        service_description_condition: tuple[bool, Pattern[str]],
-        service_labels_condition: dict[str, str],
-        match_object: RulesetMatchObject,
-    ) -> bool:
-        if not self._matches_service_description_condition(
-            service_description_condition, match_object
-        ):
-            return False
-
-        if service_labels_condition and not matches_labels(
-            match_object.service_labels, service_labels_condition
-        ):
-            return False
-
-        return True
+            if service_labels_condition and not matches_labels(
+                match_object.service_labels, service_labels_condition
+            ):
+                continue
 
-    def _matches_service_description_condition(
-        self,
-        service_description_condition: tuple[bool, Pattern[str]],
-        match_object: RulesetMatchObject,
-    ) -> bool:
-        negate, pattern = service_description_condition
+            yield value
 
-        if (
-            match_object.service_description is not None
-            and pattern.match(match_object.service_description) is not None
-        ):
-            return not negate
-        return negate
+    def service_description_match_cache_info(self) -> MatchCacheInfo:
+        """Summarizes the service description match caches of all preprocessed rulesets"""
+        hits = misses = 0
+        for info in self.ruleset_optimizer.service_description_match_cache_infos():
+            hits += info.hits
+            misses += info.misses
+        return MatchCacheInfo(hits=hits, misses=misses)
 
     def get_values_for_generic_agent(
         self, ruleset: Ruleset, path_for_rule_matching: str
@@ -336,24 +398,25 @@ class RulesetOptimizer:
         # may contain a reduced set of hosts, since each process handles a subset
         self._all_processed_hosts = self._all_configured_hosts
 
-        # A factor which indicates how much hosts share the same host tag configuration (excluding folders).
-        # len(all_processed_hosts) / len(different tag combinations)
-        # It is used to determine the best rule evualation method
-        self._all_processed_hosts_similarity = 1.0
-
-        self._service_ruleset_cache: dict = {}
+        self._service_ruleset_cache: dict[tuple[int, bool], PreprocessedServiceRuleset] = {}
         self._host_ruleset_cache: dict = {}
         self._all_matching_hosts_match_cache: dict = {}
 
         # Reference dirname -> hosts in this dir including subfolders
         self._folder_host_lookup: dict[tuple[bool, str], set[HostName]] = {}
 
-        # Provides a list of hosts with the same hosttags, excluding the folder
-        self._hosts_grouped_by_tags: dict[tuple[tuple[TaggroupID, TagID], ...], set[HostName]] = {}
-        # Reference hostname -> tag group reference
-        self._host_grouped_ref: dict[HostName, tuple[tuple[TaggroupID, TagID], ...]] = {}
+        # The following inverted indices make it possible to resolve the host conditions of
+        # a rule with set operations instead of evaluating them host by host.
+        # Reference (taggroup_id, tag_id) -> hosts having this tag
+        self._hosts_by_tag: dict[tuple[TaggroupID, TagID], set[HostName]] = {}
+        # Reference folder path -> hosts located directly in this folder
+        self._hosts_by_path: dict[str, set[HostName]] = {}
+        # Reference (label_id, label_value) -> hosts having this label. Computing the labels
+        # of a host is expensive, so the hosts are only added on demand. The hosts already
+        # contained in the index are tracked in _label_indexed_hosts.
+        self._hosts_by_label: dict[tuple[str, str], set[HostName]] = {}
+        self._label_indexed_hosts: set[HostName] = set()
 
-        # TODO: Clean this one up?
         self._initialize_host_lookup()
 
     def clear_ruleset_caches(self) -> None:
@@ -363,6 +426,9 @@ class RulesetOptimizer:
     def clear_caches(self) -> None:
         self._host_ruleset_cache.clear()
         self._all_matching_hosts_match_cache.clear()
+        # The host labels may have changed (e.g. after a host label discovery)
+        self._hosts_by_label.clear()
+        self._label_indexed_hosts.clear()
 
     def all_processed_hosts(self) -> set[HostName]:
         """Returns a set of all processed hosts"""
@@ -381,30 +447,16 @@ class RulesetOptimizer:
 
         self._all_processed_hosts.update(nodes_and_clusters)
 
+        # Processed hosts are usually configured ones, which are already indexed
+        for hostname in self._all_processed_hosts.difference(self._all_configured_hosts):
+            self._add_host_to_lookup(hostname)
+
         # The folder host lookup includes a list of all -processed- hosts within a given
         # folder. Any update with set_all_processed hosts invalidates this cache, because
         # the scope of relevant hosts has changed. This is -good-, since the values in this
         # lookup are iterated one by one later on in all_matching_hosts
         self._folder_host_lookup = {}
 
-        self._adjust_processed_hosts_similarity()
-
-    def _adjust_processed_hosts_similarity(self) -> None:
-        """This function computes the tag similarities between of the processed hosts
-        The result is a similarity factor, which helps finding the most perfomant operation
-        for the current hostset"""
-        used_groups = {
-            self._host_grouped_ref.get(hostname, ()) for hostname in self._all_processed_hosts
-        }
-
-        if not used_groups:
-            self._all_processed_hosts_similarity = 1.0
-            return
-
-        self._all_processed_hosts_similarity = (
-            1.0 * len(self._all_processed_hosts) / len(used_groups)
-        )
-
     def get_host_ruleset(
         self, ruleset: Ruleset, with_foreign_hosts: bool, is_binary: bool
     ) -> PreprocessedHostRuleset:
@@ -452,7 +504,8 @@ class RulesetOptimizer:
     def _convert_service_ruleset(
         self, ruleset: Ruleset, with_foreign_hosts: bool, is_binary: bool
     ) -> PreprocessedServiceRuleset:
-        new_rules: PreprocessedServiceRuleset = []
+        new_rules: PreprocessedServiceRules = []
+        service_description_conditions: list[HostOrServiceConditions | None] = []
         for rule in ruleset:
             if _is_disabled(rule):
                 continue
@@ -461,48 +514,20 @@ class RulesetOptimizer:
             # recomputation later
             hosts = self._all_matching_hosts(rule["condition"], with_foreign_hosts)
 
-            # Prepare cache id
-            service_labels_condition = rule["condition"].get("service_labels", {})
-            service_labels_condition_cache_id = tuple(
-                (label_id, _tags_or_labels_cache_id(label_spec))
-                for label_id, label_spec in service_labels_condition.items()
-            )
-
-            # And now preprocess the configured patterns in the servlist
-            new_rules.append(
-                (
-                    rule["value"],
-                    hosts,
-                    service_labels_condition,
-                    service_labels_condition_cache_id,
-                    self._convert_pattern_list(rule["condition"].get("service_description")),
-                )
-            )
-        return new_rules
-
-    def _convert_pattern_list(
-        self, patterns: HostOrServiceConditions | None
-    ) -> PreprocessedPattern:
-        """Compiles a list of service match patterns to a to a single regex
-
-        Reducing the number of individual regex matches improves the performance dramatically.
-        This function assumes either all or no pattern is negated (like WATO creates the rules).
-        """
-        if not patterns:
-            return False, regex("")  # Match everything
-
-        negate, parsed_patterns = parse_negated_condition_list(patterns)
+            new_rules.append((rule["value"], hosts, rule["condition"].get("service_labels", {})))
+            service_description_conditions.append(rule["condition"].get("service_description"))
 
-        pattern_parts = []
-        for p in parsed_patterns:
-            if isinstance(p, dict):
-                pattern_parts.append(p["$regex"])
-            else:
-                pattern_parts.append(p)
+        # And now compile the configured patterns of all rules into a single matcher
+        return PreprocessedServiceRuleset(
+            rules=new_rules,
+            service_description_matcher=ServiceDescriptionMatcher(service_description_conditions),
+        )
 
-        return negate, regex("(?:%s)" % "|".join("(?:%s)" % p for p in pattern_parts))
+    def service_description_match_cache_infos(self) -> Iterable[MatchCacheInfo]:
+        for preprocessed_ruleset in self._service_ruleset_cache.values():
+            yield preprocessed_ruleset.service_description_matcher.cache_info()
 
-    def _all_matching_hosts(  # pylint: disable=too-many-branches
+    def _all_matching_hosts(
         self, condition: RuleConditionsSpec, with_foreign_hosts: bool
     ) -> set[HostName]:
         """Returns a set containing the names of hosts that match the given
@@ -538,59 +563,122 @@ class RulesetOptimizer:
             valid_hosts
         )
 
-        if tag_conditions and hostlist is None and not labels:
-            # TODO: Labels could also be optimized like the tags
-            matched_by_tags = self._match_hosts_by_tags(cache_id, valid_hosts, tag_conditions)
-            if matched_by_tags is not None:
-                return matched_by_tags
-
-        matching: set[HostName] = set()
-        only_specific_hosts = (
-            hostlist is not None
-            and not isinstance(hostlist, dict)
-            and all(not isinstance(x, dict) for x in hostlist)
-        )
-
         if hostlist == []:
-            pass  # Empty host list -> Nothing matches
+            matching: set[HostName] = set()  # Empty host list -> Nothing matches
 
         elif not tag_conditions and not labels and not hostlist:
             # If no tags are specified and the hostlist only include @all (all hosts)
             matching = valid_hosts
 
-        elif not tag_conditions and not labels and only_specific_hosts and hostlist is not None:
-            # If no tags are specified and there are only specific hosts we already have the matches
-            matching = valid_hosts.intersection(hostlist)
-
         else:
-            # If the rule has only exact host restrictions, we can thin out the list of hosts to check
-            if only_specific_hosts and hostlist is not None:
-                hosts_to_check = valid_hosts.intersection(hostlist)
-            else:
-                hosts_to_check = valid_hosts
-
-            for hostname in hosts_to_check:
-                # When no tag matching is requested, do not filter by tags. Accept all hosts
-                # and filter only by hostlist
-                if tag_conditions and not self.matches_host_tags(
-                    self._host_tags[hostname],
-                    tag_conditions,
-                ):
-                    continue
+            matching = self._match_hosts_by_conditions(
+                valid_hosts, hostlist, tag_conditions, labels
+            )
 
-                if labels:
-                    host_labels = self.labels_of_host(hostname)
-                    if not matches_labels(host_labels, labels):
-                        continue
+        self._all_matching_hosts_match_cache[cache_id] = matching
+        return matching
 
-                if not self.matches_host_name(hostlist, hostname):
-                    continue
+    def _match_hosts_by_conditions(
+        self,
+        valid_hosts: set[HostName],
+        hostlist: HostOrServiceConditions | None,
+        tag_conditions: TaggroupIDToTagCondition,
+        labels: LabelConditions,
+    ) -> set[HostName]:
+        """Resolve the host conditions of a rule using the inverted host indices
 
-                matching.add(hostname)
+        The cheap conditions are applied first to thin out the set of candidates as early
+        as possible. Only the host name regexes need to be evaluated host by host."""
+        negate, host_entries = parse_negated_condition_list(hostlist) if hostlist else (False, [])
+        explicit_hosts = {entry for entry in host_entries if not isinstance(entry, dict)}
+        host_regexes = [regex(entry["$regex"]) for entry in host_entries if isinstance(entry, dict)]
+
+        matching = valid_hosts
+        if negate:
+            matching = matching.difference(explicit_hosts)
+        elif host_entries and not host_regexes:
+            # The rule has only exact host restrictions
+            matching = matching.intersection(explicit_hosts)
+
+        for taggroup_id, tag_condition in tag_conditions.items():
+            if not matching:
+                return set()
+            matching = self._filter_hosts_by_tag_condition(matching, taggroup_id, tag_condition)
+
+        if labels and matching:
+            matching = self._filter_hosts_by_labels(matching, labels)
+
+        if host_regexes:
+            matching = {
+                hostname
+                for hostname in matching
+                if (
+                    hostname in explicit_hosts
+                    or any(pattern.match(hostname) is not None for pattern in host_regexes)
+                )
+                is not negate
+            }
 
-        self._all_matching_hosts_match_cache[cache_id] = matching
         return matching
 
+    def _filter_hosts_by_tag_condition(
+        self,
+        hosts: set[HostName],
+        taggroup_id: TaggroupID,
+        tag_condition: TagCondition,
+    ) -> set[HostName]:
+        if isinstance(tag_condition, dict):
+            if "$ne" in tag_condition:
+                return hosts.difference(
+                    self._hosts_by_tag.get(
+                        (taggroup_id, cast(TagConditionNE, tag_condition)["$ne"]), ()
+                    )
+                )
+
+            if "$or" in tag_condition:
+                return hosts.intersection(
+                    self._hosts_with_any_tag(
+                        taggroup_id, cast(TagConditionOR, tag_condition)["$or"]
+                    )
+                )
+
+            if "$nor" in tag_condition:
+                return hosts.difference(
+                    self._hosts_with_any_tag(
+                        taggroup_id, cast(TagConditionNOR, tag_condition)["$nor"]
+                    )
+                )
+
+            raise NotImplementedError()
+
+        return hosts.intersection(self._hosts_by_tag.get((taggroup_id, tag_condition), ()))
+
+    def _hosts_with_any_tag(
+        self, taggroup_id: TaggroupID, tag_ids: Iterable[TagID]
+    ) -> set[HostName]:
+        return set().union(
+            *(self._hosts_by_tag.get((taggroup_id, tag_id), ()) for tag_id in tag_ids)
+        )
+
+    def _filter_hosts_by_labels(
+        self, hosts: set[HostName], labels: LabelConditions
+    ) -> set[HostName]:
+        self._add_hosts_to_label_index(hosts)
+        for label_id, label_spec in labels.items():
+            if isinstance(label_spec, dict):
+                hosts = hosts.difference(
+                    self._hosts_by_label.get((label_id, label_spec["$ne"]), ())
+                )
+            else:
+                hosts = hosts.intersection(self._hosts_by_label.get((label_id, label_spec), ()))
+        return hosts
+
+    def _add_hosts_to_label_index(self, hosts: set[HostName]) -> None:
+        for hostname in hosts.difference(self._label_indexed_hosts):
+            for label_id, label_value in self.labels_of_host(hostname).items():
+                self._hosts_by_label.setdefault((label_id, label_value), set()).add(hostname)
+            self._label_indexed_hosts.add(hostname)
+
     def matches_host_name(
         self, host_entries: HostOrServiceConditions | None, hostname: HostName
     ) -> bool:
@@ -657,91 +745,19 @@ class RulesetOptimizer:
             rule_path,
         )
 
-    # TODO: Generalize this optimization: Build some kind of key out of the tag conditions
-    # (positive, negative, ...). Make it work with the new tag group based "$or" handling.
-    def _match_hosts_by_tags(
-        self,
-        cache_id: tuple[
-            tuple[tuple[str, ...], tuple[tuple[str, Any], ...], tuple[tuple[Any, Any], ...], Any],
-            bool,
-        ],
-        valid_hosts: set[HostName],
-        tag_conditions: TaggroupIDToTagCondition,
-    ) -> set | None:
-        matching = set()
-        negative_match_tags = set()
-        positive_match_tags = set()
-        for taggroup_id, tag_condition in tag_conditions.items():
-            if isinstance(tag_condition, dict):
-                if "$ne" in tag_condition:
-                    negative_match_tags.add(
-                        (
-                            taggroup_id,
-                            cast(TagConditionNE, tag_condition)["$ne"],
-                        )
-                    )
-                    continue
-
-                if "$or" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
-
-                if "$nor" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
-
-                raise NotImplementedError()
-
-            positive_match_tags.add((taggroup_id, tag_condition))
-
-        # TODO:
-        # if has_specific_folder_tag or self._all_processed_hosts_similarity < 3.0:
-        if self._all_processed_hosts_similarity < 3.0:
-            # Without shared folders
-            for hostname in valid_hosts:
-                if positive_match_tags <= self._host_tags[
-                    hostname
-                ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                    matching.add(hostname)
-
-            self._all_matching_hosts_match_cache[cache_id] = matching
-            return matching
-
-        # With shared folders
-        checked_hosts: set[str] = set()
-        for hostname in valid_hosts:
-            if hostname in checked_hosts:
-                continue
-
-            hosts_with_same_tag = self._filter_hosts_with_same_tags_as_host(hostname, valid_hosts)
-            checked_hosts.update(hosts_with_same_tag)
-
-            if positive_match_tags <= self._host_tags[
-                hostname
-            ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                matching.update(hosts_with_same_tag)
-
-        self._all_matching_hosts_match_cache[cache_id] = matching
-        return matching
-
-    def _filter_hosts_with_same_tags_as_host(
-        self,
-        hostname: HostName,
-        hosts: set[HostName],
-    ) -> set[HostName]:
-        return self._hosts_grouped_by_tags[self._host_grouped_ref[hostname]].intersection(hosts)
-
     def get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> set[HostName]:
         cache_id = with_foreign_hosts, folder_path
         if cache_id not in self._folder_host_lookup:
-            hosts_in_folder = set()
+            hosts_in_folder: set[HostName] = set()
             relevant_hosts = (
                 self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
             )
 
-            for hostname in relevant_hosts:
-                host_path = self._host_paths.get(hostname, "/")
+            for host_path, hosts_in_path in self._hosts_by_path.items():
                 if host_path.startswith(folder_path):
-                    hosts_in_folder.add(hostname)
+                    hosts_in_folder.update(hosts_in_path)
 
+            hosts_in_folder.intersection_update(relevant_hosts)
             self._folder_host_lookup[cache_id] = hosts_in_folder
             return hosts_in_folder
 
@@ -749,9 +765,12 @@ class RulesetOptimizer:
 
     def _initialize_host_lookup(self) -> None:
         for hostname in self._all_configured_hosts:
-            group_ref = tuple(sorted(self._host_tags[hostname]))
-            self._hosts_grouped_by_tags.setdefault(group_ref, set()).add(hostname)
-            self._host_grouped_ref[hostname] = group_ref
+            self._add_host_to_lookup(hostname)
+
+    def _add_host_to_lookup(self, hostname: HostName) -> None:
+        for tag in self._host_tags.get(hostname, ()):
+            self._hosts_by_tag.setdefault(tag, set()).add(hostname)
+        self._hosts_by_path.setdefault(self._host_paths.get(hostname, "/"), set()).add(hostname)
 
     def labels_of_host(self, hostname: HostName) -> Labels:
         """Returns the effective set of host labels from all available sources
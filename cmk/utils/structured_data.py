@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import gzip
 import io
+import os
 import pprint
 from collections import Counter
 from pathlib import Path
@@ -44,6 +45,8 @@ from cmk.utils.type_defs import HostName
 SDRawPath = str
 # TODO improve this
 SDRawTree = Dict
+# Changes needed to restore an archived tree from the next newer one, see make_raw_delta()
+SDRawDelta = Dict
 
 SDNodeName = str
 SDPath = Tuple[SDNodeName, ...]
@@ -81,6 +84,11 @@ _ROWS_KEY = "Rows"
 _NODES_KEY = "Nodes"
 _RETENTIONS_KEY = "Retentions"
 
+# Used for the deltas of archived trees
+_DELTA_KEY = "Delta"
+_REMOVED_NODES_KEY = "RemovedNodes"
+_REMOVED_ROWS_KEY = "RemovedRows"
+
 
 class SDDeltaResult(NamedTuple):
     counter: SDDeltaCounter
@@ -200,11 +208,212 @@ class StructuredDataStore:
         self._gz_file(host_name).unlink(missing_ok=True)
 
     def archive(self, *, host_name: HostName, archive_dir: Union[Path, str]) -> None:
+        """Move the current tree to the archive
+
+        Only the newest archived tree is stored as a whole. The tree archived before is replaced
+        by the changes needed to restore it from the newest one, see make_raw_delta(). The
+        modification times of the files are kept, they are used to clean up the oldest files."""
         target_dir = Path(archive_dir, str(host_name))
         target_dir.mkdir(parents=True, exist_ok=True)
 
         filepath = self._host_file(host_name)
-        filepath.rename(target_dir / str(int(filepath.stat().st_mtime)))
+        target_filepath = target_dir / str(int(filepath.stat().st_mtime))
+        archived_filepaths = sorted(target_dir.iterdir(), key=_archive_timestamp)
+        raw_tree = store.load_object_from_file(filepath, default=None)
+        filepath.rename(target_filepath)
+
+        if not archived_filepaths or not _is_raw_tree(raw_tree):
+            return
+
+        if (previous_filepath := archived_filepaths[-1]) == target_filepath:
+            return
+
+        previous = self.load_archive_file(previous_filepath)
+        if previous.raw_tree is None or not _is_raw_tree(previous.raw_tree):
+            return
+
+        stat = previous_filepath.stat()
+        store.save_object_to_file(
+            previous_filepath, {_DELTA_KEY: make_raw_delta(raw_tree, previous.raw_tree)}
+        )
+        os.utime(previous_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    @staticmethod
+    def load_archive_file(file_path: Path) -> ArchivedRawTree:
+        content = store.load_object_from_file(file_path, default=None)
+        if isinstance(content, dict) and _DELTA_KEY in content:
+            return ArchivedRawTree(raw_tree=None, raw_delta=content[_DELTA_KEY])
+        return ArchivedRawTree(raw_tree=content or None, raw_delta=None)
+
+
+def _archive_timestamp(file_path: Path) -> int:
+    try:
+        return int(file_path.name)
+    except ValueError:
+        return -1
+
+
+class ArchivedRawTree(NamedTuple):
+    """An archived tree is either stored as a whole or as the changes to the next newer one"""
+
+    raw_tree: Optional[SDRawTree]
+    raw_delta: Optional[SDRawDelta]
+
+
+def _is_raw_tree(raw_tree: object) -> bool:
+    # Trees of older versions are stored in a legacy format, see _deserialize_legacy()
+    return isinstance(raw_tree, dict) and all(
+        key in raw_tree for key in (ATTRIBUTES_KEY, TABLE_KEY, _NODES_KEY)
+    )
+
+
+def _empty_raw_tree() -> SDRawTree:
+    return {ATTRIBUTES_KEY: {}, TABLE_KEY: {}, _NODES_KEY: {}}
+
+
+def make_raw_delta(raw_tree: SDRawTree, previous_raw_tree: SDRawTree) -> SDRawDelta:
+    """Compute the changes needed to restore the previous tree from the given one
+
+    Only the changed attributes and tables and the nodes containing them are part of the delta.
+    Attributes are stored as a whole, of the tables only the changed rows are stored. Both trees
+    have to be serialized in the current format, see _is_raw_tree()."""
+    raw_delta: SDRawDelta = {}
+
+    if raw_tree[ATTRIBUTES_KEY] != previous_raw_tree[ATTRIBUTES_KEY]:
+        raw_delta[ATTRIBUTES_KEY] = previous_raw_tree[ATTRIBUTES_KEY]
+
+    if raw_tree[TABLE_KEY] != previous_raw_tree[TABLE_KEY]:
+        raw_delta[TABLE_KEY] = _make_raw_table_delta(
+            raw_tree[TABLE_KEY], previous_raw_tree[TABLE_KEY]
+        )
+
+    raw_nodes = raw_tree[_NODES_KEY]
+    previous_raw_nodes = previous_raw_tree[_NODES_KEY]
+    if raw_node_deltas := {
+        name: make_raw_delta(raw_nodes.get(name, _empty_raw_tree()), previous_raw_node)
+        for name, previous_raw_node in previous_raw_nodes.items()
+        if raw_nodes.get(name) != previous_raw_node
+    }:
+        raw_delta[_NODES_KEY] = raw_node_deltas
+
+    if removed_names := [name for name in raw_nodes if name not in previous_raw_nodes]:
+        raw_delta[_REMOVED_NODES_KEY] = removed_names
+
+    return raw_delta
+
+
+def apply_raw_delta(raw_tree: SDRawTree, raw_delta: SDRawDelta) -> SDRawTree:
+    """Restore the previous tree, the unchanged parts are shared with the given tree"""
+    raw_nodes = raw_tree[_NODES_KEY]
+    removed_names = set(raw_delta.get(_REMOVED_NODES_KEY, []))
+    previous_raw_nodes = {
+        name: raw_node for name, raw_node in raw_nodes.items() if name not in removed_names
+    }
+    for name, raw_node_delta in raw_delta.get(_NODES_KEY, {}).items():
+        previous_raw_nodes[name] = apply_raw_delta(
+            raw_nodes.get(name, _empty_raw_tree()), raw_node_delta
+        )
+
+    return {
+        ATTRIBUTES_KEY: raw_delta.get(ATTRIBUTES_KEY, raw_tree[ATTRIBUTES_KEY]),
+        TABLE_KEY: (
+            _apply_raw_table_delta(raw_tree[TABLE_KEY], raw_delta[TABLE_KEY])
+            if TABLE_KEY in raw_delta
+            else raw_tree[TABLE_KEY]
+        ),
+        _NODES_KEY: previous_raw_nodes,
+    }
+
+
+def _make_raw_table_delta(raw_table: SDRawTree, previous_raw_table: SDRawTree) -> SDRawTree:
+    # A table delta without removed rows replaces the whole table
+    key_columns = previous_raw_table.get(_KEY_COLUMNS_KEY, [])
+    if raw_table.get(_KEY_COLUMNS_KEY, key_columns) != key_columns:
+        return previous_raw_table
+
+    try:
+        rows = {_raw_row_ident(row, key_columns): row for row in raw_table.get(_ROWS_KEY, [])}
+        previous_rows = {
+            _raw_row_ident(row, key_columns): row for row in previous_raw_table.get(_ROWS_KEY, [])
+        }
+    except TypeError:
+        # Unhashable values in the key columns
+        return previous_raw_table
+
+    raw_table_delta = {
+        _KEY_COLUMNS_KEY: key_columns,
+        _ROWS_KEY: [row for ident, row in previous_rows.items() if rows.get(ident) != row],
+        _REMOVED_ROWS_KEY: [ident for ident in rows if ident not in previous_rows],
+    }
+    if _RETENTIONS_KEY in previous_raw_table:
+        raw_table_delta[_RETENTIONS_KEY] = previous_raw_table[_RETENTIONS_KEY]
+    return raw_table_delta
+
+
+def _apply_raw_table_delta(raw_table: SDRawTree, raw_table_delta: SDRawTree) -> SDRawTree:
+    if _REMOVED_ROWS_KEY not in raw_table_delta:
+        return raw_table_delta
+
+    key_columns = raw_table_delta[_KEY_COLUMNS_KEY]
+    removed_idents = set(raw_table_delta[_REMOVED_ROWS_KEY])
+    changed_rows = {_raw_row_ident(row, key_columns): row for row in raw_table_delta[_ROWS_KEY]}
+
+    rows = []
+    for row in raw_table.get(_ROWS_KEY, []):
+        if (ident := _raw_row_ident(row, key_columns)) not in removed_idents:
+            rows.append(changed_rows.pop(ident, row))
+    rows.extend(changed_rows.values())
+
+    previous_raw_table: SDRawTree = {}
+    if rows:
+        previous_raw_table.update({_KEY_COLUMNS_KEY: key_columns, _ROWS_KEY: rows})
+    if _RETENTIONS_KEY in raw_table_delta:
+        previous_raw_table[_RETENTIONS_KEY] = raw_table_delta[_RETENTIONS_KEY]
+    return previous_raw_table
+
+
+def _raw_row_ident(row: SDRow, key_columns: SDKeyColumns) -> SDRowIdent:
+    return tuple(row[k] for k in key_columns if k in row)
+
+
+def get_changed_raw_tree(raw_tree: SDRawTree, raw_delta: SDRawDelta) -> SDRawTree:
+    """Keep only the parts of the tree which are touched by the delta
+
+    The delta has to be computed between this tree and the tree to compare with. Comparing both
+    restricted trees gives the same result as comparing the whole trees, but only the changed
+    parts need to be deserialized."""
+    raw_nodes = raw_tree[_NODES_KEY]
+    changed_raw_nodes = {
+        name: get_changed_raw_tree(raw_nodes[name], raw_node_delta)
+        for name, raw_node_delta in raw_delta.get(_NODES_KEY, {}).items()
+        if name in raw_nodes
+    }
+    for name in raw_delta.get(_REMOVED_NODES_KEY, []):
+        if name in raw_nodes:
+            changed_raw_nodes[name] = raw_nodes[name]
+
+    return {
+        ATTRIBUTES_KEY: raw_tree[ATTRIBUTES_KEY] if ATTRIBUTES_KEY in raw_delta else {},
+        TABLE_KEY: raw_tree[TABLE_KEY] if TABLE_KEY in raw_delta else {},
+        _NODES_KEY: changed_raw_nodes,
+    }
+
+
+def get_raw_sub_tree(raw_tree: SDRawTree, path: SDPath) -> SDRawTree:
+    """Keep only the node below the path and the nodes leading to it"""
+    if not path or not _is_raw_tree(raw_tree):
+        return raw_tree
+
+    raw_nodes = raw_tree[_NODES_KEY]
+    return {
+        ATTRIBUTES_KEY: {},
+        TABLE_KEY: {},
+        _NODES_KEY: (
+            {path[0]: get_raw_sub_tree(raw_nodes[path[0]], path[1:])}
+            if path[0] in raw_nodes
+            else {}
+        ),
+    }
 
 
 # .
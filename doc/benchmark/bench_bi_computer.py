@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark the computation of BI aggregations
+
+Synthetic aggregations with one branch per host (the host itself and its
+services) are computed from livestatus like status rows. The first page load
+loads and computes all trees, the following ones only recompute the branches of
+the hosts whose state changed in between. Finally, the aggregations of a single
+host are selected with and without the branch index:
+
+    OMD_SITE=heute PYTHONPATH=. python3 doc/benchmark/bench_bi_computer.py --aggregations 3000
+"""
+
+import argparse
+import pickle
+import random
+import time
+
+from livestatus import LivestatusResponse, SiteId
+
+from cmk.utils.type_defs import HostName
+
+from cmk.bi.aggregation import BIAggregation
+from cmk.bi.aggregation_functions import BIAggregationFunctionWorst
+from cmk.bi.branch_index import BIBranchIndex
+from cmk.bi.computer import BIAggregationFilter, BIComputer
+from cmk.bi.data_fetcher import BIStatusFetcher
+from cmk.bi.lib import BIAggregationComputationOptions, BIAggregationGroups, SitesCallback
+from cmk.bi.rule_interface import BIRuleProperties
+from cmk.bi.trees import BICompiledAggregation, BICompiledLeaf, BICompiledRule
+
+
+def _rule(title: str, nodes: list, host_name: HostName) -> BICompiledRule:
+    return BICompiledRule(
+        title,
+        "default",
+        nodes,
+        [(SiteId("heute"), host_name)],
+        BIRuleProperties(
+            {"title": title, "comment": "", "state_messages": {}, "docu_url": "", "icon": ""}
+        ),
+        BIAggregationFunctionWorst({"count": 1, "restrict_state": 2}),
+        {},
+    )
+
+
+def _aggregation(number: int, services: int) -> BICompiledAggregation:
+    host_name = HostName("host%d" % number)
+    leaves = [
+        BICompiledLeaf(host_name, "heute", "Service %d" % service) for service in range(services)
+    ]
+    branch = _rule(
+        "Host %s" % host_name,
+        [_rule("State of %s" % host_name, [BICompiledLeaf(host_name, "heute")], host_name)]
+        + [_rule("Services of %s" % host_name, leaves, host_name)],
+        host_name,
+    )
+    return BICompiledAggregation(
+        "aggr%d" % number,
+        [branch],
+        BIAggregationComputationOptions(
+            {"disabled": False, "use_hard_states": False, "escalate_downtimes_as_warn": False}
+        ),
+        {},
+        BIAggregationGroups({"names": ["Hosts"], "paths": []}),
+    )
+
+
+def _status_rows(hosts: int, services: int, changed: set[int], run: int) -> LivestatusResponse:
+    return LivestatusResponse(
+        [
+            [
+                "heute",
+                "host%d" % number,
+                0,
+                1,
+                0,
+                "Packet received via smart PING",
+                0,
+                1,
+                0,
+                [
+                    [
+                        "Service %d" % service,
+                        (run if number in changed else 0) % 3,
+                        1,
+                        "OK - all fine",
+                        0,
+                        1,
+                        1,
+                        0,
+                        0,
+                        1,
+                    ]
+                    for service in range(services)
+                ],
+            ]
+            for number in range(hosts)
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--aggregations", type=int, default=3000)
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--changed", type=float, default=1.0, help="changed hosts in percent")
+    parser.add_argument("--loads", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(42)
+    serialized = [
+        pickle.dumps(_aggregation(number, args.services).serialize())
+        for number in range(args.aggregations)
+    ]
+
+    start = time.perf_counter()
+    compiled_aggregations = {}
+    for data in serialized:
+        compiled_aggregation = BIAggregation.create_trees_from_schema(pickle.loads(data))
+        compiled_aggregations[compiled_aggregation.id] = compiled_aggregation
+    print("loading the trees: %7.1f ms" % ((time.perf_counter() - start) * 1000))
+
+    status_fetcher = BIStatusFetcher(SitesCallback(lambda: [], lambda *a, **kw: [], str))
+    computer = BIComputer(compiled_aggregations, status_fetcher)
+    required_aggregations = [
+        (compiled_aggregation, compiled_aggregation.branches)
+        for compiled_aggregation in compiled_aggregations.values()
+    ]
+    for run in range(args.loads):
+        changed = set(
+            random.sample(range(args.aggregations), int(args.aggregations * args.changed / 100))
+        )
+        rows = _status_rows(args.aggregations, args.services, changed, run)
+        start = time.perf_counter()
+        status_fetcher.states = status_fetcher.create_bi_status_data(rows)
+        fetched = time.perf_counter()
+        results = computer.compute_results(required_aggregations)
+        computed = time.perf_counter()
+        print(
+            "page load %d: status data %7.1f ms, computation %7.1f ms (%d results)"
+            % (run, (fetched - start) * 1000, (computed - fetched) * 1000, len(results))
+        )
+
+    # The aggregations of a single host, e.g. the BI icon of a host
+    host_filter = BIAggregationFilter([HostName("host42")], [], [], [], [], [])
+    for title, branch_index in [
+        ("all branches", None),
+        ("branch index", BIBranchIndex.create(compiled_aggregations)),
+    ]:
+        computer = BIComputer(compiled_aggregations, status_fetcher, branch_index)
+        start = time.perf_counter()
+        computer.get_required_aggregations(host_filter)
+        print("host filter, %s: %7.1f ms" % (title, (time.perf_counter() - start) * 1000))
+
+
+if __name__ == "__main__":
+    main()
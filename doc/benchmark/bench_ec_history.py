@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark queries of the Event Console history with the file and SQLite backends
+
+The same synthetic history, spread over several days, is written with both
+backends. Then some typical queries of the GUI are answered by both:
+
+    OMD_SITE=heute PYTHONPATH=. python3 doc/benchmark/bench_ec_history.py --events 200000
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import cmk.ec.export as ec
+from cmk.ec.history import History
+from cmk.ec.main import make_config, StatusTableEvents, StatusTableHistory
+from cmk.ec.query import QueryGET
+
+_QUERIES = {
+    "last hour, limit 1000": "Filter: history_time >= {hour_ago}\nLimit: 1000",
+    "one host, all days": "Filter: event_host = host42",
+    "one event": "Filter: event_id = 4711",
+    "host regex, limit 1000": "Filter: event_host ~~ HOST4.*\nLimit: 1000",
+}
+
+
+class _StatusServer:
+    def __init__(self, history: History) -> None:
+        self._table = StatusTableHistory(logging.getLogger("cmk.mkeventd"), history)
+
+    def table(self, name: str) -> StatusTableHistory:
+        return self._table
+
+
+def _history(archive_mode: str, omd_root: Path) -> History:
+    config = ec.default_config()
+    config["archive_mode"] = archive_mode  # type: ignore[typeddict-item]
+    return History(
+        ec.settings("1.2.3i45", omd_root, omd_root / "etc", ["mkeventd"]),
+        make_config(config),
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+
+
+def _fill(history: History, events: int, days: int, now: float) -> None:
+    start = now - days * 86400
+    for event_id in range(events):
+        timestamp = start + event_id * days * 86400 / events
+        event: Any = {
+            "id": event_id,
+            "host": "host%d" % (event_id % 500),
+            "rule_id": "rule%d" % (event_id % 50),
+            "text": "Something happened on interface eth%d" % (event_id % 8),
+            "first": timestamp,
+            "last": timestamp,
+            "match_groups": ("eth%d" % (event_id % 8),),
+        }
+        with mock.patch("time.time", lambda: timestamp), mock.patch(
+            "time.localtime", lambda: time.gmtime(timestamp)
+        ):
+            history.add(event, "NEW")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=10)
+    args = parser.parse_args()
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        histories = {mode: _history(mode, Path(tmp_dir, mode)) for mode in ("file", "sqlite")}
+        for mode, history in histories.items():
+            start = time.perf_counter()
+            _fill(history, args.events, args.days, now)
+            elapsed = time.perf_counter() - start
+            print("%-6s: adding %d events took %.1f s" % (mode, args.events, elapsed))
+
+        for title, headers in _QUERIES.items():
+            raw_query = ["GET history"] + headers.format(hour_ago=now - 3600).split("\n")
+            for mode, history in histories.items():
+                query = QueryGET(
+                    _StatusServer(history), raw_query, logging.getLogger("cmk.mkeventd")
+                )
+                start = time.perf_counter()
+                rows = list(history.get(query))
+                elapsed = time.perf_counter() - start
+                print("%-24s %-6s %6d rows %9.1f ms" % (title, mode, len(rows), elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
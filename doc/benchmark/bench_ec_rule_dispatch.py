@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark the rule matching of the Event Console
+
+A synthetic rule pack with host specific rules, plain text and regex message
+conditions is matched against random syslog messages, once with and once
+without preselecting the candidate rules. All rules drop the matching events,
+so no core or history is needed:
+
+    OMD_SITE=heute PYTHONPATH=. python3 doc/benchmark/bench_ec_rule_dispatch.py --rules 2000
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import cmk.ec.export as ec
+from cmk.ec.event import Event
+from cmk.ec.history import History
+from cmk.ec.main import (
+    default_slave_status_master,
+    ECLock,
+    EventServer,
+    EventStatus,
+    make_config,
+    Perfcounters,
+    StatusTableEvents,
+    StatusTableHistory,
+)
+from cmk.ec.rule_dispatch import RuleDispatcher
+
+_MESSAGES = [
+    "kernel: eth%d link is down",
+    "sshd[%d]: Failed password for root",
+    "Disk /dev/sd%d has failed",
+    "Temperature is %d degrees",
+    "CRON[%d]: session opened for user root",
+]
+
+
+def _rule(number: int, hosts: int) -> dict[str, Any]:
+    rule: dict[str, Any] = {"id": "rule%d" % number, "drop": True, "state": 0}
+    if number % 3 == 0:
+        rule["match_host"] = "host%d" % (number % hosts)
+    if number % 2:
+        rule["match"] = r"Disk /dev/sd%d has failed" % number
+    else:
+        rule["match"] = r"eth%d link is (up|down)$" % number
+    return rule
+
+
+def _events(count: int, rules: int, hosts: int) -> list[Event]:
+    return [
+        {
+            "host": "host%d" % random.randrange(hosts),
+            "text": random.choice(_MESSAGES) % random.randrange(rules * 2),
+            "facility": 1,
+            "priority": 5,
+            "ipaddress": "",
+            "application": "",
+            "time": time.time(),
+        }
+        for _event in range(count)
+    ]
+
+
+def _event_server(config: ec.ConfigFromWATO, omd_root: Path) -> EventServer:
+    logger = logging.getLogger("cmk.mkeventd")
+    settings = ec.settings("1.2.3i45", omd_root, omd_root / "etc", ["mkeventd"])
+    perfcounters = Perfcounters(logger)
+    history = History(
+        settings,
+        make_config(config),
+        logger,
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    return EventServer(
+        logger,
+        settings,
+        make_config(config),
+        default_slave_status_master(),
+        perfcounters,
+        ECLock(logger),
+        history,
+        EventStatus(settings, make_config(config), perfcounters, history, logger),
+        StatusTableEvents.columns,
+        False,
+    )
+
+
+def _measure(title: str, server: EventServer, events: list[Event]) -> None:
+    start = time.perf_counter()
+    for event in events:
+        server.process_event(event.copy())
+    elapsed = time.perf_counter() - start
+    print("%-28s %8.1f µs per event" % (title, elapsed * 1000000 / len(events)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--hosts", type=int, default=200)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    config = ec.default_config()
+    config["rule_packs"] = [
+        {
+            "id": "bench",
+            "title": "Benchmark",
+            "disabled": False,
+            "rules": [_rule(number, args.hosts) for number in range(args.rules)],
+        }
+    ]
+    events = _events(args.events, args.rules, args.hosts)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server = _event_server(config, Path(tmp_dir))
+        server.compile_rules(config["rule_packs"])
+        print("%d rules, %d events" % (args.rules, args.events))
+        _measure("preselected rules", server, events)
+
+        candidates = RuleDispatcher.candidates
+        RuleDispatcher.candidates = lambda self, event: self.rules  # type: ignore[assignment]
+        try:
+            _measure("all rules", server, events)
+        finally:
+            RuleDispatcher.candidates = candidates  # type: ignore[assignment]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark the upsampling and the statistics of the predictive levels
+
+Synthetic RRD slices with gaps are upsampled and summarized like it is done when computing
+a prediction, once with the numpy based code and once with the former list based code:
+
+    OMD_SITE=heute PYTHONPATH=. python3 doc/benchmark/bench_prediction.py --slices 12
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Callable, List, Tuple
+
+from cmk.utils.prediction import DataStats, TimeSeries, TimeSeriesValues, TimeWindow
+
+from cmk.base import prediction
+
+
+def _slices(count: int, step: int) -> List[Tuple[TimeSeries, int]]:
+    """One day of five minute values per slice, shifted by a week each"""
+    slices = []
+    for number in range(count):
+        shift = number * 7 * 86400
+        start = 1640995200 - shift
+        values: TimeSeriesValues = [
+            None if random.random() < 0.05 else random.uniform(0, 100) for _ in range(288)
+        ]
+        slices.append((TimeSeries(values, (start, start + 86400, 300)), shift))
+    return slices
+
+
+def _bfill_upsample_of_lists(ts: TimeSeries, twindow: TimeWindow, shift: int) -> TimeSeriesValues:
+    upsa = []
+    i = 0
+    current_times = [t + ts.step for t in range(ts.start, ts.end, ts.step)]
+    for t in range(*twindow):
+        if t >= current_times[i] + shift:
+            i += 1
+        upsa.append(ts.values[i])
+    return upsa
+
+
+def _data_stats_of_lists(slices: List[TimeSeriesValues]) -> DataStats:
+    descriptors: DataStats = []
+    for time_column in zip(*slices):
+        point_line = [x for x in time_column if x is not None]
+        if not point_line:
+            descriptors.append([None, None, None, None])
+            continue
+        samples = len(point_line)
+        average = sum(point_line) / float(samples)
+        std_dev = (
+            abs(average)
+            if samples == 1
+            else math.sqrt(
+                abs(sum(p**2 for p in point_line) - average**2 * samples) / (samples - 1)
+            )
+        )
+        descriptors.append([average, min(point_line), max(point_line), std_dev])
+    return descriptors
+
+
+def _measure(function: Callable[[], DataStats]) -> Tuple[float, DataStats]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--slices", type=int, default=12)
+    parser.add_argument("--step", type=int, default=60, help="Step of the upsampled slices")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    slices = _slices(args.slices, args.step)
+    twindow = (slices[0][0].start, slices[0][0].end, args.step)
+
+    lists_elapsed, lists_result = 0.0, []
+    numpy_elapsed, numpy_result = 0.0, []
+    for _round in range(args.rounds):
+        elapsed, lists_result = _measure(
+            lambda: _data_stats_of_lists(
+                [_bfill_upsample_of_lists(ts, twindow, shift) for ts, shift in slices]
+            )
+        )
+        lists_elapsed += elapsed
+        elapsed, numpy_result = _measure(
+            lambda: prediction._data_stats(
+                [ts.bfill_upsample(twindow, shift) for ts, shift in slices]
+            )
+        )
+        numpy_elapsed += elapsed
+
+    assert [d[:3] for d in numpy_result] == [d[:3] for d in lists_result]
+    print(
+        "%d slices, %d points: lists %8.2f ms, numpy %8.2f ms"
+        % (
+            args.slices,
+            len(numpy_result),
+            lists_elapsed * 1000 / args.rounds,
+            numpy_elapsed * 1000 / args.rounds,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark the host condition evaluation of the RulesetMatcher
+
+Builds a synthetic configuration and evaluates a set of host rulesets mixing tag, label,
+folder and host name conditions for all hosts, like config generation does. Run it on
+two revisions to compare them (as site user or with OMD_SITE set):
+
+    PYTHONPATH=. python3 doc/benchmark/bench_ruleset_matcher.py --hosts 20000
+"""
+
+import argparse
+import random
+import time
+
+from cmk.utils.labels import LabelManager
+from cmk.utils.rulesets.ruleset_matcher import RulesetMatcher, RulesetMatchObject
+from cmk.utils.type_defs import HostName
+
+_TAG_GROUPS = {
+    "group%d" % nr: ["tag%d_%d" % (nr, tag_nr) for tag_nr in range(5)] for nr in range(8)
+}
+_FOLDERS = ["/wato/", "/wato/dc1/", "/wato/dc1/rack1/", "/wato/dc2/", "/wato/dc2/rack2/"]
+
+
+def _random_condition(rnd: random.Random, hostnames: list[HostName]) -> dict:
+    condition: dict = {
+        "host_tags": {
+            taggroup_id: rnd.choice(
+                [
+                    rnd.choice(tag_ids),
+                    {"$ne": rnd.choice(tag_ids)},
+                    {"$or": rnd.sample(tag_ids, 2)},
+                    {"$nor": rnd.sample(tag_ids, 2)},
+                ]
+            )
+            for taggroup_id, tag_ids in rnd.sample(list(_TAG_GROUPS.items()), 2)
+        },
+        "host_folder": rnd.choice(_FOLDERS),
+    }
+    if rnd.random() < 0.5:
+        condition["host_labels"] = {"os": rnd.choice(["linux", {"$ne": "windows"}])}
+    if rnd.random() < 0.3:
+        condition["host_name"] = rnd.sample(hostnames, 50) + [{"$regex": "host1"}]
+    return condition
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--hosts", type=int, default=10000)
+    parser.add_argument("--rulesets", type=int, default=50)
+    parser.add_argument("--rules", type=int, default=20, help="Rules per ruleset")
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    hostnames = [HostName("host%d" % nr) for nr in range(args.hosts)]
+    matcher = RulesetMatcher(
+        tag_to_group_map={},
+        host_tags={
+            hostname: {group: rnd.choice(tags) for group, tags in _TAG_GROUPS.items()}
+            for hostname in hostnames
+        },
+        host_paths={hostname: rnd.choice(_FOLDERS) for hostname in hostnames},
+        labels=LabelManager(
+            explicit_host_labels={
+                hostname: {"os": rnd.choice(["linux", "windows", "aix"])} for hostname in hostnames
+            },
+            host_label_rules=[],
+            service_label_rules=[],
+            discovered_labels_of_service=lambda *args: {},
+        ),
+        all_configured_hosts=set(hostnames),
+        clusters_of={},
+        nodes_of={},
+    )
+    rulesets = [
+        [
+            {
+                "id": "%d-%d" % (rs_nr, nr),
+                "value": nr,
+                "condition": _random_condition(rnd, hostnames),
+            }
+            for nr in range(args.rules)
+        ]
+        for rs_nr in range(args.rulesets)
+    ]
+
+    start = time.perf_counter()
+    matches = 0
+    for ruleset in rulesets:
+        for hostname in hostnames:
+            matches += len(
+                list(
+                    matcher.get_host_ruleset_values(
+                        RulesetMatchObject(host_name=hostname), ruleset, is_binary=False
+                    )
+                )
+            )
+    duration = time.perf_counter() - start
+
+    print(
+        "%d hosts, %d rulesets with %d rules: %.3f s (%d matches)"
+        % (args.hosts, args.rulesets, args.rules, duration, matches)
+    )
+
+
+if __name__ == "__main__":
+    main()
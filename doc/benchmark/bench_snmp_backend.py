@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark fetching an interface table with the SNMP backends
+
+A synthetic stored walk serves as stand-in device: It is used directly by the stored walk
+backend, and fake snmpwalk/snmpbulkwalk commands serve it to the classic backend. This
+way the benchmark measures the process handling and parsing of the classic backend,
+column by column versus batched per table entry, without network latency:
+
+    PYTHONPATH=. python3 doc/benchmark/bench_snmp_backend.py --interfaces 2000
+"""
+
+import argparse
+import os
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import cmk.utils.paths
+from cmk.utils.log import logger
+from cmk.utils.type_defs import HostName
+
+import cmk.snmplib.snmp_cache as snmp_cache
+from cmk.snmplib.type_defs import SNMPBackend, SNMPBackendEnum, SNMPHostConfig
+
+from cmk.core_helpers.snmp_backend import ClassicSNMPBackend, StoredWalkSNMPBackend
+
+_IF_ENTRY = ".1.3.6.1.2.1.2.2.1"
+_COLUMNS = [1, 2, 3, 4, 5, 6, 7, 8, 10, 11, 12, 13, 14, 16, 17, 18, 19, 20]
+
+# Serve the lines of the stored walk below the OID given as last argument
+_FAKE_SNMPWALK = """#!/bin/sh
+for oid; do :; done
+exec awk -v p="$oid." 'index($1, p) == 1 {o = $1; $1 = ""; print o " =" $0}' "%s"
+"""
+
+
+def _write_stored_walk(path: Path, interfaces: int) -> None:
+    with path.open("w") as walk:
+        for column in range(1, 23):
+            for index in range(1, interfaces + 1):
+                value = '"eth%d"' % index if column == 2 else str(index * column)
+                walk.write("%s.%d.%d %s\n" % (_IF_ENTRY, column, index, value))
+
+
+def _install_fake_commands(bin_dir: Path, walk_path: Path) -> None:
+    for name in ("snmpwalk", "snmpbulkwalk"):
+        command = bin_dir / name
+        command.write_text(_FAKE_SNMPWALK % walk_path)
+        command.chmod(command.stat().st_mode | stat.S_IEXEC)
+
+
+def _measure(title: str, fetch: Callable[[], object], rounds: int) -> None:
+    start = time.perf_counter()
+    for _round in range(rounds):
+        fetch()
+    print("%-36s %8.1f ms per table" % (title, (time.perf_counter() - start) * 1000 / rounds))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--interfaces", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    hostname = HostName("bench")
+    snmp_config = SNMPHostConfig(
+        is_ipv6_primary=False,
+        hostname=hostname,
+        ipaddress="127.0.0.1",
+        credentials="public",
+        port=161,
+        is_bulkwalk_host=True,
+        is_snmpv2or3_without_bulkwalk_host=False,
+        bulk_walk_size_of=10,
+        max_concurrent_walks=1,
+        timing={},
+        oid_range_limits={},
+        snmpv3_contexts=[],
+        character_encoding=None,
+        is_usewalk_host=False,
+        snmp_backend=SNMPBackendEnum.CLASSIC,
+    )
+    oids = ["%s.%d" % (_IF_ENTRY, column) for column in _COLUMNS]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        walk_path = Path(tmp_dir, hostname)
+        _write_stored_walk(walk_path, args.interfaces)
+        _install_fake_commands(Path(tmp_dir), walk_path)
+        os.environ["PATH"] = "%s:%s" % (tmp_dir, os.environ["PATH"])
+        cmk.utils.paths.snmpwalks_dir = tmp_dir
+
+        classic: SNMPBackend = ClassicSNMPBackend(snmp_config, logger)
+        stored: SNMPBackend = StoredWalkSNMPBackend(snmp_config, logger)
+
+        print("%d interfaces, %d columns" % (args.interfaces, len(oids)))
+        _measure(
+            "classic, walk per column", lambda: [classic.walk(oid) for oid in oids], args.rounds
+        )
+        _measure(
+            "classic, batched per table entry", lambda: classic.walk_columns(oids), args.rounds
+        )
+
+        def fetch_stored() -> object:
+            snmp_cache.host_cache().clear()
+            return [stored.walk(oid) for oid in oids]
+
+        _measure("stored walk", fetch_stored, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Benchmark the sorting of view rows with sort keys and with comparison functions
+
+A synthetic service table is sorted like the GUI does it for some typical sorter
+combinations, once with the sort keys of the sorters and once with the former
+cmp_to_key based sorting of all sorters:
+
+    OMD_SITE=heute PYTHONPATH=. python3 doc/benchmark/bench_view_sorting.py --rows 100000
+"""
+
+import argparse
+import functools
+import random
+import time
+from typing import List, Optional, Tuple
+
+import cmk.gui.views
+from cmk.gui import main_modules
+from cmk.gui.sorter import sorter_registry, SorterEntry
+from cmk.gui.type_defs import Row, Rows
+from cmk.gui.utils.script_helpers import application_and_request_context
+
+_SORTERS: List[List[Tuple[str, bool, Optional[str]]]] = [
+    [("svcstate", True, None)],
+    [("site_host", False, None), ("svcdescr", False, None)],
+    [("svcstate", True, None), ("stateage", False, None), ("svcdescr", False, None)],
+    [("hoststate", True, None), ("svcstate", True, "Check_MK"), ("site_host", False, None)],
+]
+
+
+def _rows(count: int) -> Rows:
+    descriptions = ["Check_MK", "CPU load", "Memory"] + ["Interface %d" % n for n in range(20)]
+    rows = []
+    for number in range(count):
+        service_state = random.choice([0, 0, 0, 0, 1, 2, 3])
+        rows.append(
+            {
+                "site": "site%d" % (number % 5),
+                "host_name": "host%d" % (number // len(descriptions)),
+                "host_state": random.choice([0, 0, 0, 1, 2]),
+                "host_has_been_checked": 1,
+                "service_description": descriptions[number % len(descriptions)],
+                "service_state": service_state,
+                "service_has_been_checked": 1,
+                "service_last_state_change": random.randint(0, 10000),
+                "JOIN": {
+                    "Check_MK": {"service_state": service_state, "service_has_been_checked": 1}
+                },
+            }
+        )
+    random.shuffle(rows)
+    return rows
+
+
+def _sort_by_cmp(data: Rows, sorters: List[SorterEntry]) -> None:
+    """The comparison function based sorting of the views before the sort keys"""
+
+    def safe_compare(entry: SorterEntry, row1: Optional[Row], row2: Optional[Row]) -> int:
+        if row1 is None or row2 is None:
+            return (row1 is not None) - (row2 is not None)
+        return entry.sorter.cmp(row1, row2)
+
+    def multisort(e1: Row, e2: Row) -> int:
+        for entry in sorters:
+            neg = -1 if entry.negate else 1
+            if entry.join_key:
+                c = neg * safe_compare(
+                    entry, e1["JOIN"].get(entry.join_key), e2["JOIN"].get(entry.join_key)
+                )
+            else:
+                c = neg * entry.sorter.cmp(e1, e2)
+            if c != 0:
+                return c
+        return 0
+
+    data.sort(key=functools.cmp_to_key(multisort))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    main_modules.load_plugins()
+    random.seed(42)
+    rows = _rows(args.rows)
+
+    with application_and_request_context():
+        for sorters in _SORTERS:
+            entries = [
+                SorterEntry(sorter=sorter_registry[name](), negate=negate, join_key=join_key)
+                for name, negate, join_key in sorters
+            ]
+            title = ", ".join(
+                "%s%s%s" % ("-" if negate else "", name, "(%s)" % join_key if join_key else "")
+                for name, negate, join_key in sorters
+            )
+
+            data = list(rows)
+            start = time.perf_counter()
+            _sort_by_cmp(data, entries)
+            cmp_elapsed = time.perf_counter() - start
+
+            sorted_data = list(rows)
+            start = time.perf_counter()
+            cmk.gui.views._sort_data(None, sorted_data, entries)  # type: ignore[arg-type]
+            key_elapsed = time.perf_counter() - start
+
+            assert data == sorted_data
+            print(
+                "%-45s cmp %8.1f ms, sort keys %8.1f ms"
+                % (title, cmp_elapsed * 1000, key_elapsed * 1000)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,18 @@ from __future__ import annotations
 
 import ast
 import contextlib
+import heapq
+import itertools
 import json
 import os
 import re
 import select
+import selectors
 import socket
 import ssl
 import threading
 import time
-from collections.abc import Iterator, Sequence
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import lru_cache
@@ -495,6 +498,71 @@ def _parse_socket_url(url: str) -> tuple[socket.AddressFamily, str | tuple[str,
     )
 
 
+class _RowDecoder:
+    """Decodes the rows of a response in the json or python3 output format piece by piece
+
+    Livestatus writes each row of the response in a line of its own and escapes all control
+    characters within the rows, so every complete line can be decoded while the rest of the
+    response is still being received:
+
+        >>> decoder = _RowDecoder(json_format=True)
+        >>> list(decoder.feed(b'[["host1",0],\\n["ho'))
+        [['host1', 0]]
+        >>> list(decoder.feed(b'st2",1]]\\n')) + list(decoder.finish())
+        [['host2', 1]]
+
+    Several rows in one line are decoded as well:
+
+        >>> decoder = _RowDecoder(json_format=False)
+        >>> list(decoder.feed(b"[['a', b'b'], [1, {}]]")) + list(decoder.finish())
+        [['a', b'b'], [1, {}]]
+    """
+
+    def __init__(self, json_format: bool) -> None:
+        self._loads = json.loads if json_format else ast.literal_eval
+        self._buffer = b""
+        self._first = True
+        # Only the last line is not terminated by a comma, but by the end of the response
+        self._last: str | None = None
+
+    def feed(self, data: bytes) -> Iterator[LivestatusRow]:
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+        for line in lines:
+            yield from self._decode_line(line)
+
+    def finish(self) -> Iterator[LivestatusRow]:
+        yield from self._decode_line(self._buffer)
+        self._buffer = b""
+        if self._last is not None:
+            yield from self._decode(self._last.removesuffix("]"))
+            self._last = None
+
+    def _decode_line(self, line: bytes) -> Iterator[LivestatusRow]:
+        text = line.decode("utf-8").strip()
+        if not text:
+            return
+        if self._first:
+            if not text.startswith("["):
+                raise MKLivestatusQueryError("Malformed raw response output")
+            text = text[1:]
+            self._first = False
+        if self._last is not None:
+            raise MKLivestatusQueryError("Malformed raw response output")
+        if text.endswith(","):
+            yield from self._decode(text[:-1])
+        else:
+            self._last = text
+
+    def _decode(self, rows: str) -> Iterator[LivestatusRow]:
+        if not rows:
+            return
+        try:
+            decoded_rows = self._loads("[%s]" % rows)
+        except (ValueError, SyntaxError):
+            raise MKLivestatusQueryError("Malformed raw response output")
+        yield from decoded_rows
+
+
 class SingleSiteConnection(Helpers):
 
     # So we only collect in a specific thread, and not in all of them. We also use
@@ -752,19 +820,7 @@ class SingleSiteConnection(Helpers):
             # in the socket. The liveproxyd (same system) has the complete data available
             # while the data from a standard connection can still take some time.
             # 30 seconds should be more than enough for the maximum telegram size of 100MB
-            data = self.receive_data(length, 30)
-
-            if code == "200":
-                return data
-
-            error_info = data.decode("utf-8")
-            if code == "404":
-                raise MKLivestatusTableNotFoundError("Not Found (%s): %r" % (code, error_info))
-
-            if code == "502":
-                raise MKLivestatusBadGatewayError(error_info)
-
-            raise MKLivestatusQueryError("%s: %s" % (code, error_info))
+            return self.response_data(code, self.receive_data(length, 30))
 
         except (MKLivestatusSocketClosed, IOError) as e:
             # In case of an IO error or the other side having
@@ -804,6 +860,21 @@ class SingleSiteConnection(Helpers):
             # FIXME: ? self.disconnect()
             raise MKLivestatusSocketError("Unhandled exception: %s" % e)
 
+    @staticmethod
+    def response_data(code: str, data: bytes) -> bytes:
+        """Return the data of a successful response, raise the error of a failed one"""
+        if code == "200":
+            return data
+
+        error_info = data.decode("utf-8")
+        if code == "404":
+            raise MKLivestatusTableNotFoundError("Not Found (%s): %r" % (code, error_info))
+
+        if code == "502":
+            raise MKLivestatusBadGatewayError(error_info)
+
+        raise MKLivestatusQueryError("%s: %s" % (code, error_info))
+
     def parse_raw_response(self, raw_response: bytes, query: Query) -> LivestatusResponse:
         data = raw_response.decode("utf-8")
         try:
@@ -829,23 +900,75 @@ class SingleSiteConnection(Helpers):
     def set_limit(self, limit: int | None = None) -> None:
         self.limit = limit
 
-    def query(self, query: QueryTypes, add_headers: str = "") -> LivestatusResponse:
-        # Normalize argument types
-        normalized_add_headers = add_headers
+    def _normalize_query(self, query: QueryTypes) -> Query:
         normalized_query = Query(query) if not isinstance(query, Query) else query
-
         if self.limit is not None:
             normalized_query = Query(
                 "%sLimit: %d\n" % (normalized_query, self.limit),
                 normalized_query.suppress_exceptions,
             )
+        return normalized_query
 
-        response = self.do_query(normalized_query, normalized_add_headers)
+    def query(self, query: QueryTypes, add_headers: str = "") -> LivestatusResponse:
+        response = self.do_query(self._normalize_query(query), add_headers)
         if self.prepend_site:
             for row in response:
                 row.insert(0, b"")
         return response
 
+    def query_iter(self, query: QueryTypes, add_headers: str = "") -> Iterator[LivestatusRow]:
+        """Yield the rows of the response while it is being received
+
+        In contrast to query(), neither the raw response nor all decoded rows need to be kept
+        in memory at the same time. If the iteration is stopped early, the connection is closed,
+        because the rest of the response is still waiting on the socket."""
+        normalized_query = self._normalize_query(query)
+        with _livestatus_output_format_switcher(normalized_query, self):
+            str_query = self.build_query(normalized_query, add_headers)
+        self.send_query(str_query)
+
+        complete = False
+        try:
+            for row in self._receive_rows(str_query, normalized_query.supports_json_format()):
+                if self.prepend_site:
+                    row.insert(0, b"")
+                yield row
+            complete = True
+        finally:
+            if not complete:
+                self.disconnect()
+
+    def _receive_rows(self, query: str, json_format: bool) -> Iterator[LivestatusRow]:
+        try:
+            header = self.receive_data(16)
+        except (MKLivestatusSocketClosed, IOError):
+            # Like receive_raw_response: The peer may have closed the persisted connection in
+            # the meantime, so reconnect and send the query again (once)
+            self.disconnect()
+            self.connect()
+            self.send_query(query)
+            header = self.receive_data(16)
+
+        code = header[0:3].decode("ascii")
+        try:
+            length = int(header[4:15].lstrip())
+        except ValueError:
+            raise MKLivestatusSocketError(
+                "Malformed output. Livestatus TCP socket might be unreachable or wrong"
+                "encryption settings are used."
+            )
+
+        if code != "200":
+            self.response_data(code, self.receive_data(length, 30))
+
+        decoder = _RowDecoder(json_format)
+        while length > 0:
+            # Like receive_raw_response, allow 30 seconds for the content, but per piece of it
+            data = self.receive_data(min(length, 65536), 30)
+            length -= len(data)
+            yield from decoder.feed(data)
+        yield from decoder.finish()
+
     def command(self, command: str, site: SiteId | None = None) -> None:
         command_str = command.rstrip("\n")
         if not command_str.startswith("["):
@@ -915,6 +1038,100 @@ class ConnectedSite(NamedTuple):
 ConnectedSites = list[ConnectedSite]
 
 
+class _SiteResponseReader:
+    """Reads the response of a site piece by piece, whenever data arrives on its socket
+
+    This is the non-blocking counterpart of SingleSiteConnection.receive_raw_response used by
+    MultiSiteConnection.query_parallel to wait for all sites at the same time."""
+
+    def __init__(
+        self, connected_site: ConnectedSite, query: str, query_timeout: float | None
+    ) -> None:
+        self.connected_site = connected_site
+        self.query = query
+        self.timeout_at = None if query_timeout is None else time.time() + query_timeout
+        self.registered_socket: socket.socket | None = None
+        self.reconnect_at: float | None = None
+        self._reconnect_until: float | None = None
+        self._header = b""
+        self._length: int | None = None
+        self._data = BytesIO()
+
+    @property
+    def socket(self) -> socket.socket:
+        if self.connected_site.connection.socket is None:
+            raise MKLivestatusSocketError(
+                "Socket to '%s' is not connected" % self.connected_site.connection.socketurl
+            )
+        return self.connected_site.connection.socket
+
+    def has_pending_data(self) -> bool:
+        # See is_socket_readable: Data of SSL sockets may be pending without the socket being
+        # readable
+        return isinstance(self.socket, ssl.SSLSocket) and self.socket.pending() > 0
+
+    def read(self) -> bytes | None:
+        """Read the data available on the socket, return the data once the response is complete"""
+        while True:
+            if self._length is None:
+                size = 16 - len(self._header)
+            else:
+                size = self._length - self._data.tell()
+                if size == 0:
+                    return SingleSiteConnection.response_data(
+                        self._header[0:3].decode("ascii"), self._data.getvalue()
+                    )
+
+            packet = self.socket.recv(min(size, 65536))
+            if not packet:
+                raise MKLivestatusSocketClosed(
+                    "Read zero data from socket, remote peer closed connection."
+                )
+
+            if self._length is not None:
+                self._data.write(packet)
+            else:
+                self._header += packet
+                if len(self._header) == 16:
+                    self._read_length()
+
+            if self._length is None or self._data.tell() < self._length:
+                if not self.has_pending_data():
+                    return None
+
+    def _read_length(self) -> None:
+        try:
+            self._length = int(self._header[4:15].lstrip())
+        except ValueError:
+            self.connected_site.connection.disconnect()
+            raise MKLivestatusSocketError(
+                "Malformed output. Livestatus TCP socket might be unreachable or wrong"
+                "encryption settings are used."
+            )
+        # Like receive_raw_response, allow 30 seconds for the content
+        content_timeout_at = time.time() + 30
+        if self.timeout_at is None or self.timeout_at > content_timeout_at:
+            self.timeout_at = content_timeout_at
+
+    def schedule_reconnect(self) -> bool:
+        """Like receive_raw_response, retry once or until the timeout of the connection"""
+        now = time.time()
+        if self._reconnect_until is None:
+            self._reconnect_until = now + (self.connected_site.connection.timeout or 0)
+        elif self._reconnect_until <= now:
+            return False
+        self.reconnect_at = now + 0.1
+        return True
+
+    def reconnect(self) -> None:
+        self.reconnect_at = None
+        self._header = b""
+        self._length = None
+        self._data = BytesIO()
+        self.connected_site.connection.connect()
+        self.connected_site.connection.send_query(self.query)
+
+
 class MultiSiteConnection(Helpers):
     def __init__(  # pylint: disable=too-many-branches
         self, sites: SiteConfigurations, disabled_sites: SiteConfigurations | None = None
@@ -928,6 +1145,7 @@ class MultiSiteConnection(Helpers):
         self.prepend_site = False
         self.only_sites: OnlySites = None
         self.limit: int | None = None
+        self.query_timeout: float | None = None
         self.parallelize = True
 
         # Status host: A status host helps to prevent trying to connect
@@ -1103,6 +1321,10 @@ class MultiSiteConnection(Helpers):
         """Impose Limit on number of returned datasets (distributed among sites)"""
         self.limit = limit
 
+    def set_query_timeout(self, timeout: float | None = None) -> None:
+        """Consider sites dead, which did not answer a parallel query within this time"""
+        self.query_timeout = timeout
+
     def dead_sites(self) -> dict[SiteId, DeadSite]:
         return self.deadsites
 
@@ -1177,19 +1399,132 @@ class MultiSiteConnection(Helpers):
         self.connections = stillalive
         return result
 
+    def query_iter(self, query: QueryTypes, add_headers: str = "") -> Iterator[LivestatusRow]:
+        """Yield the rows of the sites one site after the other while they are being received
+
+        The sites are queried like with query_non_parallel(), but the rows are not collected
+        in memory. A site failing in the middle of its response is marked as dead, the rows it
+        already sent have been yielded at that point."""
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+        limit = self.limit
+        dead_sites: set[SiteId] = set()
+        try:
+            for connected_site in self.connections:
+                if self.only_sites is not None and connected_site.id not in self.only_sites:
+                    continue
+                if limit is not None and limit <= 0:
+                    break
+                limit_header = "" if limit is None else "Limit: %d\n" % limit
+                rows = connected_site.connection.query_iter(
+                    normalized_query, add_headers + limit_header
+                )
+                try:
+                    for row in rows:
+                        if self.prepend_site:
+                            row.insert(0, connected_site.id)
+                        if limit is not None:
+                            limit -= 1
+                        yield row
+                except LivestatusTestingError:
+                    raise
+                except Exception as e:
+                    connected_site.connection.disconnect()
+                    self.deadsites[connected_site.id] = {
+                        "exception": e,
+                        "site": connected_site.config,
+                    }
+                    dead_sites.add(connected_site.id)
+                finally:
+                    rows.close()
+        finally:
+            self.connections = [c for c in self.connections if c.id not in dead_sites]
+
     # New parallelized version of query(). The semantics differs in the handling
     # of Limit: since all sites are queried in parallel, the Limit: is simply
     # applied to all sites - resulting in possibly more results then Limit requests.
-    def query_parallel(  # pylint: disable=too-many-branches
+    def query_parallel(
         self,
         query: Query,
         add_headers: str = "",
     ) -> LivestatusResponse:
-        stillalive = []
+        site_order = [connected_site.id for connected_site in self.connections]
+        site_rows = dict(self.query_parallel_by_site(query, add_headers))
+        # Keep the order of the sites, regardless of which site answered first
+        result = LivestatusResponse([])
+        for site_id in site_order:
+            result.extend(site_rows.get(site_id, []))
+        return result
+
+    def query_merged(
+        self,
+        query: QueryTypes,
+        key: Callable[[LivestatusRow], Any],
+        add_headers: str = "",
+        unordered_query: QueryTypes | None = None,
+    ) -> LivestatusResponse:
+        """Merge the already ordered responses of all sites
+
+        The query has to order the rows of each site with OrderBy: headers in the same way as
+        the given key does. In contrast to query(), the Limit: is applied to the merged rows,
+        so the result contains the first rows of all sites, not some rows of each site.
+
+        Sites rejecting the query, e.g. because their livestatus does not know the OrderBy:
+        header yet, are asked the unordered_query instead, if given. Their rows are ordered
+        here, so they are some rows of these sites like with query()."""
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+        site_order = [connected_site.id for connected_site in self.connections]
+        queried_sites = [
+            site_id
+            for site_id in site_order
+            if self.only_sites is None or site_id in self.only_sites
+        ]
+        if unordered_query is not None:
+            normalized_query = Query(
+                normalized_query._query,
+                normalized_query.suppress_exceptions + (MKLivestatusQueryError,),
+            )
+        with _livestatus_output_format_switcher(normalized_query, self):
+            site_rows = dict(self.query_parallel_by_site(normalized_query, add_headers))
+
+        if unordered_query is not None and (
+            rejecting_sites := [
+                site_id
+                for site_id in queried_sites
+                if site_id not in site_rows and site_id not in self.deadsites
+            ]
+        ):
+            normalized_unordered_query = (
+                Query(unordered_query)
+                if not isinstance(unordered_query, Query)
+                else unordered_query
+            )
+            only_sites = self.only_sites
+            self.set_only_sites(rejecting_sites)
+            try:
+                with _livestatus_output_format_switcher(normalized_unordered_query, self):
+                    for site_id, rows in self.query_parallel_by_site(
+                        normalized_unordered_query, add_headers
+                    ):
+                        site_rows[site_id] = LivestatusResponse(sorted(rows, key=key))
+            finally:
+                self.set_only_sites(only_sites)
+
+        # Equal rows are taken from the sites in their order, like query() does
+        merged = heapq.merge(*(site_rows.get(site_id, []) for site_id in site_order), key=key)
+        return LivestatusResponse(list(itertools.islice(merged, self.limit)))
+
+    def query_parallel_by_site(  # pylint: disable=too-many-branches
+        self,
+        query: Query,
+        add_headers: str = "",
+    ) -> Iterator[tuple[SiteId, LivestatusResponse]]:
+        """Query all sites in parallel and yield the rows of each site as soon as they arrived
+
+        The responses are read whenever data arrives on one of the sockets, so slow sites do
+        not delay reading and parsing the responses of the other ones. Sites which did not
+        answer within the query timeout are considered dead."""
         if self.only_sites is not None:
-            connect_to_sites = [c for c in self.connections if c[0] in self.only_sites]
-            # Unused sites are assumed to be alive
-            stillalive.extend([c for c in self.connections if c[0] not in self.only_sites])
+            connect_to_sites = [c for c in self.connections if c.id in self.only_sites]
         else:
             connect_to_sites = self.connections
 
@@ -1199,70 +1534,122 @@ class MultiSiteConnection(Helpers):
         else:
             limit_header = ""
 
+        dead_sites: set[SiteId] = set()
+
+        def site_is_dead(connected_site: ConnectedSite, exception: Exception) -> None:
+            dead_sites.add(connected_site.id)
+            self.deadsites[connected_site.id] = {
+                "exception": exception,
+                "site": connected_site.config,
+            }
+
         # First send all queries
-        retrieve_responses: list[tuple[str, ConnectedSite]] = []
+        readers: list[_SiteResponseReader] = []
         for connected_site in connect_to_sites:
             try:
                 str_query = connected_site.connection.build_query(query, add_headers + limit_header)
                 connected_site.connection.send_query(str_query)
-                retrieve_responses.append((str_query, connected_site))
+                readers.append(_SiteResponseReader(connected_site, str_query, self.query_timeout))
             except LivestatusTestingError:
                 raise
             except Exception as e:
-                self.deadsites[connected_site.id] = {
-                    "exception": e,
-                    "site": connected_site.config,
-                }
+                site_is_dead(connected_site, e)
 
-        # Then retrieve all raw responses. We will be as slow as the slowest of all connections.
-        site_responses: list[tuple[ConnectedSite, bytes]] = []
-        for str_query, connected_site in retrieve_responses:
-            try:
-                site_responses.append(
-                    (
-                        connected_site,
-                        connected_site.connection.receive_raw_response(
-                            str_query, query.suppress_exceptions
-                        ),
-                    )
-                )
-            except query.suppress_exceptions:
-                # Mostly handles exception types MKLivestatusTableNotFoundError
-                stillalive.append(connected_site)
-                continue
-            except LivestatusTestingError:
-                raise
-            except Exception as e:
-                connected_site.connection.disconnect()
-                self.deadsites[connected_site.id] = {
-                    "exception": e,
-                    "site": connected_site.config,
-                }
+        # Then read and parse the responses in the order they arrive
+        selector = selectors.DefaultSelector()
 
-        # Convert responses to python format
-        result = LivestatusResponse([])
-        for connected_site, raw_response in site_responses:
-            try:
-                rows = connected_site.connection.parse_raw_response(raw_response, query)
-                stillalive.append(connected_site)
-                if self.prepend_site:
-                    for row in rows:
-                        row.insert(0, connected_site.id)
-                result.extend(rows)
-            except query.suppress_exceptions:
-                stillalive.append(connected_site)
-                continue
-            except LivestatusTestingError:
-                raise
-            except Exception as e:
-                connected_site.connection.disconnect()
-                self.deadsites[connected_site.id] = {
-                    "exception": e,
-                    "site": connected_site.config,
-                }
+        def finish(reader: _SiteResponseReader) -> None:
+            if reader.registered_socket is not None:
+                selector.unregister(reader.registered_socket)
+                reader.registered_socket = None
+            readers.remove(reader)
 
-        self.connections = stillalive
-        return result
+        try:
+            for reader in readers:
+                reader.registered_socket = reader.socket
+                selector.register(reader.socket, selectors.EVENT_READ, reader)
+
+            while readers:
+                now = time.time()
+                for reader in readers[:]:
+                    if reader.timeout_at is not None and reader.timeout_at <= now:
+                        finish(reader)
+                        reader.connected_site.connection.disconnect()
+                        site_is_dead(
+                            reader.connected_site,
+                            MKLivestatusSocketError("Timeout while waiting for the response"),
+                        )
+                    elif reader.reconnect_at is not None and reader.reconnect_at <= now:
+                        try:
+                            reader.reconnect()
+                            reader.registered_socket = reader.socket
+                            selector.register(reader.socket, selectors.EVENT_READ, reader)
+                        except LivestatusTestingError:
+                            raise
+                        except Exception as e:
+                            finish(reader)
+                            site_is_dead(reader.connected_site, e)
+
+                ready = [
+                    reader
+                    for reader in readers
+                    if reader.registered_socket is not None and reader.has_pending_data()
+                ]
+                if readers and not ready:
+                    wake_up_at = [
+                        at
+                        for reader in readers
+                        for at in (reader.timeout_at, reader.reconnect_at)
+                        if at is not None
+                    ]
+                    ready = [
+                        key.data
+                        for key, _events in selector.select(
+                            max(0.0, min(wake_up_at) - now) if wake_up_at else None
+                        )
+                    ]
+
+                for reader in ready:
+                    connected_site = reader.connected_site
+                    try:
+                        if (raw_response := reader.read()) is None:
+                            continue
+                        finish(reader)
+                        rows = connected_site.connection.parse_raw_response(raw_response, query)
+                    except query.suppress_exceptions:
+                        # Mostly handles exception types MKLivestatusTableNotFoundError
+                        if reader in readers:
+                            finish(reader)
+                        continue
+                    except LivestatusTestingError:
+                        raise
+                    except (MKLivestatusSocketClosed, IOError) as e:
+                        # Like receive_raw_response: Reconnect and send the query again
+                        finish(reader)
+                        connected_site.connection.disconnect()
+                        if reader.schedule_reconnect():
+                            readers.append(reader)
+                        else:
+                            site_is_dead(connected_site, MKLivestatusSocketError(str(e)))
+                        continue
+                    except Exception as e:
+                        if reader in readers:
+                            finish(reader)
+                        connected_site.connection.disconnect()
+                        site_is_dead(connected_site, e)
+                        continue
+
+                    if self.prepend_site:
+                        for row in rows:
+                            row.insert(0, connected_site.id)
+                    yield connected_site.id, rows
+        finally:
+            selector.close()
+            # The responses of the remaining sites can not be read anymore. Close their
+            # connections, they are opened again by the next query.
+            for reader in readers:
+                reader.connected_site.connection.disconnect()
+            self.connections = [c for c in self.connections if c.id not in dead_sites]
 
     def command(self, command: str, sitename: SiteId | None = SiteId("local")) -> None:
         if sitename in self.deadsites:
@@ -13,6 +13,7 @@
 #include <functional>
 #include <memory>
 #include <string>
+#include <variant>
 #include <vector>
 
 #include "Filter.h"
@@ -34,6 +35,13 @@ enum class ColumnType { int_, double_, string, list, time, dict, blob, null };
 
 using AggregationFactory = std::function<std::unique_ptr<Aggregation>()>;
 
+// The value of a column used for ordering rows with the OrderBy: header. Its
+// order is the order of the rendered values, i.e. strings are compared
+// bytewise.
+using SortKey = std::variant<double, std::string>;
+using SortKeyFunction = std::function<SortKey(
+    Row row, const User &user, std::chrono::seconds timezone_offset)>;
+
 class ColumnOffsets {
 public:
     using shifter = std::function<const void *(Row)>;
@@ -69,6 +77,9 @@ public:
     [[nodiscard]] virtual std::unique_ptr<Aggregator> createAggregator(
         AggregationFactory factory) const = 0;
 
+    // Columns which can not be used for ordering return an empty function.
+    [[nodiscard]] virtual SortKeyFunction createSortKey() const { return {}; }
+
     [[nodiscard]] Logger *logger() const { return &_logger; }
 
 private:
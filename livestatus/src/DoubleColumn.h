@@ -9,7 +9,9 @@
 #include "config.h"  // IWYU pragma: keep
 
 #include <chrono>
+#include <cmath>
 #include <functional>
+#include <limits>
 #include <memory>
 #include <string>
 #include <utility>
@@ -62,6 +64,17 @@ public:
             factory, [this](Row row) { return this->getValue(row); });
     }
 
+    [[nodiscard]] SortKeyFunction createSortKey() const override {
+        return [this](Row row, const User & /*user*/,
+                      std::chrono::seconds /*timezone_offset*/) {
+            // NaN is rendered as null, order it before all numbers.
+            auto value = getValue(row);
+            return SortKey{std::isnan(value)
+                               ? -std::numeric_limits<double>::infinity()
+                               : value};
+        };
+    }
+
     [[nodiscard]] value_type getValue(Row row) const {
         const T *data = columnData<T>(row);
         return data == nullptr ? 0.0 : f_(*data);
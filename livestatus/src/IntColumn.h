@@ -60,6 +60,13 @@ public:
             [this](Row row, const User &user) { return getValue(row, user); });
     }
 
+    [[nodiscard]] SortKeyFunction createSortKey() const override {
+        return [this](Row row, const User &user,
+                      std::chrono::seconds /*timezone_offset*/) {
+            return SortKey{static_cast<double>(getValue(row, user))};
+        };
+    }
+
     // TODO(sp): The only 2 places where auth_user is actually used are
     // HostListState::getValue() and ServiceListState::getValue(). These methods
     // aggregate values for hosts/services, but they should do this only for
@@ -9,12 +9,16 @@
 #include <cassert>
 #include <cctype>
 #include <cmath>
+#include <cstddef>
 #include <cstdlib>
 #include <memory>
 #include <ratio>
 #include <sstream>
 #include <stdexcept>
+#include <string>
 #include <type_traits>
+#include <utility>
+#include <vector>
 
 #include "Aggregator.h"
 #include "AndingFilter.h"
@@ -76,7 +80,8 @@ Query::Query(const std::list<std::string> &lines, Table &table,
     , _limit(-1)
     , _current_line(0)
     , _timezone_offset(0)
-    , _logger(logger) {
+    , _logger(logger)
+    , _ordered_rows_size(0) {
     FilterStack filters;
     FilterStack wait_conditions;
     for (const auto &line : lines) {
@@ -123,6 +128,8 @@ Query::Query(const std::list<std::string> &lines, Table &table,
                 parseColumnHeadersLine(arguments);
             } else if (header == "Limit") {
                 parseLimitLine(arguments);
+            } else if (header == "OrderBy") {
+                parseOrderByLine(arguments);
             } else if (header == "Timelimit") {
                 parseTimelimitLine(arguments);
             } else if (header == "AuthUser") {
@@ -162,6 +169,11 @@ Query::Query(const std::list<std::string> &lines, Table &table,
         }
     }
 
+    if (doOrdering() && doStats()) {
+        _output.setError(OutputBuffer::ResponseCode::bad_request,
+                         "OrderBy: not supported for stats queries");
+    }
+
     if (_columns.empty() && !doStats()) {
         table.any_column([this](const auto &c) {
             return _columns.push_back(c), _all_columns.insert(c), false;
@@ -508,6 +520,39 @@ void Query::parseLimitLine(char *line) {
     _limit = nextNonNegativeIntegerArgument(&line);
 }
 
+void Query::parseOrderByLine(char *line) {
+    auto column_name = nextStringArgument(&line);
+    auto descending = false;
+    if (auto *direction = next_field(&line)) {
+        if (std::string{direction} == "desc") {
+            descending = true;
+        } else if (std::string{direction} != "asc") {
+            throw std::runtime_error("expected 'asc' or 'desc'");
+        }
+    }
+    if (next_field(&line) != nullptr) {
+        throw std::runtime_error("superfluous argument(s)");
+    }
+
+    std::shared_ptr<Column> column;
+    try {
+        column = _table.column(column_name);
+    } catch (const std::runtime_error &e) {
+        // Like in parseColumnsLine(), do not fail for non-existing columns.
+        Informational(_logger)
+            << "ignoring non-existing column '" << column_name
+            << "' for ordering, reason: " << e.what();
+        return;
+    }
+    auto sort_key = column->createSortKey();
+    if (!sort_key) {
+        throw std::runtime_error("ordering by column '" + column_name +
+                                 "' not supported");
+    }
+    _order_by.push_back(OrderBy{std::move(sort_key), descending});
+    _all_columns.insert(column);
+}
+
 void Query::parseTimelimitLine(char *line) {
     auto duration = std::chrono::seconds{nextNonNegativeIntegerArgument(&line)};
     _time_limit = {duration, std::chrono::steady_clock::now() + duration};
@@ -560,6 +605,8 @@ void Query::parseLocaltimeLine(char *line) {
 
 bool Query::doStats() const { return !_stats_columns.empty(); }
 
+bool Query::doOrdering() const { return !_order_by.empty(); }
+
 bool Query::process() {
     // Precondition: output has been reset
     auto start_time = std::chrono::system_clock::now();
@@ -622,7 +669,8 @@ bool Query::processDataset(Row row) {
         return false;
     }
 
-    if (static_cast<size_t>(_output.os().tellp()) > _max_response_size) {
+    if (static_cast<size_t>(_output.os().tellp()) + _ordered_rows_size >
+        _max_response_size) {
         _output.setError(OutputBuffer::ResponseCode::payload_too_large,
                          "Maximum response size of " +
                              std::to_string(_max_response_size) +
@@ -635,7 +683,9 @@ bool Query::processDataset(Row row) {
     }
 
     _current_line++;
-    if (_limit >= 0 && static_cast<int>(_current_line) > _limit) {
+    // Ordered queries have to look at all rows, the limit is applied later.
+    if (_limit >= 0 && !doOrdering() &&
+        static_cast<int>(_current_line) > _limit) {
         return false;
     }
 
@@ -652,20 +702,11 @@ bool Query::processDataset(Row row) {
         // row anymore, so we can't use Column::output() then.  :-/ The slightly
         // hacky workaround is to pre-render all non-stats columns into a single
         // string here (RowFragment) and output it later in a verbatim manner.
-        std::ostringstream os;
-        {
-            auto renderer =
-                Renderer::make(_output_format, os, _output.getLogger(),
-                               _separators, _data_encoding);
-            QueryRenderer q(*renderer, EmitBeginEnd::off);
-            RowRenderer r(q);
-            for (const auto &column : _columns) {
-                column->output(row, r, *user_, _timezone_offset);
-            }
-        }
-        for (const auto &aggr : getAggregatorsFor(RowFragment{os.str()})) {
+        for (const auto &aggr : getAggregatorsFor(renderColumns(row))) {
             aggr->consume(row, *user_, timezoneOffset());
         }
+    } else if (doOrdering()) {
+        addOrderedRow(row);
     } else {
         assert(_renderer_query);  // Missing call to `process()`.
         RowRenderer r(*_renderer_query);
@@ -676,6 +717,66 @@ bool Query::processDataset(Row row) {
     return true;
 }
 
+RowFragment Query::renderColumns(Row row) {
+    std::ostringstream os;
+    {
+        auto renderer = Renderer::make(_output_format, os, _output.getLogger(),
+                                       _separators, _data_encoding);
+        QueryRenderer q(*renderer, EmitBeginEnd::off);
+        RowRenderer r(q);
+        for (const auto &column : _columns) {
+            column->output(row, r, *user_, _timezone_offset);
+        }
+    }
+    return RowFragment{os.str()};
+}
+
+void Query::addOrderedRow(Row row) {
+    std::vector<SortKey> keys;
+    keys.reserve(_order_by.size());
+    for (const auto &order_by : _order_by) {
+        keys.push_back(order_by.sort_key(row, *user_, _timezone_offset));
+    }
+    auto fragment = renderColumns(row);
+    _ordered_rows_size += fragment._str.size();
+    _ordered_rows.push_back(
+        OrderedRow{std::move(keys), _current_line, std::move(fragment)});
+    // With a limit only the first rows are needed, so we do not need to keep
+    // all rows until the end.
+    if (_limit >= 0 &&
+        _ordered_rows.size() >= 2 * static_cast<size_t>(_limit) + 1024) {
+        dropOrderedRowsBeyondLimit();
+    }
+}
+
+bool Query::orderedBefore(const OrderedRow &row1,
+                          const OrderedRow &row2) const {
+    for (size_t i = 0; i < _order_by.size(); ++i) {
+        if (row1.keys[i] != row2.keys[i]) {
+            return _order_by[i].descending ? row2.keys[i] < row1.keys[i]
+                                           : row1.keys[i] < row2.keys[i];
+        }
+    }
+    // Keep the order of the table for equal rows.
+    return row1.position < row2.position;
+}
+
+void Query::dropOrderedRowsBeyondLimit() {
+    auto limit = static_cast<size_t>(_limit);
+    if (_ordered_rows.size() <= limit) {
+        return;
+    }
+    auto last = _ordered_rows.begin() + static_cast<std::ptrdiff_t>(limit);
+    std::nth_element(_ordered_rows.begin(), last, _ordered_rows.end(),
+                     [this](const OrderedRow &row1, const OrderedRow &row2) {
+                         return orderedBefore(row1, row2);
+                     });
+    for (auto it = last; it != _ordered_rows.end(); ++it) {
+        _ordered_rows_size -= it->fragment._str.size();
+    }
+    _ordered_rows.erase(last, _ordered_rows.end());
+}
+
 void Query::finish(QueryRenderer &q) {
     if (doStats()) {
         for (const auto &group : _stats_groups) {
@@ -687,6 +788,18 @@ void Query::finish(QueryRenderer &q) {
                 aggr->output(r);
             }
         }
+    } else if (doOrdering()) {
+        if (_limit >= 0) {
+            dropOrderedRowsBeyondLimit();
+        }
+        std::sort(_ordered_rows.begin(), _ordered_rows.end(),
+                  [this](const OrderedRow &row1, const OrderedRow &row2) {
+                      return orderedBefore(row1, row2);
+                  });
+        for (const auto &ordered_row : _ordered_rows) {
+            RowRenderer r(q);
+            r.output(ordered_row.fragment);
+        }
     }
 }
 
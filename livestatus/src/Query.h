@@ -25,6 +25,7 @@
 #include <vector>
 
 #include "Aggregator.h"  // IWYU pragma: keep
+#include "Column.h"
 #include "Filter.h"
 #include "Renderer.h"
 #include "RendererBrokenCSV.h"
@@ -32,7 +33,6 @@
 #include "StatsColumn.h"
 #include "Triggers.h"
 #include "User.h"
-class Column;
 class Logger;
 class OutputBuffer;
 class Table;
@@ -74,6 +74,18 @@ private:
     using LogicalConnective =
         std::function<std::unique_ptr<Filter>(Filter::Kind, const Filters &)>;
 
+    struct OrderBy {
+        SortKeyFunction sort_key;
+        bool descending;
+    };
+
+    // A row of an ordered query, pre-rendered like the groups of stats queries
+    struct OrderedRow {
+        std::vector<SortKey> keys;
+        unsigned position;
+        RowFragment fragment;
+    };
+
     const Encoding _data_encoding;
     const size_t _max_response_size;
     OutputBuffer &_output;
@@ -102,8 +114,12 @@ private:
     std::map<RowFragment, std::vector<std::unique_ptr<Aggregator>>>
         _stats_groups;
     std::unordered_set<std::shared_ptr<Column>> _all_columns;
+    std::vector<OrderBy> _order_by;
+    std::vector<OrderedRow> _ordered_rows;
+    size_t _ordered_rows_size;
 
     bool doStats() const;
+    bool doOrdering() const;
     void doWait();
     void parseFilterLine(char *line, FilterStack &filters);
     void parseStatsLine(char *line);
@@ -117,6 +133,7 @@ private:
     void parseColumnsLine(const char *line);
     void parseColumnHeadersLine(char *line);
     void parseLimitLine(char *line);
+    void parseOrderByLine(char *line);
     void parseTimelimitLine(char *line);
     void parseSeparatorsLine(char *line);
     void parseOutputFormatLine(const char *line);
@@ -129,6 +146,11 @@ private:
     void parseLocaltimeLine(char *line);
     void start(QueryRenderer &q);
     void finish(QueryRenderer &q);
+    RowFragment renderColumns(Row row);
+    void addOrderedRow(Row row);
+    [[nodiscard]] bool orderedBefore(const OrderedRow &row1,
+                                     const OrderedRow &row2) const;
+    void dropOrderedRowsBeyondLimit();
 
     // NOTE: We cannot make this 'const' right now, it adds entries into
     // _stats_groups.
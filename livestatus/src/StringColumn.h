@@ -57,6 +57,13 @@ public:
                                  "' not supported");
     }
 
+    [[nodiscard]] SortKeyFunction createSortKey() const override {
+        return [this](Row row, const User & /*user*/,
+                      std::chrono::seconds /*timezone_offset*/) {
+            return SortKey{row.isNull() ? "" : getValue(row)};
+        };
+    }
+
     [[nodiscard]] std::string getValue(Row row) const {
         using namespace std::string_literals;
         const T *data = columnData<T>(row);
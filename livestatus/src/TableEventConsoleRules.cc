@@ -8,6 +8,7 @@
 #include <memory>
 
 #include "Column.h"
+#include "DoubleColumn.h"
 #include "IntColumn.h"
 #include "StringColumn.h"
 
@@ -19,6 +20,15 @@ TableEventConsoleRules::TableEventConsoleRules(MonitoringCore *mc)
 
     addColumn(ECRow::makeIntColumn(
         "rule_hits", "The times rule matched an incoming message", offsets));
+
+    addColumn(ECRow::makeIntColumn(
+        "rule_tries", "The times rule was tried on an incoming message",
+        offsets));
+
+    addColumn(ECRow::makeDoubleColumn(
+        "rule_match_time",
+        "The total time spent for trying the rule on incoming messages in seconds",
+        offsets));
 }
 
 std::string TableEventConsoleRules::name() const { return "eventconsolerules"; }
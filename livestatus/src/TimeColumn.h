@@ -60,6 +60,15 @@ public:
             });
     }
 
+    [[nodiscard]] SortKeyFunction createSortKey() const override {
+        return [this](Row row, const User & /*user*/,
+                      std::chrono::seconds timezone_offset) {
+            return SortKey{
+                static_cast<double>(std::chrono::system_clock::to_time_t(
+                    getValue(row, timezone_offset)))};
+        };
+    }
+
     [[nodiscard]] value_type getValue(
         Row row, std::chrono::seconds timezone_offset) const {
         const T *data = columnData<T>(row);
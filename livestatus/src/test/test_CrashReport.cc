@@ -126,3 +126,20 @@ TEST_F(CrashReportTableFixture, TestGetOneCrashReport) {
                                           uuid + "/" + crash_info + "\n",
                                       "Filter: id = " + uuid + "\n"}));
 }
+
+TEST_F(CrashReportTableFixture, TestOrderBy) {
+    const std::string other{"01234567-0123-4567-89ab-0123456789ab"};
+    fs::create_directories(basepath / component / other);
+    std::ofstream(basepath / component / other / crash_info) << json;
+
+    EXPECT_EQ(other + "\n" + uuid + "\n",
+              mk::test::query(table, {"Columns: id\n", "OrderBy: id\n"}));
+    EXPECT_EQ(uuid + "\n" + other + "\n",
+              mk::test::query(table, {"Columns: id\n", "OrderBy: id desc\n"}));
+    EXPECT_EQ(uuid + "\n",
+              mk::test::query(table, {"Columns: id\n", "OrderBy: id desc\n",
+                                      "Limit: 1\n"}));
+    EXPECT_EQ(other + "\n",
+              mk::test::query(table, {"Columns: id\n", "OrderBy: component\n",
+                                      "OrderBy: id asc\n", "Limit: 1\n"}));
+}
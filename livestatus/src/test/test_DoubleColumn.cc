@@ -4,11 +4,14 @@
 // source code package.
 
 #include <initializer_list>
+#include <limits>
 #include <memory>
 #include <string>
 
+#include "Column.h"
 #include "DoubleColumn.h"
 #include "Row.h"
+#include "User.h"
 #include "gtest/gtest.h"
 
 using namespace std::string_literals;
@@ -43,3 +46,28 @@ TEST(DoubleColumn, GetValueDefault) {
         EXPECT_EQ(0.0, col.getValue(row));
     }
 }
+
+TEST(DoubleColumn, SortKey) {
+    const DummyValue val{};
+    const DummyRow row{&val};
+    for (const auto v : {-42.0, 0.0, 1337.5}) {
+        const DoubleColumn<DummyRow> col{
+            "name"s, "description"s, {}, [v](const DummyRow & /*row*/) {
+                return v;
+            }};
+
+        EXPECT_EQ(SortKey{v}, col.createSortKey()(row, NoAuthUser{}, {}));
+    }
+}
+
+TEST(DoubleColumn, SortKeyNaN) {
+    const DummyValue val{};
+    const DummyRow row{&val};
+    const DoubleColumn<DummyRow> col{
+        "name"s, "description"s, {}, [](const DummyRow & /*row*/) {
+            return std::numeric_limits<double>::quiet_NaN();
+        }};
+
+    EXPECT_EQ(SortKey{-std::numeric_limits<double>::infinity()},
+              col.createSortKey()(row, NoAuthUser{}, {}));
+}
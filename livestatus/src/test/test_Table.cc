@@ -479,6 +479,8 @@ static ColumnDefinitions event_console_rules_columns() {
     return {
         {"rule_hits", ColumnType::int_},
         {"rule_id", ColumnType::string},
+        {"rule_match_time", ColumnType::double_},
+        {"rule_tries", ColumnType::int_},
     };
 }
 
@@ -225,6 +225,7 @@ def _create_configs_ipv4() -> List[SNMPHostConfig]:
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -241,6 +242,7 @@ def _create_configs_ipv4() -> List[SNMPHostConfig]:
             is_bulkwalk_host=True,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -264,6 +266,7 @@ def _create_configs_ipv4() -> List[SNMPHostConfig]:
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -285,6 +288,7 @@ def _create_configs_ipv6() -> List[SNMPHostConfig]:
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -301,6 +305,7 @@ def _create_configs_ipv6() -> List[SNMPHostConfig]:
             is_bulkwalk_host=True,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -324,6 +329,7 @@ def _create_configs_ipv6() -> List[SNMPHostConfig]:
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -348,6 +354,7 @@ def _create_configs_special_auth() -> List[SNMPHostConfig]:
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -369,6 +376,7 @@ def _create_configs_special_auth() -> List[SNMPHostConfig]:
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -393,6 +401,7 @@ def _create_configs_oidranges() -> List:
             is_bulkwalk_host=True,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={SectionName("if64"): [(first_str, 3)]},
             snmpv3_contexts=[],
@@ -409,6 +418,7 @@ def _create_configs_oidranges() -> List:
             is_bulkwalk_host=True,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={SectionName("if64"): [(mid_str, (4, 2))]},
             snmpv3_contexts=[],
@@ -425,6 +435,7 @@ def _create_configs_oidranges() -> List:
             is_bulkwalk_host=True,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={SectionName("if64"): [(last_str, 3)]},
             snmpv3_contexts=[],
@@ -441,6 +452,7 @@ def _create_configs_oidranges() -> List:
             is_bulkwalk_host=True,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=10,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={
                 SectionName("if64"): [(first_str, 1), (mid_str, (3, 1)), (last_str, 2)]
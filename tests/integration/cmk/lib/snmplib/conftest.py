@@ -192,6 +192,7 @@ def backend_fixture(request, snmp_data_dir):
         is_bulkwalk_host=False,
         is_snmpv2or3_without_bulkwalk_host=True,
         bulk_walk_size_of=10,
+        max_concurrent_walks=1,
         timing={},
         oid_range_limits={},
         snmpv3_contexts=[],
@@ -5,26 +5,28 @@
 
 # pylint: disable=protected-access
 
-import cmk.utils.store as store
+from pathlib import Path
+
+import pytest
+
 from cmk.utils.type_defs import CheckPluginName, ServiceID
 
 from cmk.base.api.agent_based.value_store._global_state import (
     get_value_store,
     load_host_value_store,
 )
+from cmk.base.api.agent_based.value_store._utils import ValueStoreManager
 
 _TEST_KEY = ("check", "item", "user-key")
 
 
-def test_load_host_value_store_loads_file(monkeypatch) -> None:  # type:ignore[no-untyped-def]
+def test_load_host_value_store_loads_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
 
     service_id = ServiceID(CheckPluginName("test_service"), None)
 
-    monkeypatch.setattr(
-        store,
-        "load_text_from_file",
-        lambda *_a, **_kw: "{('test_load_host_value_store_loads_file', '%s', %r, 'loaded_file'): True}"
-        % service_id,
+    monkeypatch.setattr(ValueStoreManager, "STORAGE_PATH", tmp_path)
+    (tmp_path / "test_load_host_value_store_loads_file").write_text(
+        "{('test_load_host_value_store_loads_file', '%s', %r, 'loaded_file'): True}" % service_id
     )
 
     with load_host_value_store(
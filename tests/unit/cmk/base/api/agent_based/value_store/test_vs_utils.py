@@ -3,16 +3,15 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from ast import literal_eval
 from pathlib import Path
 from typing import Optional, Tuple
 
 # pylint: disable=protected-access
 import pytest
 
-from cmk.utils import store
 from cmk.utils.type_defs import CheckPluginName
 
+import cmk.base.api.agent_based.value_store._utils as _vs_utils
 from cmk.base.api.agent_based.value_store._utils import (
     _DiskSyncedMapping,
     _DynamicDiskSyncedMapping,
@@ -78,25 +77,13 @@ class Test_DynamicDiskSyncedMapping:
 
 
 class Test_StaticDiskSyncedMapping:
-    def _mock_load(self, mocker):
-        stored_item_states = (
+    @staticmethod
+    def _write_legacy_file(tmp_path: Path) -> None:
+        (tmp_path / "test-host").write_text(
             '{("check1", None, "stored-user-key-1"): 23,'
             ' ("check2", "item", "stored-user-key-2"): 42}'
         )
 
-        mocker.patch.object(
-            store,
-            "load_text_from_file",
-            side_effect=lambda *a, **kw: stored_item_states,
-        )
-
-    def _mock_store(self, mocker):
-        mocker.patch.object(
-            store,
-            "save_text_to_file",
-            autospec=True,
-        )
-
     @staticmethod
     def _get_sdsm(
         tmp_path: Path,
@@ -104,13 +91,11 @@ class Test_StaticDiskSyncedMapping:
         return _StaticDiskSyncedMapping(
             path=tmp_path / "test-host",
             log_debug=lambda msg: None,
-            serializer=repr,
-            deserializer=literal_eval,
         )
 
-    def test_mapping_features(self, mocker, tmp_path: Path) -> None:  # type:ignore[no-untyped-def]
+    def test_mapping_features(self, tmp_path: Path) -> None:
 
-        self._mock_load(mocker)
+        self._write_legacy_file(tmp_path)
         sdsm = self._get_sdsm(tmp_path)
         assert sdsm.get(("check_no", None, "moo")) is None
         with pytest.raises(KeyError):
@@ -125,10 +110,9 @@ class Test_StaticDiskSyncedMapping:
         ]
         assert len(sdsm) == 2
 
-    def test_store(self, mocker, tmp_path: Path) -> None:  # type:ignore[no-untyped-def]
+    def test_store(self, tmp_path: Path) -> None:
 
-        self._mock_load(mocker)
-        self._mock_store(mocker)
+        self._write_legacy_file(tmp_path)
 
         sdsm = self._get_sdsm(tmp_path)
 
@@ -141,9 +125,71 @@ class Test_StaticDiskSyncedMapping:
             ("check1", None, "stored-user-key-1"): 23,
             ("check3", "el Barto", "Ay caramba"): "ASDF",
         }
-        written = store.save_text_to_file.call_args.args[1]  # type: ignore[attr-defined]
-        assert written == repr(expected_values)
         assert list(sdsm.items()) == list(expected_values.items())
+        assert dict(self._get_sdsm(tmp_path)) == expected_values
+
+    def test_store_appends_changes_only(self, tmp_path: Path) -> None:
+        sdsm = self._get_sdsm(tmp_path)
+        sdsm.disksync(updated=[(("check", None, str(n)), (n, 1.5)) for n in range(100)])
+        size = (tmp_path / "test-host").stat().st_size
+
+        # Unchanged values are not written again
+        sdsm.disksync(updated=[(("check", None, "1"), (1, 1.5))])
+        assert (tmp_path / "test-host").stat().st_size == size
+
+        sdsm.disksync(
+            removed={("check", None, "2")},
+            updated=[(("check", None, "1"), (1, 2.5))],
+        )
+        assert size < (tmp_path / "test-host").stat().st_size < size + 100
+
+        reloaded = self._get_sdsm(tmp_path)
+        assert len(reloaded) == 99
+        assert reloaded[("check", None, "1")] == (1, 2.5)
+        assert ("check", None, "2") not in reloaded
+
+    def test_store_compacts_log(self, tmp_path: Path) -> None:
+        sdsm = self._get_sdsm(tmp_path)
+        for n in range(1000):
+            sdsm.disksync(updated=[(("check", None, "counter"), n)])
+
+        assert (tmp_path / "test-host").stat().st_size < 2 * _vs_utils._MIN_COMPACTION_SIZE
+        assert dict(self._get_sdsm(tmp_path)) == {("check", None, "counter"): 999}
+
+    def test_sync_changes_of_other_process(self, tmp_path: Path) -> None:
+        sdsm = self._get_sdsm(tmp_path)
+        sdsm.disksync(updated=[(("check", None, "mine"), 1)])
+
+        other = self._get_sdsm(tmp_path)
+        other.disksync(updated=[(("check", None, "theirs"), 2)])
+
+        sdsm.disksync()
+        assert dict(sdsm) == {("check", None, "mine"): 1, ("check", None, "theirs"): 2}
+
+    def test_ignore_incomplete_record(self, tmp_path: Path) -> None:
+        sdsm = self._get_sdsm(tmp_path)
+        sdsm.disksync(updated=[(("check", None, "key"), 1)])
+        with (tmp_path / "test-host").open("ab") as file:
+            file.write(b"\xff\x00\x00\x00crash")
+
+        reloaded = self._get_sdsm(tmp_path)
+        assert dict(reloaded) == {("check", None, "key"): 1}
+
+        reloaded.disksync(updated=[(("check", None, "key"), 2)])
+        assert dict(self._get_sdsm(tmp_path)) == {("check", None, "key"): 2}
+
+    def test_reload_replaced_log_with_same_inode(self, tmp_path: Path) -> None:
+        sdsm = self._get_sdsm(tmp_path)
+        sdsm.disksync(updated=[(("check", None, "key"), 1)])
+
+        other = self._get_sdsm(tmp_path / "other")
+        other.disksync(updated=[(("check", None, str(n)), n) for n in range(10)])
+        # Overwrite the file in place: same inode, larger size, but a different snapshot.
+        with (tmp_path / "test-host").open("r+b") as file:
+            file.write((tmp_path / "other" / "test-host").read_bytes())
+
+        sdsm.disksync()
+        assert dict(sdsm) == dict(other)
 
 
 class Test_DiskSyncedMapping:
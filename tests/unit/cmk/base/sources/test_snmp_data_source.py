@@ -55,6 +55,7 @@ def source_fixture():
             is_bulkwalk_host=False,
             is_snmpv2or3_without_bulkwalk_host=False,
             bulk_walk_size_of=0,
+            max_concurrent_walks=1,
             timing={},
             oid_range_limits={},
             snmpv3_contexts=[],
@@ -133,6 +134,7 @@ class TestSNMPSummaryResult:
                 is_bulkwalk_host=False,
                 is_snmpv2or3_without_bulkwalk_host=False,
                 bulk_walk_size_of=0,
+                max_concurrent_walks=1,
                 timing={},
                 oid_range_limits={},
                 snmpv3_contexts=[],
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, List, NoReturn
+
+import pytest
+
+import cmk.automations.helper as automation_helper_client
+from cmk.automations.helper import AutomationHelperRequest, AutomationHelperResponse
+
+import cmk.base.automation_helper as automation_helper
+from cmk.base.automations import Automations
+
+
+class _Automations(Automations):
+    def __init__(self) -> None:
+        super().__init__()
+        self.config_loads = 0
+
+    def load_checks(self) -> None:
+        pass
+
+    def load_config(self) -> None:
+        self.config_loads += 1
+
+
+class _Restarted(Exception):
+    pass
+
+
+def _run_automation(args: List[str]) -> None:
+    sys.stdout.write("%s %s\n" % (" ".join(args), sys.stdin.read()))
+    sys.stderr.write("some warning\n")
+    sys.exit(2)
+
+
+def _call(helper: automation_helper.AutomationHelper, request: AutomationHelperRequest) -> Any:
+    client, server = socket.socketpair()
+    with client, server:
+        automation_helper_client.send(client, request._asdict())
+        helper._handle_connection(server)
+        server.close()
+        response = automation_helper_client.receive(client)
+    os.waitpid(-1, 0)
+    return response
+
+
+@pytest.fixture(name="automations")
+def fixture_automations() -> _Automations:
+    return _Automations()
+
+
+@pytest.fixture(name="helper")
+def fixture_helper(
+    automations: _Automations, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> automation_helper.AutomationHelper:
+    monkeypatch.setattr(automation_helper, "config_signature", lambda: ())
+    monkeypatch.setattr(automation_helper, "plugins_signature", lambda: ())
+    return automation_helper.AutomationHelper(tmp_path / "socket", automations, _run_automation)
+
+
+def test_execute_in_child(helper: automation_helper.AutomationHelper) -> None:
+    response = _call(
+        helper,
+        AutomationHelperRequest(
+            command="get-check-information", args=["a"], stdin="x", verbosity=0
+        ),
+    )
+
+    assert AutomationHelperResponse(**response) == AutomationHelperResponse(
+        exit_code=2, stdout="get-check-information a x\n", stderr="some warning\n"
+    )
+
+
+def test_reload_changed_config(
+    helper: automation_helper.AutomationHelper,
+    automations: _Automations,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    helper._load_config()
+    _call(helper, AutomationHelperRequest(command="a", args=[], stdin="", verbosity=0))
+    assert automations.config_loads == 1
+
+    monkeypatch.setattr(automation_helper, "config_signature", lambda: (("main.mk", 1, 2),))
+    _call(helper, AutomationHelperRequest(command="a", args=[], stdin="", verbosity=0))
+    assert automations.config_loads == 2
+
+
+def test_restart_on_changed_plugins(
+    helper: automation_helper.AutomationHelper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(automation_helper, "plugins_signature", lambda: (("check", 1, 2),))
+
+    def restart() -> NoReturn:
+        raise _Restarted()
+
+    monkeypatch.setattr(helper, "_restart", restart)
+
+    client, server = socket.socketpair()
+    with client, server:
+        automation_helper_client.send(
+            client, AutomationHelperRequest(command="a", args=[], stdin="", verbosity=0)._asdict()
+        )
+        with pytest.raises(_Restarted):
+            helper._handle_connection(server)
+        server.close()
+        assert automation_helper_client.receive(client) is None
+
+
+def test_client_without_helper(tmp_path: Path) -> None:
+    assert (
+        automation_helper_client.execute(
+            AutomationHelperRequest(command="a", args=[], stdin="", verbosity=0),
+            tmp_path / "socket",
+        )
+        is None
+    )
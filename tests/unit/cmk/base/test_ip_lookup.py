@@ -4,8 +4,9 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import socket
+import time
 from pathlib import Path
-from typing import Dict, Mapping, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
@@ -403,6 +404,99 @@ def test_update_dns_cache(monkeypatch: MonkeyPatch) -> None:
     assert cache.get((HostName("dual"), socket.AF_INET6)) is None
 
 
+def _update_dns_cache_with_resolver(
+    monkeypatch: MonkeyPatch,
+    resolve: Callable[..., str],
+    **kwargs: Any,
+) -> Tuple[int, List[HostName]]:
+    ts = Scenario()
+    for number in range(20):
+        ts.add_host(HostName(f"host{number}"))
+    ts.add_host(HostName("dual"), tags={"address_family": "ip-v4v6"})
+    ts.add_host(HostName("configured"))
+    ts.apply(monkeypatch)
+
+    config_cache = config.get_config_cache()
+    return ip_lookup.update_dns_cache(
+        host_configs=(config_cache.get_host_config(hn) for hn in config_cache.all_active_hosts()),
+        configured_ipv4_addresses={HostName("configured"): "10.0.0.1"},
+        configured_ipv6_addresses={},
+        simulation_mode=False,
+        override_dns=None,
+        resolve=resolve,
+        max_workers=4,
+        **kwargs,
+    )
+
+
+def _fake_resolve(*, host_name: HostName, family: socket.AddressFamily) -> str:
+    if family is socket.AF_INET6:
+        raise ip_lookup.MKIPAddressLookupError(f"No IPv6 address of {host_name}")
+    return "10.1.0.%s" % host_name.removeprefix("host").replace("dual", "99")
+
+
+def test_update_dns_cache_concurrently(monkeypatch: MonkeyPatch) -> None:
+    looked_up: List[ip_lookup.IPLookupCacheId] = []
+    saved = []
+    monkeypatch.setattr(
+        ip_lookup.IPLookupCache, "save_persisted", lambda self: saved.append(len(self))
+    )
+
+    def resolve(*, host_name: HostName, family: socket.AddressFamily) -> str:
+        looked_up.append((host_name, family))
+        return _fake_resolve(host_name=host_name, family=family)
+
+    assert _update_dns_cache_with_resolver(monkeypatch, resolve) == (21, ["dual"])
+    assert len(looked_up) == 22
+    assert (HostName("configured"), socket.AF_INET) not in looked_up
+    # The cache is written once
+    assert saved == [21]
+
+
+def test_update_dns_cache_timeout(monkeypatch: MonkeyPatch) -> None:
+    def resolve(*, host_name: HostName, family: socket.AddressFamily) -> str:
+        if host_name == "host3":
+            time.sleep(1)
+        return _fake_resolve(host_name=host_name, family=family)
+
+    n_updated, failed = _update_dns_cache_with_resolver(monkeypatch, resolve, timeout=0.1)
+
+    assert (n_updated, sorted(failed)) == (20, ["dual", "host3"])
+    cache = ip_lookup.IPLookupCache({})
+    cache.load_persisted()
+    assert cache.get((HostName("host3"), socket.AF_INET)) is None
+    assert cache[(HostName("host4"), socket.AF_INET)] == "10.1.0.4"
+
+
+def test_update_dns_cache_incremental(monkeypatch: MonkeyPatch) -> None:
+    ip_lookup.IPLookupCache(
+        {
+            (HostName("host1"), socket.AF_INET): "10.2.0.1",
+            (HostName("configured"), socket.AF_INET): "10.2.0.2",
+            (HostName("removed"), socket.AF_INET): "10.2.0.3",
+        }
+    ).save_persisted()
+    looked_up: List[ip_lookup.IPLookupCacheId] = []
+
+    def resolve(*, host_name: HostName, family: socket.AddressFamily) -> str:
+        looked_up.append((host_name, family))
+        return _fake_resolve(host_name=host_name, family=family)
+
+    assert _update_dns_cache_with_resolver(monkeypatch, resolve, incremental=True) == (
+        21,
+        ["dual"],
+    )
+    assert (HostName("host1"), socket.AF_INET) not in looked_up
+    assert len(looked_up) == 21
+
+    cache = ip_lookup.IPLookupCache({})
+    cache.load_persisted()
+    assert cache[(HostName("host1"), socket.AF_INET)] == "10.2.0.1"
+    assert cache[(HostName("host2"), socket.AF_INET)] == "10.1.0.2"
+    assert cache.get((HostName("configured"), socket.AF_INET)) is None
+    assert cache.get((HostName("removed"), socket.AF_INET)) is None
+
+
 @pytest.mark.parametrize(
     "hostname_str, tags, result_address",
     [
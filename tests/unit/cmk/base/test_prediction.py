@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import math
+import random
 import time
 from pprint import pprint
 
@@ -185,3 +186,43 @@ def test_time_slices(  # type:ignore[no-untyped-def]
 )
 def test_data_stats(slices, result) -> None:  # type:ignore[no-untyped-def]
     assert prediction._data_stats(slices) == result
+
+
+def _data_stats_of_lists(slices):  # type:ignore[no-untyped-def]
+    """The former computation of the statistics with lists"""
+    descriptors = []
+    for time_column in zip(*slices):
+        point_line = [x for x in time_column if x is not None]
+        if not point_line:
+            descriptors.append([None, None, None, None])
+            continue
+        samples = len(point_line)
+        average = sum(point_line) / float(samples)
+        std_dev = (
+            abs(average)
+            if samples == 1
+            else math.sqrt(
+                abs(sum(p**2 for p in point_line) - average**2 * samples) / (samples - 1)
+            )
+        )
+        descriptors.append([average, min(point_line), max(point_line), std_dev])
+    return descriptors
+
+
+@pytest.mark.parametrize("num_slices", [1, 2, 5, 12])
+def test_data_stats_like_lists(num_slices: int) -> None:
+    rng = random.Random(num_slices)
+    slices = [
+        [None if rng.random() < 0.3 else rng.uniform(-1e6, 1e6) for _ in range(1000)]
+        for _ in range(num_slices)
+    ]
+    slices[-1] = slices[-1][:-10]
+    descriptors = prediction._data_stats(slices)
+    expected = _data_stats_of_lists(slices)
+    # The squares may differ from the ones of pow() in the last bit
+    assert [d[:3] for d in descriptors] == [e[:3] for e in expected]
+    assert [d[3] for d in descriptors] == pytest.approx([e[3] for e in expected], rel=1e-9)
+
+
+def test_data_stats_without_slices() -> None:
+    assert not prediction._data_stats([])
@@ -76,3 +76,39 @@ def test_compute_aggregation(
     assert actual_result.acknowledged == expected_acknowledgment
     assert actual_result.downtime_state == expected_downtime_state
     assert actual_result.in_service_period == expected_service_period
+
+
+def test_compute_aggregation_reuses_unchanged_branches(  # type:ignore[no-untyped-def]
+    bi_packs_sample_config, bi_searcher_with_sample_config, bi_status_fetcher
+):
+    bi_aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    compiled_aggregation = bi_aggregation.compile(bi_searcher_with_sample_config)
+
+    bi_status_fetcher.states = bi_status_fetcher.create_bi_status_data(sample_config.bi_status_rows)
+    first_results = compiled_aggregation.compute_branches(
+        compiled_aggregation.branches, bi_status_fetcher
+    )
+
+    # Same states, fetched again
+    bi_status_fetcher.states = bi_status_fetcher.create_bi_status_data(sample_config.bi_status_rows)
+    second_results = compiled_aggregation.compute_branches(
+        compiled_aggregation.branches, bi_status_fetcher
+    )
+    assert [id(result) for result in second_results] == [id(result) for result in first_results]
+
+    # The state of the host "heute" changed
+    bi_status_fetcher.states = bi_status_fetcher.create_bi_status_data(
+        sample_config.bi_acknowledgment_status_rows
+    )
+    third_results = compiled_aggregation.compute_branches(
+        compiled_aggregation.branches, bi_status_fetcher
+    )
+    assert third_results[0] is not first_results[0]
+    assert third_results[0].actual_result.acknowledged
+
+    bi_status_fetcher.set_assumed_states({("heute", "heute", "Check_MK Discovery"): 0})
+    assumed_results = compiled_aggregation.compute_branches(
+        compiled_aggregation.branches, bi_status_fetcher
+    )
+    assert assumed_results[0].assumed_result is not None
+    assert assumed_results[0].assumed_result.state == 0
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# pylint: disable=redefined-outer-name
+
+import pytest
+
+from cmk.utils.type_defs import HostName, ServiceName
+
+from cmk.bi.branch_index import BIBranchIndex
+from cmk.bi.computer import BIAggregationFilter, BIComputer
+from cmk.bi.trees import BICompiledAggregation
+
+
+@pytest.fixture
+def compiled_aggregations(  # type:ignore[no-untyped-def]
+    bi_packs_sample_config, bi_searcher_with_sample_config
+) -> dict[str, BICompiledAggregation]:
+    bi_aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    return {bi_aggregation.id: bi_aggregation.compile(bi_searcher_with_sample_config)}
+
+
+def test_branch_index(compiled_aggregations: dict[str, BICompiledAggregation]) -> None:
+    branch_index = BIBranchIndex.deserialize(
+        BIBranchIndex.create(compiled_aggregations).serialize()
+    )
+
+    assert branch_index.branches_of_hosts([HostName("heute")]) == {
+        ("default_aggregation", "Host heute")
+    }
+    assert branch_index.branches_of_hosts([HostName("heute"), HostName("heute_clone")]) == {
+        ("default_aggregation", "Host heute"),
+        ("default_aggregation", "Host heute_clone"),
+    }
+    assert branch_index.branches_of_services(
+        [(HostName("heute_clone"), ServiceName("OMD heute apache"))]
+    ) == {("default_aggregation", "Host heute_clone")}
+    assert not branch_index.branches_of_hosts([HostName("unknown")])
+
+
+@pytest.mark.parametrize(
+    "hosts, services, aggr_titles, expected_titles",
+    [
+        ([], [], [], ["Host heute", "Host heute_clone"]),
+        (["heute"], [], [], ["Host heute"]),
+        (["heute", "heute_clone"], [], ["Host heute_clone"], ["Host heute_clone"]),
+        ([], [("heute", "OMD heute apache")], [], ["Host heute"]),
+        (["heute_clone"], [("heute", "OMD heute apache")], [], []),
+        (["unknown"], [], [], []),
+    ],
+)
+def test_computer_filters_with_branch_index(  # type:ignore[no-untyped-def]
+    compiled_aggregations: dict[str, BICompiledAggregation],
+    bi_status_fetcher,
+    hosts: list[HostName],
+    services: list[tuple[HostName, ServiceName]],
+    aggr_titles: list[str],
+    expected_titles: list[str],
+) -> None:
+    bi_aggregation_filter = BIAggregationFilter(hosts, services, [], aggr_titles, [], [])
+
+    def branch_titles(computer: BIComputer) -> list[list[str]]:
+        return [
+            [branch.properties.title for branch in branches]
+            for _compiled_aggregation, branches in computer.get_required_aggregations(
+                bi_aggregation_filter
+            )
+        ]
+
+    assert (
+        branch_titles(
+            BIComputer(
+                compiled_aggregations,
+                bi_status_fetcher,
+                BIBranchIndex.create(compiled_aggregations),
+            )
+        )
+        == branch_titles(BIComputer(compiled_aggregations, bi_status_fetcher))
+        == [expected_titles]
+    )
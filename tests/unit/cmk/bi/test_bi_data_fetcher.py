@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import pytest
+
+from livestatus import LivestatusOutputFormat, LivestatusResponse, SiteId
+
+from cmk.utils.type_defs import HostName
+
+from cmk.bi.data_fetcher import BIStatusFetcher
+from cmk.bi.lib import BIHostSpec, RequiredBIElement, SitesCallback
+
+
+def _status_row(host_name: str) -> list:
+    return ["heute", host_name, 0, 1, 0, "OK", 0, 1, 0, []]
+
+
+@pytest.mark.parametrize(
+    "required_hosts, expect_filter",
+    [
+        pytest.param(3, True, id="filtered by the core"),
+        pytest.param(1001, False, id="too many hosts for a filter"),
+    ],
+)
+def test_status_fetcher_host_filter(required_hosts: int, expect_filter: bool) -> None:
+    queries = []
+
+    def query_callback(
+        query: str,
+        only_sites: list[SiteId] | None = None,
+        output_format: LivestatusOutputFormat = LivestatusOutputFormat.PYTHON,
+        fetch_full_data: bool = False,
+    ) -> LivestatusResponse:
+        queries.append(query)
+        return LivestatusResponse([_status_row("host%d" % nr) for nr in range(2000)])
+
+    fetcher = BIStatusFetcher(SitesCallback(lambda: [], query_callback, lambda s: s))
+    fetcher.update_states(
+        {
+            RequiredBIElement(SiteId("heute"), HostName("host%d" % nr), None)
+            for nr in range(required_hosts)
+        }
+    )
+
+    assert ("Filter: name = " in queries[0]) is expect_filter
+    if not expect_filter:
+        assert set(fetcher.states) == {
+            BIHostSpec(SiteId("heute"), HostName("host%d" % nr)) for nr in range(required_hosts)
+        }
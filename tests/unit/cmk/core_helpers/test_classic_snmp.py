@@ -3,11 +3,13 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import NamedTuple, Optional
 
 import pytest
 
-from cmk.utils.exceptions import MKGeneralException
+from cmk.utils.exceptions import MKGeneralException, MKSNMPError
 from cmk.utils.log import logger
 from cmk.utils.type_defs import HostName
 
@@ -34,6 +36,7 @@ def test_snmp_port_spec(port, expected) -> None:  # type:ignore[no-untyped-def]
         is_bulkwalk_host=False,
         is_snmpv2or3_without_bulkwalk_host=False,
         bulk_walk_size_of=10,
+        max_concurrent_walks=1,
         timing={},
         oid_range_limits={},
         snmpv3_contexts=[],
@@ -61,6 +64,7 @@ def test_snmp_proto_spec(monkeypatch, is_ipv6, expected) -> None:  # type:ignore
         is_bulkwalk_host=False,
         is_snmpv2or3_without_bulkwalk_host=False,
         bulk_walk_size_of=10,
+        max_concurrent_walks=1,
         timing={},
         oid_range_limits={},
         snmpv3_contexts=[],
@@ -90,6 +94,7 @@ class SNMPSettings(NamedTuple):
                     is_bulkwalk_host=True,
                     is_snmpv2or3_without_bulkwalk_host=True,
                     bulk_walk_size_of=10,
+                    max_concurrent_walks=1,
                     timing={"timeout": 2, "retries": 3},
                     oid_range_limits={},
                     snmpv3_contexts=[],
@@ -127,6 +132,7 @@ class SNMPSettings(NamedTuple):
                     is_bulkwalk_host=False,
                     is_snmpv2or3_without_bulkwalk_host=False,
                     bulk_walk_size_of=5,
+                    max_concurrent_walks=1,
                     timing={"timeout": 5, "retries": 1},
                     oid_range_limits={},
                     snmpv3_contexts=[],
@@ -165,6 +171,7 @@ class SNMPSettings(NamedTuple):
                     is_bulkwalk_host=False,
                     is_snmpv2or3_without_bulkwalk_host=False,
                     bulk_walk_size_of=5,
+                    max_concurrent_walks=1,
                     timing={"timeout": 5, "retries": 1},
                     oid_range_limits={},
                     snmpv3_contexts=[],
@@ -209,6 +216,7 @@ class SNMPSettings(NamedTuple):
                     is_bulkwalk_host=False,
                     is_snmpv2or3_without_bulkwalk_host=False,
                     bulk_walk_size_of=5,
+                    max_concurrent_walks=1,
                     timing={"timeout": 5, "retries": 1},
                     oid_range_limits={},
                     snmpv3_contexts=[],
@@ -247,6 +255,7 @@ class SNMPSettings(NamedTuple):
                     is_bulkwalk_host=False,
                     is_snmpv2or3_without_bulkwalk_host=False,
                     bulk_walk_size_of=5,
+                    max_concurrent_walks=1,
                     timing={"timeout": 5, "retries": 1},
                     oid_range_limits={},
                     snmpv3_contexts=[],
@@ -335,3 +344,95 @@ def test_priv_proto(proto, result) -> None:  # type:ignore[no-untyped-def]
 def test_priv_proto_unknown(proto) -> None:  # type:ignore[no-untyped-def]
     with pytest.raises(MKGeneralException):
         classic_snmp._priv_proto_for(proto)
+
+
+def _fake_walk_output_backend(monkeypatch: pytest.MonkeyPatch, output: str) -> ClassicSNMPBackend:
+    snmp_config = SNMPHostConfig(
+        is_ipv6_primary=False,
+        hostname=HostName("localhost"),
+        ipaddress="127.0.0.1",
+        credentials="public",
+        port=161,
+        is_bulkwalk_host=False,
+        is_snmpv2or3_without_bulkwalk_host=False,
+        bulk_walk_size_of=10,
+        max_concurrent_walks=1,
+        timing={},
+        oid_range_limits={},
+        snmpv3_contexts=[],
+        character_encoding=None,
+        is_usewalk_host=False,
+        snmp_backend=SNMPBackendEnum.CLASSIC,
+    )
+    backend = ClassicSNMPBackend(snmp_config, logger)
+    # The options and the OID appended to the command become unused shell arguments
+    monkeypatch.setattr(
+        backend, "_snmp_walk_command", lambda context_name: ["sh", "-c", "printf '%s'" % output]
+    )
+    return backend
+
+
+def test_walk_columns(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = _fake_walk_output_backend(
+        monkeypatch,
+        "\\n".join(
+            [
+                ".1.2.3.1.1 = 1",
+                ".1.2.3.1.2 = 2",
+                '.1.2.3.2.1 = "eth0"',
+                '.1.2.3.2.2 = "eth1"',
+                '.1.2.3.3.1 = "AA BB "',
+                '.1.2.3.3.2 = "AA ',
+                'BB "',
+                ".1.2.3.4.1 = 6",
+            ]
+        ),
+    )
+    assert backend.walk_columns([".1.2.3.3", ".1.2.3.1"]) == {
+        ".1.2.3.3": [(".1.2.3.3.1", b"\xaa\xbb"), (".1.2.3.3.2", b"\xaa\xbb")],
+        ".1.2.3.1": [(".1.2.3.1.1", b"1"), (".1.2.3.1.2", b"2")],
+    }
+
+
+def test_cancel_walks(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = _fake_walk_output_backend(monkeypatch, "")
+    monkeypatch.setattr(
+        backend, "_snmp_walk_command", lambda context_name: ["sh", "-c", "exec sleep 30"]
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        walk = executor.submit(backend.walk, ".1.2.3")
+        deadline = time.monotonic() + 10
+        while not backend._walk_processes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        backend.cancel_walks()
+
+        with pytest.raises(MKSNMPError):
+            walk.result(timeout=10)
+    assert not backend._walk_processes
+
+
+def test_get_rowinfo_from_walk_output_incomplete_dataset() -> None:
+    backend = ClassicSNMPBackend(
+        SNMPHostConfig(
+            is_ipv6_primary=False,
+            hostname=HostName("localhost"),
+            ipaddress="127.0.0.1",
+            credentials="public",
+            port=161,
+            is_bulkwalk_host=False,
+            is_snmpv2or3_without_bulkwalk_host=False,
+            bulk_walk_size_of=10,
+            max_concurrent_walks=1,
+            timing={},
+            oid_range_limits={},
+            snmpv3_contexts=[],
+            character_encoding=None,
+            is_usewalk_host=False,
+            snmp_backend=SNMPBackendEnum.CLASSIC,
+        ),
+        logger,
+    )
+    assert backend._get_rowinfo_from_walk_output(
+        [".1.2.1 = 1", ".1.2.2 = No Such Object available", '.1.2.3 = "AA ', "BB "]
+    ) == [(".1.2.1", b"1")]
@@ -31,6 +31,7 @@ def fixture_snmp_config() -> SNMPHostConfig:
         is_bulkwalk_host=False,
         is_snmpv2or3_without_bulkwalk_host=False,
         bulk_walk_size_of=0,
+        max_concurrent_walks=1,
         timing={},
         oid_range_limits={},
         snmpv3_contexts=[],
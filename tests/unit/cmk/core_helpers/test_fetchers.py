@@ -163,6 +163,26 @@ class TestAgentFileCache_and_SNMPFileCache:
         assert file_cache.read(mode) is None
 
 
+class TestSNMPFileCache:
+    @pytest.fixture
+    def raw_data(self) -> SNMPRawData:
+        return {
+            SectionName("if64"): [[["1", "eth0", [0, 12, 255]], ["2", "eth1", []]]],
+            SectionName("nested"): [[[["1"]], []], []],
+        }
+
+    def test_serialization(self, raw_data: SNMPRawData) -> None:
+        assert SNMPFileCache._from_cache_file(SNMPFileCache._to_cache_file(raw_data)) == raw_data
+
+    def test_read_previous_format(self, raw_data: SNMPRawData) -> None:
+        assert (
+            SNMPFileCache._from_cache_file(
+                (repr({str(k): v for k, v in raw_data.items()}) + "\n").encode("utf-8")
+            )
+            == raw_data
+        )
+
+
 class StubFileCache(FileCache[TRawData]):
     """Holds the data to be cached in-memory for testing"""
 
@@ -389,6 +409,7 @@ class TestSNMPFetcherDeserialization:
                 is_bulkwalk_host=False,
                 is_snmpv2or3_without_bulkwalk_host=False,
                 bulk_walk_size_of=0,
+                max_concurrent_walks=1,
                 timing={},
                 oid_range_limits={},
                 snmpv3_contexts=[],
@@ -415,6 +436,7 @@ class TestSNMPFetcherDeserialization:
                 is_bulkwalk_host=False,
                 is_snmpv2or3_without_bulkwalk_host=False,
                 bulk_walk_size_of=0,
+                max_concurrent_walks=1,
                 timing={},
                 oid_range_limits={},
                 snmpv3_contexts=[],
@@ -519,6 +541,7 @@ class TestSNMPFetcherFetch:
                 is_bulkwalk_host=False,
                 is_snmpv2or3_without_bulkwalk_host=False,
                 bulk_walk_size_of=0,
+                max_concurrent_walks=1,
                 timing={},
                 oid_range_limits={},
                 snmpv3_contexts=[],
@@ -757,6 +780,7 @@ class TestSNMPFetcherFetchCache:
                 is_bulkwalk_host=False,
                 is_snmpv2or3_without_bulkwalk_host=False,
                 bulk_walk_size_of=0,
+                max_concurrent_walks=1,
                 timing={},
                 oid_range_limits={},
                 snmpv3_contexts=[],
@@ -148,6 +148,42 @@ class TestAgentParser:
         assert ahs.piggybacked_raw_data == {}
         assert store.load() == {}
 
+    def test_raw_section_lines_and_whitespace(  # type:ignore[no-untyped-def]
+        self, parser, store
+    ) -> None:
+        raw_data = AgentRawData(
+            b"\r\n".join(
+                (
+                    b"<<<a_section>>>",
+                    b"  first line  ",
+                    b"",
+                    b"<<<not a header",
+                    b"<<<another_section:nostrip():sep(124)>>>",
+                    b"  first|line  ",
+                    b"   ",
+                    b"<<<<piggy>>>>",
+                    b"<<<piggy_section>>>",
+                    b"  first line  ",
+                    b"<<<<>>>>",
+                    b"<<<a_section>>>",
+                    b"second line",
+                    b"",
+                )
+            )
+        )
+
+        ahs = parser.parse(raw_data, selection=NO_SELECTION)
+
+        assert ahs.sections == {
+            SectionName("a_section"): [
+                ["first", "line"],
+                ["<<<not", "a", "header"],
+                ["second", "line"],
+            ],
+            SectionName("another_section"): [["  first", "line  "]],
+        }
+        assert ahs.piggybacked_raw_data[HostName("piggy")][1:] == [b"  first line  "]
+
     def test_merge_split_raw_sections(self, parser, store) -> None:  # type:ignore[no-untyped-def]
         raw_data = AgentRawData(
             b"\n".join(
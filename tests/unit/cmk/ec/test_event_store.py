@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from collections.abc import Iterable
+
+import pytest
+
+from tests.testlib import CMKEventConsole
+
+from cmk.ec.event import Event
+from cmk.ec.event_store import EventStore
+from cmk.ec.main import EventServer, EventStatus
+
+
+def _event(event_id: int, rule_id: str | None, host: str) -> Event:
+    return {"id": event_id, "rule_id": rule_id, "host": host}
+
+
+def _ids(events: Iterable[Event]) -> list[int]:
+    return [event["id"] for event in events]
+
+
+def test_event_store_indices() -> None:
+    store = EventStore(
+        [
+            _event(1, "rule1", "host1"),
+            _event(2, "rule2", "host1"),
+            _event(3, "rule1", "host2"),
+            _event(4, None, "host2"),
+        ]
+    )
+
+    assert len(store) == 4
+    assert _ids(store) == [1, 2, 3, 4]
+    assert _ids(store.of_rule("rule1")) == [1, 3]
+    assert _ids(store.of_rule(None)) == [4]
+    assert not store.of_rule("rule3")
+    assert store.get(3) == _event(3, "rule1", "host2")
+    assert store.get(5) is None
+
+
+def test_event_store_remove() -> None:
+    events = [_event(1, "rule1", "host1"), _event(2, "rule1", "host1"), _event(3, "rule2", "host2")]
+    store = EventStore(events)
+
+    store.remove(events[0])
+    assert _ids(store) == [2, 3]
+    assert store.oldest() is events[1]
+    assert store.oldest_of_rule("rule1") is events[1]
+    assert store.oldest_of_host("host1") is events[1]
+
+    store.remove(events[2])
+    assert store.oldest_of_rule("rule2") is None
+    assert store.oldest_of_host("host2") is None
+
+    with pytest.raises(KeyError):
+        store.remove(events[2])
+
+
+def test_event_store_update_host() -> None:
+    events = [_event(1, "rule1", "host1"), _event(2, "rule1", "host2"), _event(3, "rule1", "host1")]
+    store = EventStore(events)
+
+    events[0]["host"] = "host2"
+    store.update_host(events[0])
+
+    assert store.oldest_of_host("host1") is events[2]
+    assert store.oldest_of_host("host2") is events[0]
+
+    # The event has to be removed from the index it was added to
+    events[0]["host"] = "host3"
+    store.remove(events[0])
+    assert store.oldest_of_host("host2") is events[1]
+
+
+@pytest.mark.parametrize(
+    "ty, expected_ids",
+    [
+        pytest.param("overall", [2, 3, 4], id="overall"),
+        pytest.param("by_rule", [1, 2, 4], id="by_rule"),
+        pytest.param("by_host", [1, 3, 4], id="by_host"),
+    ],
+)
+def test_remove_oldest_event(event_status: EventStatus, ty: str, expected_ids: list[int]) -> None:
+    for rule_id, host in [
+        ("rule1", "host1"),
+        ("rule1", "host2"),
+        ("rule2", "host2"),
+        ("rule2", "host3"),
+    ]:
+        event_status.new_event(
+            CMKEventConsole.new_event({"rule_id": rule_id, "host": host, "core_host": host})
+        )
+
+    event_status.remove_oldest_event(ty, {"rule_id": "rule2", "host": "host2"})
+
+    assert _ids(event_status.events()) == expected_ids
+    assert event_status.num_existing_events == 3
+
+
+def test_merged_absent_event_is_reindexed(
+    event_server: EventServer, event_status: EventStatus
+) -> None:
+    event_status.new_event(
+        CMKEventConsole.new_event(
+            {"rule_id": "absent", "host": "host1", "core_host": "host1", "phase": "open"}
+        )
+    )
+
+    event_server._handle_absent_event(  # pylint: disable=protected-access
+        {
+            "id": "absent",
+            "state": 2,
+            "sl": {"value": 0, "precedence": "message"},
+            "expect": {"merge": "open"},
+            "set_host": "host2",
+        },
+        event_count=0,
+        expected_count=1,
+        interval_start=0.0,
+    )
+
+    (event,) = event_status.events()
+    assert event["host"] == "host2"
+    assert event["count"] == 2
+    assert event_status.get_num_existing_events_by("by_host", event) == 1
+    event_status.remove_oldest_event("by_host", event)
+    assert not event_status.events()
+    assert event_status.num_existing_events_by_host == {
+        ("host1", "host1"): 0,
+        ("host2", "host1"): 0,
+    }
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import pathlib
+import sqlite3
+from typing import Any
+
+import pytest
+
+from tests.testlib import CMKEventConsole
+
+from tests.unit.cmk.ec.helpers import FakeStatusSocket
+
+import cmk.ec.export as ec
+from cmk.ec.config import ConfigFromWATO
+from cmk.ec.history import History
+from cmk.ec.main import StatusServer
+from cmk.ec.settings import Settings
+
+
+@pytest.fixture(name="settings")
+def fixture_settings(tmp_path: pathlib.Path) -> Settings:
+    return ec.settings("1.2.3i45", tmp_path, tmp_path / "etc", ["mkeventd"])
+
+
+@pytest.fixture(name="config")
+def fixture_config() -> ConfigFromWATO:
+    config = ec.default_config()
+    config["archive_mode"] = "sqlite"
+    return config
+
+
+def _add_events(history: History) -> None:
+    for event_id, (host, rule_id) in enumerate(
+        [("host1", "rule1"), ("host2", "rule1"), ("host1", "rule2")], start=1
+    ):
+        event = CMKEventConsole.new_event(
+            {
+                "id": event_id,
+                "host": host,
+                "rule_id": rule_id,
+                "text": f"Message {event_id}",
+                "match_groups": ("a", "b"),
+                "contact_groups": None,
+                "host_in_downtime": True,
+            }
+        )
+        history.add(event, "NEW")
+    history.add(event, "DELETE", "someuser")
+
+
+def _query(status_server: StatusServer, query: bytes) -> list[dict[str, Any]]:
+    s = FakeStatusSocket(query)
+    status_server.handle_client(s, True, "127.0.0.1")
+    header, *rows = s.get_response()
+    return [dict(zip(header, row)) for row in rows]
+
+
+def test_sqlite_history_add_and_get(history: History, status_server: StatusServer) -> None:
+    _add_events(history)
+
+    rows = _query(status_server, b"GET history\n")
+
+    assert [(row["history_what"], row["event_id"]) for row in rows] == [
+        ("DELETE", 3),
+        ("NEW", 3),
+        ("NEW", 2),
+        ("NEW", 1),
+    ]
+    assert rows[0]["history_who"] == "someuser"
+    assert rows[0]["event_text"] == "Message 3"
+    assert rows[0]["event_match_groups"] == ("a", "b")
+    assert rows[0]["event_contact_groups"] is None
+    assert rows[0]["event_host_in_downtime"] is True
+
+
+@pytest.mark.parametrize(
+    "filters, expected_ids",
+    [
+        pytest.param(b"Filter: event_host = host1\n", [3, 3, 1], id="pushed down"),
+        pytest.param(b"Filter: event_id >= 2\nLimit: 2\n", [3, 3], id="pushed down limit"),
+        pytest.param(b"Filter: event_text ~ [12]$\n", [2, 1], id="regex"),
+        pytest.param(
+            b"Filter: event_rule_id = rule1\nFilter: event_host ~~ HOST\nLimit: 1\n",
+            [2],
+            id="mixed limit",
+        ),
+        pytest.param(b"Filter: history_what = DELETE\n", [3], id="history column"),
+    ],
+)
+def test_sqlite_history_filters(
+    history: History, status_server: StatusServer, filters: bytes, expected_ids: list[int]
+) -> None:
+    _add_events(history)
+
+    rows = _query(status_server, b"GET history\nColumns: event_id\n" + filters)
+
+    assert [row["event_id"] for row in rows] == expected_ids
+
+
+def test_sqlite_history_add_columns(
+    settings: Settings, history: History, status_server: StatusServer
+) -> None:
+    # A database of a version which did not know most of the columns yet
+    path = settings.paths.history_dir.value / "history.sqlite"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE history"
+            " (history_line INTEGER PRIMARY KEY, history_time REAL, event_id INTEGER)"
+        )
+        connection.execute("INSERT INTO history (history_time, event_id) VALUES (1.0, 1)")
+    connection.close()
+
+    history.add(CMKEventConsole.new_event({"id": 2, "text": "Message 2"}), "NEW")
+
+    rows = _query(status_server, b"GET history\nFilter: event_text = \n")
+    assert [row["event_id"] for row in rows] == [1]
+    assert rows[0]["history_what"] == ""
+    assert rows[0]["event_match_groups"] == ""
+    assert rows[0]["event_host_in_downtime"] is False
+
+
+def test_sqlite_history_housekeeping(
+    history: History, status_server: StatusServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("time.time", lambda: 1000000.0)
+    _add_events(history)
+    monkeypatch.setattr("time.time", lambda: 1000000.0 + 86400 * 365 + 1)
+    history.add(CMKEventConsole.new_event({"id": 4}), "NEW")
+
+    history.housekeeping()
+    assert [row["event_id"] for row in _query(status_server, b"GET history\n")] == [4]
+
+    history.flush()
+    assert not _query(status_server, b"GET history\n")
@@ -32,6 +32,19 @@ def test_perfcounters_count_time() -> None:
     assert c._times["processing"] == 1.04
 
 
+def test_perfcounters_count_rule_try() -> None:
+    c = Perfcounters(logger)
+    c.count_rule_try("rule1", 1.0)
+    c.count_rule_try("rule1", 0.5)
+    c.count_rule_try("rule2", 2.0)
+    assert c._counters["rule_tries"] == 3
+    assert c.get_rule_costs() == {"rule1": (2, 1.5), "rule2": (1, 2.0)}
+
+    c.reset_rule_costs()
+    assert c._counters["rule_tries"] == 3
+    assert not c.get_rule_costs()
+
+
 def test_perfcounters_do_statistics(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("time.time", lambda: 1.0)
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import re
+
+import pytest
+
+from cmk.ec.config import Rule
+from cmk.ec.event import Event
+from cmk.ec.main import EventServer
+from cmk.ec.rule_dispatch import required_text, RuleDispatcher
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("", ""),
+        ("Disk failure", "disk failure"),
+        (r"^sshd\[\d+\]: Failed password for (\w+)$", "]: failed password for "),
+        (r"Temperature (is|was) \d+ degrees", "temperature "),
+        ("colou?r changed", "r changed"),
+        ("a+bc", "abc"),
+        (r"x{2,3}yz", "yz"),
+        (r"eth[0-9]+ is down", " is down"),
+        (r"[]a-z] is a character class", " is a character class"),
+        (r"\x41BC", ""),
+        (r"\1 backreference", ""),
+        ("(?i)case", ""),
+        ("error|warning", ""),
+        (r"error\|warning", "error|warning"),
+        ("café au lait", " au lait"),
+        ("(?:non capturing) group", " group"),
+    ],
+)
+def test_required_text(pattern: str, expected: str) -> None:
+    assert required_text(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern, message",
+    [
+        ("colou?r changed", "Color changed"),
+        (r"Temperature (is|was) \d+ degrees", "temperature was 42 DEGREES"),
+        (r"eth[0-9]+ is down", "Link eth1 is down"),
+        ("a+bc", "xaaabc"),
+    ],
+)
+def test_required_text_is_contained_in_matches(pattern: str, message: str) -> None:
+    assert re.search(pattern, message, re.IGNORECASE)
+    assert required_text(pattern) in message.lower()
+
+
+def _rule(rule_id: str, **conditions: str) -> Rule:
+    rule: Rule = {"id": rule_id}
+    for key, value in conditions.items():
+        rule[key] = EventServer._compile_matching_value(key, value)  # type: ignore[literal-required]
+    return rule
+
+
+def _candidates(dispatcher: RuleDispatcher, host: str, text: str) -> list[str]:
+    event: Event = {"host": host, "text": text}
+    return [rule["id"] for rule in dispatcher.candidates(event)]
+
+
+def test_rule_dispatcher() -> None:
+    dispatcher = RuleDispatcher(
+        [
+            _rule("any"),
+            _rule("host", match_host="Host1"),
+            _rule("text", match="Disk failure"),
+            _rule("regex", match=r"eth\d+ is down"),
+            _rule("host and text", match_host="host2", match="disk failure"),
+            _rule("cancelling", match="is down", match_ok="is up"),
+            _rule("complex regex", match="(down|up)"),
+        ]
+    )
+
+    assert _candidates(dispatcher, "host1", "Kernel panic") == ["any", "host", "complex regex"]
+    assert _candidates(dispatcher, "HOST2", "DISK FAILURE") == [
+        "any",
+        "text",
+        "host and text",
+        "complex regex",
+    ]
+    assert _candidates(dispatcher, "host3", "eth0 is up") == ["any", "cancelling", "complex regex"]
+    assert _candidates(dispatcher, "host3", "eth0 is down") == [
+        "any",
+        "regex",
+        "cancelling",
+        "complex regex",
+    ]
+
+
+def test_rule_dispatcher_non_ascii_message() -> None:
+    # Due to the case folding of re.IGNORECASE, "ſ" matches "s"
+    rule = _rule("regex", match="is down$")
+    assert re.search(rule["match"], "Link iſ down")  # type: ignore[arg-type]
+    assert _candidates(RuleDispatcher([rule]), "host", "Link iſ down") == ["regex"]
+
+
+def test_rule_dispatcher_inverted_matching() -> None:
+    rule = _rule("inverted", match_host="host1", match="Disk failure")
+    rule["invert_matching"] = True
+    assert _candidates(RuleDispatcher([rule]), "host2", "Kernel panic") == ["inverted"]
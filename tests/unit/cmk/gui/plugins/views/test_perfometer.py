@@ -34,3 +34,7 @@ def test_cmp_of_missing_values(sort_values) -> None:  # type:ignore[no-untyped-d
     sorter = SorterPerfometer()
     data.sort(key=functools.cmp_to_key(sorter.cmp))
     assert [Perfometer(r).sort_value()[1] for r in data] == [None, -1.0, 0.0, 1.0]
+
+
+def test_sort_key_of_broken_row(request_context) -> None:  # type:ignore[no-untyped-def]
+    assert SorterPerfometer().sort_key({}) == (0.0,)
@@ -3,6 +3,7 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 from cmk.gui.livestatus_data_source import RowTableLivestatus
+from cmk.gui.type_defs import SorterSpec
 from cmk.gui.view import View
 from cmk.gui.view_store import multisite_builtin_views
 
@@ -47,3 +48,50 @@ def test_row_table_object(mock_livestatus, request_context) -> None:  # type:ign
             limit=None,
             all_active_filters=[],
         )
+
+
+def test_row_table_order_by_pushed_down(  # type:ignore[no-untyped-def]
+    mock_livestatus, request_context
+) -> None:
+    live = mock_livestatus
+    live.set_sites(["NO_SITE", "remote"])
+    for site, hosts in [("NO_SITE", [("a", 3), ("b", 1)]), ("remote", [("c", 2), ("d", 0)])]:
+        live.add_table(
+            "hosts",
+            [
+                {
+                    "name": name,
+                    "host_num_services": num_services,
+                    "host_state": 0,
+                    "host_has_been_checked": True,
+                }
+                for name, num_services in hosts
+            ],
+            site=site,
+        )
+    live.expect_query(
+        "GET hosts\nColumns: host_has_been_checked host_num_services host_state name\n"
+        "OrderBy: host_num_services desc",
+        match_type="loose",
+    )
+
+    view_spec = multisite_builtin_views["allhosts"].copy()
+    view_spec["painters"] = []
+    view_spec["group_painters"] = []
+    view_spec["sorters"] = [SorterSpec(sorter="num_services", negate=True)]
+    view_spec["context"] = {}
+    view = View("allhosts", view_spec, view_spec["context"])
+
+    with live(expect_status_query=True):
+        rows, _length = RowTableLivestatus("hosts").query(
+            view=view,
+            columns=["host_num_services", "name"],
+            headers="",
+            only_sites=None,
+            limit=1,
+            all_active_filters=[],
+        )
+
+    # One row more than the limit is fetched to detect an exceeded limit. These are the first
+    # rows of all sites, not the first rows of the first site.
+    assert [(row["site"], row["name"]) for row in rows] == [("NO_SITE", "a"), ("remote", "c")]
@@ -3,6 +3,7 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import os
 from pathlib import Path
 from typing import Dict
 
@@ -10,7 +11,8 @@ import pytest
 
 import cmk.utils
 from cmk.utils.exceptions import MKGeneralException
-from cmk.utils.structured_data import StructuredDataNode
+from cmk.utils.structured_data import StructuredDataNode, StructuredDataStore
+from cmk.utils.type_defs import HostName
 
 import cmk.gui.inventory
 from cmk.gui.inventory import InventoryPath, TreeSource
@@ -283,6 +285,50 @@ def test_get_history() -> None:
         assert delta_cache_filename == expected_delta_cache_filename
 
 
+def test_get_history_of_delta_archive() -> None:
+    hostname = HostName("inv-host")
+    inventory_store = StructuredDataStore(cmk.utils.paths.inventory_output_dir)
+    for timestamp, raw_tree in enumerate(
+        [
+            {"inv": "attr-0"},
+            {"inv": "attr-1"},
+            {"inv-2": "attr"},
+            {"inv": "attr-3", "node": {"sub": "value"}},
+            {"inv": "attr", "node": {"sub": "changed"}},
+        ]
+    ):
+        if timestamp:
+            inventory_store.archive(
+                host_name=hostname, archive_dir=cmk.utils.paths.inventory_archive_dir
+            )
+        inventory_store.save(host_name=hostname, tree=StructuredDataNode.deserialize(raw_tree))
+        os.utime(Path(cmk.utils.paths.inventory_output_dir, hostname), (timestamp, timestamp))
+
+    assert StructuredDataStore.load_archive_file(
+        Path(cmk.utils.paths.inventory_archive_dir, hostname, "0")
+    ).raw_delta == {"Attributes": {"Pairs": {"inv": "attr-0"}}}
+
+    delta_tree, corrupted_history_files = cmk.gui.inventory.load_delta_tree(hostname, 4, ("node",))
+    assert delta_tree is not None
+    assert delta_tree.is_equal(
+        StructuredDataNode.deserialize({"node": {"sub": ("value", "changed")}})
+    )
+    assert not corrupted_history_files
+    # Restricted delta trees are not cached
+    assert not Path(cmk.utils.paths.inventory_delta_cache_dir, hostname, "3_4").exists()
+
+    history, corrupted_history_files = cmk.gui.inventory.get_history(hostname)
+
+    assert [(e.timestamp, e.new, e.changed, e.removed) for e in history] == [
+        (0, 1, 0, 0),
+        (1, 0, 1, 0),
+        (2, 1, 0, 1),
+        (3, 2, 0, 1),
+        (4, 0, 2, 0),
+    ]
+    assert not corrupted_history_files
+
+
 @pytest.mark.usefixtures("create_inventory_history")
 @pytest.mark.parametrize(
     "search_timestamp, expected_raw_delta_tree",
@@ -4,7 +4,8 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import copy
-from typing import Any, Dict, Literal, Tuple
+import functools
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 import pytest
 from pytest_mock import MockerFixture
@@ -25,8 +26,8 @@ from cmk.gui.logged_in import user
 from cmk.gui.painter_options import painter_option_registry
 from cmk.gui.plugins.views.utils import Cell, Painter
 from cmk.gui.plugins.visuals.utils import Filter
-from cmk.gui.sorter import sorter_registry
-from cmk.gui.type_defs import PainterSpec, SorterSpec
+from cmk.gui.sorter import sorter_registry, SorterEntry
+from cmk.gui.type_defs import PainterSpec, Row, Rows, SorterSpec
 from cmk.gui.valuespec import ValueSpec
 from cmk.gui.view import View
 from cmk.gui.view_store import multisite_builtin_views
@@ -2019,6 +2020,82 @@ def test_view_user_sorters(view: View) -> None:
     assert view.user_sorters == [SorterSpec(sorter="abc", negate=True)]
 
 
+def _sorting_rows() -> Rows:
+    return [
+        {
+            "site": site,
+            "host_name": host_name,
+            "host_address": address,
+            "host_state": host_state,
+            "host_has_been_checked": 1,
+            "service_description": description,
+            "service_state": service_state,
+            "service_has_been_checked": int(service_state != 0 or description != "CPU"),
+            "service_last_state_change": last_state_change,
+            "JOIN": {"CPU": {"service_state": service_state, "service_has_been_checked": 1}}
+            if description != "CPU"
+            else {},
+        }
+        for site, host_name, address, host_state, description, service_state, last_state_change in [
+            ("b", "host10", "10.0.0.10", 0, "Check_MK", 0, 1000),
+            ("a", "host9", "10.0.0.9", 1, "CPU", 2, 1000),
+            ("a", "Host9", "10.0.0.9", 0, "Check_MK Discovery", 3, 2000),
+            ("b", "host10", "10.0.0.10", 0, "CPU", 0, 500),
+            ("a", "host1", "192.168.0.1", 2, "Memory", 1, 2000),
+            ("a", "host9", "10.0.0.9", 1, "Interface 10", 0, 1500),
+            ("a", "host9", "10.0.0.9", 1, "Interface 9", 3, 1500),
+        ]
+    ]
+
+
+@pytest.mark.usefixtures("request_context")
+@pytest.mark.parametrize(
+    "sorter_name",
+    ["svcstate", "hoststate", "site_host", "host_name", "svcdescr", "stateage", "host_address"],
+)
+def test_sort_key_orders_like_cmp(sorter_name: str) -> None:
+    sorter = sorter_registry[sorter_name]()
+    rows = _sorting_rows()
+
+    assert sorted(rows, key=sorter.sort_key) == sorted(rows, key=functools.cmp_to_key(sorter.cmp))
+
+
+@pytest.mark.usefixtures("request_context")
+@pytest.mark.parametrize(
+    "sorters",
+    [
+        [("svcstate", True, None)],
+        [("site_host", False, None), ("svcdescr", True, None)],
+        [("hoststate", True, None), ("stateage", True, None), ("svcdescr", False, None)],
+        [("svcstate", True, "CPU"), ("site_host", False, None), ("svcdescr", False, None)],
+    ],
+)
+def test_sort_data(view: View, sorters: List[Tuple[str, bool, Optional[str]]]) -> None:
+    entries = [
+        SorterEntry(sorter=sorter_registry[name](), negate=negate, join_key=join_key)
+        for name, negate, join_key in sorters
+    ]
+
+    def cmp_join(entry: SorterEntry, r1: Row, r2: Row) -> int:
+        # The former comparison based sorting of _sort_data
+        if entry.join_key:
+            r1, r2 = r1["JOIN"].get(entry.join_key), r2["JOIN"].get(entry.join_key)
+            if r1 is None or r2 is None:
+                return (r1 is not None) - (r2 is not None)
+        return entry.sorter.cmp(r1, r2)
+
+    def multisort(r1: Row, r2: Row) -> int:
+        for entry in entries:
+            if c := (-1 if entry.negate else 1) * cmp_join(entry, r1, r2):
+                return c
+        return 0
+
+    rows = _sorting_rows()
+    cmk.gui.views._sort_data(view, rows, entries)
+
+    assert rows == sorted(_sorting_rows(), key=functools.cmp_to_key(multisort))
+
+
 def test_view_want_checkboxes(view: View) -> None:
     assert view.want_checkboxes is False
     view.want_checkboxes = True
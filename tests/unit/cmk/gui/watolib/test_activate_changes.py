@@ -5,6 +5,7 @@
 
 import io
 import logging
+import os
 import tarfile
 from pathlib import Path
 from typing import List
@@ -17,6 +18,7 @@ import tests.testlib as testlib
 from livestatus import SiteConfiguration, SiteId
 
 import cmk.utils.paths
+import cmk.utils.store as store
 import cmk.utils.version as cmk_version
 
 import cmk.gui.watolib.activate_changes as activate_changes
@@ -252,6 +254,7 @@ def test_automation_get_config_sync_state() -> None:
             ),
         },
         0,
+        True,
     )
 
 
@@ -334,6 +337,54 @@ def test_get_config_sync_file_infos() -> None:
     }
 
 
+def test_config_sync_file_hash_cache(tmp_path: Path) -> None:
+    base_dir = tmp_path / "central"
+    base_dir.mkdir()
+    base_dir.joinpath("a").write_text("Däng")
+    base_dir.joinpath("b").write_text("Dong")
+    os.link(base_dir / "a", base_dir / "a-link")
+    cache_path = tmp_path / "hashes.pkl"
+    replication_paths = [ReplicationPath("dir", "abc", ".", [])]
+
+    file_hash_cache = activate_changes.ConfigSyncFileHashCache(cache_path)
+    file_hash_cache.load()
+    infos = activate_changes._get_config_sync_file_infos(
+        replication_paths, base_dir, file_hash_cache
+    )
+    file_hash_cache.save()
+    assert infos == activate_changes._get_config_sync_file_infos(replication_paths, base_dir)
+    assert infos["a"].file_hash == infos["a-link"].file_hash
+
+    # The cached hashes are used as long as the files are unchanged
+    base_dir.joinpath("b").write_text("Ding")
+    file_hash_cache = activate_changes.ConfigSyncFileHashCache(cache_path)
+    file_hash_cache.load()
+    file_hash_cache._hashes = {k: "cached" for k in file_hash_cache._hashes}
+    infos = activate_changes._get_config_sync_file_infos(
+        replication_paths, base_dir, file_hash_cache
+    )
+    assert infos["a"].file_hash == infos["a-link"].file_hash == "cached"
+    assert infos["b"].file_hash == activate_changes._create_config_sync_file_hash(base_dir / "b")
+
+    # Hard linking the files again, like the next activation does, keeps their cached hashes.
+    # Files saved via the store are replaced and hashed again, even with an unchanged size
+    # and modification time.
+    file_hash_cache.save()
+    stat = base_dir.joinpath("b").stat()
+    store.save_text_to_file(base_dir / "b", "Dung")
+    os.utime(base_dir / "b", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    base_dir.joinpath("a-link").unlink()
+    os.link(base_dir / "a", base_dir / "a-link")
+    file_hash_cache = activate_changes.ConfigSyncFileHashCache(cache_path)
+    file_hash_cache.load()
+    file_hash_cache._hashes = {k: "cached" for k in file_hash_cache._hashes}
+    infos = activate_changes._get_config_sync_file_infos(
+        replication_paths, base_dir, file_hash_cache
+    )
+    assert infos["a"].file_hash == infos["a-link"].file_hash == "cached"
+    assert infos["b"].file_hash == activate_changes._create_config_sync_file_hash(base_dir / "b")
+
+
 def _create_get_config_sync_file_infos_test_config(base_dir):
     base_dir.joinpath("etc/d1").mkdir(parents=True, exist_ok=True)
 
@@ -526,9 +577,11 @@ def _get_test_file_infos():
     return remote, central
 
 
-def test_get_sync_archive(tmp_path) -> None:  # type:ignore[no-untyped-def]
-    sync_archive = _get_test_sync_archive(tmp_path)
-    with tarfile.TarFile(mode="r", fileobj=io.BytesIO(sync_archive)) as f:
+@pytest.mark.parametrize("compressed", [False, True])
+def test_get_sync_archive(tmp_path: Path, compressed: bool) -> None:
+    sync_archive = _get_test_sync_archive(tmp_path, compressed)
+    assert sync_archive.startswith(b"\x1f\x8b") is compressed
+    with tarfile.open(mode="r:*", fileobj=io.BytesIO(sync_archive)) as f:
         assert sorted(f.getnames()) == sorted(
             [
                 "etc/abc",
@@ -541,7 +594,7 @@ def test_get_sync_archive(tmp_path) -> None:  # type:ignore[no-untyped-def]
         )
 
 
-def _get_test_sync_archive(tmp_path):
+def _get_test_sync_archive(tmp_path: Path, compressed: bool = False) -> bytes:
     tmp_path.joinpath("etc").mkdir(parents=True, exist_ok=True)
     with tmp_path.joinpath("etc/abc").open("w", encoding="utf-8") as f:
         f.write("gä")
@@ -569,14 +622,17 @@ def _get_test_sync_archive(tmp_path):
             "working-symlink",
         ],
         tmp_path,
+        compressed,
     )
 
 
 class TestAutomationReceiveConfigSync:
+    @pytest.mark.parametrize("compressed", [False, True])
     def test_automation_receive_config_sync(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
+        compressed: bool,
     ) -> None:
         remote_path = tmp_path / "remote"
         monkeypatch.setattr(cmk.utils.paths, "omd_root", remote_path)
@@ -616,7 +672,7 @@ class TestAutomationReceiveConfigSync:
         automation.execute(
             activate_changes.ReceiveConfigSyncRequest(
                 site_id=SiteId("remote"),
-                sync_archive=_get_test_sync_archive(tmp_path.joinpath("central")),
+                sync_archive=_get_test_sync_archive(tmp_path.joinpath("central"), compressed),
                 to_delete=[
                     "to_delete",
                     "working-symlink/file",
@@ -82,6 +82,7 @@ def test_registered_configvars() -> None:
         "adhoc_downtime",
         "agent_simulator",
         "apache_process_tuning",
+        "archive_mode",
         "archive_orphans",
         "auth_by_http_header",
         "builtin_icon_visibility",
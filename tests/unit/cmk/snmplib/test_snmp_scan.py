@@ -140,6 +140,7 @@ SNMPConfig = SNMPHostConfig(
     is_bulkwalk_host=False,
     is_snmpv2or3_without_bulkwalk_host=False,
     bulk_walk_size_of=0,
+    max_concurrent_walks=1,
     timing={},
     oid_range_limits=[],
     snmpv3_contexts=[],
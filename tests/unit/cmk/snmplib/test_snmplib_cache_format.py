@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022 tribe29 GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cmk.snmplib import cache_format
+from cmk.snmplib.type_defs import SNMPRowInfo
+
+
+@pytest.mark.parametrize(
+    "rowinfo",
+    [
+        [],
+        [(".1.2.3.1", b"")],
+        [(".1.2.3.1", b"eth0"), (".1.2.3.2", b"\n\x00\xff"), (".1.2.3.10", b"AA BB")],
+    ],
+)
+def test_rowinfo_roundtrip(rowinfo: SNMPRowInfo) -> None:
+    assert cache_format.decode_rowinfo(cache_format.encode_rowinfo(rowinfo)) == rowinfo
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        [],
+        [[]],
+        [[["1", "eth0", [0, 255], []], ["2", "Überlänge", [], ""]]],
+        [[["1", [256, 1]]], [[-5, None, b"raw", ("a", "b")]]],
+    ],
+)
+def test_value_roundtrip(value: Any) -> None:
+    assert cache_format.decode_value(cache_format.encode_value(value)) == value
+
+
+def test_encode_value_rejects_unknown_types() -> None:
+    with pytest.raises(TypeError):
+        cache_format.encode_value([True])
+
+
+def test_file_index(tmp_path: Path) -> None:
+    entries = {".1.2.3": b"abc", ".1.2.4": b"", "öid": b"xyz"}
+    path = tmp_path / "cache"
+    path.write_bytes(cache_format.dump(entries))
+
+    with cache_format.mapped_file(path) as buffer:
+        index = cache_format.load_index(buffer)
+        assert {
+            key: buffer[offset : offset + size] for key, (offset, size) in index.items()
+        } == entries
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "cache"
+    path.touch()
+
+    with cache_format.mapped_file(path) as buffer:
+        assert not cache_format.load_index(buffer)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"{'section': []}\n",
+        cache_format.dump({".1.2.3": b"abc"})[:-1],
+        cache_format.dump({}).replace(b"\x01\x00", b"\x02\x00", 1),
+    ],
+)
+def test_load_index_invalid(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        cache_format.load_index(data)
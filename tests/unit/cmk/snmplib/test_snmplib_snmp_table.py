@@ -3,10 +3,15 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import signal
+import threading
+import time
+
 import pytest
 
 from tests.testlib.base import Scenario
 
+from cmk.utils.exceptions import MKSNMPError, MKTimeout
 from cmk.utils.log import logger
 from cmk.utils.type_defs import HostName, SectionName
 
@@ -31,6 +36,7 @@ SNMPConfig = SNMPHostConfig(
     is_bulkwalk_host=False,
     is_snmpv2or3_without_bulkwalk_host=False,
     bulk_walk_size_of=0,
+    max_concurrent_walks=1,
     timing={},
     oid_range_limits={},
     snmpv3_contexts=[],
@@ -92,6 +98,99 @@ def test_get_snmp_table(  # type:ignore[no-untyped-def]
     assert get_all_snmp_tables(snmp_info) == expected_values
 
 
+class SNMPCountingTestBackend(SNMPTestBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.walked_oids = []
+
+    def walk(self, oid, section_name=None, table_base_oid=None, context_name=None):
+        self.walked_oids.append(oid)
+        return super().walk(oid, section_name, table_base_oid, context_name)
+
+
+def test_prefetch_snmpwalks() -> None:
+    backend = SNMPCountingTestBackend(SNMPConfig, logger)
+    walk_cache = {".1.2.3.4": (False, [(".1.2.3.4.1", b"cached")])}
+    tree = BackendSNMPTree(
+        base=".1.2.3",
+        oids=[
+            BackendOIDSpec(SpecialColumn.END, "string", False),
+            BackendOIDSpec("4", "string", False),
+            BackendOIDSpec("5", "string", True),
+        ],
+    )
+    other_tree = BackendSNMPTree(
+        base=".1.2",
+        oids=[BackendOIDSpec("3.5", "string", False), BackendOIDSpec("6", "string", False)],
+    )
+
+    snmp_table.prefetch_snmpwalks(
+        trees=[(SectionName("one"), tree), (SectionName("two"), other_tree)],
+        walk_cache=walk_cache,
+        backend=backend,
+        max_workers=4,
+    )
+
+    assert sorted(backend.walked_oids) == [".1.2.3.5", ".1.2.6"]
+    assert list(walk_cache) == [".1.2.3.4", ".1.2.3.5", ".1.2.6"]
+    assert walk_cache[".1.2.3.5"] == (
+        True,
+        [(".1.2.3.5.1", b"C0FEFE"), (".1.2.3.5.2", b"C0FEFE"), (".1.2.3.5.3", b"C0FEFE")],
+    )
+
+    assert snmp_table.get_snmp_table(
+        section_name=SectionName("one"),
+        tree=tree,
+        walk_cache=walk_cache,
+        backend=backend,
+    ) == [["1", "cached", "C0FEFE"], ["2", "", "C0FEFE"], ["3", "", "C0FEFE"]]
+    assert len(backend.walked_oids) == 2
+
+
+class SNMPBlockingTestBackend(SNMPTestBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cancelled = threading.Event()
+
+    def cancel_walks(self):
+        self.cancelled.set()
+
+    def walk(self, oid, section_name=None, table_base_oid=None, context_name=None):
+        self.cancelled.wait(timeout=30)
+        raise MKSNMPError("Walk of %s cancelled" % oid)
+
+
+def test_prefetch_snmpwalks_cancels_walks_on_timeout() -> None:
+    backend = SNMPBlockingTestBackend(SNMPConfig, logger)
+    tree = BackendSNMPTree(
+        base=".1.2.3",
+        oids=[BackendOIDSpec("4", "string", False), BackendOIDSpec("5", "string", False)],
+    )
+
+    def raise_timeout(signum, frame):
+        raise MKTimeout("Fetching timed out")
+
+    previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0.1)
+        start = time.monotonic()
+        with pytest.raises(MKTimeout):
+            snmp_table.prefetch_snmpwalks(
+                trees=[(SectionName("one"), tree)],
+                walk_cache={},
+                backend=backend,
+                max_workers=2,
+            )
+        elapsed = time.monotonic() - start
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+    assert backend.cancelled.is_set()
+    # Not waiting for the walks, which would only end after 30 seconds
+    assert elapsed < 10
+
+
 @pytest.mark.parametrize(
     "encoding,columns,expected",
     [
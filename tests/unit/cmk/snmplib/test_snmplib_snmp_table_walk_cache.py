@@ -3,11 +3,14 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from pathlib import Path
-from typing import Iterable, MutableMapping
+from typing import Container, Iterator, Mapping, MutableMapping, Tuple
 
+import pytest
+
+import cmk.utils.store as store
 from cmk.utils.type_defs import HostName
 
+import cmk.snmplib.snmp_table as snmp_table
 from cmk.snmplib.snmp_table import WalkCache
 from cmk.snmplib.type_defs import BackendOIDSpec, BackendSNMPTree, SNMPRowInfo
 
@@ -17,26 +20,22 @@ class MockWalkCache(WalkCache):
         super().__init__(HostName("testhost"))
         self.mock_stored_on_fs = mockdata
 
-    def _read_row(self, path: Path) -> SNMPRowInfo:
-        return self.mock_stored_on_fs[str(path.name)]
-
-    def _write_row(self, path: Path, rowinfo: SNMPRowInfo) -> None:
-        self.mock_stored_on_fs[str(path.name)] = rowinfo
+    def _read_walks(self, fetchoids: Container[str]) -> Iterator[Tuple[str, SNMPRowInfo]]:
+        return (
+            (fetchoid, rowinfo)
+            for fetchoid, rowinfo in self.mock_stored_on_fs.items()
+            if fetchoid in fetchoids
+        )
 
-    def _iterfiles(self) -> Iterable[Path]:
-        return (Path(k) for k in self.mock_stored_on_fs)
+    def _write_walks(self, walks: Mapping[str, SNMPRowInfo]) -> None:
+        self.mock_stored_on_fs.update(walks)
 
 
 class TestWalkCache:
-    def test_oid2name_roundtrip(self) -> None:
-        fetchoid = ".3.1.4.1.5.9.2.6.5.3.5"
-        assert fetchoid == WalkCache._name2oid(WalkCache._oid2name(fetchoid))
-
     def test_cache_keeps_stored_data(self) -> None:
 
         fetchoid = ".1.2.3"
-        path = f"OID{fetchoid}"
-        cache = MockWalkCache({path: [("23", b"43")]})
+        cache = MockWalkCache({fetchoid: [("23", b"43")]})
 
         assert not cache
 
@@ -51,7 +50,7 @@ class TestWalkCache:
 
         assert fetchoid in cache
         cache.save()
-        assert path in cache.mock_stored_on_fs
+        assert fetchoid in cache.mock_stored_on_fs
 
     def test_cache_ignores_non_save_oids(self) -> None:
         """
@@ -60,8 +59,7 @@ class TestWalkCache:
         """
 
         fetchoid = ".1.2.3"
-        path = f"OID{fetchoid}"
-        cache = MockWalkCache({path: [("23", b"42")]})
+        cache = MockWalkCache({fetchoid: [("23", b"42")]})
 
         assert not cache
 
@@ -79,3 +77,66 @@ class TestWalkCache:
         )
 
         assert fetchoid not in cache
+
+    def test_cache_loads_only_requested_oids(self) -> None:
+        cache = MockWalkCache({".1.2.3": [("23", b"42")], ".1.2.4": [("24", b"43")]})
+
+        cache.load(
+            trees=[
+                BackendSNMPTree(
+                    base=".1.2",
+                    oids=[BackendOIDSpec("4", "string", True)],
+                ),
+            ]
+        )
+
+        assert list(cache) == [".1.2.4"]
+
+    def test_file_roundtrip(self) -> None:
+        tree = BackendSNMPTree(
+            base=".1.2",
+            oids=[BackendOIDSpec("3", "string", True), BackendOIDSpec("4", "binary", True)],
+        )
+        cache = WalkCache(HostName("testhost"))
+        cache[".1.2.3"] = (True, [(".1.2.3.1", b"eth0"), (".1.2.3.2", b"")])
+        cache[".1.2.5"] = (True, [(".1.2.5.1", b"\x00\xff")])
+        cache.save()
+
+        # Walks not saved by this instance are kept.
+        cache = WalkCache(HostName("testhost"))
+        cache[".1.2.4"] = (True, [])
+        cache.save()
+
+        cache = WalkCache(HostName("testhost"))
+        cache.load(trees=[tree])
+        assert dict(cache) == {
+            ".1.2.3": (False, [(".1.2.3.1", b"eth0"), (".1.2.3.2", b"")]),
+            ".1.2.4": (False, []),
+        }
+
+        cache.clear()
+        cache = WalkCache(HostName("testhost"))
+        cache.load(trees=[tree])
+        assert not cache
+
+    def test_file_update_is_locked(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        cache = WalkCache(HostName("testhost"))
+        cache[".1.2.3"] = (True, [(".1.2.3.1", b"eth0")])
+        cache.save()
+
+        dump = snmp_table.cache_format.dump
+
+        def locked_dump(entries: Mapping[str, bytes]) -> bytes:
+            assert store.have_lock(cache.path)
+            return dump(entries)
+
+        monkeypatch.setattr(snmp_table.cache_format, "dump", locked_dump)
+        cache = WalkCache(HostName("testhost"))
+        cache[".1.2.4"] = (True, [])
+        cache.save()
+
+        assert not store.have_lock(cache.path)
+        assert sorted(WalkCache(HostName("testhost"))._read_walks({".1.2.3", ".1.2.4"})) == [
+            (".1.2.3", [(".1.2.3.1", b"eth0")]),
+            (".1.2.4", []),
+        ]
@@ -12,8 +12,10 @@ from cmk.special_agents.agent_aws import (
     EBS,
     EBSLimits,
     EBSSummary,
+    EC2,
     EC2Summary,
     ResultDistributor,
+    run_sections,
 )
 
 from .agent_aws_fake_clients import (
@@ -204,3 +206,55 @@ def test_agent_aws_ebs_without_limits(get_ebs_sections) -> None:  # type:ignore[
         # Y (len results) == 6 (metrics) * X (buckets)
         # But: 5 metrics for all volume types
         assert len(result.content) >= 5
+
+
+@pytest.mark.parametrize("names,tags,found_ebs", ebs_params)
+def test_agent_aws_ebs_run_sections(  # type:ignore[no-untyped-def]
+    get_ebs_sections, names, tags, found_ebs
+) -> None:
+    ec2_summary, ebs_limits, ebs_summary, ebs = get_ebs_sections(names, tags)
+    outcomes = run_sections([ec2_summary, ebs_limits, ebs_summary, ebs], use_cache=False)
+
+    assert [len(o.results) for o in outcomes] == [1, 1, found_ebs, found_ebs]
+
+
+class CountingCloudwatchClient(FakeCloudwatchClient):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_metric_data(self, MetricDataQueries, StartTime="START", EndTime="END"):
+        self.calls += 1
+        return super().get_metric_data(MetricDataQueries, StartTime=StartTime, EndTime=EndTime)
+
+
+def test_agent_aws_ebs_and_ec2_share_metric_data_calls() -> None:
+    region = "region"
+    config = AWSConfig("hostname", [], ([], []))
+    config.add_single_service_config("ebs_names", None)
+    config.add_service_tags("ebs_tags", (None, None))
+    config.add_single_service_config("ec2_names", None)
+    config.add_service_tags("ec2_tags", (None, None))
+
+    fake_ec2_client = FakeEC2Client()
+    cloudwatch_client = CountingCloudwatchClient()
+    distributor = ResultDistributor()
+    ec2_summary = EC2Summary(fake_ec2_client, region, config, distributor)
+    ebs_summary = EBSSummary(fake_ec2_client, region, config, distributor)
+    ec2 = EC2(cloudwatch_client, region, config)
+    ebs = EBS(cloudwatch_client, region, config)
+    distributor.add(ec2_summary.name, ebs_summary)
+    distributor.add(ec2_summary.name, ec2)
+    distributor.add(ebs_summary.name, ebs)
+    ebs_alone = EBS(cloudwatch_client, region, config)
+    distributor.add(ebs_summary.name, ebs_alone)
+
+    outcomes = run_sections([ec2_summary, ebs_summary, ec2, ebs], use_cache=False)
+
+    assert cloudwatch_client.calls == 1
+    ec2_results, ebs_results = outcomes[2].results, outcomes[3].results
+    assert len(ec2_results) == 2
+    assert len(ebs_results) == 3
+
+    # The same results as when fetching the metric data on its own
+    assert ebs_alone.run().results == ebs_results
+    assert cloudwatch_client.calls == 2
@@ -3,9 +3,30 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import threading
+import time
+
 import pytest
 
-from cmk.special_agents.agent_aws import AWSSectionResult, AWSSectionsGeneric, Results
+from cmk.special_agents import agent_aws
+from cmk.special_agents.agent_aws import (
+    AwsAccessError,
+    AWSColleagueContents,
+    AWSComputedContent,
+    AWSConfig,
+    AWSRawContent,
+    AWSSection,
+    AWSSectionCloudwatch,
+    AWSSectionResult,
+    AWSSectionResults,
+    AWSSectionsGeneric,
+    main,
+    Metrics,
+    ResultDistributor,
+    ResultDistributorS3Limits,
+    Results,
+    run_sections,
+)
 
 
 class TestAWSSections:
@@ -54,3 +75,253 @@ class TestAWSSections:
         generic_section._write_section_results(cached_data)
         section_stdout = capsys.readouterr().out
         assert section_stdout.split("\n")[0] == "<<<aws_costs_and_usage:cached(1606382471,38642)>>>"
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.max_concurrent_calls = 0
+        self._concurrent_calls = 0
+        self._lock = threading.Lock()
+
+    def call(self, name: str, barrier: threading.Barrier | None) -> None:
+        with self._lock:
+            self._concurrent_calls += 1
+            self.max_concurrent_calls = max(self.max_concurrent_calls, self._concurrent_calls)
+        if barrier is not None:
+            barrier.wait()
+        time.sleep(0.01)
+        with self._lock:
+            self.calls.append(name)
+            self._concurrent_calls -= 1
+
+
+class FakeSection(AWSSection):
+    def __init__(
+        self,
+        name: str,
+        client: FakeClient,
+        distributor: ResultDistributor | None = None,
+        barrier: threading.Barrier | None = None,
+    ) -> None:
+        self._name = name
+        self._barrier = barrier
+        super().__init__(client, "region", AWSConfig("hostname", [], ([], [])), distributor)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def cache_interval(self) -> int:
+        return 300
+
+    @property
+    def granularity(self) -> int:
+        return 300
+
+    def _get_colleague_contents(self) -> AWSColleagueContents:
+        return AWSColleagueContents(
+            sorted(c.content["name"] for c in self._received_results.values()), 0.0
+        )
+
+    def get_live_data(self, *args):  # type:ignore[no-untyped-def]
+        (colleague_contents,) = args
+        if self._name == "broken":
+            raise AssertionError("broken")
+        self._client.call(self._name, self._barrier)
+        return {"name": self._name, "received": colleague_contents.content}
+
+    def _compute_content(
+        self, raw_content: AWSRawContent, colleague_contents: AWSColleagueContents
+    ) -> AWSComputedContent:
+        return AWSComputedContent(raw_content.content, raw_content.cache_timestamp)
+
+    def _create_results(self, computed_content: AWSComputedContent) -> list[AWSSectionResult]:
+        return [AWSSectionResult("", [computed_content.content])]
+
+
+def test_run_sections_in_order_of_colleagues() -> None:
+    ec2_client, cloudwatch_client = FakeClient(), FakeClient()
+    distributor = ResultDistributor()
+    limits = FakeSection("limits", ec2_client, distributor)
+    summary = FakeSection("summary", ec2_client, distributor)
+    cloudwatch = FakeSection("cloudwatch", cloudwatch_client, distributor)
+    distributor.add(limits.name, summary)
+    distributor.add(summary.name, cloudwatch)
+    distributor.add(limits.name, cloudwatch)
+
+    outcomes = run_sections([limits, summary, cloudwatch], use_cache=False)
+
+    assert [o.results[0].content for o in outcomes if isinstance(o, AWSSectionResults)] == [
+        [{"name": "limits", "received": []}],
+        [{"name": "summary", "received": ["limits"]}],
+        [{"name": "cloudwatch", "received": ["limits", "summary"]}],
+    ]
+
+
+def test_run_sections_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    clients = [FakeClient(), FakeClient()]
+    sections = [
+        FakeSection(f"section{idx}", clients[idx % 2], barrier=barrier if idx < 2 else None)
+        for idx in range(6)
+    ] + [FakeSection("broken", clients[0])]
+
+    outcomes = run_sections(sections, use_cache=False, max_workers=4)
+
+    # The sections of different clients ran at the same time, the ones of the same client not
+    assert [c.max_concurrent_calls for c in clients] == [1, 1]
+    assert [o.results[0].content[0]["name"] for o in outcomes[:6]] == [  # type: ignore[union-attr]
+        f"section{idx}" for idx in range(6)
+    ]
+    assert isinstance(outcomes[6], AssertionError)
+
+
+def test_run_sections_debug() -> None:
+    with pytest.raises(AssertionError):
+        run_sections([FakeSection("broken", FakeClient())], use_cache=False, debug=True)
+
+
+def test_main_writes_initialized_regions_on_access_error(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def init_sections(
+        self: AWSSectionsGeneric,
+        services: list[str],
+        region: str,
+        config: AWSConfig,
+        s3_limits_distributor: ResultDistributorS3Limits | None = None,
+    ) -> None:
+        if region == "us-east-2":
+            raise AwsAccessError("Access denied")
+        self._sections.append(FakeSection(f"fake_{region.replace('-', '_')}", FakeClient()))
+
+    # main() would reconfigure (and disable) the root logger for all following tests
+    monkeypatch.setattr(agent_aws, "_setup_logging", lambda *args: None)
+    monkeypatch.setattr(agent_aws, "_create_session", lambda *args: None)
+    monkeypatch.setattr(AWSSectionsGeneric, "init_sections", init_sections)
+    monkeypatch.setattr(AWSConfig, "is_up_to_date", lambda self: False)
+
+    assert (
+        main(
+            [
+                "--access-key-id=id",
+                "--secret-access-key=key",
+                "--hostname=host",
+                "--services",
+                "ec2",
+                "--regions",
+                "eu-central-1",
+                "us-east-2",
+                "eu-west-1",
+            ]
+        )
+        == 0
+    )
+
+    output = capsys.readouterr().out
+    # The regions initialized before the error are still reported, the later ones are skipped
+    assert "<<<aws_fake_eu_central_1" in output
+    assert "eu_west_1" not in output
+    assert output.endswith("<<<aws_exceptions>>>\nException: Access denied\n")
+
+
+class FakeCloudwatchClient:
+    def __init__(self, failing_period: int | None = None) -> None:
+        self.calls: list[tuple[int, int]] = []
+        self._failing_period = failing_period
+
+    def get_metric_data(self, MetricDataQueries, StartTime, EndTime):  # type:ignore[no-untyped-def]
+        period = int(EndTime - StartTime)
+        self.calls.append((period, len(MetricDataQueries)))
+        if period == self._failing_period:
+            raise ValueError("Rate exceeded")
+        return {
+            "MetricDataResults": [
+                {"Id": query["Id"], "Label": query["Label"], "Values": [period]}
+                for query in MetricDataQueries
+            ]
+        }
+
+
+class FakeCloudwatchSection(AWSSectionCloudwatch):
+    def __init__(self, name: str, client: FakeCloudwatchClient, queries: int, period: int) -> None:
+        self._name = name
+        self._queries = queries
+        self._period = period
+        super().__init__(client, "region", AWSConfig("hostname", [], ([], [])))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def cache_interval(self) -> int:
+        return 300
+
+    @property
+    def period(self) -> int:
+        return self._period
+
+    def _get_colleague_contents(self) -> AWSColleagueContents:
+        return AWSColleagueContents(None, 0.0)
+
+    def _get_metrics(self, colleague_contents: AWSColleagueContents) -> Metrics:
+        return [
+            {
+                "Id": self._create_id_for_metric_data_query(idx, "Metric"),
+                "Label": f"{self._name}-{idx}",
+                "MetricStat": {
+                    "Metric": {"Namespace": "AWS/Fake", "MetricName": "Metric", "Dimensions": []},
+                    "Period": self._period,
+                    "Stat": "Average",
+                },
+            }
+            for idx in range(self._queries)
+        ]
+
+    def _compute_content(
+        self, raw_content: AWSRawContent, colleague_contents: AWSColleagueContents
+    ) -> AWSComputedContent:
+        return AWSComputedContent(raw_content.content, raw_content.cache_timestamp)
+
+    def _create_results(self, computed_content: AWSComputedContent) -> list[AWSSectionResult]:
+        return [AWSSectionResult("", computed_content.content)]
+
+
+def test_run_sections_shares_metric_data_calls() -> None:
+    client = FakeCloudwatchClient()
+    sections = [
+        FakeCloudwatchSection("first", client, 300, 600),
+        FakeCloudwatchSection("second", client, 300, 600),
+        FakeCloudwatchSection("third", client, 10, 172800),
+    ]
+
+    outcomes = run_sections(sections, use_cache=False)
+
+    assert client.calls == [(600, 500), (600, 100), (172800, 10)]
+    for section, outcome in zip(sections, outcomes):
+        assert isinstance(outcome, AWSSectionResults)
+        assert outcome.results[0].content == [
+            {
+                "Id": f"id_{idx}_Metric",
+                "Label": f"{section.name}-{idx}",
+                "Values": [(section.period, None)],
+            }
+            for idx in range(10 if section.name == "third" else 300)
+        ]
+
+
+def test_run_sections_fetches_metric_data_of_failed_calls_per_section() -> None:
+    client = FakeCloudwatchClient(failing_period=172800)
+    sections = [
+        FakeCloudwatchSection("first", client, 10, 600),
+        FakeCloudwatchSection("second", client, 10, 172800),
+    ]
+
+    outcomes = run_sections(sections, use_cache=False)
+
+    assert client.calls == [(600, 10), (172800, 10), (172800, 10)]
+    assert isinstance(outcomes[0], AWSSectionResults)
+    assert isinstance(outcomes[1], ValueError)
@@ -206,29 +206,41 @@ def test_pod_name() -> None:
     assert pod_namespaced_name == f"{namespace}_{name}"
 
 
-def test_filter_pods_by_namespace() -> None:
+def test_pod_index_namespace_pods() -> None:
     pod_one = APIPodFactory.build(metadata=MetaDataFactory.build(name="pod_one", namespace="one"))
     pod_two = APIPodFactory.build(metadata=MetaDataFactory.build(name="pod_two", namespace="two"))
 
-    filtered_pods = agent.filter_pods_by_namespace([pod_one, pod_two], api.NamespaceName("one"))
+    filtered_pods = agent.PodIndex([pod_one, pod_two]).namespace_pods(api.NamespaceName("one"))
 
     assert [pod.metadata.name for pod in filtered_pods] == ["pod_one"]
 
 
-def test_filter_pods_by_cron_job() -> None:
-    pod_one = APIPodFactory.build(
-        uid="in_cron_job",
-    )
-    pod_two = APIPodFactory.build(
-        uid="not_in_cron_job",
-    )
-    cron_job = CronJobFactory.build(
-        pod_uids=[
-            "in_cron_job",
-        ]
-    )
-    filtered_pods = agent.filter_pods_by_cron_job([pod_one, pod_two], cron_job)
-    assert [pod.uid for pod in filtered_pods] == ["in_cron_job"]
+def test_pod_index_namespace_pods_in_phase() -> None:
+    metadata = MetaDataFactory.build(namespace="one")
+    pods = [
+        APIPodFactory.build(
+            uid=f"pod_{number}",
+            metadata=metadata,
+            status=PodStatusFactory.build(phase=phase),
+        )
+        for number, phase in enumerate(
+            [api.Phase.RUNNING, api.Phase.PENDING, api.Phase.RUNNING, api.Phase.FAILED]
+        )
+    ]
+
+    filtered_pods = agent.PodIndex(pods).namespace_pods(api.NamespaceName("one"), api.Phase.RUNNING)
+
+    assert [pod.uid for pod in filtered_pods] == ["pod_0", "pod_2"]
+
+
+def test_pod_index_pods_by_uids_of_cron_job() -> None:
+    pods = [APIPodFactory.build(uid=uid) for uid in ["in_cron_job", "not_in_cron_job", "last"]]
+    cron_job = CronJobFactory.build(pod_uids=["last", "in_cron_job", "unknown"])
+
+    filtered_pods = agent.PodIndex(pods).pods_by_uids(cron_job.pod_uids)
+
+    # The pods are in the order of the API
+    assert [pod.uid for pod in filtered_pods] == ["in_cron_job", "last"]
 
 
 @pytest.mark.parametrize(
@@ -471,7 +471,7 @@ def test_create_correct_number_pod_names_for_cluster_host(
         monitored_pods=set(),
         cluster=cluster,
         monitored_namespaces=set(),
-        api_pods=pods,
+        pod_index=agent.PodIndex(pods),
         resource_quotas=[],
         monitored_api_namespaces=[],
         api_cron_jobs=[],
@@ -17,21 +17,22 @@ from cmk.special_agents import agent_kube as agent
 from cmk.special_agents.utils_kubernetes.schemata import api
 
 
-def test_filter_matching_namespace_resource_quota() -> None:
+def test_resource_quotas_by_namespace() -> None:
     namespace_name = api.NamespaceName("matching-namespace")
     resource_quotas = [
         APIResourceQuotaFactory.build(metadata=MetaDataFactory.build(namespace=namespace_name)),
         APIResourceQuotaFactory.build(
             metadata=MetaDataFactory.build(namespace=api.NamespaceName("non-matching-namespace"))
         ),
+        APIResourceQuotaFactory.build(metadata=MetaDataFactory.build(namespace=namespace_name)),
     ]
 
-    matching_resource_quota = agent.filter_matching_namespace_resource_quota(
-        namespace_name, resource_quotas
-    )
+    namespace_resource_quotas = agent.resource_quotas_by_namespace(resource_quotas)
 
-    assert matching_resource_quota is not None
-    assert matching_resource_quota.metadata.namespace == namespace_name
+    assert namespace_resource_quotas == {
+        namespace_name: resource_quotas[0],
+        api.NamespaceName("non-matching-namespace"): resource_quotas[1],
+    }
 
 
 def test_filter_terminating_pods_by_quota_scope() -> None:
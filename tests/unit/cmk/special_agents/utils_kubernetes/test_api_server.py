@@ -6,6 +6,7 @@
 # mypy: disallow-untyped-defs
 import json
 import logging
+import threading
 from typing import Mapping, Sequence, Union
 
 import pytest
@@ -16,6 +17,7 @@ from mocket.mockhttp import Entry  # type: ignore[import]
 
 from cmk.special_agents.utils_kubernetes.api_server import (
     _verify_version_support,
+    CoreAPI,
     decompose_git_version,
     RawAPI,
     UnsupportedEndpointData,
@@ -63,6 +65,91 @@ def test_raw_api_get_healthz_nok(raw_api: RawAPI) -> None:
     assert result.verbose_response == "verbose\nresponse\nnok"
 
 
+def test_core_api_query_raw_nodes_page_by_page() -> None:
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/api/v1/nodes?limit=500",
+        body=json.dumps(
+            {"items": [{"metadata": {"name": "node-1"}}], "metadata": {"continue": "page-2"}}
+        ),
+    )
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/api/v1/nodes?limit=500&continue=page-2",
+        body=json.dumps({"items": [{"metadata": {"name": "node-2"}}], "metadata": {}}),
+    )
+    with Mocketizer():
+        nodes = CoreAPI(kubernetes_api_client(), timeout=(10, 10)).query_raw_nodes()
+
+    assert [node.metadata.name for node in nodes] == ["node-1", "node-2"]
+
+
+def test_core_api_query_raw_nodes_expired_continue_token() -> None:
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/api/v1/nodes?limit=500",
+        body=json.dumps(
+            {"items": [{"metadata": {"name": "node-1"}}], "metadata": {"continue": "page-2"}}
+        ),
+    )
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/api/v1/nodes?limit=500&continue=page-2",
+        body=json.dumps({"kind": "Status", "reason": "Expired", "code": 410}),
+        status=410,
+    )
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/api/v1/nodes",
+        body=json.dumps(
+            {
+                "items": [{"metadata": {"name": "node-1"}}, {"metadata": {"name": "node-2"}}],
+                "metadata": {},
+            }
+        ),
+    )
+    with Mocketizer():
+        nodes = CoreAPI(kubernetes_api_client(), timeout=(10, 10)).query_raw_nodes()
+
+    assert [node.metadata.name for node in nodes] == ["node-1", "node-2"]
+
+
+def test_raw_api_query_raw_statefulsets_page_by_page(raw_api: RawAPI) -> None:
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/apis/apps/v1/statefulsets?limit=500",
+        body=json.dumps({"items": [{"id": 1}], "metadata": {"continue": "page-2"}}),
+    )
+    Entry.single_register(
+        Entry.GET,
+        "http://api-unittest/apis/apps/v1/statefulsets?limit=500&continue=page-2",
+        body=json.dumps({"items": [{"id": 2}], "metadata": {}}),
+    )
+    with Mocketizer():
+        statefulsets = raw_api.query_raw_statefulsets()
+
+    assert statefulsets == {"items": [{"id": 1}, {"id": 2}]}
+
+
+def test_raw_api_query_kubelets_health_concurrently() -> None:
+    node_names = ["node-1", "node-2", "node-3"]
+    # Each query waits for the others, which only succeeds if they run at the same time
+    barrier = threading.Barrier(len(node_names), timeout=10)
+
+    class _RawAPI(RawAPI):
+        def query_kubelet_health(self, node_name: str) -> api.HealthZ:
+            barrier.wait()
+            return api.HealthZ(status_code=200, response=f"{node_name}-ok", verbose_response=None)
+
+    result = _RawAPI(kubernetes_api_client(), timeout=(10, 10)).query_kubelets_health(node_names)
+
+    assert {node_name: health.response for node_name, health in result.items()} == {
+        "node-1": "node-1-ok",
+        "node-2": "node-2-ok",
+        "node-3": "node-3-ok",
+    }
+
+
 version_json_pytest_params = [
     pytest.param(
         {
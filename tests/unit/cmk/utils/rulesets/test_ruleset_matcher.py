@@ -10,7 +10,12 @@ from _pytest.monkeypatch import MonkeyPatch
 
 from tests.testlib.base import Scenario
 
-from cmk.utils.rulesets.ruleset_matcher import matches_tag_condition, RulesetMatchObject
+from cmk.utils.rulesets.ruleset_matcher import (
+    MatchCacheInfo,
+    matches_tag_condition,
+    RulesetMatchObject,
+    ServiceDescriptionMatcher,
+)
 from cmk.utils.tags import TagConfig
 from cmk.utils.type_defs import (
     CheckPluginName,
@@ -838,3 +843,37 @@ def test_matches_tag_condition(
         )
         is expected_result
     )
+
+
+@pytest.mark.parametrize(
+    "service_description, expected_result",
+    [
+        ("CPU load", (0, 1, 3, 5)),
+        ("CPU utilization", (0, 3, 5)),
+        ("Interface 1", (2, 3, 4, 5)),
+        ("Interface 10", (2, 4, 5)),
+        ("Memory", (1, 4, 5)),
+    ],
+)
+def test_service_description_matcher(
+    service_description: str, expected_result: Sequence[int]
+) -> None:
+    matcher = ServiceDescriptionMatcher(
+        [
+            ["CPU"],
+            ["CPU load$", {"$regex": "Memory$"}],
+            [{"$regex": "Interface \\d+$"}],
+            {"$nor": ["Interface 10", "Mem.*y$"]},
+            {"$nor": ["CPU"]},
+            None,
+        ]
+    )
+    assert matcher.matching_rules(service_description) == expected_result
+
+
+def test_service_description_matcher_cache_info() -> None:
+    matcher = ServiceDescriptionMatcher([["CPU"]], cache_size=2)
+    for service_description in ["CPU load", "CPU load", "Memory", "Uptime", "CPU load"]:
+        matcher.matching_rules(service_description)
+    assert matcher.cache_info() == MatchCacheInfo(hits=1, misses=4)
+    assert matcher.cache_info().hit_rate == 0.2
@@ -332,6 +332,24 @@ def test_all_matching_hosts(ts) -> None:  # type:ignore[no-untyped-def]
         with_foreign_hosts=False,
     ) == set([])
 
+    assert config_cache.ruleset_matcher.ruleset_optimizer._all_matching_hosts(
+        {"host_tags": {"criticality": {"$or": ["test", "prod"]}}}, with_foreign_hosts=True
+    ) == {"host1", "host2", "host3"}
+
+    assert config_cache.ruleset_matcher.ruleset_optimizer._all_matching_hosts(
+        {"host_tags": {"criticality": {"$nor": ["test", "offline"]}}}, with_foreign_hosts=True
+    ) == {"host2", "host3"}
+
+    assert config_cache.ruleset_matcher.ruleset_optimizer._all_matching_hosts(
+        {"host_tags": {"agent": "no-agent"}, "host_name": {"$nor": ["host1"]}},
+        with_foreign_hosts=True,
+    ) == {"host2", "host3"}
+
+    assert config_cache.ruleset_matcher.ruleset_optimizer._all_matching_hosts(
+        {"host_tags": {"agent": "no-agent"}, "host_name": {"$nor": [{"$regex": "host[12]"}]}},
+        with_foreign_hosts=True,
+    ) == {"host3"}
+
 
 def test_in_extraconf_hostlist() -> None:
     assert tuple_rulesets.in_extraconf_hostlist(tuple_rulesets.ALL_HOSTS, "host1") is True
@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import gzip
+import os
 import shutil
 from pathlib import Path
 from typing import NamedTuple
@@ -13,8 +14,12 @@ import pytest
 from tests.testlib import cmk_path
 
 from cmk.utils.structured_data import (
+    apply_raw_delta,
     Attributes,
+    get_changed_raw_tree,
+    get_raw_sub_tree,
     make_filter,
+    make_raw_delta,
     parse_visible_raw_path,
     RetentionIntervals,
     StructuredDataNode,
@@ -722,6 +727,93 @@ def test_real_compare_with(tree_old, tree_new, result) -> None:  # type:ignore[n
     ) == result
 
 
+@pytest.mark.parametrize(
+    "tree_old,tree_new",
+    list(zip(trees_old, trees_new)) + list(zip(trees_new, trees_old)),
+)
+def test_real_apply_raw_delta(  # type:ignore[no-untyped-def]
+    tree_old, tree_new
+) -> None:
+    raw_tree_old, raw_tree_new = tree_old.serialize(), tree_new.serialize()
+    raw_delta = make_raw_delta(raw_tree_new, raw_tree_old)
+
+    assert StructuredDataNode.deserialize(apply_raw_delta(raw_tree_new, raw_delta)).is_equal(
+        tree_old
+    )
+    assert apply_raw_delta(raw_tree_new, make_raw_delta(raw_tree_new, raw_tree_new)) == raw_tree_new
+
+    delta_result = tree_new.compare_with(tree_old)
+    changed_delta_result = StructuredDataNode.deserialize(
+        get_changed_raw_tree(raw_tree_new, raw_delta)
+    ).compare_with(StructuredDataNode.deserialize(get_changed_raw_tree(raw_tree_old, raw_delta)))
+    assert changed_delta_result.counter == delta_result.counter
+    assert changed_delta_result.delta.is_equal(delta_result.delta)
+
+
+def test_apply_raw_table_delta() -> None:
+    raw_tree_old = StructuredDataNode.deserialize(
+        {"packages": [{"name": "a", "version": "1"}, {"name": "b", "version": "1"}]}
+    ).serialize()
+    raw_tree_old["Nodes"]["packages"]["Table"]["KeyColumns"] = ["name"]
+    raw_tree_new = StructuredDataNode.deserialize(
+        {"packages": [{"name": "b", "version": "2"}, {"name": "c", "version": "1"}]}
+    ).serialize()
+    raw_tree_new["Nodes"]["packages"]["Table"]["KeyColumns"] = ["name"]
+
+    raw_delta = make_raw_delta(raw_tree_new, raw_tree_old)
+
+    assert raw_delta == {
+        "Nodes": {
+            "packages": {
+                "Table": {
+                    "KeyColumns": ["name"],
+                    "Rows": [{"name": "a", "version": "1"}, {"name": "b", "version": "1"}],
+                    "RemovedRows": [("c",)],
+                },
+            },
+        },
+    }
+    assert apply_raw_delta(raw_tree_new, raw_delta)["Nodes"]["packages"]["Table"]["Rows"] == [
+        {"name": "b", "version": "1"},
+        {"name": "a", "version": "1"},
+    ]
+
+
+def test_get_raw_sub_tree() -> None:
+    raw_tree = StructuredDataNode.deserialize(
+        {"hardware": {"cpu": {"cores": 2}, "memory": {"total": 4}}, "software": {"os": "linux"}}
+    ).serialize()
+
+    sub_tree = StructuredDataNode.deserialize(get_raw_sub_tree(raw_tree, ("hardware", "cpu")))
+
+    assert sub_tree.is_equal(StructuredDataNode.deserialize({"hardware": {"cpu": {"cores": 2}}}))
+    assert get_raw_sub_tree(raw_tree, ("foo",)) == {"Attributes": {}, "Table": {}, "Nodes": {}}
+
+
+def test_archive(tmp_path: Path) -> None:
+    host_name = HostName("heute")
+    archive_dir = tmp_path / "archive"
+    store = StructuredDataStore(tmp_path / "inventory")
+    for timestamp, tree in enumerate([tree_old_heute, tree_new_heute, tree_old_heute], start=1):
+        if timestamp > 1:
+            store.archive(host_name=host_name, archive_dir=archive_dir)
+        store.save(host_name=host_name, tree=tree)
+        os.utime(tmp_path / "inventory" / str(host_name), (timestamp, timestamp))
+
+    oldest = StructuredDataStore.load_archive_file(archive_dir / str(host_name) / "1")
+    newest = StructuredDataStore.load_archive_file(archive_dir / str(host_name) / "2")
+
+    assert (archive_dir / str(host_name) / "1").stat().st_mtime == 1
+    assert oldest.raw_tree is None
+    assert oldest.raw_delta is not None
+    assert newest.raw_tree is not None
+    assert newest.raw_delta is None
+    assert StructuredDataNode.deserialize(newest.raw_tree).is_equal(tree_new_heute)
+    assert StructuredDataNode.deserialize(
+        apply_raw_delta(newest.raw_tree, oldest.raw_delta)
+    ).is_equal(tree_old_heute)
+
+
 @pytest.mark.parametrize(
     "tree,edges_t,edges_f",
     list(
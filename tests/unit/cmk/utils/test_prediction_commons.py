@@ -3,6 +3,7 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import random
 from collections.abc import Mapping
 
 import pytest
@@ -90,6 +91,7 @@ def test_rrdtimestamps(twindow: prediction.TimeWindow, result: list[int]) -> Non
             [25, 25, 25, 25, None, None, None, None, 105, 105],
         ),
         ([0, 120, 40, 25, 65, 105], (330, 410, 10), 300, [25, 65, 65, 65, 65, 105, 105, 105]),
+        ([0, 40, 10, 1, 2, 3, 4], (0, 40, 20), 0, [1, 2]),
     ],
 )
 def test_time_series_upsampling(
@@ -102,6 +104,22 @@ def test_time_series_upsampling(
     assert ts.bfill_upsample(twindow, shift) == upsampled
 
 
+@pytest.mark.parametrize("shift", [0, 7, 300, 86400])
+def test_time_series_upsampling_like_stepwise(shift: int) -> None:
+    rng = random.Random(shift)
+    for _ in range(100):
+        step = rng.choice([60, 300, 1800])
+        start = rng.randrange(0, 3600, 60)
+        values: prediction.TimeSeriesValues = [
+            None if rng.random() < 0.2 else rng.uniform(-100, 100) for _ in range(50)
+        ]
+        ts = prediction.TimeSeries(values, (start, start + 50 * step, step))
+        target_step = rng.choice([10, 60, step])
+        target_start = start + shift + rng.randrange(0, 2 * step, target_step)
+        twindow = (target_start, target_start + step * 40, target_step)
+        assert ts.bfill_upsample(twindow, shift) == ts._bfill_upsample_stepwise(twindow, shift)
+
+
 @pytest.mark.parametrize(
     "rrddata, twindow, cf, downsampled",
     [
@@ -8,7 +8,10 @@
 import errno
 import socket
 import ssl
-from contextlib import closing
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
 from pathlib import Path
 
 import pytest
@@ -270,3 +273,171 @@ def test_set_auth_user(mock_livestatus, user_id, allowed):
             return
 
         livestatus.LocalConnection().set_auth_user("mydomain", user_id)
+
+
+@contextmanager
+def _livestatus_server(socket_path: Path, response: bytes, delay: float) -> Iterator[str]:
+    """Answer each query on the socket with the given response after the given delay"""
+    with closing(socket.socket(socket.AF_UNIX)) as server:
+        server.bind(str(socket_path))
+        server.listen(1)
+
+        def serve() -> None:
+            with closing(server.accept()[0]) as connection:
+                while connection.recv(4096).endswith(b"\n\n"):
+                    time.sleep(delay)
+                    connection.sendall(b"200 %11d\n" % len(response) + response)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        yield "unix:%s" % socket_path
+
+
+@contextmanager
+def _livestatus_server_without_order_by(socket_path: Path, response: bytes) -> Iterator[str]:
+    """Answer each query on the socket like a livestatus not knowing the OrderBy: header"""
+    with closing(socket.socket(socket.AF_UNIX)) as server:
+        server.bind(str(socket_path))
+        server.listen(1)
+
+        def serve() -> None:
+            with closing(server.accept()[0]) as connection:
+                while (query := connection.recv(4096)).endswith(b"\n\n"):
+                    if b"\nOrderBy:" in query:
+                        error = b"undefined request header\n"
+                        connection.sendall(b"400 %11d\n" % len(error) + error)
+                    else:
+                        connection.sendall(b"200 %11d\n" % len(response) + response)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        yield "unix:%s" % socket_path
+
+
+def test_query_parallel_reads_responses_as_they_arrive(tmp_path: Path) -> None:
+    with _livestatus_server(tmp_path / "slow", b"[[1]]", 0.5) as slow_socket, _livestatus_server(
+        tmp_path / "fast", b"[[2], [3]]", 0.0
+    ) as fast_socket:
+        live = livestatus.MultiSiteConnection(
+            {
+                livestatus.SiteId("slow"): {"socket": slow_socket},
+                livestatus.SiteId("fast"): {"socket": fast_socket},
+            }
+        )
+        live.set_prepend_site(True)
+
+        start = time.time()
+        site_responses = live.query_parallel_by_site(livestatus.Query("GET hosts\nColumns: x"))
+        assert next(site_responses) == ("fast", [["fast", 2], ["fast", 3]])
+        assert time.time() - start < 0.5
+        assert next(site_responses) == ("slow", [["slow", 1]])
+
+        # The rows are returned in the order of the sites
+        assert live.query("GET hosts\nColumns: x") == [["slow", 1], ["fast", 2], ["fast", 3]]
+
+
+def test_query_parallel_query_timeout(tmp_path: Path) -> None:
+    with _livestatus_server(tmp_path / "slow", b"[[1]]", 2) as slow_socket, _livestatus_server(
+        tmp_path / "fast", b"[[2]]", 0.0
+    ) as fast_socket:
+        live = livestatus.MultiSiteConnection(
+            {
+                livestatus.SiteId("slow"): {"socket": slow_socket},
+                livestatus.SiteId("fast"): {"socket": fast_socket},
+            }
+        )
+        live.set_query_timeout(0.2)
+
+        assert live.query("GET hosts\nColumns: x") == [[2]]
+        assert live.alive_sites() == ["fast"]
+        assert "Timeout" in str(live.dead_sites()["slow"]["exception"])
+
+
+def test_query_iter_yields_rows_while_receiving(tmp_path: Path) -> None:
+    response = b"".join(b'[%d,"host%d\\nline 2"],\n' % (n, n) for n in range(20000)) + b'[0,"x"]]\n'
+    with _livestatus_server(tmp_path / "site", b"[" + response, 0.0) as site_socket:
+        live = livestatus.SingleSiteConnection(site_socket)
+
+        rows = live.query_iter("GET hosts\nColumns: x y")
+        assert next(rows) == [0, "host0\nline 2"]
+        assert len(list(rows)) == 20000
+
+        # A query may be stopped early, the rest of the response is dropped with the connection
+        rows = live.query_iter("GET hosts\nColumns: x y")
+        assert next(rows) == [0, "host0\nline 2"]
+        rows.close()
+        assert live.socket is None
+
+
+@pytest.mark.parametrize(
+    "response", [b"[]\n", b"[[1, 'a'],\n[2, b'b']]\n", b"[[1, 'a'], [2, b'b']]"]
+)
+def test_query_iter_response_formats(tmp_path: Path, response: bytes) -> None:
+    with _livestatus_server(tmp_path / "site", response, 0.0) as site_socket:
+        live = livestatus.SingleSiteConnection(site_socket)
+        assert list(live.query_iter("GET hosts\nColumns: x y")) == live.query(
+            "GET hosts\nColumns: x y"
+        )
+
+
+def test_multisite_query_iter(tmp_path: Path) -> None:
+    with _livestatus_server(
+        tmp_path / "site1", b"[[1],\n[2]]\n", 0.0
+    ) as socket1, _livestatus_server(tmp_path / "site2", b"[[3]]\n", 0.0) as socket2:
+        live = livestatus.MultiSiteConnection(
+            {
+                livestatus.SiteId("site1"): {"socket": socket1},
+                livestatus.SiteId("site2"): {"socket": socket2},
+            }
+        )
+        live.set_prepend_site(True)
+        assert list(live.query_iter("GET hosts\nColumns: x")) == [
+            ["site1", 1],
+            ["site1", 2],
+            ["site2", 3],
+        ]
+
+
+def test_multisite_query_merged(tmp_path: Path) -> None:
+    with _livestatus_server(
+        tmp_path / "site1", b"[[1],\n[4]]\n", 0.0
+    ) as socket1, _livestatus_server(tmp_path / "site2", b"[[1],\n[2],\n[3]]\n", 0.0) as socket2:
+        live = livestatus.MultiSiteConnection(
+            {
+                livestatus.SiteId("site1"): {"socket": socket1},
+                livestatus.SiteId("site2"): {"socket": socket2},
+            }
+        )
+        live.set_prepend_site(True)
+        live.set_limit(3)
+        assert live.query_merged("GET hosts\nColumns: x\nOrderBy: x", key=lambda row: row[1]) == [
+            ["site1", 1],
+            ["site2", 1],
+            ["site2", 2],
+        ]
+
+
+def test_multisite_query_merged_unordered_site(tmp_path: Path) -> None:
+    with _livestatus_server(
+        tmp_path / "site1", b"[[1],\n[4]]\n", 0.0
+    ) as socket1, _livestatus_server_without_order_by(
+        tmp_path / "site2", b"[[3],\n[1],\n[2]]\n"
+    ) as socket2:
+        live = livestatus.MultiSiteConnection(
+            {
+                livestatus.SiteId("site1"): {"socket": socket1},
+                livestatus.SiteId("site2"): {"socket": socket2},
+            }
+        )
+        live.set_prepend_site(True)
+        live.set_limit(3)
+        assert live.query_merged(
+            "GET hosts\nColumns: x\nOrderBy: x",
+            key=lambda row: row[1],
+            unordered_query="GET hosts\nColumns: x",
+        ) == [
+            ["site1", 1],
+            ["site2", 1],
+            ["site2", 2],
+        ]
+        assert not live.dead_sites()